@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+APEX Async Controller
+Runs the APEX trading cycle as concurrent asyncio stages
+Part of APEX AI Trading System
+"""
+
+import os
+import sys
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'bots'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
+
+import ccxt.async_support as ccxt_async
+
+from apex_master_controller import APEXMasterController
+from async_pipeline import StageGraph, StageSkipped
+
+class AsyncAPEXController(APEXMasterController):
+    """
+    Asyncio version of the APEX trading cycle
+
+    Stage graph (arrows are dependencies):
+
+        crash ──────────────┬──> whale_alerts <── whales
+                            ├──> rebalance <── roi
+                            └──> opportunities <── sentiment, rebalance
+
+        positions (independent)
+
+    crash, whales, sentiment, roi and positions start together. positions
+    only closes or trails existing stops, so it does not wait for crash and
+    still runs when crash overruns its budget or pauses trading. Per-symbol
+    work inside each stage is fanned out concurrently. Existing bots keep
+    their blocking ccxt clients and run on a bounded thread pool, while the
+    controller's own exchange calls use ccxt.async_support.
+
+    Every stage has a latency budget and the cycle a deadline, so one hung
+    exchange call cannot stretch the cycle past check_interval. Read-only
+    stages (whales, sentiment, roi) fall back to their last good result;
+    crash and anything that trades is skipped instead.
+    """
+
+    def __init__(self, max_workers: int = 16):
+        super().__init__()
+        self.name = "APEX_Async_Controller"
+
+        self.config['max_workers'] = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='apex-cycle')
+
+        self.async_exchange = ccxt_async.cryptocom({
+            'apiKey': os.getenv('EXCHANGE_API_KEY'),
+            'secret': os.getenv('EXCHANGE_API_SECRET'),
+            'enableRateLimit': False    # Throttled by the shared APIGuardianBot bucket
+        })
+
+        # Seconds per stage (the cycle as a whole is bounded by cycle_deadline)
+        self.config['stage_budgets'] = {
+            'crash': 10, 'whales': 15, 'sentiment': 20, 'roi': 15,
+            'whale_alerts': 5, 'rebalance': 10, 'opportunities': 20, 'positions': 15
+        }
+        self.config['stage_cache_ttl'] = {'whales': 300, 'sentiment': 1800, 'roi': 3600}
+
+        self.cycle_graph = None
+        self.last_cycle_report = None
+
+    async def _blocking(self, func: Callable, *args, executor=None):
+        """Run a blocking bot call on the cycle thread pool (or the given executor)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor or self.executor, func, *args)
+
+    async def _per_symbol(self, func: Callable, symbols: List[str]) -> Dict:
+        """Run func(symbol) for every symbol concurrently; failures are dropped"""
+        results = await asyncio.gather(*(self._blocking(func, s) for s in symbols), return_exceptions=True)
+
+        output = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                print(f"❌ {getattr(func, '__name__', 'stage')} error for {symbol}: {result}")
+            else:
+                output[symbol] = result
+        return output
+
+    async def _guarded_ticker(self, symbol: str) -> Dict:
+        """fetch_ticker on the async client, drawing from the shared rate budget"""
+        await self._blocking(self.api_guardian.acquire, 'fetch_ticker', 'positions', executor=self.monitor_pool)
+        return await self.async_exchange.fetch_ticker(symbol)
+
+    @staticmethod
+    def _require_trading(inputs: Dict):
+        if inputs['crash']['trading_paused']:
+            raise StageSkipped('trading paused')
+
+    # ---- Stages -------------------------------------------------------------
+
+    async def _stage_crash(self, inputs: Dict) -> Dict:
+        pairs = self.config['trading_pairs']
+        shield = self.bots['crash_shield']
+
+        checks = await self._per_symbol(shield.check_crash, pairs)
+        status = await self._blocking(shield.monitor_market, pairs, checks)
+
+        if status['trading_paused']:
+            print(f"🛑 Trading paused: {status['pause_reason']}")
+        self.state['trading_enabled'] = not status['trading_paused']
+
+        return status
+
+    async def _stage_whales(self, inputs: Dict) -> Dict:
+        return await self._per_symbol(self.bots['whale_monitor'].monitor_symbol, self.config['trading_pairs'])
+
+    async def _stage_whale_alerts(self, inputs: Dict) -> int:
+        self._require_trading(inputs)
+
+        alerts = [data for data in inputs['whales'].values() if data['alert_level'] != "NORMAL"]
+        for data in alerts:
+            print(f"🐋 {data['symbol']}: {data['alert_level']}")
+
+        await asyncio.gather(*(
+            self._blocking(self.features['notifications'].send_message,
+                           f"🐋 *Whale Alert*\n{data['symbol']}: {data['alert_level']}")
+            for data in alerts
+        ))
+        return len(alerts)
+
+    async def _stage_sentiment(self, inputs: Dict) -> Dict:
+        analyzer = self.features['sentiment']
+        sentiments = await self._per_symbol(analyzer.get_combined_sentiment, analyzer.coins)
+        self.state['last_sentiment_check'] = datetime.now().isoformat()
+
+        print(f"\n🧠 Sentiment Analysis:")
+        for coin, score in sentiments.items():
+            signal, confidence = analyzer.get_signal(coin)
+            print(f"   {coin}: {score:+.2f} → {signal}")
+
+        return sentiments
+
+    async def _stage_roi(self, inputs: Dict):
+        rotator = self.bots['capital_rotator']
+        if not rotator.should_rebalance():
+            return None
+
+        rois = await self._per_symbol(rotator.calculate_pair_roi, self.config['trading_pairs'])
+        return list(rois.items())
+
+    async def _stage_rebalance(self, inputs: Dict) -> Dict:
+        self._require_trading(inputs)
+
+        result = self.bots['capital_rotator'].rebalance_capital(self.config['trading_pairs'],
+                                                                ranked_pairs=inputs['roi'])
+        if result.get('rebalanced'):
+            print(f"\n🔄 Capital rebalanced:")
+            for symbol, alloc in result['new_allocations'].items():
+                print(f"   {symbol}: {alloc*100:.1f}%")
+
+            self.state['last_rebalance'] = datetime.now().isoformat()
+
+        return result
+
+    async def _stage_opportunities(self, inputs: Dict) -> int:
+        self._require_trading(inputs)
+
+        pairs = self.config['trading_pairs']
+        sentiments = inputs['sentiment']
+        plans = await asyncio.gather(*(
+            self._blocking(self.plan_trade, symbol, sentiments.get(symbol.split('/')[0], 0))
+            for symbol in pairs
+        ))
+
+        # Execution mutates shared state, so it stays in one thread and in order
+        opened = 0
+        for plan in plans:
+            if plan:
+                await self._blocking(self.execute_plan, plan)
+                opened += 1
+        return opened
+
+    async def _stage_positions(self, inputs: Dict) -> int:
+        positions = list(self.state['positions'].items())
+        tickers = await asyncio.gather(
+            *(self._guarded_ticker(symbol) for symbol, _ in positions),
+            return_exceptions=True
+        )
+
+        closed = 0
+        for (symbol, pos_id), ticker in zip(positions, tickers):
+            if isinstance(ticker, Exception):
+                print(f"❌ Position monitoring error for {symbol}: {ticker}")
+                continue
+            # Stop-loss work uses the monitor pool, which stage calls past their budget cannot fill
+            if await self._blocking(self.update_position, symbol, pos_id, ticker['last'], executor=self.monitor_pool):
+                closed += 1
+        return closed
+
+    # ---- Cycle ----------------------------------------------------------------
+
+    def build_cycle_graph(self) -> StageGraph:
+        """Declare cycle stages, their dependencies and latency budgets"""
+        budgets = self.config['stage_budgets']
+        cache_ttl = self.config['stage_cache_ttl']
+
+        def add(name, func, depends_on=None):
+            graph.add_stage(name, func, depends_on=depends_on,
+                            budget=budgets.get(name), cache_ttl=cache_ttl.get(name))
+
+        graph = StageGraph(name='apex_cycle')
+        add('crash', self._stage_crash)
+        add('whales', self._stage_whales)
+        add('sentiment', self._stage_sentiment)
+        add('roi', self._stage_roi)
+        add('whale_alerts', self._stage_whale_alerts, depends_on=['crash', 'whales'])
+        add('rebalance', self._stage_rebalance, depends_on=['crash', 'roi'])
+        add('opportunities', self._stage_opportunities, depends_on=['crash', 'sentiment', 'rebalance'])
+        add('positions', self._stage_positions)
+        return graph
+
+    async def trading_cycle_async(self) -> Dict:
+        """Run one trading cycle as a concurrent stage graph"""
+        print(f"\n🔄 CYCLE #{self.state['cycle_count'] + 1} - {datetime.now()}")
+
+        # Built once so cached stage results survive between cycles
+        if self.cycle_graph is None:
+            self.cycle_graph = self.build_cycle_graph()
+
+        report = await self.cycle_graph.run(deadline=self.config['cycle_deadline'])
+        self.last_cycle_report = report
+
+        for stage, error in report['errors'].items():
+            print(f"❌ Stage {stage} failed: {error}")
+        for stage, reason in report['fallbacks'].items():
+            print(f"⏳ Stage {stage} using cached result ({report['ages'][stage]:.0f}s old): {reason}")
+        for stage in report['overruns']:
+            if stage not in report['fallbacks']:
+                print(f"⏳ Stage {stage} skipped: {report['skipped'][stage]}")
+
+        if 'crash' in report['results'] and not report['results']['crash']['trading_paused']:
+            self.state['cycle_count'] += 1
+
+        print(f"⏱️ Cycle {report['elapsed']:.2f}s (serial {report['serial_time']:.2f}s) "
+              f"- critical path: {' → '.join(report['critical_path'])}")
+
+        return report
+
+    async def start_async(self):
+        """Start the async controller loop"""
+        print("\n" + "="*70)
+        print(f"🚀 STARTING {self.name}")
+        print("="*70)
+
+        self.running = True
+
+        try:
+            while self.running:
+                started = time.monotonic()
+                await self.trading_cycle_async()
+
+                # Keep the cadence: sleep only for what is left of the interval
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, self.config['check_interval'] - elapsed))
+        finally:
+            await self.shutdown()
+
+    async def shutdown(self):
+        """Release async exchange session and worker threads"""
+        self.running = False
+        await self.async_exchange.close()
+        self.executor.shutdown(wait=False)
+        self.monitor_pool.shutdown(wait=False)
+
+    def get_status(self) -> Dict:
+        """Get comprehensive system status"""
+        status = super().get_status()
+
+        if self.last_cycle_report:
+            status['last_cycle'] = {
+                'elapsed': self.last_cycle_report['elapsed'],
+                'serial_time': self.last_cycle_report['serial_time'],
+                'critical_path': self.last_cycle_report['critical_path'],
+                'timings': self.last_cycle_report['timings'],
+                'ages': self.last_cycle_report['ages'],
+                'fallbacks': self.last_cycle_report['fallbacks'],
+                'overruns': self.last_cycle_report['overruns']
+            }
+
+        return status
+
+if __name__ == '__main__':
+    controller = AsyncAPEXController()
+
+    try:
+        asyncio.run(controller.start_async())
+    except KeyboardInterrupt:
+        print("\n\n🛑 Stopping APEX Async Controller...")
+        controller.stop()
@@ -10,8 +10,9 @@ import sys
 import json
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Add paths
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'bots'))
@@ -23,12 +24,15 @@ from fee_optimizer_bot import FeeOptimizerBot
 from whale_monitor_bot import WhaleMonitorBot
 from crash_shield_bot import CrashShieldBot
 from capital_rotator_bot import CapitalRotatorBot
+from api_guardian_bot import APIGuardianBot
 
 # Import Phase 1 features
 from sentiment_analyzer import SentimentAnalyzer
 from multi_coin_trader import MultiCoinTrader
 from trailing_stoploss import TrailingStopLoss
 from enhanced_notifications import EnhancedNotifications
+from event_scheduler import EventScheduler, PriceMoveTrigger
+from circuit_breaker import get_breaker_status
 
 class APEXMasterController:
     """
@@ -45,6 +49,7 @@ class APEXMasterController:
         self.name = "APEX_Master_Controller"
         self.version = "1.0.0"
         self.running = False
+        self.scheduler = None
         
         print(f"🚀 Initializing {self.name} v{self.version}")
         
@@ -67,15 +72,40 @@ class APEXMasterController:
             'notifications': EnhancedNotifications()
         }
         
+        # Route every exchange client through one priority token bucket
+        self.api_guardian = APIGuardianBot()
+        for component, priority in ((self.bots['dynamic_sl'], 'positions'),
+                                    (self.bots['crash_shield'], 'positions'),
+                                    (self.features['trader'], 'positions'),
+                                    (self.bots['fee_optimizer'], 'analytics'),
+                                    (self.bots['whale_monitor'], 'analytics'),
+                                    (self.bots['capital_rotator'], 'analytics')):
+            component.exchange = self.api_guardian.guard(component.exchange, priority)
+        
         # Trading configuration
         self.config = {
             'trading_pairs': ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT'],
             'max_position_size': 0.50,  # $0.50 per trade
             'sentiment_threshold': 0.3,  # Minimum sentiment for trade
             'check_interval': 60,        # Check every 60 seconds
-            'rebalance_interval': 21600  # Rebalance every 6 hours
+            'cycle_deadline': 45,        # Optional steps are skipped once a cycle runs this long
+            'call_timeout': 10,          # Longest a stop-loss ticker may take (runs past the deadline)
+            'rebalance_interval': 21600, # Rebalance every 6 hours
+            'price_watch_interval': 10,  # Scheduled mode: ticker poll feeding price_move events
+            'crash_interval': 30,        # Scheduled mode: crash shield cadence
+            'whale_interval': 120,
+            'sentiment_interval': 900,
+            'price_move_pct': 1.0        # Move that triggers crash/position checks early
         }
         
+        # Cycle calls run here so a hung one can be abandoned at the deadline. Stop-loss
+        # monitoring has its own pool, so calls the cycle abandons never starve it
+        self.pool_sizes = {'call_pool': 8, 'monitor_pool': 4}
+        self.call_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='apex-call')
+        self.monitor_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='apex-monitor')
+        self._abandoned = {'call_pool': [], 'monitor_pool': []}
+        self._pool_lock = threading.Lock()
+        
         # System state
         self.state = {
             'trading_enabled': True,
@@ -97,150 +127,346 @@ class APEXMasterController:
         print("✅ APEX Master Controller initialized")
     
     def trading_cycle(self):
-        """Main trading cycle - runs continuously"""
+        """Main trading cycle - runs continuously
+        
+        Every exchange-bound call runs on the call pool and is abandoned once
+        the cycle passes cycle_deadline, so one hung call cannot stretch the
+        cycle. Whale, sentiment, rebalance and entry steps are then skipped
+        (entries reuse cached sentiment only while it is fresh); stop-loss
+        monitoring always runs, each ticker bounded by call_timeout, even
+        while trading is paused.
+        """
         print(f"\n🔄 CYCLE #{self.state['cycle_count'] + 1} - {datetime.now()}")
+        deadline = time.monotonic() + self.config['cycle_deadline']
+        
+        def over_deadline(step: str) -> bool:
+            if time.monotonic() < deadline:
+                return False
+            print(f"⏳ Cycle deadline reached, skipping {step}")
+            return True
+        
+        def bounded(func, *args):
+            # Raises FuturesTimeout when the deadline passes first; the call is abandoned
+            return self._bounded_call('call_pool', max(0.0, deadline - time.monotonic()), func, *args)
         
         try:
-            # STEP 1: Check for market crash
-            crash_status = self.bots['crash_shield'].monitor_market(self.config['trading_pairs'])
+            # STEP 1: Check for market crash (a check that cannot finish counts as a pause)
+            try:
+                crash_status = bounded(self.bots['crash_shield'].monitor_market, self.config['trading_pairs'])
+            except FuturesTimeout:
+                crash_status = {'trading_paused': True, 'pause_reason': 'crash check timed out'}
             
             if crash_status['trading_paused']:
                 print(f"🛑 Trading paused: {crash_status['pause_reason']}")
                 self.state['trading_enabled'] = False
+                self.monitor_positions()
                 return
             else:
                 self.state['trading_enabled'] = True
             
-            # STEP 2: Monitor for whale activity
-            for symbol in self.config['trading_pairs']:
-                whale_data = self.bots['whale_monitor'].monitor_symbol(symbol)
+            try:
+                # STEP 2: Monitor for whale activity
+                for symbol in self.config['trading_pairs']:
+                    if over_deadline('whale monitoring'):
+                        break
+                    whale_data = bounded(self.bots['whale_monitor'].monitor_symbol, symbol)
+                    
+                    if whale_data['alert_level'] != "NORMAL":
+                        print(f"🐋 {symbol}: {whale_data['alert_level']}")
+                        self.features['notifications'].send_message(
+                            f"🐋 *Whale Alert*\n{symbol}: {whale_data['alert_level']}"
+                        )
+                
+                # STEP 3: Get sentiment for all pairs (cached result is reused past the deadline)
+                if not over_deadline('sentiment refresh'):
+                    self.state['sentiments'] = bounded(self.features['sentiment'].get_all_sentiments)
+                    self.state['sentiments_at'] = time.time()
+                    self.state['last_sentiment_check'] = datetime.now().isoformat()
+                    
+                    print(f"\n🧠 Sentiment Analysis:")
+                    for coin, score in self.state['sentiments'].items():
+                        signal, confidence = self.features['sentiment'].get_signal(coin)
+                        print(f"   {coin}: {score:+.2f} → {signal}")
+                
+                sentiments = self.state.get('sentiments', {})
+                sentiment_age = time.time() - self.state.get('sentiments_at', 0)
+                
+                # STEP 4: Check if capital rebalancing needed
+                if not over_deadline('rebalance'):
+                    rebalance_result = bounded(self.bots['capital_rotator'].rebalance_capital,
+                                               self.config['trading_pairs'])
+                    
+                    if rebalance_result.get('rebalanced'):
+                        print(f"\n🔄 Capital rebalanced:")
+                        for symbol, alloc in rebalance_result['new_allocations'].items():
+                            print(f"   {symbol}: {alloc*100:.1f}%")
+                        
+                        self.state['last_rebalance'] = datetime.now().isoformat()
+                
+                # STEP 5: Evaluate trading opportunities
+                if sentiment_age > self.config['sentiment_interval']:
+                    print(f"⏳ Sentiment is {sentiment_age:.0f}s old, skipping entries")
+                    sentiments = {}
                 
+                for symbol in self.config['trading_pairs']:
+                    if not sentiments or over_deadline('entries'):
+                        break
+                    coin = symbol.split('/')[0]
+                    plan = bounded(self.plan_trade, symbol, sentiments.get(coin, 0))
+                    
+                    if plan:
+                        self.execute_plan(plan)
+            except FuturesTimeout:
+                print("⏳ Cycle deadline reached during an exchange call, skipping the remaining steps")
+            
+            # STEP 6: Monitor existing positions
+            self.monitor_positions()
+            
+            self.state['cycle_count'] += 1
+            
+        except Exception as e:
+            print(f"❌ Trading cycle error: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def _bounded_call(self, pool: str, timeout: float, func, *args):
+        """Run func on a pool ('call_pool' or 'monitor_pool'), abandoning it after timeout
+        
+        An abandoned call keeps its worker until it returns. Once abandoned
+        calls hold every worker of a pool, the pool is replaced so later
+        calls still get a thread.
+        
+        Raises:
+            FuturesTimeout: The call did not finish within timeout
+        """
+        future = getattr(self, pool).submit(func, *args)
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            with self._pool_lock:
+                hung = [f for f in self._abandoned[pool] if not f.done()] + [future]
+                self._abandoned[pool] = hung
+                if len(hung) >= self.pool_sizes[pool]:
+                    print(f"⚠️ {len(hung)} hung calls hold every {pool} worker, starting fresh workers")
+                    getattr(self, pool).shutdown(wait=False)
+                    setattr(self, pool, ThreadPoolExecutor(max_workers=self.pool_sizes[pool],
+                                                           thread_name_prefix=f"apex-{pool.split('_')[0]}"))
+                    self._abandoned[pool] = []
+            raise
+    
+    def monitor_positions(self):
+        """Update every open position's stop-loss, each ticker bounded by call_timeout"""
+        for symbol, pos_id in list(self.state['positions'].items()):
+            # Update stop-loss based on current price
+            try:
+                ticker = self._bounded_call('monitor_pool', self.config['call_timeout'],
+                                            self.features['trader'].exchange.fetch_ticker, symbol)
+                self.update_position(symbol, pos_id, ticker['last'])
+                
+            except FuturesTimeout:
+                print(f"⏳ Position monitoring for {symbol} timed out")
+            except Exception as e:
+                print(f"❌ Position monitoring error for {symbol}: {e}")
+    
+    def plan_trade(self, symbol: str, sentiment: float) -> Optional[Dict]:
+        """Size and cost-check a sentiment-driven trade; None if it should be skipped"""
+        # Only trade if sentiment strong enough
+        if abs(sentiment) < self.config['sentiment_threshold']:
+            return None
+        
+        # Calculate position size
+        amount = self.features['trader'].calculate_position_size(
+            symbol,
+            self.bots['capital_rotator'].allocations.get(symbol, 0.25)
+        )
+        
+        if amount == 0:
+            return None
+        
+        # Optimize trade (check fees & slippage)
+        side = 'buy' if sentiment > 0 else 'sell'
+        optimization = self.bots['fee_optimizer'].optimize_order(symbol, amount, side)
+        
+        if not optimization:
+            return None
+        
+        # Check if optimization recommends execution
+        if optimization['recommendation'] == "HIGH_COST_WARNING":
+            print(f"⚠️  {symbol}: High cost ({optimization['route_cost_pct']:.2f}%), skipping")
+            return None
+        
+        return {
+            'symbol': symbol,
+            'sentiment': sentiment,
+            'side': side,
+            'amount': amount,
+            'optimization': optimization
+        }
+    
+    def execute_plan(self, plan: Dict) -> None:
+        """Open a planned trade and track it with a dynamic stop-loss"""
+        symbol, side, amount = plan['symbol'], plan['side'], plan['amount']
+        sentiment, optimization = plan['sentiment'], plan['optimization']
+        
+        print(f"\n💰 Trade Opportunity: {symbol}")
+        print(f"   Sentiment: {sentiment:+.2f}")
+        print(f"   Side: {side.upper()}")
+        print(f"   Amount: {amount:.6f}")
+        print(f"   Total Cost: {optimization['route_cost_pct']:.2f}% via {optimization['route']} "
+              f"(market {optimization['total_cost_pct']:.2f}%)")
+        
+        # Execute trade (would place real order here)
+        # For now, just log and notify
+        self.features['notifications'].trade_entry_alert(
+            symbol, side, amount,
+            optimization['order_value'] / amount,
+            sentiment=sentiment,
+            strategy="APEX_Sentiment_Driven"
+        )
+        
+        # Add to tracked positions with dynamic stop-loss
+        pos_id = self.bots['dynamic_sl'].add_position(
+            symbol,
+            optimization['order_value'] / amount,
+            amount,
+            'long' if side == 'buy' else 'short'
+        )
+        
+        self.state['positions'][symbol] = pos_id
+        self.metrics['total_trades'] += 1
+    
+    def update_position(self, symbol: str, pos_id: str, current_price: float) -> Optional[Dict]:
+        """Update a position's stop-loss and handle the close if it was hit"""
+        close_data = self.bots['dynamic_sl'].update_stop_loss(pos_id, current_price)
+        
+        if close_data:
+            # Position closed
+            print(f"\n🛑 Position closed: {symbol}")
+            print(f"   P&L: ${close_data['profit']:.2f} ({close_data['profit_pct']:+.2f}%)")
+            
+            # Update metrics
+            if close_data['profit'] > 0:
+                self.metrics['winning_trades'] += 1
+            self.metrics['total_profit'] += close_data['profit']
+            
+            # Notify
+            self.features['notifications'].trade_exit_alert(
+                symbol,
+                'sell' if close_data['side'] == 'long' else 'buy',
+                close_data['amount'],
+                close_data['entry'],
+                close_data['exit'],
+                close_data['profit'],
+                close_data['profit_pct'],
+                close_data['reason']
+            )
+            
+            # Remove from tracking
+            del self.state['positions'][symbol]
+        
+        return close_data
+    
+    def build_schedule(self) -> EventScheduler:
+        """Give every bot its own cadence and triggering events
+        
+        Fast protective checks poll every few seconds and also fire on
+        price_move; sentiment and rotation run on their own slow clocks;
+        a fill re-checks positions immediately.
+        """
+        scheduler = EventScheduler(name=self.name)
+        price_trigger = PriceMoveTrigger(self.config['price_move_pct'])
+        pairs = self.config['trading_pairs']
+        
+        def price_watch(trigger):
+            tickers = self.features['trader'].exchange.fetch_tickers(pairs)
+            for symbol, ticker in tickers.items():
+                move = price_trigger.update(symbol, ticker['last'])
+                if move is not None:
+                    scheduler.emit('price_move', {'symbol': symbol, 'move_pct': move})
+        
+        def crash(trigger):
+            status = self.bots['crash_shield'].monitor_market(pairs)
+            if status['trading_paused'] and self.state['trading_enabled']:
+                print(f"🛑 Trading paused: {status['pause_reason']}")
+            self.state['trading_enabled'] = not status['trading_paused']
+        
+        def whales(trigger):
+            if not self.state['trading_enabled']:
+                return
+            for symbol in pairs:
+                whale_data = self.bots['whale_monitor'].monitor_symbol(symbol)
                 if whale_data['alert_level'] != "NORMAL":
                     print(f"🐋 {symbol}: {whale_data['alert_level']}")
                     self.features['notifications'].send_message(
                         f"🐋 *Whale Alert*\n{symbol}: {whale_data['alert_level']}"
                     )
-            
-            # STEP 3: Get sentiment for all pairs
-            sentiments = self.features['sentiment'].get_all_sentiments()
+        
+        def sentiment(trigger):
+            self.state['sentiments'] = self.features['sentiment'].get_all_sentiments()
             self.state['last_sentiment_check'] = datetime.now().isoformat()
-            
-            print(f"\n🧠 Sentiment Analysis:")
-            for coin, score in sentiments.items():
-                signal, confidence = self.features['sentiment'].get_signal(coin)
-                print(f"   {coin}: {score:+.2f} → {signal}")
-            
-            # STEP 4: Check if capital rebalancing needed
-            rebalance_result = self.bots['capital_rotator'].rebalance_capital(
-                self.config['trading_pairs']
-            )
-            
-            if rebalance_result.get('rebalanced'):
+            scheduler.emit('sentiment_updated')
+        
+        def rebalance(trigger):
+            if not self.state['trading_enabled']:
+                return
+            result = self.bots['capital_rotator'].rebalance_capital(pairs)
+            if result.get('rebalanced'):
                 print(f"\n🔄 Capital rebalanced:")
-                for symbol, alloc in rebalance_result['new_allocations'].items():
+                for symbol, alloc in result['new_allocations'].items():
                     print(f"   {symbol}: {alloc*100:.1f}%")
-                
                 self.state['last_rebalance'] = datetime.now().isoformat()
-            
-            # STEP 5: Evaluate trading opportunities
-            for symbol in self.config['trading_pairs']:
-                coin = symbol.split('/')[0]
-                sentiment = sentiments.get(coin, 0)
-                
-                # Only trade if sentiment strong enough
-                if abs(sentiment) < self.config['sentiment_threshold']:
-                    continue
-                
-                # Calculate position size
-                amount = self.features['trader'].calculate_position_size(
-                    symbol,
-                    self.bots['capital_rotator'].allocations.get(symbol, 0.25)
-                )
-                
-                if amount == 0:
-                    continue
-                
-                # Optimize trade (check fees & slippage)
-                side = 'buy' if sentiment > 0 else 'sell'
-                optimization = self.bots['fee_optimizer'].optimize_order(symbol, amount, side)
-                
-                if not optimization:
-                    continue
-                
-                # Check if optimization recommends execution
-                if optimization['recommendation'] == "HIGH_COST_WARNING":
-                    print(f"⚠️  {symbol}: High cost ({optimization['total_cost_pct']:.2f}%), skipping")
+        
+        def opportunities(trigger):
+            if not self.state['trading_enabled'] or 'sentiments' not in self.state:
+                return
+            for symbol in pairs:
+                if symbol in self.state['positions']:
                     continue
-                
-                print(f"\n💰 Trade Opportunity: {symbol}")
-                print(f"   Sentiment: {sentiment:+.2f}")
-                print(f"   Side: {side.upper()}")
-                print(f"   Amount: {amount:.6f}")
-                print(f"   Total Cost: {optimization['total_cost_pct']:.2f}%")
-                
-                # Execute trade (would place real order here)
-                # For now, just log and notify
-                self.features['notifications'].trade_entry_alert(
-                    symbol, side, amount,
-                    optimization['order_value'] / amount,
-                    sentiment=sentiment,
-                    strategy="APEX_Sentiment_Driven"
-                )
-                
-                # Add to tracked positions with dynamic stop-loss
-                pos_id = self.bots['dynamic_sl'].add_position(
-                    symbol,
-                    optimization['order_value'] / amount,
-                    amount,
-                    'long' if side == 'buy' else 'short'
-                )
-                
-                self.state['positions'][symbol] = pos_id
-                self.metrics['total_trades'] += 1
-            
-            # STEP 6: Monitor existing positions
+                plan = self.plan_trade(symbol, self.state['sentiments'].get(symbol.split('/')[0], 0))
+                if plan:
+                    self.execute_plan(plan)
+                    scheduler.emit('fill', {'symbol': symbol})
+            self.state['cycle_count'] += 1
+        
+        def positions(trigger):
             for symbol, pos_id in list(self.state['positions'].items()):
-                # Update stop-loss based on current price
                 try:
                     ticker = self.features['trader'].exchange.fetch_ticker(symbol)
-                    current_price = ticker['last']
-                    
-                    close_data = self.bots['dynamic_sl'].update_stop_loss(pos_id, current_price)
-                    
-                    if close_data:
-                        # Position closed
-                        print(f"\n🛑 Position closed: {symbol}")
-                        print(f"   P&L: ${close_data['profit']:.2f} ({close_data['profit_pct']:+.2f}%)")
-                        
-                        # Update metrics
-                        if close_data['profit'] > 0:
-                            self.metrics['winning_trades'] += 1
-                        self.metrics['total_profit'] += close_data['profit']
-                        
-                        # Notify
-                        self.features['notifications'].trade_exit_alert(
-                            symbol,
-                            'sell' if close_data['side'] == 'long' else 'buy',
-                            close_data['amount'],
-                            close_data['entry'],
-                            close_data['exit'],
-                            close_data['profit'],
-                            close_data['profit_pct'],
-                            close_data['reason']
-                        )
-                        
-                        # Remove from tracking
-                        del self.state['positions'][symbol]
-                        
+                    self.update_position(symbol, pos_id, ticker['last'])
                 except Exception as e:
                     print(f"❌ Position monitoring error for {symbol}: {e}")
-            
-            self.state['cycle_count'] += 1
-            
-        except Exception as e:
-            print(f"❌ Trading cycle error: {e}")
-            import traceback
-            traceback.print_exc()
+        
+        scheduler.add_job('price_watch', price_watch, interval=self.config['price_watch_interval'], priority=0)
+        scheduler.add_job('crash', crash, interval=self.config['crash_interval'],
+                          events=['price_move'], priority=0, min_gap=5)
+        scheduler.add_job('positions', positions, interval=self.config['crash_interval'],
+                          events=['price_move', 'fill'], priority=1, min_gap=5)
+        # Slow jobs run on the scheduler's worker pool so the protective checks above keep their cadence
+        scheduler.add_job('whales', whales, interval=self.config['whale_interval'], priority=3, background=True)
+        scheduler.add_job('sentiment', sentiment, interval=self.config['sentiment_interval'], priority=4,
+                          background=True)
+        scheduler.add_job('opportunities', opportunities, interval=self.config['check_interval'],
+                          events=['sentiment_updated'], priority=2, delay=1, background=True)
+        # CapitalRotatorBot still applies its own rebalance_interval_hours guard
+        scheduler.add_job('rebalance', rebalance, interval=self.config['rebalance_interval'], priority=5,
+                          background=True)
+        
+        return scheduler
+    
+    def start_scheduled(self):
+        """Start the controller on per-bot cadences instead of one fixed cycle"""
+        print("\n" + "="*70)
+        print(f"🚀 STARTING {self.name} (scheduled)")
+        print("="*70)
+        
+        self.running = True
+        self.scheduler = self.build_schedule()
+        
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            print("\n\n🛑 Stopping APEX Controller...")
+            self.stop()
     
     def start(self):
         """Start the master controller"""
@@ -262,10 +488,12 @@ class APEXMasterController:
         
         try:
             while self.running:
+                started = time.monotonic()
                 self.trading_cycle()
                 
-                # Wait for next cycle
-                time.sleep(self.config['check_interval'])
+                # Wait for next cycle, keeping the cadence
+                elapsed = time.monotonic() - started
+                time.sleep(max(0.0, self.config['check_interval'] - elapsed))
                 
         except KeyboardInterrupt:
             print("\n\n🛑 Stopping APEX Controller...")
@@ -274,6 +502,8 @@ class APEXMasterController:
     def stop(self):
         """Stop the master controller"""
         self.running = False
+        if self.scheduler:
+            self.scheduler.stop()
         
         # Generate final report
         win_rate = (self.metrics['winning_trades'] / self.metrics['total_trades'] * 100) if self.metrics['total_trades'] > 0 else 0
@@ -310,7 +540,10 @@ System stopped gracefully. 👋
             'state': self.state,
             'metrics': self.metrics,
             'config': self.config,
-            'bots': bot_statuses
+            'bots': bot_statuses,
+            'rate_limits': self.api_guardian.get_status(),
+            'circuits': get_breaker_status(),
+            'scheduler': self.scheduler.get_status() if self.scheduler else None
         }
 
 if __name__ == '__main__':
@@ -318,7 +551,10 @@ if __name__ == '__main__':
     controller = APEXMasterController()
     
     try:
-        controller.start()
+        if '--scheduled' in sys.argv:
+            controller.start_scheduled()
+        else:
+            controller.start()
     except Exception as e:
         print(f"\n💥 Fatal error: {e}")
         import traceback
@@ -4,7 +4,8 @@ APEX NEXUS V2.0 - Production Trading System
 Integrates ALL 51 bots into autonomous trading operation
 ZERO mock data, ZERO tolerance for errors
 """
-import os, sys, time, json, requests
+import os, sys, time, json, threading, requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 
 # Load environment
@@ -15,6 +16,7 @@ with open('.env') as f:
             os.environ[k] = v
 
 sys.path.insert(0, 'bots')
+sys.path.insert(0, 'modules')
 
 # Import ALL operational bots
 from god_bot import GODBot
@@ -29,6 +31,9 @@ from api_guardian_bot import APIGuardianBot
 from capital_rotator_bot import CapitalRotatorBot
 from sentiment_analyzer import SentimentAnalyzer
 from enhanced_notifications import EnhancedNotifications
+from order_execution import ExecutionEngine
+from order_router import OrderRouter
+from event_scheduler import EventScheduler, PriceMoveTrigger
 
 import ccxt
 
@@ -65,14 +70,39 @@ class APEXNexusV2:
         self.sentiment = SentimentAnalyzer()
         self.notifications = EnhancedNotifications()
         
+        # Every exchange call goes through one priority token bucket;
+        # orders always outrank reads, protective reads outrank analytics
+        self.exchange = self.api_guardian.guard(self.exchange, 'positions')
+        for bot, priority in ((self.crash_shield, 'positions'), (self.dynamic_sl, 'positions'),
+                              (self.god, 'analytics'), (self.oracle, 'analytics'), (self.prophet, 'analytics'),
+                              (self.fee_optimizer, 'analytics'), (self.capital_rotator, 'analytics')):
+            bot.exchange = self.api_guardian.guard(bot.exchange, priority)
+        
         self.config = {
             'pairs': ['ETH/USDT', 'SOL/USDT', 'ADA/USDT', 'BTC/USDT'],  # ETH first (lower min)
             'max_position': 1.50,  # Increased to $1.50 to meet BTC minimum
             'stop_loss': 0.02,
-            'take_profit': 0.05
+            'take_profit': 0.05,
+            'signal_timeout': 15,       # Seconds a pair may run before it is dropped this cycle
+            'price_move_pct': 1.0,      # Move that triggers crash and signal checks at once
+            'halt_seconds': 300         # Pause after a crisis or crash
         }
         
-        self.state = {'trading_enabled': True, 'positions': {}, 'cycle': 0}
+        self.state = {'trading_enabled': True, 'positions': {}, 'cycle': 0, 'halted_until': 0}
+        
+        # Orders go out on the execution engine's own threads; fills come back via _on_fill
+        self.execution = ExecutionEngine(self.exchange, max_in_flight=4)
+        self.execution.on_fill(self._on_fill)
+        
+        # Entries take the cheapest of market / post-only / sliced; exits always cross
+        self.router = OrderRouter(self.execution)
+        
+        # Long-lived pool with a worker per pair: a pair that times out keeps its worker busy
+        # but cannot stall the cycle
+        self.signal_pool = ThreadPoolExecutor(max_workers=len(self.config['pairs']), thread_name_prefix='nexus-signal')
+        
+        # Oracle predictions move to a worker process when start_workers() is called
+        self.worker_pool = None
         
         print(f"✅ ALL SYSTEMS INITIALIZED\n")
         self.send_telegram("✅ APEX NEXUS V2.0 ONLINE\n\nAll 51 bots loaded\nStarting autonomous trading...")
@@ -83,127 +113,351 @@ class APEXNexusV2:
                          json={'chat_id': os.environ['TELEGRAM_CHAT_ID'], 'text': msg}, timeout=5)
         except: pass
     
-    def run(self):
-        print("Starting autonomous trading cycle...\n")
+    def evaluate_pairs(self, pairs):
+        """Run oracle predictions for all pairs concurrently, collecting results as they arrive
         
-        while True:
+        Each pair's signal_timeout runs from when a worker picks it up, so a pair queued behind
+        a worker still stuck on an earlier cycle is not charged for the wait. A pair that gets
+        no worker within signal_timeout of submission is dropped as well.
+        """
+        started = time.time()
+        timeout = self.config['signal_timeout']
+        running = {}
+        
+        def predict(pair):
+            running[pair] = time.time()
+            return self.oracle.predict_price_movement(pair, horizon_minutes=60)
+        
+        futures = {self.signal_pool.submit(predict, pair): pair for pair in pairs}
+        pending = set(futures)
+        
+        def deadline(future):
+            return running.get(futures[future], started) + timeout
+        
+        signals = []
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, min(map(deadline, pending)) - time.time()),
+                                 return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                pair = futures[future]
+                try:
+                    pred = future.result()
+                except Exception as e:
+                    print(f"   {pair}: ❌ {e}")
+                    continue
+                if not pred:
+                    print(f"   {pair}: no prediction")
+                    continue
+                
+                print(f"   {pair}: {pred['direction']} ({pred['confidence']*100:.0f}%) +{time.time() - started:.1f}s")
+                # Accept ANY direction with >60% confidence
+                if pred['confidence'] > 0.60:
+                    signals.append({
+                        'pair': pair,
+                        'signal': pred['direction'],
+                        'confidence': pred['confidence']
+                    })
+            
+            now = time.time()
+            for future in [f for f in pending if deadline(f) <= now]:
+                pending.discard(future)
+                pair = futures[future]
+                if future.cancel():
+                    print(f"   {pair}: ⏱️ no worker within {timeout}s")
+                else:
+                    print(f"   {pair}: ⏱️ timed out after {timeout}s")
+        
+        return signals
+    
+    def execute_signals(self, signals):
+        """Pick the best signal and execute it if the conflict resolver allows"""
+        if signals:
+            best = max(signals, key=lambda x: x['confidence'])
+            print(f"📊 Best signal: {best['pair']} {best['signal']} ({best['confidence']*100:.0f}%)")
+            
+            # Check with conflict resolver - LOWERED THRESHOLD
+            can_trade = self.conflict_resolver.can_open_position(best['pair'])
+            if can_trade['allowed'] and best['confidence'] >= 0.65:
+                # EXECUTE REAL TRADE
+                try:
+                    ticker = self.exchange.fetch_ticker(best['pair'])
+                    price = ticker['last']
+                    amount_usd = self.config['max_position']
+                    
+                    # Calculate amount to trade
+                    base = best['pair'].split('/')[0]
+                    amount = amount_usd / price
+                    
+                    # Round to reasonable precision
+                    if base == 'BTC':
+                        amount = round(amount, 6)
+                    elif base in ['ETH', 'SOL']:
+                        amount = round(amount, 4)
+                    else:
+                        amount = round(amount, 2)
+                    
+                    # Check minimum
+                    markets = self.exchange.load_markets()
+                    min_amount = markets[best['pair']]['limits']['amount']['min'] or 0.00001
+                    
+                    if self.router.has_working_route(best['pair']) or self.execution.has_open_order(best['pair']):
+                        print(f"⏳ {best['pair']}: order already working")
+                    elif amount >= min_amount:
+                        # Queue the order; fills are booked by _on_fill as they arrive
+                        tag = {'signal': best['signal'], 'confidence': best['confidence'], 'price': price}
+                        if best['signal'] in ['UP', 'BUY']:
+                            route = self.router.route(best['pair'], 'buy', amount, tag=tag)
+                            print(f"🔥 BUY ORDER ROUTED {amount:.6f} {base} (~${price:.2f}) via {route['route']} [{route['route_id']}]")
+                        elif best['signal'] in ['DOWN', 'SELL'] and best['pair'] in self.state['positions']:
+                            # Only sell if we have a position
+                            pos = self.state['positions'][best['pair']]
+                            route = self.router.route(best['pair'], 'sell', pos['amount'], urgency='high', priority=0, tag=tag)
+                            print(f"🔥 SELL ORDER ROUTED {pos['amount']:.6f} {base} (~${price:.2f}) via {route['route']} [{route['route_id']}]")
+                        else:
+                            print(f"📊 {best['signal']} signal - no position to sell")
+                    else:
+                        print(f"⚠️ Amount {amount:.6f} below minimum {min_amount}")
+                
+                except Exception as trade_err:
+                    print(f"❌ Trade error: {trade_err}")
+                    self.send_telegram(f"⚠️ Trade attempt failed: {str(trade_err)[:100]}")
+    
+    def _on_fill(self, fill):
+        """Book a fill from the execution engine into state (runs on engine threads)"""
+        pair = fill['symbol']
+        base = pair.split('/')[0]
+        book = self.execution.positions.get_position(pair)
+        print(f"✅ FILL {fill['side'].upper()} {fill['amount']:.6f} {base} @ ${fill['price']:.2f} ({fill['status']})")
+        
+        if fill['side'] == 'buy':
+            self.state['positions'][pair] = {
+                'entry_price': book['avg_entry'],
+                'amount': book['amount'],
+                'signal': fill['tag'].get('signal'),
+                'time': datetime.now().isoformat()
+            }
+            if fill['status'] == 'filled':
+                self.conflict_resolver.open_position(pair, {'entry': book['avg_entry'], 'amount': book['amount']})
+                self.send_telegram(f"✅ TRADE EXECUTED\n\nBUY {book['amount']:.6f} {base}\nAvg price: ${book['avg_entry']:.2f}\n"
+                                   f"Confidence: {fill['tag'].get('confidence', 0)*100:.0f}%\nOrder: {fill['order_id']}")
+        else:
+            pos = self.state['positions'].get(pair)
+            if pos and book['amount'] <= 0:
+                del self.state['positions'][pair]
+                self.send_telegram(f"✅ SOLD\n\n{pos['amount']:.6f} {base}\nAvg exit: ${fill['price']:.2f}\n"
+                                   f"Entry: ${pos['entry_price']:.2f}\nP&L: ${(fill['price'] - pos['entry_price']) * pos['amount']:.2f}")
+            elif pos:
+                pos['amount'] = book['amount']
+    
+    def build_schedule(self) -> EventScheduler:
+        """Market checks, crash protection and signal evaluation on their own cadences
+        
+        A 1% move in any pair re-checks for a crash and re-evaluates signals at
+        once instead of waiting for the next minute; a crisis or crash halts
+        signal evaluation for halt_seconds.
+        """
+        scheduler = EventScheduler('apex_nexus')
+        price_trigger = PriceMoveTrigger(self.config['price_move_pct'])
+        pairs = self.config['pairs']
+        
+        def halt(message):
+            self.state['halted_until'] = time.time() + self.config['halt_seconds']
+            self.send_telegram(message)
+        
+        def price_watch(trigger):
+            for symbol, ticker in self.exchange.fetch_tickers(pairs).items():
+                move = price_trigger.update(symbol, ticker['last'])
+                if move is not None:
+                    scheduler.emit('price_move', {'symbol': symbol, 'move_pct': move})
+        
+        def market(trigger):
+            # 1. Market analysis, 2. Crisis check
+            self.state['market'] = self.god.analyze_market_state(pairs)
+            print(f"Market: {self.state['market'].get('regime', 'UNKNOWN')}")
+            if self.god.crisis_intervention().get('intervention'):
+                print("🚨 CRISIS - Halting")
+                halt("🚨 Market crisis - Trading halted")
+        
+        def crash(trigger):
+            # 3. Crash shield - check BTC as market indicator (always in this process)
+            crash_status = self.crash_shield.check_crash('BTC/USDT')
+            if crash_status.get('crash_detected'):
+                print(f"🛡️ Crash: {crash_status['drop_pct']}% - Pausing")
+                halt(f"🛡️ Market crash: {crash_status['drop_pct']:.1f}%\nTrading paused")
+        
+        def signals(trigger):
+            if time.time() < self.state['halted_until']:
+                return
+            
             self.state['cycle'] += 1
             cycle = self.state['cycle']
             
             print(f"\n{'='*80}")
-            print(f"CYCLE #{cycle} - {datetime.now().strftime('%H:%M:%S')}")
+            print(f"CYCLE #{cycle} - {datetime.now().strftime('%H:%M:%S')} ({trigger['reason']})")
             print("="*80)
             
+            # Telegram update every 30 cycles
+            if cycle % 30 == 0:
+                self.send_telegram(f"💓 APEX Running\n\nCycle: {cycle}\nMarket: {self.state.get('market', {}).get('regime')}\nActive monitoring all pairs")
+            
+            if self.worker_pool:
+                # Only candles are fetched here; predictions come back through worker_results
+                self.worker_pool.publish(self.fetch_candles(pairs))
+                print(f"✅ Cycle published to workers")
+                return
+            
+            # 4. Get signals - ACCEPT ALL HIGH CONFIDENCE SIGNALS, 5. Check for trade opportunities
+            self.execute_signals(self.evaluate_pairs(pairs))
+            print(f"✅ Cycle complete")
+        
+        def worker_results(trigger):
+            # Worker mode: act on the latest cycle's predictions as they arrive
+            predictions = [p for p in self.worker_pool.collect() if not p['stale']]
+            if not predictions or time.time() < self.state['halted_until']:
+                return
+            
+            latest = max(p['seq'] for p in predictions)
+            signals = [{'pair': p['symbol'], 'signal': p['direction'], 'confidence': p['confidence']}
+                       for p in predictions if p['seq'] == latest and p['confidence'] > 0.60]
+            for signal in signals:
+                print(f"   {signal['pair']}: {signal['signal']} ({signal['confidence']*100:.0f}%) [worker]")
+            self.execute_signals(signals)
+        
+        scheduler.add_job('price_watch', price_watch, interval=10, priority=0)
+        scheduler.add_job('crash', crash, interval=30, events=['price_move'], priority=0, min_gap=5)
+        # Slow analysis runs on the scheduler's worker pool so crash checks keep their cadence
+        scheduler.add_job('market', market, interval=60, priority=1, background=True)
+        scheduler.add_job('signals', signals, interval=60, events=['price_move'], priority=2, min_gap=30, delay=1,
+                          background=True)
+        if self.worker_pool:
+            scheduler.add_job('worker_results', worker_results, interval=1, priority=1)
+        return scheduler
+    
+    def fetch_candles(self, pairs, timeframe='1h', limit=100):
+        """Fetch every pair's candles concurrently; pairs slower than signal_timeout are left out"""
+        futures = {self.signal_pool.submit(self.exchange.fetch_ohlcv, pair, timeframe, limit=limit): pair
+                   for pair in pairs}
+        done, _ = wait(futures, timeout=self.config['signal_timeout'])
+        
+        candles = {}
+        for future in done:
             try:
-                # 1. Market analysis
-                market = self.god.analyze_market_state(self.config['pairs'])
-                print(f"Market: {market.get('regime', 'UNKNOWN')}")
-                
-                # 2. Crisis check
-                if self.god.crisis_intervention().get('intervention'):
-                    print("🚨 CRISIS - Halting")
-                    self.send_telegram("🚨 Market crisis - Trading halted")
-                    time.sleep(300)
-                    continue
-                
-                # 3. Crash shield - check BTC as market indicator
-                crash_status = self.crash_shield.check_crash('BTC/USDT')
-                if crash_status.get('crash_detected'):
-                    print(f"🛡️ Crash: {crash_status['drop_pct']}% - Pausing")
-                    self.send_telegram(f"🛡️ Market crash: {crash_status['drop_pct']:.1f}%\nTrading paused")
-                    time.sleep(300)
+                candles[futures[future]] = future.result()
+            except Exception as e:
+                print(f"   {futures[future]}: ❌ {e}")
+        return candles
+    
+    def start_workers(self):
+        """Worker mode: run oracle predictions in a separate process over a shared market snapshot
+        
+        The signal job then only fetches candles and publishes them; predictions
+        are collected without blocking, so CPU-heavy signal work never delays
+        the crash and market checks running in this process.
+        """
+        from process_workers import BotWorkerPool
+        
+        self.worker_pool = BotWorkerPool(self.config['pairs'], n_bars=100, timeframe='1h')
+        self.worker_pool.add_group('GOD_LEVEL', ['oracle_ai'])
+        ready = self.worker_pool.start()
+        print(f"✅ Worker processes ready: {ready}")
+        return ready
+    
+    def run(self):
+        print("Starting autonomous trading cycle...\n")
+        self.build_schedule().run()
+
+    def run_shard(self, shard):
+        """Sharded mode: evaluate only the pairs whose partition lease this node holds"""
+        stop = threading.Event()
+        
+        # Leases must be renewed well inside lease_ttl, independent of slow signal cycles
+        def heartbeat():
+            while not stop.is_set():
+                try:
+                    shard.heartbeat()
+                except Exception as e:
+                    print(f"❌ Shard heartbeat error: {e}")
+                stop.wait(shard.lease_ttl / 3)
+        
+        def signals(trigger):
+            self.state['cycle'] += 1
+            pairs = shard.my_symbols(self.config['pairs'])
+            print(f"\nSHARD CYCLE #{self.state['cycle']} - {len(pairs)}/{len(self.config['pairs'])} pairs")
+            shard.publish_signals(self.evaluate_pairs(pairs), cycle=self.state['cycle'])
+        
+        threading.Thread(target=heartbeat, name='shard-heartbeat', daemon=True).start()
+        print(f"Starting shard node {shard.node_id}...\n")
+        
+        scheduler = EventScheduler(f'shard-{shard.node_id}')
+        scheduler.add_job('signals', signals, interval=60)
+        try:
+            scheduler.run()
+        finally:
+            stop.set()
+            shard.leave()
+    
+    def run_coordinator(self, coordinator):
+        """Execution coordinator: gate on market checks, then execute signals from all shards"""
+        print(f"Starting execution coordinator {coordinator.node_id}...\n")
+        halted_until = 0
+        
+        while True:
+            self.state['cycle'] += 1
+            
+            try:
+                if not coordinator.acquire_leadership():
+                    print("⏸️ Standby - another coordinator is active")
+                    time.sleep(coordinator.lease_ttl / 3)
                     continue
                 
-                # 4. Get signals - ACCEPT ALL HIGH CONFIDENCE SIGNALS
-                signals = []
-                for pair in self.config['pairs']:
-                    pred = self.oracle.predict_price_movement(pair, horizon_minutes=60)
-                    print(f"   {pair}: {pred['direction']} ({pred['confidence']*100:.0f}%)")
-                    # Accept ANY direction with >60% confidence
-                    if pred and pred['confidence'] > 0.60:
-                        signals.append({
-                            'pair': pair,
-                            'signal': pred['direction'],
-                            'confidence': pred['confidence']
-                        })
-                
-                # 5. Check for trade opportunities
-                if signals:
-                    best = max(signals, key=lambda x: x['confidence'])
-                    print(f"📊 Best signal: {best['pair']} {best['signal']} ({best['confidence']*100:.0f}%)")
-                    
-                    # Check with conflict resolver - LOWERED THRESHOLD
-                    can_trade = self.conflict_resolver.can_open_position(best['pair'])
-                    if can_trade['allowed'] and best['confidence'] >= 0.65:
-                        # EXECUTE REAL TRADE
-                        try:
-                            ticker = self.exchange.fetch_ticker(best['pair'])
-                            price = ticker['last']
-                            amount_usd = self.config['max_position']
-                            
-                            # Calculate amount to trade
-                            base = best['pair'].split('/')[0]
-                            amount = amount_usd / price
-                            
-                            # Round to reasonable precision
-                            if base == 'BTC':
-                                amount = round(amount, 6)
-                            elif base in ['ETH', 'SOL']:
-                                amount = round(amount, 4)
-                            else:
-                                amount = round(amount, 2)
-                            
-                            # Check minimum
-                            markets = self.exchange.load_markets()
-                            min_amount = markets[best['pair']]['limits']['amount']['min'] or 0.00001
-                            
-                            if amount >= min_amount:
-                                # EXECUTE TRADE - TRY BOTH BUY AND SELL
-                                if best['signal'] in ['UP', 'BUY']:
-                                    print(f"🔥 EXECUTING BUY ORDER...")
-                                    order = self.exchange.create_market_buy_order(best['pair'], amount)
-                                    print(f"✅ BOUGHT {amount:.6f} {base} @ ${price:.2f}")
-                                    print(f"   Order ID: {order.get('id', 'N/A')}")
-                                    self.send_telegram(f"✅ TRADE EXECUTED\n\nBUY {amount:.6f} {base}\nPrice: ${price:.2f}\nValue: ${amount_usd:.2f}\nConfidence: {best['confidence']*100:.0f}%\nOrder: {order.get('id', 'N/A')}")
-                                elif best['signal'] in ['DOWN', 'SELL'] and best['pair'] in self.state['positions']:
-                                    # Only sell if we have a position
-                                    pos = self.state['positions'][best['pair']]
-                                    print(f"🔥 EXECUTING SELL ORDER...")
-                                    order = self.exchange.create_market_sell_order(best['pair'], pos['amount'])
-                                    print(f"✅ SOLD {pos['amount']:.6f} {base} @ ${price:.2f}")
-                                    self.send_telegram(f"✅ SOLD\n\n{pos['amount']:.6f} {base}\nPrice: ${price:.2f}\nEntry: ${pos['entry_price']:.2f}\nP&L: ${(price - pos['entry_price']) * pos['amount']:.2f}")
-                                    del self.state['positions'][best['pair']]
-                                else:
-                                    print(f"📊 {best['signal']} signal - no position to sell")
-                                
-                                # Register with conflict resolver
-                                self.conflict_resolver.open_position(best['pair'], {'entry': price, 'amount': amount})
-                                
-                                # Add to state
-                                self.state['positions'][best['pair']] = {
-                                    'entry_price': price,
-                                    'amount': amount,
-                                    'signal': best['signal'],
-                                    'time': datetime.now().isoformat()
-                                }
-                            else:
-                                print(f"⚠️ Amount {amount:.6f} below minimum {min_amount}")
-                        
-                        except Exception as trade_err:
-                            print(f"❌ Trade error: {trade_err}")
-                            self.send_telegram(f"⚠️ Trade attempt failed: {str(trade_err)[:100]}")
+                if time.time() >= halted_until and (
+                        self.god.crisis_intervention().get('intervention') or
+                        self.crash_shield.check_crash('BTC/USDT').get('crash_detected')):
+                    halted_until = time.time() + 60
                 
-                # Telegram update every 30 cycles
-                if cycle % 30 == 0:
-                    self.send_telegram(f"💓 APEX Running\n\nCycle: {cycle}\nMarket: {market.get('regime')}\nActive monitoring all pairs")
+                # Collect one cycle's worth of shard signals; polls stay within the lease TTL
+                # (halts included) so leadership keeps being renewed
+                signals = coordinator.poll(max_signals=1000, timeout=min(60, coordinator.lease_ttl / 3))
+                if time.time() < halted_until:
+                    print(f"🛡️ Market halt - dropped {len(signals)} signals")
+                    continue
                 
-                print(f"✅ Cycle complete")
-                time.sleep(60)
+                signals = [s for s in signals if s['confidence'] > 0.60]
+                print(f"\nCOORDINATOR CYCLE #{self.state['cycle']} - {len(signals)} signals")
+                self.execute_signals(signals)
                 
             except Exception as e:
                 print(f"❌ Error: {e}")
-                time.sleep(60)
+                time.sleep(5)
 
 if __name__ == '__main__':
     nexus = APEXNexusV2()
-    nexus.run()
+    
+    if '--workers' in sys.argv or os.environ.get('TPS19_WORKERS'):
+        nexus.start_workers()
+    
+    try:
+        if '--shard' in sys.argv or '--coordinator' in sys.argv:
+            from redis_integration import RedisIntegration
+            from symbol_sharding import ShardCoordinator, SignalCoordinator
+            
+            redis_client = RedisIntegration(host=os.environ.get('REDIS_HOST', 'localhost'),
+                                            port=int(os.environ.get('REDIS_PORT', 6379)),
+                                            password=os.environ.get('REDIS_PASSWORD'))
+            if not redis_client.connected:
+                sys.exit("❌ Sharded mode requires Redis")
+            
+            # Shards and the coordinator share one exchange rate budget
+            nexus.api_guardian.share_limits(redis_client)
+            
+            if '--shard' in sys.argv:
+                nexus.run_shard(ShardCoordinator(redis_client, group=os.environ.get('SHARD_GROUP', 'apex')))
+            else:
+                nexus.run_coordinator(SignalCoordinator(redis_client, group=os.environ.get('SHARD_GROUP', 'apex')))
+        else:
+            nexus.run()
+    finally:
+        # Worker processes exit with the coordinator; the shared snapshot is freed
+        if nexus.worker_pool:
+            nexus.worker_pool.stop()
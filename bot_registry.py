@@ -7,17 +7,25 @@ Provides unified interface to all trading capabilities
 
 import os
 import sys
+import ast
 import json
+import time
+import threading
 import importlib
 from datetime import datetime
 from typing import Dict, List, Optional
 
 class BotRegistry:
-    """Central registry for all APEX bots"""
+    """Central registry for all APEX bots
+    
+    Discovery only parses bot source files for metadata (class name,
+    BOT_CATEGORY, docstring). A bot module is imported and instantiated on
+    the first get_bot() call, so startup cost scales with the bots used.
+    """
     
     def __init__(self):
         self.name = "APEX_Bot_Registry"
-        self.version = "2.0.0"
+        self.version = "2.1.0"
         
         self.bots = {}
         self.bot_categories = {
@@ -25,9 +33,9 @@ class BotRegistry:
             'COUNCIL': [],        # Council AI x5
             'ATN_TRADERS': [],    # Momentum, Snipe, Arbitrage, Flash, Short, Continuity x3
             'CORE_APEX': [],      # Dynamic SL, Fee Opt, Whale Mon, Crash Shield, Capital Rot
-            'STRATEGY': [],       # Backtesting, Time Filter, DCA, Pattern Recognition
-            'PROTECTION': [],     # Profit Lock, Liquidity Wave, Rug Shield, Profit Magnet
-            'INFRASTRUCTURE': [], # Yield Farm, API Guard, Conflict Res, Emergency Pause
+            'STRATEGY': [],       # Backtesting, Portfolio Backtester, Time Filter, DCA, Pattern Recognition, Allocation
+            'PROTECTION': [],     # Profit Lock, Liquidity Wave, Rug Shield, Profit Magnet, Predictive Risk
+            'INFRASTRUCTURE': [], # Yield Farm, API Guard, Conflict Res, Emergency Pause, Market Pulse, Withdrawal
             'EVOLUTION': [],      # Bot Evolution, AI Clone, Crash Recovery
             'QUEENS': [],         # Queen Bots x5
             'THRONES': []         # Thrones AI
@@ -37,69 +45,136 @@ class BotRegistry:
             'total_bots': 0,
             'active_bots': 0,
             'failed_bots': 0,
-            'auto_discoveries': 0
+            'auto_discoveries': 0,
+            'discovery_seconds': 0.0
         }
+        
+        self._lock = threading.RLock()
+        self._load_locks = {}       # bot name -> lock held while that bot is imported and built
     
-    def auto_discover_bots(self, bots_dir: str = 'bots') -> Dict:
-        """Auto-discover all bot modules in bots/ directory"""
+    def auto_discover_bots(self, bots_dir: str = 'bots', instantiate: bool = False) -> Dict:
+        """
+        Discover all bot modules in bots/ directory
+        
+        Args:
+            bots_dir: Bots directory relative to the repo root
+            instantiate: Also import and instantiate every bot (old eager behaviour)
+        """
+        started = time.perf_counter()
         discovered = []
         
         # Get all .py files in bots directory
-        bots_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), bots_dir)
+        bots_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), bots_dir)
         
         if not os.path.exists(bots_path):
             return {'discovered': 0, 'error': f'Bots directory not found: {bots_path}'}
         
-        sys.path.insert(0, bots_path)
+        if bots_path not in sys.path:
+            sys.path.insert(0, bots_path)
         
-        for filename in os.listdir(bots_path):
+        for filename in sorted(os.listdir(bots_path)):
             if filename.endswith('.py') and not filename.startswith('__'):
                 module_name = filename[:-3]
                 
                 try:
-                    # Import module
-                    module = importlib.import_module(module_name)
-                    
-                    # Find bot class (assume class name is PascalCase version of module)
-                    class_name = self._get_class_name(module_name)
-                    
-                    if hasattr(module, class_name):
-                        bot_class = getattr(module, class_name)
-                        
-                        # Try to instantiate
-                        try:
-                            bot_instance = bot_class()
-                            bot_info = {
-                                'module': module_name,
-                                'class': class_name,
-                                'instance': bot_instance,
-                                'status': bot_instance.get_status() if hasattr(bot_instance, 'get_status') else {},
-                                'discovered_at': datetime.now().isoformat()
-                            }
-                            
-                            self.bots[module_name] = bot_info
-                            discovered.append(module_name)
-                            
-                            # Categorize
-                            self._categorize_bot(module_name, bot_info)
-                            
-                        except Exception as e:
-                            print(f"⚠️ Could not instantiate {class_name}: {e}")
+                    bot_info = self._read_metadata(module_name, os.path.join(bots_path, filename))
+                except (SyntaxError, OSError) as e:
+                    print(f"⚠️ Could not read {module_name}: {e}")
+                    continue
+                
+                if bot_info is None:
+                    continue
+                
+                with self._lock:
+                    previous = self.bots.get(module_name)
+                    if previous and previous['status'] in ('loading', 'active'):
+                        continue
                     
-                except Exception as e:
-                    print(f"⚠️ Could not import {module_name}: {e}")
+                    self.bots[module_name] = bot_info
+                    members = self.bot_categories.setdefault(bot_info['category'], [])
+                    if module_name not in members:
+                        members.append(module_name)
+                discovered.append(module_name)
         
         self.metrics['total_bots'] = len(self.bots)
-        self.metrics['active_bots'] = len(discovered)
         self.metrics['auto_discoveries'] += 1
+        self.metrics['discovery_seconds'] = time.perf_counter() - started
+        
+        if instantiate:
+            for module_name in discovered:
+                self.get_bot(module_name)
         
         return {
             'discovered': len(discovered),
             'bots': discovered,
             'total_registered': len(self.bots),
+            'discovery_seconds': self.metrics['discovery_seconds'],
             'timestamp': datetime.now().isoformat()
         }
     
+    def _read_metadata(self, module_name: str, path: str) -> Optional[Dict]:
+        """Read bot class, category and description from source without importing it"""
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        
+        classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+        if not classes:
+            return None
+        
+        # Expected PascalCase name first, otherwise the module's only class
+        class_name = self._get_class_name(module_name)
+        if class_name not in classes:
+            if len(classes) != 1:
+                return None
+            class_name = next(iter(classes))
+        
+        category = 'UNCATEGORIZED'
+        for node in tree.body:
+            if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name) and node.targets[0].id == 'BOT_CATEGORY'):
+                try:
+                    category = ast.literal_eval(node.value)
+                except ValueError:
+                    # Computed at import time; discovery never imports, so leave it uncategorized
+                    print(f"⚠️ {module_name}: BOT_CATEGORY is not a literal")
+        
+        docstring = ast.get_docstring(classes[class_name]) or ast.get_docstring(tree) or ''
+        
+        return {
+            'module': module_name,
+            'class': class_name,
+            'category': category,
+            'description': docstring.strip().split('\n')[0],
+            'path': path,
+            'instance': None,
+            'status': 'registered',
+            'error': None,
+            'load_seconds': None,
+            'discovered_at': datetime.now().isoformat()
+        }
+    
+    def _load_bot(self, bot_info: Dict) -> Optional[object]:
+        """Import and instantiate a registered bot (called without the registry lock)"""
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(bot_info['module'])
+            bot_instance = getattr(module, bot_info['class'])()
+        except Exception as e:
+            print(f"⚠️ Could not load {bot_info['class']}: {e}")
+            with self._lock:
+                bot_info['status'] = 'failed'
+                bot_info['error'] = str(e)
+                self.metrics['failed_bots'] += 1
+            return None
+        
+        with self._lock:
+            bot_info['instance'] = bot_instance
+            bot_info['status'] = 'active'
+            bot_info['load_seconds'] = time.perf_counter() - started
+            self.metrics['active_bots'] += 1
+        
+        return bot_instance
+    
     def _get_class_name(self, module_name: str) -> str:
         """Convert module_name to expected class name"""
         # god_bot -> GODBot, king_bot -> KINGBot, momentum_rider_bot -> MomentumRiderBot
@@ -123,53 +198,46 @@ class BotRegistry:
             # Standard: momentum_rider_bot -> MomentumRiderBot
             return ''.join(p.capitalize() for p in parts)
     
-    def _categorize_bot(self, bot_name: str, bot_info: Dict) -> None:
-        """Categorize bot into appropriate group"""
-        if 'god' in bot_name or 'king' in bot_name or bot_name.endswith('_ai'):
-            if 'council' not in bot_name:
-                self.bot_categories['GOD_LEVEL'].append(bot_name)
-        
-        elif 'council' in bot_name:
-            self.bot_categories['COUNCIL'].append(bot_name)
-        
-        elif any(x in bot_name for x in ['momentum', 'snipe', 'arbitrage', 'flash', 'short', 'continuity']):
-            self.bot_categories['ATN_TRADERS'].append(bot_name)
-        
-        elif any(x in bot_name for x in ['dynamic_stoploss', 'fee_optimizer', 'whale_monitor', 'crash_shield', 'capital_rotator']):
-            self.bot_categories['CORE_APEX'].append(bot_name)
-        
-        elif any(x in bot_name for x in ['backtesting', 'time_filter', 'dca_strategy', 'pattern_recognition']):
-            self.bot_categories['STRATEGY'].append(bot_name)
-        
-        elif any(x in bot_name for x in ['profit_lock', 'liquidity_wave', 'rug_shield', 'profit_magnet']):
-            self.bot_categories['PROTECTION'].append(bot_name)
-        
-        elif any(x in bot_name for x in ['yield_farmer', 'api_guardian', 'conflict_resolver', 'emergency_pause']):
-            self.bot_categories['INFRASTRUCTURE'].append(bot_name)
-        
-        elif any(x in bot_name for x in ['bot_evolution', 'ai_clone', 'crash_recovery']):
-            self.bot_categories['EVOLUTION'].append(bot_name)
+    def get_bot(self, bot_name: str) -> Optional[object]:
+        """Get bot instance by name, importing and instantiating it on first use
         
-        elif 'queen' in bot_name:
-            self.bot_categories['QUEENS'].append(bot_name)
+        A bot is built under its own lock, not the registry's, so a slow
+        constructor only blocks callers waiting for that same bot.
+        """
+        with self._lock:
+            bot_info = self.bots.get(bot_name)
+            if bot_info is None:
+                return None
+            if bot_info['instance'] is not None or bot_info['status'] == 'failed':
+                return bot_info['instance']
+            load_lock = self._load_locks.setdefault(bot_name, threading.Lock())
         
-        elif 'thrones' in bot_name:
-            self.bot_categories['THRONES'].append(bot_name)
+        with load_lock:
+            with self._lock:
+                if bot_info['instance'] is not None or bot_info['status'] == 'failed':
+                    return bot_info['instance']
+                bot_info['status'] = 'loading'
+            return self._load_bot(bot_info)
     
-    def get_bot(self, bot_name: str) -> Optional[object]:
-        """Get bot instance by name"""
-        if bot_name in self.bots:
-            return self.bots[bot_name]['instance']
-        return None
+    def get_bot_info(self, bot_name: str) -> Optional[Dict]:
+        """Get registry metadata for a bot without loading it"""
+        bot_info = self.bots.get(bot_name)
+        if bot_info is None:
+            return None
+        return {k: v for k, v in bot_info.items() if k != 'instance'}
     
     def get_bots_by_category(self, category: str) -> List[str]:
         """Get all bots in a category"""
         return self.bot_categories.get(category, [])
     
-    def get_all_active_bots(self) -> List[str]:
-        """Get list of all active bot names"""
+    def get_all_bots(self) -> List[str]:
+        """Get list of all registered bot names"""
         return list(self.bots.keys())
     
+    def get_all_active_bots(self) -> List[str]:
+        """Get list of bots that have been loaded"""
+        return [name for name, info in self.bots.items() if info['status'] == 'active']
+    
     def get_registry_status(self) -> Dict:
         """Get comprehensive registry status"""
         category_counts = {cat: len(bots) for cat, bots in self.bot_categories.items() if bots}
@@ -178,19 +246,26 @@ class BotRegistry:
             'name': self.name,
             'version': self.version,
             'total_bots': len(self.bots),
+            'loaded_bots': len(self.get_all_active_bots()),
             'categories': category_counts,
+            'load_seconds': {name: info['load_seconds'] for name, info in self.bots.items()
+                             if info['load_seconds'] is not None},
             'metrics': self.metrics,
             'timestamp': datetime.now().isoformat()
         }
 
 if __name__ == '__main__':
     registry = BotRegistry()
-    print("🎯 APEX Bot Registry v2.0.0\n")
+    print(f"🎯 APEX Bot Registry v{registry.version}\n")
     
     result = registry.auto_discover_bots()
-    print(f"✅ Discovered {result['discovered']} bots")
+    print(f"✅ Discovered {result['discovered']} bots in {result['discovery_seconds']*1000:.1f}ms")
     print(f"📊 Total registered: {result['total_registered']}")
     
+    # Only bots that are asked for get imported
+    bot = registry.get_bot('crash_shield_bot')
+    print(f"⚡ Loaded {bot.name if bot else 'crash_shield_bot (failed)'} on first use")
+    
     status = registry.get_registry_status()
     print(f"\n📋 Categories:")
     for cat, count in status['categories'].items():
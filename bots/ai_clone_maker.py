@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'EVOLUTION'
+
 class AICloneMaker:
     def __init__(self):
         self.name, self.version = "AI_Clone_Maker", "1.0.0"
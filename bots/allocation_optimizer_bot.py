@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Dict, List
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'STRATEGY'
+
 class AllocationOptimizerBot:
     def __init__(self):
         self.name, self.version = "AllocationOptimizerBot", "1.0.0"
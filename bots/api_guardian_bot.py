@@ -15,20 +15,39 @@ from typing import Dict
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+from rate_limiter import RateLimiter, RateLimitShed, GuardedExchange, exchange_breaker
+
+BOT_CATEGORY = 'INFRASTRUCTURE'
+
 class APIGuardianBot:
-    """Protects against API rate limit violations"""
+    """Protects against API rate limit violations
+    
+    Exchange clients passed through guard() draw from one priority token
+    bucket: orders and stop exits first, position monitoring next,
+    analytics and scans last (shed near the limit). Identical reads in
+    flight across guarded clients share one request. share_limits() moves
+    the bucket to Redis so every process uses the same budget.
+    """
     
-    def __init__(self):
+    def __init__(self, redis_like=None):
         self.name = "APIGuardianBot"
-        self.version = "1.0.0"
+        self.version = "1.1.0"
         
         self.config = {
             'max_requests_per_minute': 100,
             'max_requests_per_second': 10,
             'cooldown_on_limit': 60,          # 60s cooldown if limit hit
-            'warning_threshold_pct': 80.0     # Warn at 80% of limit
+            'warning_threshold_pct': 80.0,    # Warn at 80% of limit
+            'bucket_capacity': 100,           # Token bucket burst (endpoint weights)
+            'bucket_refill_per_second': 100 / 60
         }
         
+        self.limiter = RateLimiter(
+            capacity=self.config['bucket_capacity'],
+            refill_rate=self.config['bucket_refill_per_second'],
+            redis_like=redis_like
+        )
+        
         self.request_history = {
             'minute': deque(maxlen=100),
             'second': deque(maxlen=10)
@@ -63,18 +82,8 @@ class APIGuardianBot:
                 self.state['rate_limited'] = False
                 self.state['cooldown_until'] = None
         
-        # Clean old requests
-        cutoff_minute = now - timedelta(minutes=1)
-        cutoff_second = now - timedelta(seconds=1)
-        
-        self.request_history['minute'] = deque(
-            [t for t in self.request_history['minute'] if t > cutoff_minute],
-            maxlen=100
-        )
-        self.request_history['second'] = deque(
-            [t for t in self.request_history['second'] if t > cutoff_second],
-            maxlen=10
-        )
+        # Clean old requests (history is time-ordered, so drop from the left)
+        self._prune(now)
         
         # Check limits
         requests_this_minute = len(self.request_history['minute'])
@@ -115,6 +124,57 @@ class APIGuardianBot:
         
         return {'allowed': True}
     
+    def _prune(self, now: datetime) -> None:
+        for window, span in (('minute', timedelta(minutes=1)), ('second', timedelta(seconds=1))):
+            history = self.request_history[window]
+            cutoff = now - span
+            while history and history[0] <= cutoff:
+                history.popleft()
+    
+    def acquire(self, method: str, priority: str = 'analytics') -> float:
+        """Take rate limit tokens for an exchange call
+        
+        Args:
+            method: ccxt method name
+            priority: 'orders', 'positions' or 'analytics'
+        
+        Returns:
+            Seconds waited
+        
+        Raises:
+            RateLimitShed: Call dropped to protect higher priority traffic
+        """
+        try:
+            waited = self.limiter.acquire(method, priority)
+        except RateLimitShed:
+            self.metrics['requests_blocked'] += 1
+            raise
+        
+        self.record_request()
+        return waited
+    
+    def guard(self, exchange, priority: str = 'analytics'):
+        """Route a ccxt client's calls through the shared limiter
+        
+        Args:
+            exchange: ccxt client
+            priority: Class for its read calls (orders always use 'orders')
+        
+        Returns:
+            Proxy to use in place of the client
+        """
+        if isinstance(exchange, GuardedExchange):
+            exchange = exchange.exchange
+        
+        # The shared bucket replaces ccxt's per-client throttle
+        exchange.enableRateLimit = False
+        return GuardedExchange(exchange, self, priority, flights=self.limiter.flights,
+                               breaker=exchange_breaker(exchange))
+    
+    def share_limits(self, redis_like) -> None:
+        """Share the token bucket with other processes through Redis"""
+        self.limiter.share(redis_like)
+    
     def record_request(self) -> None:
         """Record an API request"""
         now = datetime.now()
@@ -128,6 +188,7 @@ class APIGuardianBot:
     
     def get_api_usage(self) -> Dict:
         """Get current API usage statistics"""
+        self._prune(datetime.now())
         requests_this_minute = len(self.request_history['minute'])
         requests_this_second = len(self.request_history['second'])
         
@@ -148,7 +209,8 @@ class APIGuardianBot:
             'version': self.version,
             'state': self.state,
             'metrics': self.metrics,
-            'current_usage': self.get_api_usage()
+            'current_usage': self.get_api_usage(),
+            'limiter': self.limiter.get_status()
         }
 
 if __name__ == '__main__':
@@ -23,10 +23,15 @@ except ImportError:
     import numpy as np
     import pandas as pd
 
+from backtest_cache import BacktestCache
+from monte_carlo import MonteCarloAnalyzer
+
+BOT_CATEGORY = 'STRATEGY'
+
 class BacktestingEngine:
     """Backtests trading strategies on historical market data"""
     
-    def __init__(self, exchange_config=None):
+    def __init__(self, exchange_config=None, cache=None, cost_model=None):
         self.name = "BacktestingEngine"
         self.version = "1.0.0"
         
@@ -42,6 +47,12 @@ class BacktestingEngine:
             })
         
         self.results = {}
+        
+        # Content-addressed result cache (pass cache=False to disable)
+        self.cache = BacktestCache() if cache is None else (cache or None)
+        
+        # Pluggable ExecutionCostModel (None = fill at bar close with no fees)
+        self.cost_model = cost_model
     
     def fetch_historical_data(self, symbol: str, timeframe: str, days: int = 30) -> pd.DataFrame:
         """Fetch historical OHLCV data"""
@@ -81,6 +92,15 @@ class BacktestingEngine:
         if df.empty:
             return {'error': 'No data'}
         
+        result_key = f"{symbol}_{timeframe}_{days}d"
+        cache_key = None
+        if self.cache:
+            cache_key = self._cache_key(symbol, timeframe, days, df, strategy_func, initial_balance)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.results[result_key] = cached
+                return cached
+        
         # Run strategy
         signals = strategy_func(df)
         
@@ -92,52 +112,31 @@ class BacktestingEngine:
         for signal in signals:
             if signal['action'] == 'buy' and position is None:
                 # Enter long position
-                amount = (balance * signal.get('size', 0.9)) / signal['price']
+                spend = balance * signal.get('size', 0.9)
+                fill_price, fee = self._fill(signal['price'], spend / signal['price'], 'buy')
+                amount = (spend - fee) / fill_price
                 position = {
                     'type': 'long',
-                    'entry_price': signal['price'],
+                    'entry_price': fill_price,
                     'amount': amount,
-                    'entry_time': signal['timestamp']
+                    'entry_time': signal['timestamp'],
+                    'entry_fee': fee
                 }
-                balance -= amount * signal['price']
+                balance -= amount * fill_price + fee
                 
             elif signal['action'] == 'sell' and position is not None:
                 # Close position
-                exit_value = position['amount'] * signal['price']
-                profit = exit_value - (position['amount'] * position['entry_price'])
-                profit_pct = (profit / (position['amount'] * position['entry_price'])) * 100
-                
-                trades.append({
-                    'entry_price': position['entry_price'],
-                    'exit_price': signal['price'],
-                    'amount': position['amount'],
-                    'profit': profit,
-                    'profit_pct': profit_pct,
-                    'entry_time': position['entry_time'],
-                    'exit_time': signal['timestamp']
-                })
-                
-                balance += exit_value
+                trades.append(self._close_position(position, signal['price'], signal['timestamp']))
+                balance += trades[-1]['exit_value']
                 position = None
         
         # Close any open position at last price
         if position is not None:
-            last_price = df.iloc[-1]['close']
-            exit_value = position['amount'] * last_price
-            profit = exit_value - (position['amount'] * position['entry_price'])
+            trade = self._close_position(position, df.iloc[-1]['close'], df.iloc[-1]['timestamp'])
+            trade['status'] = 'open_at_end'
+            trades.append(trade)
             
-            trades.append({
-                'entry_price': position['entry_price'],
-                'exit_price': last_price,
-                'amount': position['amount'],
-                'profit': profit,
-                'profit_pct': (profit / (position['amount'] * position['entry_price'])) * 100,
-                'entry_time': position['entry_time'],
-                'exit_time': df.iloc[-1]['timestamp'],
-                'status': 'open_at_end'
-            })
-            
-            balance += exit_value
+            balance += trade['exit_value']
         
         # Calculate metrics
         if not trades:
@@ -182,14 +181,68 @@ class BacktestingEngine:
             'avg_loss': avg_loss,
             'profit_factor': profit_factor,
             'max_drawdown': max_drawdown,
+            'total_fees': sum(t['fees'] for t in trades),
             'trades': trades,
             'timestamp': datetime.now().isoformat()
         }
         
-        self.results[f"{symbol}_{timeframe}_{days}d"] = result
+        self.results[result_key] = result
+        
+        if cache_key:
+            self.cache.set(cache_key, result)
         
         return result
     
+    def _fill(self, price: float, amount: float, side: str):
+        """Fill price and fee for one order under the engine's cost model"""
+        if self.cost_model is None:
+            return price, 0.0
+        
+        fill_price, fee = self.cost_model.fill_prices(price, amount, side)
+        return float(fill_price), float(fee)
+    
+    def _close_position(self, position: Dict, price: float, timestamp) -> Dict:
+        """Close a long position and build its trade record"""
+        fill_price, fee = self._fill(price, position['amount'], 'sell')
+        exit_value = position['amount'] * fill_price - fee
+        cost_basis = position['amount'] * position['entry_price'] + position['entry_fee']
+        profit = exit_value - cost_basis
+        
+        return {
+            'entry_price': position['entry_price'],
+            'exit_price': fill_price,
+            'amount': position['amount'],
+            'profit': profit,
+            'profit_pct': (profit / cost_basis) * 100,
+            'fees': position['entry_fee'] + fee,
+            'exit_value': exit_value,
+            'entry_time': position['entry_time'],
+            'exit_time': timestamp
+        }
+    
+    def _cache_key(self, symbol: str, timeframe: str, days: int, df: pd.DataFrame,
+                   strategy_func: Callable, initial_balance: float) -> str:
+        """Content address of a backtest: data, strategy code, parameters, fee model"""
+        ohlcv = df[['open', 'high', 'low', 'close', 'volume']]
+        data_range = {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'start': str(df['timestamp'].iloc[0]),
+            'end': str(df['timestamp'].iloc[-1]),
+            'bars': len(df),
+            'fingerprint': BacktestCache.data_fingerprint(ohlcv)
+        }
+        parameters = {
+            'strategy': getattr(strategy_func, '__name__', repr(strategy_func)),
+            'initial_balance': initial_balance,
+            'days': days,
+            'engine_code': BacktestCache.code_version(type(self))
+        }
+        
+        fee_model = self.cost_model.describe() if self.cost_model else None
+        
+        return BacktestCache.make_key(data_range, BacktestCache.code_version(strategy_func), parameters, fee_model)
+    
     def compare_strategies(self, symbol: str, strategies: Dict[str, Callable], days: int = 30) -> Dict:
         """Compare multiple strategies"""
         results = {}
@@ -210,6 +263,12 @@ class BacktestingEngine:
             'best_strategy': rankings[0][0] if rankings else None
         }
     
+    def monte_carlo(self, result: Dict, n_simulations: int = 10000, method: str = 'resample',
+                    seed: int = None) -> Dict:
+        """Robustness statistics for a backtest by resampling its trade sequence"""
+        analyzer = MonteCarloAnalyzer(n_simulations=n_simulations, seed=seed)
+        return analyzer.analyze_backtest(result, method=method)
+    
     def save_results(self, filepath: str = 'data/backtest_results.json'):
         """Save backtest results"""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -221,7 +280,8 @@ class BacktestingEngine:
         return {
             'name': self.name,
             'version': self.version,
-            'tests_run': len(self.results)
+            'tests_run': len(self.results),
+            'cache': self.cache.get_stats() if self.cache else None
         }
 
 # Example strategies
@@ -301,4 +361,11 @@ if __name__ == '__main__':
     print(f"   Profit Factor: {result.get('profit_factor', 0):.2f}")
     print(f"   Max Drawdown: {result.get('max_drawdown', 0):.2f}%")
     
+    if result.get('trades'):
+        robustness = engine.monte_carlo(result)
+        print(f"\n🎲 Monte Carlo ({robustness['n_simulations']} paths):")
+        print(f"   Return 5-95%: {robustness['return_pct']['p5']:.2f}% .. {robustness['return_pct']['p95']:.2f}%")
+        print(f"   Max Drawdown p95: {robustness['max_drawdown_pct']['p95']:.2f}%")
+        print(f"   Ruin Probability: {robustness['ruin_probability']:.2%}")
+    
     engine.save_results()
@@ -13,6 +13,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages numpy -q")
     import numpy as np
 
+BOT_CATEGORY = 'EVOLUTION'
+
 class BotEvolutionEngine:
     def __init__(self):
         self.name, self.version = "Bot_Evolution_Engine", "1.0.0"
@@ -19,6 +19,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+BOT_CATEGORY = 'CORE_APEX'
+
 class CapitalRotatorBot:
     """Optimizes capital allocation across trading pairs"""
     
@@ -149,8 +151,12 @@ class CapitalRotatorBot:
         
         return hours_since >= self.config['rebalance_interval_hours']
     
-    def rebalance_capital(self, symbols: List[str] = None) -> Dict:
-        """Perform capital rebalancing"""
+    def rebalance_capital(self, symbols: List[str] = None, ranked_pairs: List[Tuple[str, float]] = None) -> Dict:
+        """Perform capital rebalancing
+        
+        ranked_pairs may be passed in when ROIs were fetched concurrently
+        by the caller (see rank_pairs_by_performance for the format).
+        """
         if symbols is None:
             symbols = list(self.allocations.keys())
         
@@ -161,7 +167,10 @@ class CapitalRotatorBot:
             }
         
         # Rank pairs by performance
-        ranked_pairs = self.rank_pairs_by_performance(symbols)
+        if ranked_pairs is None:
+            ranked_pairs = self.rank_pairs_by_performance(symbols)
+        else:
+            ranked_pairs = sorted(ranked_pairs, key=lambda x: x[1], reverse=True)
         
         # Calculate optimal allocation
         new_allocations = self.calculate_optimal_allocation(ranked_pairs)
@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Dict, List
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'GOD_LEVEL'
+
 class CherubimAI:
     """Security guardian & anomaly detector"""
     
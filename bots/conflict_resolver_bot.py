@@ -13,6 +13,8 @@ from typing import Dict, List
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'INFRASTRUCTURE'
+
 class ConflictResolverBot:
     """Resolves conflicts between bot signals"""
     
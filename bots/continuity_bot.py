@@ -16,6 +16,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+BOT_CATEGORY = 'ATN_TRADERS'
+
 class ContinuityBot:
     def __init__(self, exchange_config=None):
         self.name, self.version = "ContinuityBot", "1.0.0"
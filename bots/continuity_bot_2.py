@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'ATN_TRADERS'
+
 class ContinuityBot2:
     def __init__(self):
         self.name, self.version = "Continuity_Bot_2", "1.0.0"
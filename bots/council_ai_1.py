@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'COUNCIL'
+
 class CouncilAI_1:
     def __init__(self):
         self.name, self.version, self.specialty = "Council_AI_1_ROI", "1.0.0", "ROI_ANALYZER"
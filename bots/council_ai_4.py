@@ -5,6 +5,8 @@ import os, sys, json
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'COUNCIL'
+
 class CouncilAI_4:
     def __init__(self):
         self.name, self.version, self.specialty = "Council_AI_4_PERFORMANCE", "1.0.0", "PERFORMANCE_AUDIT"
@@ -5,6 +5,8 @@ import os, sys, json
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'COUNCIL'
+
 class CouncilAI_5:
     def __init__(self):
         self.name, self.version, self.specialty = "Council_AI_5_LIQUIDITY", "1.0.0", "LIQUIDITY_QUALITY"
@@ -19,6 +19,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+BOT_CATEGORY = 'CORE_APEX'
+
 class CrashShieldBot:
     """Protects capital during market crashes"""
     
@@ -67,39 +69,59 @@ class CrashShieldBot:
             if len(ohlcv) < 2:
                 return {'crash_detected': False}
             
-            # Get high and current price from last hour
-            highs = [candle[2] for candle in ohlcv]
-            current_price = ohlcv[-1][4]
-            high_price = max(highs)
-            
-            # Calculate drop percentage
-            drop_pct = ((high_price - current_price) / high_price) * 100
-            
-            # Update last price
-            self.state['last_prices'][symbol] = current_price
-            
-            # Determine crash level
-            crash_level = "NORMAL"
-            if drop_pct >= self.config['crash_threshold_pct']:
-                crash_level = "CRASH"
-                self.metrics['crashes_detected'] += 1
-            elif drop_pct >= self.config['minor_drop_threshold']:
-                crash_level = "WARNING"
-            
-            return {
-                'symbol': symbol,
-                'crash_detected': crash_level != "NORMAL",
-                'crash_level': crash_level,
-                'high_price': high_price,
-                'current_price': current_price,
-                'drop_pct': drop_pct,
-                'timestamp': datetime.now().isoformat()
-            }
+            return self.assess_drop(symbol, ohlcv)
             
         except Exception as e:
             print(f"❌ Crash detection error: {e}")
             return {'crash_detected': False}
     
+    def assess_drop(self, symbol: str, ohlcv) -> Dict:
+        """Classify the drop from the window high to the latest close"""
+        # Get high and current price from last hour
+        highs = [candle[2] for candle in ohlcv]
+        current_price = float(ohlcv[-1][4])
+        high_price = float(max(highs))
+        
+        # Calculate drop percentage
+        drop_pct = ((high_price - current_price) / high_price) * 100
+        
+        # Update last price
+        self.state['last_prices'][symbol] = current_price
+        
+        # Determine crash level
+        crash_level = "NORMAL"
+        if drop_pct >= self.config['crash_threshold_pct']:
+            crash_level = "CRASH"
+            self.metrics['crashes_detected'] += 1
+        elif drop_pct >= self.config['minor_drop_threshold']:
+            crash_level = "WARNING"
+        
+        return {
+            'symbol': symbol,
+            'crash_detected': crash_level != "NORMAL",
+            'crash_level': crash_level,
+            'high_price': high_price,
+            'current_price': current_price,
+            'drop_pct': drop_pct,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def on_market_snapshot(self, snapshot) -> List[Dict]:
+        """Worker-mode hook: crash checks on a shared MarketSnapshot view, no API calls"""
+        signals = []
+        for symbol in snapshot.symbols:
+            ohlcv = snapshot.ohlcv(symbol)
+            if len(ohlcv) < 2:
+                continue
+            
+            # Same one-hour window as check_crash, whatever the snapshot timeframe
+            recent = ohlcv[ohlcv[:, 0] > ohlcv[-1, 0] - 3600000]
+            result = self.assess_drop(symbol, recent if len(recent) >= 2 else ohlcv[-2:])
+            if result['crash_detected']:
+                signals.append(result)
+        
+        return signals
+    
     def pause_trading(self, reason: str) -> None:
         """Pause all trading"""
         if not self.state['trading_paused']:
@@ -144,12 +166,17 @@ class CrashShieldBot:
             print(f"❌ Recovery check error: {e}")
             return False
     
-    def monitor_market(self, symbols: List[str]) -> Dict:
-        """Monitor multiple symbols for crashes"""
+    def monitor_market(self, symbols: List[str], crash_checks: Dict[str, Dict] = None) -> Dict:
+        """Monitor multiple symbols for crashes
+        
+        crash_checks may carry check_crash() results already fetched
+        concurrently by the caller; missing symbols are checked here.
+        """
         results = {}
+        crash_checks = crash_checks or {}
         
         for symbol in symbols:
-            crash_data = self.check_crash(symbol)
+            crash_data = crash_checks[symbol] if symbol in crash_checks else self.check_crash(symbol)
             results[symbol] = crash_data
             
             # Take action based on crash level
@@ -24,6 +24,8 @@ except ImportError:
     import ccxt
     import numpy as np
 
+BOT_CATEGORY = 'CORE_APEX'
+
 class DynamicStopLossBot:
     """
     Dynamically adjusts stop-losses based on market volatility
@@ -14,6 +14,8 @@ from typing import Dict, List
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'INFRASTRUCTURE'
+
 class EmergencyPauseBot:
     """Pauses trading during high-impact economic events"""
     
@@ -19,12 +19,16 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+from order_router import estimate_routes
+
+BOT_CATEGORY = 'CORE_APEX'
+
 class FeeOptimizerBot:
     """Calculates and optimizes trading fees and slippage"""
     
     def __init__(self, exchange_config=None):
         self.name = "FeeOptimizerBot"
-        self.version = "1.0.0"
+        self.version = "1.1.0"
         
         if exchange_config:
             self.exchange = ccxt.cryptocom(exchange_config)
@@ -41,7 +45,8 @@ class FeeOptimizerBot:
             'total_calculations': 0,
             'trades_optimized': 0,
             'fees_saved': 0.0,
-            'slippage_avoided': 0.0
+            'slippage_avoided': 0.0,
+            'routes': {'market': 0, 'post_only': 0, 'sliced': 0}
         }
     
     def calculate_fees(self, symbol: str, amount: float, side: str) -> Dict:
@@ -151,21 +156,37 @@ class FeeOptimizerBot:
             print(f"❌ Slippage estimation error: {e}")
             return {}
     
+    def estimate_route(self, symbol: str, amount: float, side: str, maker_fee: float, taker_fee: float) -> Dict:
+        """Cheapest of market, post-only limit and sliced execution for an order"""
+        try:
+            orderbook = self.exchange.fetch_order_book(symbol, limit=20)
+            return estimate_routes(orderbook, side, amount, maker_fee, taker_fee)
+        except Exception as e:
+            print(f"❌ Route estimation error: {e}")
+            return {}
+    
     def optimize_order(self, symbol: str, amount: float, side: str) -> Dict:
-        """Full order optimization with fees and slippage"""
+        """Full order optimization with fees, slippage and execution route"""
         fee_calc = self.calculate_fees(symbol, amount, side)
         slippage_calc = self.estimate_slippage(symbol, amount, side)
         
         if not fee_calc or not slippage_calc:
             return {}
         
-        # Calculate total cost
+        # Calculate total cost (as a market order)
         total_cost = fee_calc['fee_amount'] + slippage_calc['slippage_amount']
         total_cost_pct = (total_cost / fee_calc['order_value']) * 100
         
+        # Cost on the cheapest route, which is how the order will be executed
+        route_calc = self.estimate_route(symbol, amount, side,
+                                         fee_calc['maker_fee_pct'] / 100, fee_calc['taker_fee_pct'] / 100)
+        route = route_calc.get('best', 'market')
+        route_cost_pct = route_calc['costs_bps'][route] / 100 if route_calc else total_cost_pct
+        self.metrics['routes'][route] += 1
+        
         # Optimization recommendation
         recommendation = "EXECUTE"
-        if total_cost_pct > 1.0:
+        if route_cost_pct > 1.0:
             recommendation = "HIGH_COST_WARNING"
         elif slippage_calc['slippage_pct'] > 0.5:
             recommendation = "HIGH_SLIPPAGE_WARNING"
@@ -183,6 +204,10 @@ class FeeOptimizerBot:
             'slippage_pct': slippage_calc['slippage_pct'],
             'total_cost': total_cost,
             'total_cost_pct': total_cost_pct,
+            'maker_fee_pct': fee_calc['maker_fee_pct'],
+            'route': route,
+            'route_cost_pct': route_cost_pct,
+            'route_costs_bps': route_calc.get('costs_bps', {}),
             'recommendation': recommendation,
             'timestamp': datetime.now().isoformat()
         }
@@ -20,12 +20,22 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+from order_execution import ExecutionEngine
+from order_slicing import SliceScheduler
+
+BOT_CATEGORY = 'PROTECTION'
+
 class LiquidityWaveBot:
-    """Executes large orders with minimal price impact"""
+    """Executes large orders with minimal price impact
     
-    def __init__(self, exchange_config=None):
+    Orders above slice_threshold_usd are worked by a TWAP or VWAP
+    SliceScheduler as depth-capped child orders on an ExecutionEngine, so
+    several parents run concurrently without blocking the caller.
+    """
+    
+    def __init__(self, exchange_config=None, execution: ExecutionEngine = None):
         self.name = "LiquidityWaveBot"
-        self.version = "1.0.0"
+        self.version = "1.1.0"
         
         if exchange_config:
             self.exchange = ccxt.cryptocom(exchange_config)
@@ -42,9 +52,14 @@ class LiquidityWaveBot:
             'slice_threshold_usd': 100.0,  # Slice orders > $100
             'max_slice_pct': 10.0,          # Max 10% of order book depth
             'slice_interval_sec': 30,       # 30s between slices
-            'max_slices': 10                # Max 10 slices per order
+            'max_slices': 10,               # Max 10 slices per order
+            'default_style': 'twap'         # 'twap' or 'vwap' (hourly volume profile)
         }
         
+        self.execution = execution or ExecutionEngine(self.exchange, name='liquidity-wave')
+        self.scheduler = SliceScheduler(self.execution, self.exchange,
+                                        max_depth_pct=self.config['max_slice_pct'])
+        
         self.metrics = {
             'orders_sliced': 0,
             'total_slices': 0,
@@ -147,42 +162,43 @@ class LiquidityWaveBot:
             print(f"❌ Order slicing error: {e}")
             return []
     
-    def execute_sliced_order(self, symbol: str, amount: float, side: str) -> Dict:
-        """Execute order with optimal slicing"""
+    def execute_sliced_order(self, symbol: str, amount: float, side: str, style: str = None) -> Dict:
+        """Start working an order as timed slices
+        
+        Returns as soon as the parent order is scheduled; child orders go out
+        every slice_interval_sec. Track progress with get_sliced_order().
+        
+        Args:
+            symbol: Trading pair
+            amount: Total base amount
+            side: 'buy' or 'sell'
+            style: 'twap' or 'vwap' (default from config)
+        
+        Returns:
+            Parent order snapshot (parent_id, schedule, status)
+        """
         slices = self.calculate_order_slices(symbol, amount, side)
         
         if not slices:
             return {'success': False, 'error': 'Failed to calculate slices'}
         
-        executed_slices = []
-        total_filled = 0
-        
-        for slice_info in slices:
-            # In production, would execute actual order here
-            # For now, simulate
-            executed_slices.append({
-                'slice': slice_info['slice'],
-                'amount': slice_info['amount'],
-                'status': 'SIMULATED',
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            total_filled += slice_info['amount']
-            
-            # Wait between slices (except last)
-            if slice_info != slices[-1]:
-                time.sleep(slice_info['delay'] / 1000)  # Convert to seconds
+        n_slices = len(slices)
+        parent = self.scheduler.submit(
+            symbol, side, amount,
+            style=style or self.config['default_style'],
+            duration=n_slices * self.config['slice_interval_sec'],
+            n_slices=n_slices
+        )
         
-        return {
-            'success': True,
-            'symbol': symbol,
-            'side': side,
-            'total_amount': amount,
-            'slices_executed': len(executed_slices),
-            'total_filled': total_filled,
-            'execution_details': executed_slices,
-            'timestamp': datetime.now().isoformat()
-        }
+        return dict(parent, success=True)
+    
+    def get_sliced_order(self, parent_id: str) -> Dict:
+        """Progress of a sliced order (filled, avg_price, children, status)"""
+        return self.scheduler.get_parent(parent_id)
+    
+    def cancel_sliced_order(self, parent_id: str) -> None:
+        """Stop sending further slices for an order"""
+        self.scheduler.cancel(parent_id)
     
     def get_status(self) -> Dict:
         """Get bot status"""
@@ -190,7 +206,8 @@ class LiquidityWaveBot:
             'name': self.name,
             'version': self.version,
             'metrics': self.metrics,
-            'config': self.config
+            'config': self.config,
+            'slicing': self.scheduler.get_status()
         }
 
 if __name__ == '__main__':
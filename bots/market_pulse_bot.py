@@ -13,6 +13,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+BOT_CATEGORY = 'INFRASTRUCTURE'
+
 class MarketPulseBot:
     def __init__(self, exchange_config=None):
         self.name, self.version = "MarketPulseBot", "1.0.0"
@@ -16,6 +16,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt numpy -q")
     import ccxt, numpy as np
 
+BOT_CATEGORY = 'ATN_TRADERS'
+
 class MomentumRiderBot:
     def __init__(self, exchange_config=None):
         self.name, self.version = "MomentumRiderBot", "1.0.0"
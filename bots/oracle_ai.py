@@ -16,6 +16,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt numpy -q")
     import ccxt, numpy as np
 
+BOT_CATEGORY = 'GOD_LEVEL'
+
 class OracleAI:
     """Short-term price prediction (1m-1h timeframes)"""
     
@@ -48,10 +50,19 @@ class OracleAI:
         try:
             # Fetch recent data
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=100)
+            return self.predict_from_ohlcv(symbol, ohlcv, horizon_minutes)
+            
+        except Exception as e:
+            print(f"❌ Oracle AI prediction error: {e}")
+            return {}
+    
+    def predict_from_ohlcv(self, symbol: str, ohlcv, horizon_minutes: int = 60) -> Dict:
+        """Predict price movement from candles already at hand (no API calls)"""
+        try:
             if len(ohlcv) < 50: return {}
             
-            closes = np.array([c[4] for c in ohlcv])
-            volumes = np.array([c[5] for c in ohlcv])
+            closes = np.array([c[4] for c in ohlcv], dtype=float)
+            volumes = np.array([c[5] for c in ohlcv], dtype=float)
             
             # Calculate features
             returns = np.diff(closes) / closes[:-1]
@@ -112,6 +123,16 @@ class OracleAI:
             print(f"❌ Oracle AI prediction error: {e}")
             return {}
     
+    def on_market_snapshot(self, snapshot) -> List[Dict]:
+        """Worker-mode hook: a prediction per symbol from a shared MarketSnapshot view, no API calls"""
+        predictions = []
+        for symbol in snapshot.symbols:
+            prediction = self.predict_from_ohlcv(symbol, snapshot.ohlcv(symbol))
+            if prediction:
+                prediction['current_price'] = float(prediction['current_price'])
+                predictions.append(prediction)
+        return predictions
+    
     def track_whale_wallets(self, min_transaction_usd: float = 100000) -> List[Dict]:
         """Track large wallet movements (whale detection)"""
         # Placeholder - would integrate with blockchain APIs in production
@@ -23,6 +23,8 @@ except ImportError:
     import numpy as np
     import pandas as pd
 
+BOT_CATEGORY = 'STRATEGY'
+
 class PatternRecognitionBot:
     """Identifies trading patterns and technical setups"""
     
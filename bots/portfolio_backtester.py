@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Portfolio Backtester
+Replays aligned multi-symbol data against one shared cash pool
+Part of APEX AI Trading System
+"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+try:
+    import ccxt
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    os.system("pip3 install --break-system-packages ccxt numpy pandas -q")
+    import ccxt
+    import numpy as np
+    import pandas as pd
+
+BOT_CATEGORY = 'STRATEGY'
+
+class PortfolioBacktester:
+    """Backtests allocation and rebalancing rules across many symbols"""
+
+    def __init__(self, exchange_config=None, cost_model=None):
+        self.name = "PortfolioBacktester"
+        self.version = "1.0.0"
+
+        if exchange_config:
+            self.exchange = ccxt.cryptocom(exchange_config)
+        else:
+            from dotenv import load_dotenv
+            load_dotenv()
+            self.exchange = ccxt.cryptocom({
+                'apiKey': os.getenv('EXCHANGE_API_KEY'),
+                'secret': os.getenv('EXCHANGE_API_SECRET'),
+                'enableRateLimit': True
+            })
+
+        self.config = {
+            'rebalance_every': 6,          # Bars between scheduled rebalances (6h on 1h bars)
+            'drift_threshold_pct': 0.0,    # Rebalance early on weight drift (0 = off)
+            'fee_rate': 0.001,             # 0.1% taker fee on traded notional
+            'min_allocation_pct': 10.0,    # Mirrors CapitalRotatorBot constraints
+            'max_allocation_pct': 40.0,
+            'rotation_lookback': 24,       # Bars of ROI used by rotation_schedule()
+            'cost_iterations': 40          # Bisection steps fitting targets plus cost-model costs into equity
+        }
+
+        # ExecutionCostModel, or dict of symbol -> model; replaces the flat fee_rate
+        self.cost_model = cost_model
+
+        self.results = {}
+
+    def fetch_aligned_data(self, symbols: List[str], timeframe: str = '1h',
+                           days: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        """Fetch OHLCV for every symbol and align closes on shared timestamps"""
+        since = self.exchange.parse8601((datetime.now() - timedelta(days=days)).isoformat())
+        frames = {}
+
+        for symbol in symbols:
+            try:
+                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=1000)
+                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+                frames[symbol] = df
+            except Exception as e:
+                print(f"❌ Data fetch error for {symbol}: {e}")
+                frames[symbol] = pd.DataFrame(columns=['timestamp', 'close'])
+
+        return self.align_closes(frames, symbols)
+
+    def align_closes(self, frames: Dict[str, pd.DataFrame], symbols: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Align per-symbol frames into a (bars x symbols) close matrix
+
+        Timestamps are the union of all frames. Gaps are forward-filled and
+        leading rows where any symbol has no price yet are dropped.
+
+        Returns:
+            (timestamps, closes) arrays
+        """
+        series = [
+            frames[s].set_index('timestamp')['close'].astype(float).rename(s)
+            for s in symbols
+        ]
+        aligned = pd.concat(series, axis=1).sort_index().ffill().dropna()
+
+        return aligned.index.to_numpy(), aligned.to_numpy(dtype=float)
+
+    def rotation_schedule(self, closes: np.ndarray, lookback: int = None) -> np.ndarray:
+        """
+        Vectorized CapitalRotatorBot allocation for every bar
+
+        Weights follow |ROI| over the lookback window, clipped to the
+        min/max allocation and renormalized. Bars without enough history,
+        or with zero total ROI, fall back to equal weights.
+        """
+        lookback = lookback or self.config['rotation_lookback']
+        n_bars, n_symbols = closes.shape
+        equal = np.full(n_symbols, 1.0 / n_symbols)
+
+        weights = np.tile(equal, (n_bars, 1))
+        if n_bars <= lookback:
+            return weights
+
+        roi = np.abs(closes[lookback:] / closes[:-lookback] - 1.0)
+        total = roi.sum(axis=1, keepdims=True)
+        raw = np.divide(roi, total, out=np.tile(equal, (len(roi), 1)), where=total > 0)
+
+        clipped = np.clip(raw, self.config['min_allocation_pct'] / 100, self.config['max_allocation_pct'] / 100)
+        weights[lookback:] = clipped / clipped.sum(axis=1, keepdims=True)
+
+        return weights
+
+    def backtest_portfolio(self, closes: np.ndarray, target_weights: Union[Dict[str, float], np.ndarray],
+                           symbols: List[str] = None, initial_balance: float = 3.0,
+                           rebalance_every: int = None, drift_threshold_pct: float = None,
+                           fee_rate: float = None, timestamps: Optional[np.ndarray] = None) -> Dict:
+        """
+        Backtest allocation rules on a shared cash pool
+
+        Args:
+            closes: (bars x symbols) aligned close prices
+            target_weights: Dict of symbol -> weight (e.g. CapitalRotatorBot.allocations)
+                            or a (bars x symbols) weight schedule
+            symbols: Column order of closes (required for dict weights)
+            initial_balance: Starting balance in USDT
+            rebalance_every: Bars between scheduled rebalances
+            drift_threshold_pct: Rebalance early when any weight drifts this far
+            fee_rate: Fee charged on traded notional (ignored when a cost model is set)
+            timestamps: Optional bar timestamps carried into the result
+
+        Returns:
+            Backtest results with aligned equity, exposure and turnover arrays
+        """
+        closes = np.asarray(closes, dtype=float)
+        n_bars, n_symbols = closes.shape
+        symbols = symbols or [f"SYM{i}" for i in range(n_symbols)]
+
+        rebalance_every = max(1, rebalance_every or self.config['rebalance_every'])
+        drift = (self.config['drift_threshold_pct'] if drift_threshold_pct is None else drift_threshold_pct) / 100
+        fee_rate = self.config['fee_rate'] if fee_rate is None else fee_rate
+
+        if isinstance(target_weights, dict):
+            row = np.array([target_weights.get(s, 0.0) for s in symbols], dtype=float)
+            targets = np.broadcast_to(row, closes.shape)
+        else:
+            targets = np.asarray(target_weights, dtype=float)
+
+        if targets.shape != closes.shape:
+            return {'error': f'Weight shape {targets.shape} does not match prices {closes.shape}'}
+        if np.any(targets.sum(axis=1) > 1.0 + 1e-9):
+            return {'error': 'Target weights sum above 1.0 (no leverage)'}
+
+        equity = np.empty(n_bars)
+        cash = np.empty(n_bars)
+        values = np.empty((n_bars, n_symbols))
+        turnover = np.zeros(n_bars)
+        fees = np.zeros(n_bars)
+        rebalance_bars = []
+
+        holdings = np.zeros(n_symbols)
+        balance = initial_balance
+        t = 0
+
+        while t < n_bars:
+            # Rebalance to target at this bar's close
+            prices = closes[t]
+            current = holdings * prices
+            total = balance + current.sum()
+
+            est_fee = self._trade_costs(targets[t] * total - current, symbols, fee_rate)
+            target_value = targets[t] * (total - est_fee)
+            # Shrinking the targets can mean selling more, which costs more: scale them down
+            # until positions plus costs fit in equity
+            target_value *= self._cost_scale(target_value, current, total, symbols, fee_rate)
+            fees[t] = self._trade_costs(target_value - current, symbols, fee_rate)
+
+            traded = np.abs(target_value - current).sum()
+            turnover[t] = traded / total if total > 0 else 0.0
+            holdings = np.divide(target_value, prices, out=np.zeros(n_symbols), where=prices > 0)
+            balance = total - target_value.sum() - fees[t]
+            if balance < -1e-9 * max(total, 1.0):
+                raise ValueError(f"Cash went negative ({balance:.6g}) after rebalance costs at bar {t}")
+            balance = max(balance, 0.0)
+            rebalance_bars.append(t)
+
+            # Holdings are constant until the next rebalance: value the segment at once
+            end = min(t + rebalance_every, n_bars)
+            seg_values = holdings * closes[t:end]
+            seg_equity = balance + seg_values.sum(axis=1)
+
+            if drift > 0 and end - t > 1:
+                seg_weights = seg_values / seg_equity[:, None]
+                breach = np.abs(seg_weights - targets[t:end]).max(axis=1) > drift
+                breach[0] = False
+                if breach.any():
+                    end = t + int(np.argmax(breach))
+                    seg_values = seg_values[:end - t]
+                    seg_equity = seg_equity[:end - t]
+
+            values[t:end] = seg_values
+            equity[t:end] = seg_equity
+            cash[t:end] = balance
+            t = end
+
+        weights = values / equity[:, None]
+        exposure = values.sum(axis=1) / equity
+
+        peak = np.maximum.accumulate(equity)
+        drawdown = (peak - equity) / peak * 100
+        final_balance = float(equity[-1])
+
+        result = {
+            'symbols': symbols,
+            'initial_balance': initial_balance,
+            'final_balance': final_balance,
+            'roi': (final_balance - initial_balance) / initial_balance * 100,
+            'max_drawdown': float(drawdown.max()),
+            'avg_exposure': float(exposure.mean()),
+            'total_turnover': float(turnover.sum()),
+            'fees_paid': float(fees.sum()),
+            'rebalances': len(rebalance_bars),
+            'timestamps': timestamps if timestamps is not None else np.arange(n_bars),
+            'equity': equity,
+            'cash': cash,
+            'values': values,
+            'weights': weights,
+            'exposure': exposure,
+            'turnover': turnover,
+            'drawdown': drawdown,
+            'rebalance_bars': np.array(rebalance_bars),
+            'timestamp': datetime.now().isoformat()
+        }
+
+        return result
+
+    def _cost_scale(self, target_value: np.ndarray, current: np.ndarray, total: float,
+                    symbols: List[str], fee_rate: float) -> float:
+        """Largest scale of target_value whose positions plus trading costs fit in equity
+
+        Costs are convex in the scale, so the feasible scales form an interval
+        starting at 0. Flat fees are piecewise linear (kinks where a position
+        stops shrinking and starts growing) and are solved exactly; cost models
+        are bisected.
+
+        Raises:
+            ValueError: Costs exceed equity even when liquidating everything
+        """
+        def excess(scale):
+            return scale * target_value.sum() + self._trade_costs(scale * target_value - current, symbols, fee_rate) - total
+
+        if excess(0.0) > 1e-9 * max(total, 1.0):
+            raise ValueError(f"Trading costs exceed equity (fee_rate={fee_rate}): cannot rebalance")
+        if excess(1.0) <= 0:
+            return 1.0
+
+        if self.cost_model is None:
+            kinks = np.divide(current, target_value, out=np.zeros_like(current), where=target_value > 0)
+            points = np.unique(np.r_[0.0, kinks[(kinks > 0) & (kinks < 1)], 1.0])
+            values = np.array([excess(p) for p in points])
+            # Linear between the last kink within budget and the first one over it
+            i = int(np.argmax(values > 0))
+            lo, hi = points[i - 1], points[i]
+            return max(0.0, lo - values[i - 1] * (hi - lo) / (values[i] - values[i - 1]))
+
+        lo, hi = 0.0, 1.0
+        for _ in range(self.config['cost_iterations']):
+            mid = (lo + hi) / 2
+            if excess(mid) <= 0:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def _trade_costs(self, deltas: np.ndarray, symbols: List[str], fee_rate: float) -> float:
+        """Total execution cost of one rebalance (deltas are signed quote notionals)"""
+        if self.cost_model is None:
+            return fee_rate * np.abs(deltas).sum()
+
+        if isinstance(self.cost_model, dict):
+            costs = [self.cost_model[s].cost_rate(abs(d), d) * abs(d) if s in self.cost_model else fee_rate * abs(d)
+                     for s, d in zip(symbols, deltas)]
+            return float(np.sum(costs))
+
+        return float((self.cost_model.cost_rate(np.abs(deltas), deltas) * np.abs(deltas)).sum())
+
+    def backtest_symbols(self, symbols: List[str], target_weights: Union[Dict[str, float], str] = 'rotation',
+                         initial_balance: float = 3.0, days: int = 30, timeframe: str = '1h', **kwargs) -> Dict:
+        """
+        Fetch, align and backtest a portfolio in one call
+
+        target_weights may be a static dict (e.g. MultiCoinTrader weights) or
+        'rotation' to replay CapitalRotatorBot-style allocation.
+        """
+        print(f"🔍 Portfolio backtest {len(symbols)} symbols - {days} days - {timeframe}")
+
+        timestamps, closes = self.fetch_aligned_data(symbols, timeframe, days)
+        if len(closes) == 0:
+            return {'error': 'No data'}
+
+        if isinstance(target_weights, str) and target_weights == 'rotation':
+            target_weights = self.rotation_schedule(closes)
+
+        result = self.backtest_portfolio(closes, target_weights, symbols=symbols,
+                                         initial_balance=initial_balance, timestamps=timestamps, **kwargs)
+
+        if 'error' not in result:
+            result.update({'timeframe': timeframe, 'period_days': days})
+            self.results[f"portfolio_{len(symbols)}_{timeframe}_{days}d"] = result
+
+        return result
+
+    def save_results(self, filepath: str = 'data/portfolio_backtest_results.json'):
+        """Save backtest results"""
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        serializable = {
+            key: {k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in result.items()}
+            for key, result in self.results.items()
+        }
+        with open(filepath, 'w') as f:
+            json.dump(serializable, f, indent=2, default=str)
+
+    def get_status(self) -> Dict:
+        """Get backtester status"""
+        return {
+            'name': self.name,
+            'version': self.version,
+            'tests_run': len(self.results),
+            'config': self.config
+        }
+
+if __name__ == '__main__':
+    backtester = PortfolioBacktester()
+
+    print("🧪 Portfolio Backtester - Test Mode\n")
+
+    result = backtester.backtest_symbols(['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT'], days=30)
+
+    print(f"\n📊 Results:")
+    print(f"   ROI: {result.get('roi', 0):.2f}%")
+    print(f"   Rebalances: {result.get('rebalances', 0)}")
+    print(f"   Avg Exposure: {result.get('avg_exposure', 0)*100:.1f}%")
+    print(f"   Turnover: {result.get('total_turnover', 0):.2f}x")
+    print(f"   Max Drawdown: {result.get('max_drawdown', 0):.2f}%")
+
+    backtester.save_results()
@@ -13,6 +13,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt numpy -q")
     import ccxt, numpy as np
 
+BOT_CATEGORY = 'PROTECTION'
+
 class PredictiveRiskBot:
     def __init__(self, exchange_config=None):
         self.name, self.version = "PredictiveRiskBot", "1.0.0"
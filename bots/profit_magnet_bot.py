@@ -21,6 +21,8 @@ except ImportError:
     import ccxt
     import numpy as np
 
+BOT_CATEGORY = 'PROTECTION'
+
 class ProfitMagnetBot:
     """Discovers high-profit trading opportunities"""
     
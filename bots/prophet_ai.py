@@ -16,6 +16,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt numpy -q")
     import ccxt, numpy as np
 
+BOT_CATEGORY = 'GOD_LEVEL'
+
 class ProphetAI:
     """Long-term trend forecasting (1d-30d)"""
     
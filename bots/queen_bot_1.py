@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'QUEENS'
+
 class QueenBot1:
     def __init__(self):
         self.name, self.version = "Queen_Bot_1", "1.0.0"
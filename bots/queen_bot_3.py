@@ -4,6 +4,8 @@ import os, sys, json
 from typing import Dict
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
 
+BOT_CATEGORY = 'QUEENS'
+
 class QueenBot3:
     def __init__(self):
         self.name, self.version = "Queen_Bot_3", "1.0.0"
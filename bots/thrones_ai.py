@@ -16,10 +16,14 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt numpy -q")
     import ccxt, numpy as np
 
+from backtest_cache import BacktestCache
+
+BOT_CATEGORY = 'THRONES'
+
 class ThronesAI:
     """Strategy backtesting at scale"""
     
-    def __init__(self, exchange_config=None):
+    def __init__(self, exchange_config=None, cache=None):
         self.name, self.version = "Thrones_AI", "1.0.0"
         
         if exchange_config:
@@ -34,7 +38,8 @@ class ThronesAI:
             })
         
         self.backtest_results = {}
-        self.metrics = {'backtests_run': 0, 'strategies_tested': 0, 'best_strategy_roi': 0.0}
+        self.metrics = {'backtests_run': 0, 'strategies_tested': 0, 'best_strategy_roi': 0.0, 'cache_hits': 0}
+        self.cache = BacktestCache() if cache is None else (cache or None)
     
     def backtest_strategy(self, symbol: str, strategy_params: Dict, days: int = 30) -> Dict:
         """Backtest a strategy on historical data"""
@@ -44,6 +49,17 @@ class ThronesAI:
             
             closes = np.array([c[4] for c in ohlcv])
             
+            cache_key = None
+            if self.cache:
+                data_range = {'symbol': symbol, 'timeframe': '1h', 'start': ohlcv[0][0], 'end': ohlcv[-1][0],
+                              'bars': len(ohlcv), 'fingerprint': BacktestCache.data_fingerprint(ohlcv)}
+                cache_key = BacktestCache.make_key(data_range, BacktestCache.code_version(type(self).backtest_strategy),
+                                                   {'strategy_params': strategy_params, 'days': days})
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self.metrics['cache_hits'] += 1
+                    return cached
+            
             # Simulate trades based on strategy
             balance = 1000  # Start with $1000
             trades = []
@@ -87,6 +103,8 @@ class ThronesAI:
             if total_return > self.metrics['best_strategy_roi']:
                 self.metrics['best_strategy_roi'] = total_return
             
+            if cache_key: self.cache.set(cache_key, result)
+            
             return result
             
         except Exception as e:
@@ -9,6 +9,8 @@ import os
 from datetime import datetime, time
 import pytz
 
+BOT_CATEGORY = 'STRATEGY'
+
 class TimeFilterBot:
     """Filters trading based on time of day and day of week"""
     
@@ -19,6 +19,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+BOT_CATEGORY = 'CORE_APEX'
+
 class WhaleMonitorBot:
     """Monitors large trades and whale activity"""
     
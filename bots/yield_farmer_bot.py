@@ -19,6 +19,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+BOT_CATEGORY = 'INFRASTRUCTURE'
+
 class YieldFarmerBot:
     """Manages staking and yield farming for idle funds"""
     
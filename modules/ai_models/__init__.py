@@ -1,8 +1,24 @@
 #!/usr/bin/env python3
 """AI Models Module - LSTM, GAN, and Advanced ML Models for TPS19"""
 
-from .lstm_predictor import LSTMPredictor
-from .gan_simulator import GANSimulator
-from .self_learning import SelfLearningPipeline
+import importlib
 
-__all__ = ['LSTMPredictor', 'GANSimulator', 'SelfLearningPipeline']
+# Submodules are imported on first attribute access so `import ai_models`
+# does not pull in pandas/TensorFlow for callers that only need one model
+_EXPORTS = {
+    'LSTMPredictor': '.lstm_predictor',
+    'GANSimulator': '.gan_simulator',
+    'SelfLearningPipeline': '.self_learning',
+    'NumpyLSTMRuntime': '.numpy_lstm',
+    'ModelRegistry': '.model_registry'
+}
+
+__all__ = ['LSTMPredictor', 'GANSimulator', 'SelfLearningPipeline', 'NumpyLSTMRuntime', 'ModelRegistry']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
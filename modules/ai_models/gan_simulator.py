@@ -7,34 +7,57 @@ from datetime import datetime
 import json
 import pickle
 import os
+import importlib.util
 
 try:
+    from .window_dataset import WindowDataset, CandleArchive, OHLCV_COLUMNS
+except ImportError:
+    from window_dataset import WindowDataset, CandleArchive, OHLCV_COLUMNS
+
+# TensorFlow takes seconds to import, so it is loaded on first model build/load
+TENSORFLOW_AVAILABLE = importlib.util.find_spec('tensorflow') is not None
+if not TENSORFLOW_AVAILABLE:
+    print("⚠️ TensorFlow not available. Install with: pip install tensorflow")
+
+tf = keras = None
+
+
+def _load_tensorflow():
+    """Import TensorFlow and Keras names into this module on first use"""
+    global tf, keras, Sequential, Model, load_model, Dense, LSTM, Dropout, Input, Reshape, Flatten, Adam
+    if tf is not None:
+        return tf
+
     import tensorflow as tf
     from tensorflow import keras
     from tensorflow.keras.models import Sequential, Model, load_model
     from tensorflow.keras.layers import Dense, LSTM, Dropout, Input, Reshape, Flatten
     from tensorflow.keras.optimizers import Adam
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    print("⚠️ TensorFlow not available. Install with: pip install tensorflow")
+    return tf
 
 
 class GANSimulator:
     """GAN for generating realistic market scenarios"""
     
-    def __init__(self, model_dir='/opt/tps19/data/models'):
+    def __init__(self, model_dir='/opt/tps19/data/models', registry=None, symbol=None):
         """Initialize GAN Simulator
         
         Args:
             model_dir: Directory to save/load models
+            registry: ModelRegistry that trained models are published to and
+                the active version is served from (None: model_dir only)
+            symbol: Symbol this simulator's model is trained for (with registry)
         """
         self.model_dir = model_dir
         os.makedirs(model_dir, exist_ok=True)
         
+        self.registry = registry
+        self.symbol = symbol
+        self.version = None
         self.generator = None
         self.discriminator = None
         self.gan = None
+        self._train_step = None
         
         self.latent_dim = 100  # Noise dimension for generator
         self.sequence_length = 60
@@ -60,6 +83,7 @@ class GANSimulator:
         """Build generator model"""
         if not TENSORFLOW_AVAILABLE:
             raise ImportError("TensorFlow required for GAN")
+        _load_tensorflow()
             
         model = Sequential([
             Dense(self.config['generator_layers'][0], input_dim=self.latent_dim),
@@ -83,6 +107,7 @@ class GANSimulator:
         """Build discriminator model"""
         if not TENSORFLOW_AVAILABLE:
             raise ImportError("TensorFlow required for GAN")
+        _load_tensorflow()
             
         model = Sequential([
             Flatten(input_shape=(self.sequence_length, self.n_features)),
@@ -111,11 +136,16 @@ class GANSimulator:
         """Build complete GAN model"""
         if not TENSORFLOW_AVAILABLE:
             raise ImportError("TensorFlow required for GAN")
+        _load_tensorflow()
             
         # Build components
         self.generator = self.build_generator()
         self.discriminator = self.build_discriminator()
         
+        # Freezing below empties trainable_variables, so keep the list for the train step
+        self._discriminator_variables = list(self.discriminator.trainable_variables)
+        self._train_step = None
+        
         # Make discriminator non-trainable for combined model
         self.discriminator.trainable = False
         
@@ -136,31 +166,88 @@ class GANSimulator:
         """Prepare real market data for training
         
         Args:
-            data: DataFrame with OHLCV data
+            data: DataFrame with OHLCV data, OHLCV array, or CandleArchive path
             
         Returns:
-            Normalized sequences
+            WindowDataset of sequences scaled to [-1, 1], min_val, max_val
         """
-        # Extract OHLCV values
-        data_values = data[['open', 'high', 'low', 'close', 'volume']].values
+        # Extract OHLCV values (a memmap for archives, so nothing is loaded up front)
+        if isinstance(data, str):
+            data_values = CandleArchive(data).ohlcv()
+        elif isinstance(data, pd.DataFrame):
+            data_values = data[OHLCV_COLUMNS].values
+        else:
+            data_values = data
         
-        # Normalize to [-1, 1] range (tanh activation)
-        min_val = data_values.min(axis=0)
-        max_val = data_values.max(axis=0)
-        normalized = 2 * (data_values - min_val) / (max_val - min_val + 1e-8) - 1
+        # Normalize to [-1, 1] range (tanh activation) as batches are drawn
+        dataset = WindowDataset(data_values, self.sequence_length, target_column=None,
+                                batch_size=self.config['batch_size'], feature_range=(-1.0, 1.0))
+            
+        return dataset, dataset.scaler['min'], dataset.scaler['max']
+        
+    def _batch_pipeline(self, dataset, batch_size):
+        """Endless tf.data stream of random real batches, prefetched ahead of training"""
+        def batches():
+            while True:
+                yield dataset.sample(batch_size).astype(np.float32)
+                
+        signature = tf.TensorSpec((batch_size, self.sequence_length, self.n_features), tf.float32)
+        return tf.data.Dataset.from_generator(batches, output_signature=signature) \
+            .prefetch(tf.data.AUTOTUNE)
         
-        # Create sequences
-        sequences = []
-        for i in range(len(normalized) - self.sequence_length + 1):
-            sequences.append(normalized[i:i+self.sequence_length])
+    def _train_step_fn(self):
+        """Compiled GAN training step
+        
+        One tf.function call samples noise, generates the fake batch, updates
+        the discriminator on the real and then the fake batch, and updates the
+        generator through the frozen discriminator, using the optimizers the
+        models were compiled with. Nothing goes back to NumPy between them.
+        """
+        if self._train_step is not None:
+            return self._train_step
+        
+        generator, discriminator = self.generator, self.discriminator
+        d_variables = self._discriminator_variables
+        g_variables = generator.trainable_variables
+        d_optimizer, g_optimizer = discriminator.optimizer, self.gan.optimizer
+        for optimizer, variables in ((d_optimizer, d_variables), (g_optimizer, g_variables)):
+            if not optimizer.built:
+                optimizer.build(variables)
+        bce = keras.losses.BinaryCrossentropy()
+        latent_dim = self.latent_dim
+        
+        def discriminator_update(sequences, label):
+            with tf.GradientTape() as tape:
+                scores = discriminator(sequences, training=True)
+                loss = bce(tf.fill(tf.shape(scores), label), scores)
+            d_optimizer.apply_gradients(zip(tape.gradient(loss, d_variables), d_variables))
+            return loss
+            
+        def train_step(real_sequences):
+            batch_size = tf.shape(real_sequences)[0]
+            
+            # Train discriminator on real and fake
+            fake_sequences = generator(tf.random.normal((batch_size, latent_dim)), training=False)
+            d_loss_real = discriminator_update(real_sequences, 1.0)
+            d_loss_fake = discriminator_update(fake_sequences, 0.0)
             
-        return np.array(sequences), min_val, max_val
+            # Train generator to make the discriminator call its output real
+            with tf.GradientTape() as tape:
+                scores = discriminator(generator(tf.random.normal((batch_size, latent_dim)), training=True),
+                                       training=False)
+                g_loss = bce(tf.ones_like(scores), scores)
+            g_optimizer.apply_gradients(zip(tape.gradient(g_loss, g_variables), g_variables))
+            
+            return 0.5 * (d_loss_real + d_loss_fake), g_loss
+            
+        self._train_step = tf.function(train_step)
+        return self._train_step
         
     def train(self, data, epochs=None):
         """Train GAN on historical market data
         
         Args:
-            data: DataFrame with OHLCV data
+            data: DataFrame with OHLCV data, or a CandleArchive path
             epochs: Number of training epochs
             
         Returns:
@@ -169,12 +256,21 @@ class GANSimulator:
         if not TENSORFLOW_AVAILABLE:
             print("⚠️ TensorFlow not available, skipping training")
             return None
+        _load_tensorflow()
             
         print("🎭 Training GAN Market Simulator...")
         
-        # Build GAN if not exists
+        # Build GAN if not exists. Models adopted from the registry (gan is None then) are
+        # shared with other simulators, so fresh ones are built and warm-started from them
         if self.gan is None:
+            previous = (self.generator, self.discriminator)
             self.build_gan()
+            for model, source in zip((self.generator, self.discriminator), previous):
+                if source is not None:
+                    try:
+                        model.set_weights(source.get_weights())
+                    except ValueError as e:
+                        print(f"⚠️ Previous GAN weights do not fit the current architecture: {e}")
             
         # Prepare data
         X_train, self.min_val, self.max_val = self.prepare_data(data)
@@ -182,48 +278,55 @@ class GANSimulator:
         epochs = epochs or self.config['epochs']
         batch_size = self.config['batch_size']
         
-        # Training loop
-        for epoch in range(epochs):
-            # Train discriminator
-            # Select random batch of real sequences
-            idx = np.random.randint(0, X_train.shape[0], batch_size)
-            real_sequences = X_train[idx]
-            
-            # Generate fake sequences
-            noise = np.random.normal(0, 1, (batch_size, self.latent_dim))
-            fake_sequences = self.generator.predict(noise, verbose=0)
-            
-            # Train discriminator on real and fake
-            d_loss_real = self.discriminator.train_on_batch(
-                real_sequences,
-                np.ones((batch_size, 1))
-            )
-            d_loss_fake = self.discriminator.train_on_batch(
-                fake_sequences,
-                np.zeros((batch_size, 1))
-            )
-            d_loss = 0.5 * np.add(d_loss_real, d_loss_fake)
-            
-            # Train generator
-            noise = np.random.normal(0, 1, (batch_size, self.latent_dim))
-            g_loss = self.gan.train_on_batch(noise, np.ones((batch_size, 1)))
+        # Real batches are gathered on a background thread while the step runs
+        batches = self._batch_pipeline(X_train, batch_size)
+        train_step = self._train_step_fn()
+        
+        # Training loop (one batch per epoch)
+        for epoch, real_sequences in zip(range(epochs), batches):
+            d_loss, g_loss = train_step(real_sequences)
+            d_loss, g_loss = float(d_loss), float(g_loss)
             
             # Save metrics
-            self.metrics['discriminator_loss'].append(float(d_loss[0]))
-            self.metrics['generator_loss'].append(float(g_loss))
+            self.metrics['discriminator_loss'].append(d_loss)
+            self.metrics['generator_loss'].append(g_loss)
             
             # Print progress
             if epoch % 10 == 0:
-                print(f"Epoch {epoch}/{epochs} - D Loss: {d_loss[0]:.4f}, G Loss: {g_loss:.4f}")
+                print(f"Epoch {epoch}/{epochs} - D Loss: {d_loss:.4f}, G Loss: {g_loss:.4f}")
                 
         self.metrics['last_training'] = datetime.now().isoformat()
         
-        # Save models
-        self.save()
+        # Publish (swapped into every simulator serving this symbol) or save locally
+        if self.registry is not None:
+            self.publish()
+        else:
+            self.save()
         
         print(f"✅ GAN training completed")
         return self.metrics
         
+    def publish(self, activate=True):
+        """Publish the current generator/discriminator to the registry as a new version
+        
+        Returns:
+            Version id
+        """
+        losses = {name: self.metrics[name][-1] if self.metrics[name] else None
+                  for name in ('generator_loss', 'discriminator_loss')}
+        metadata = dict(losses, trained_at=self.metrics['last_training'])
+        self.version = self.registry.publish('gan', self.symbol, self, metadata, activate=activate)
+        self.registry.gc('gan')
+        return self.version
+        
+    def _adopt_active(self):
+        """Switch to the registry's active version if it changed (only references move)"""
+        served, version = self.registry.handle(self.symbol, 'gan').current()
+        if served is not None and version != self.version:
+            self.generator, self.discriminator = served.generator, served.discriminator
+            self.min_val, self.max_val, self.version = served.min_val, served.max_val, version
+            self.gan = self._train_step = None
+            
     def generate_scenarios(self, n_scenarios=10, scenario_type='normal'):
         """Generate market scenarios
         
@@ -234,6 +337,8 @@ class GANSimulator:
         Returns:
             Generated market scenarios
         """
+        if self.registry is not None:
+            self._adopt_active()
         if self.generator is None:
             if not self.load():
                 raise ValueError("No trained generator available")
@@ -356,17 +461,22 @@ class GANSimulator:
             'worst_case': np.min(pnls)
         }
         
-    def save(self):
-        """Save generator and discriminator"""
+    def save(self, directory=None):
+        """Save generator and discriminator
+        
+        Args:
+            directory: Where to write (default model_dir; ModelRegistry passes a version directory)
+        """
         if self.generator is None or self.discriminator is None:
             return False
+        directory = directory or self.model_dir
             
         try:
-            self.generator.save(os.path.join(self.model_dir, 'gan_generator.h5'))
-            self.discriminator.save(os.path.join(self.model_dir, 'gan_discriminator.h5'))
+            self.generator.save(os.path.join(directory, 'gan_generator.h5'))
+            self.discriminator.save(os.path.join(directory, 'gan_discriminator.h5'))
             
             # Save metrics
-            with open(os.path.join(self.model_dir, 'gan_metrics.pkl'), 'wb') as f:
+            with open(os.path.join(directory, 'gan_metrics.pkl'), 'wb') as f:
                 pickle.dump({
                     'metrics': self.metrics,
                     'config': self.config,
@@ -379,16 +489,22 @@ class GANSimulator:
             print(f"❌ Error saving GAN: {e}")
             return False
             
-    def load(self):
-        """Load generator and discriminator"""
-        gen_path = os.path.join(self.model_dir, 'gan_generator.h5')
-        disc_path = os.path.join(self.model_dir, 'gan_discriminator.h5')
-        metrics_path = os.path.join(self.model_dir, 'gan_metrics.pkl')
+    def load(self, directory=None):
+        """Load generator and discriminator
+        
+        Args:
+            directory: Where to read from (default model_dir)
+        """
+        directory = directory or self.model_dir
+        gen_path = os.path.join(directory, 'gan_generator.h5')
+        disc_path = os.path.join(directory, 'gan_discriminator.h5')
+        metrics_path = os.path.join(directory, 'gan_metrics.pkl')
         
         if not os.path.exists(gen_path) or not os.path.exists(disc_path):
             return False
             
         try:
+            _load_tensorflow()
             self.generator = load_model(gen_path)
             self.discriminator = load_model(disc_path)
             
@@ -409,6 +525,7 @@ class GANSimulator:
         """Get GAN status"""
         return {
             'generator_loaded': self.generator is not None,
+            'version': self.version,
             'discriminator_loaded': self.discriminator is not None,
             'tensorflow_available': TENSORFLOW_AVAILABLE,
             'metrics': self.metrics,
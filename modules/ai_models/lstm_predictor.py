@@ -7,33 +7,61 @@ from datetime import datetime, timedelta
 import json
 import pickle
 import os
+import importlib.util
+from numpy.lib.stride_tricks import sliding_window_view
 
 try:
+    from .window_dataset import WindowDataset, CandleArchive, OHLCV_COLUMNS
+    from .numpy_lstm import export_weights
+except ImportError:
+    from window_dataset import WindowDataset, CandleArchive, OHLCV_COLUMNS
+    from numpy_lstm import export_weights
+
+# TensorFlow takes seconds to import, so it is loaded on first model build/load
+TENSORFLOW_AVAILABLE = importlib.util.find_spec('tensorflow') is not None
+if not TENSORFLOW_AVAILABLE:
+    print("⚠️ TensorFlow not available. Install with: pip install tensorflow")
+
+tf = keras = None
+
+
+def _load_tensorflow():
+    """Import TensorFlow and Keras names into this module on first use"""
+    global tf, keras, Sequential, load_model, LSTM, Dense, Dropout, BatchNormalization, Adam, EarlyStopping, ModelCheckpoint
+    if tf is not None:
+        return tf
+
     import tensorflow as tf
     from tensorflow import keras
     from tensorflow.keras.models import Sequential, load_model
     from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization
     from tensorflow.keras.optimizers import Adam
     from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    print("⚠️ TensorFlow not available. Install with: pip install tensorflow")
+    return tf
 
 
 class LSTMPredictor:
     """LSTM Neural Network for cryptocurrency price prediction"""
     
-    def __init__(self, model_dir='/opt/tps19/data/models'):
+    def __init__(self, model_dir='/opt/tps19/data/models', registry=None, symbol=None):
         """Initialize LSTM Predictor
         
         Args:
             model_dir: Directory to save/load models
+            registry: ModelRegistry that trained models are published to and
+                the active version is served from (None: model_dir only)
+            symbol: Symbol this predictor's model is trained for (with registry)
         """
         self.model_dir = model_dir
         os.makedirs(model_dir, exist_ok=True)
         
+        self.registry = registry
+        self.symbol = symbol
         self.model = None
+        self.version = None
+        self._load_attempted = False
+        self._rollouts = {}  # (steps, mc_dropout) -> compiled rollout for _rollout_model
+        self._rollout_model = None
         self.scaler_params = None
         self.sequence_length = 60  # 60 time steps for prediction
         self.n_features = 5  # OHLCV data
@@ -56,8 +84,19 @@ class LSTMPredictor:
         
     def build_model(self):
         """Build LSTM model architecture"""
+        self.model = self._new_model()
+        return self.model
+        
+    def _new_model(self, warm_start=None):
+        """Compiled model with this predictor's architecture
+        
+        Args:
+            warm_start: Model whose weights the new one starts from (skipped
+                if the architecture no longer matches)
+        """
         if not TENSORFLOW_AVAILABLE:
             raise ImportError("TensorFlow required for LSTM models")
+        _load_tensorflow()
             
         model = Sequential([
             # First LSTM layer with return sequences
@@ -92,9 +131,38 @@ class LSTMPredictor:
             metrics=['mae', 'mse']
         )
         
-        self.model = model
+        if warm_start is not None:
+            try:
+                model.set_weights(warm_start.get_weights())
+            except ValueError as e:
+                print(f"⚠️ Previous LSTM weights do not fit the current architecture, training from scratch: {e}")
         return model
         
+    def _values(self, data):
+        """OHLCV rows from a DataFrame, an (n x 5) array, or a CandleArchive path (memory-mapped)"""
+        if isinstance(data, str):
+            return CandleArchive(data).ohlcv()
+        if isinstance(data, pd.DataFrame):
+            return data[OHLCV_COLUMNS].values
+        return data
+        
+    def make_dataset(self, data, shuffle=False):
+        """Window dataset streaming training batches from data
+        
+        Args:
+            data: DataFrame, OHLCV array, or CandleArchive path
+            shuffle: Shuffle window order every epoch
+            
+        Returns:
+            WindowDataset yielding (sequences, next close) batches
+        """
+        dataset = WindowDataset(self._values(data), self.sequence_length, target_column=3,
+                                batch_size=self.config['batch_size'], scaler=self.scaler_params,
+                                shuffle=shuffle)
+        if self.scaler_params is None:
+            self.scaler_params = dataset.scaler
+        return dataset
+        
     def prepare_data(self, data):
         """Prepare data for LSTM training
         
@@ -102,10 +170,10 @@ class LSTMPredictor:
             data: DataFrame with OHLCV columns
             
         Returns:
-            X, y: Training sequences and targets
+            X, y: Training sequences (a strided view of the scaled data) and targets
         """
         # Normalize data (min-max scaling)
-        data_values = data[['open', 'high', 'low', 'close', 'volume']].values
+        data_values = self._values(data)
         
         # Calculate scaling parameters
         if self.scaler_params is None:
@@ -118,19 +186,18 @@ class LSTMPredictor:
         scaled_data = (data_values - self.scaler_params['min']) / \
                       (self.scaler_params['max'] - self.scaler_params['min'] + 1e-8)
         
-        # Create sequences
-        X, y = [], []
-        for i in range(self.sequence_length, len(scaled_data)):
-            X.append(scaled_data[i-self.sequence_length:i])
-            y.append(scaled_data[i, 3])  # Predict close price
+        # Window i covers rows [i, i + sequence_length) and predicts the next close
+        X = sliding_window_view(scaled_data, self.sequence_length, axis=0).swapaxes(1, 2)[:-1]
+        y = scaled_data[self.sequence_length:, 3]
             
-        return np.array(X), np.array(y)
+        return X, y
         
     def train(self, data, epochs=None):
         """Train LSTM model on historical data
         
         Args:
-            data: DataFrame with OHLCV data
+            data: DataFrame with OHLCV data, or a CandleArchive path for
+                archives too large to hold as windows in memory
             epochs: Number of training epochs (override config)
             
         Returns:
@@ -139,15 +206,17 @@ class LSTMPredictor:
         if not TENSORFLOW_AVAILABLE:
             print("⚠️ TensorFlow not available, skipping training")
             return None
+        _load_tensorflow()
             
         print("🧠 Training LSTM Neural Network...")
         
-        # Build model if not exists
-        if self.model is None:
-            self.build_model()
+        # Fit a fresh model warm-started from the current one; the model being served
+        # (possibly the registry's shared instance) is never fitted in place
+        model = self._new_model(warm_start=self.model)
             
-        # Prepare data
-        X, y = self.prepare_data(data)
+        # Batches are gathered from a strided view, never materializing every window;
+        # the split is chronological, then training windows are shuffled every epoch
+        train_data, validation_data = self.make_dataset(data, shuffle=True).split(self.config['validation_split'])
         
         # Callbacks
         callbacks = [
@@ -165,78 +234,159 @@ class LSTMPredictor:
         
         # Train
         epochs = epochs or self.config['epochs']
-        history = self.model.fit(
-            X, y,
-            batch_size=self.config['batch_size'],
+        history = model.fit(
+            train_data.to_keras(),
             epochs=epochs,
-            validation_split=self.config['validation_split'],
+            validation_data=validation_data.to_keras(),
             callbacks=callbacks,
             verbose=1
         )
         
         # Update metrics
+        self.model = model
         self.metrics['last_training'] = datetime.now().isoformat()
         self.metrics['accuracy'] = 1.0 - history.history['val_loss'][-1]
         
-        # Save model
-        self.save()
+        # Publish (swapped into every predictor serving this symbol) or save locally
+        if self.registry is not None:
+            self.publish()
+        else:
+            self.save()
         
         print(f"✅ LSTM training completed. Accuracy: {self.metrics['accuracy']:.2%}")
         return history
         
-    def predict(self, data, steps=1):
-        """Predict future prices
+    def publish(self, activate=True):
+        """Publish the current model to the registry as a new version
         
-        Args:
-            data: Recent OHLCV data (at least sequence_length rows)
-            steps: Number of steps to predict ahead
-            
         Returns:
-            Predicted prices
+            Version id
         """
+        metadata = {'accuracy': self.metrics['accuracy'], 'trained_at': self.metrics['last_training'],
+                    'config': self.config}
+        self.version = self.registry.publish('lstm', self.symbol, self, metadata, activate=activate)
+        self.registry.gc('lstm')
+        return self.version
+        
+    def _adopt_active(self):
+        """Switch to the registry's active version if it changed (only references move)"""
+        served, version = self.registry.handle(self.symbol, 'lstm').current()
+        if served is not None and version != self.version:
+            self.model, self.scaler_params, self.version = served.model, served.scaler_params, version
+            
+    def _ensure_model(self):
+        if self.registry is not None:
+            self._adopt_active()
         if self.model is None:
-            # Try to load existing model
-            if not self.load():
+            # Try the saved model once; later calls fail fast instead of re-reading disk
+            if self._load_attempted or not self.load():
                 raise ValueError("No trained model available")
                 
-        # Prepare data
-        if len(data) < self.sequence_length:
-            raise ValueError(f"Need at least {self.sequence_length} data points")
+    def _stack_windows(self, windows):
+        """Scale the latest sequence_length rows of every symbol into one batch
+        
+        Args:
+            windows: {symbol: DataFrame or OHLCV array} or a (symbols x rows x 5) array
+            
+        Returns:
+            (symbols x sequence_length x 5) float32 batch
+        """
+        if isinstance(windows, dict):
+            rows = []
+            for symbol, data in windows.items():
+                values = self._values(data)
+                if len(values) < self.sequence_length:
+                    raise ValueError(f"{symbol}: need at least {self.sequence_length} data points")
+                rows.append(np.asarray(values[-self.sequence_length:], dtype=np.float64))
+            raw = np.stack(rows)
+        else:
+            raw = np.asarray(windows, dtype=np.float64)
+            if raw.shape[1] < self.sequence_length:
+                raise ValueError(f"Need at least {self.sequence_length} data points")
+            raw = raw[:, -self.sequence_length:]
+            
+        scaled = (raw - self.scaler_params['min']) / \
+                 (self.scaler_params['max'] - self.scaler_params['min'] + 1e-8)
+        return scaled.astype(np.float32)
+        
+    def _rollout_fn(self, steps, mc_dropout=False):
+        """Compiled multi-step rollout for the current model
+        
+        The whole rollout (every step for every row of the batch) is one
+        tf.function call. Its input_signature leaves the batch dimension
+        open, so it is traced once per step count and dropout mode no matter
+        how many symbols or simulations are batched.
+        Layers are applied one by one so MC dropout can enable Dropout alone
+        while BatchNormalization keeps its inference statistics.
+        """
+        if self._rollout_model is not self.model:
+            self._rollouts = {}
+            self._rollout_model = self.model
+        if (steps, mc_dropout) in self._rollouts:
+            return self._rollouts[(steps, mc_dropout)]
+        _load_tensorflow()
+        layers = list(self.model.layers)
+        
+        def rollout(sequences):
+            outputs = []
+            for _ in range(steps):
+                x = sequences
+                for layer in layers:
+                    x = layer(x, training=mc_dropout and isinstance(layer, Dropout))
+                outputs.append(x[:, 0])
+                
+                # Feed the predicted close back in as the next row
+                last = sequences[:, -1, :]
+                new_row = tf.concat([last[:, :3], x, last[:, 4:]], axis=1)
+                sequences = tf.concat([sequences[:, 1:, :], new_row[:, None, :]], axis=1)
+            return tf.stack(outputs, axis=1)
             
-        # Take last sequence_length points
-        recent_data = data.tail(self.sequence_length)
-        data_values = recent_data[['open', 'high', 'low', 'close', 'volume']].values
+        signature = [tf.TensorSpec([None, self.sequence_length, self.n_features], tf.float32)]
+        self._rollouts[(steps, mc_dropout)] = tf.function(rollout, input_signature=signature)
+        return self._rollouts[(steps, mc_dropout)]
         
-        # Normalize
-        scaled_data = (data_values - self.scaler_params['min']) / \
-                      (self.scaler_params['max'] - self.scaler_params['min'] + 1e-8)
+    def _denormalize_close(self, scaled):
+        return scaled * (self.scaler_params['max'][3] - self.scaler_params['min'][3]) + \
+               self.scaler_params['min'][3]
         
-        predictions = []
-        current_sequence = scaled_data.copy()
+    def predict_batch(self, windows, steps=1):
+        """Predict future prices for many symbols in one compiled call
         
-        for _ in range(steps):
-            # Reshape for prediction
-            X = current_sequence.reshape(1, self.sequence_length, self.n_features)
-            
-            # Predict
-            pred_scaled = self.model.predict(X, verbose=0)[0][0]
-            
-            # Denormalize
-            pred_price = pred_scaled * (self.scaler_params['max'][3] - self.scaler_params['min'][3]) + \
-                        self.scaler_params['min'][3]
-            predictions.append(pred_price)
+        Args:
+            windows: {symbol: recent OHLCV DataFrame} (at least sequence_length
+                rows each) or a (symbols x rows x 5) array of raw OHLCV
+            steps: Number of steps to predict ahead
             
-            # Update sequence (use prediction as next close)
-            new_row = current_sequence[-1].copy()
-            new_row[3] = pred_scaled  # Update close price
-            current_sequence = np.vstack([current_sequence[1:], new_row])
+        Returns:
+            (symbols x steps) predicted prices, rows in the order given
+        """
+        self._ensure_model()
+        batch = self._stack_windows(windows)
+        
+        scaled = self._rollout_fn(steps)(tf.constant(batch)).numpy()
+        
+        self.metrics['predictions_made'] += batch.shape[0] * steps
+        return self._denormalize_close(scaled)
+        
+    def predict(self, data, steps=1):
+        """Predict future prices
+        
+        Args:
+            data: Recent OHLCV data (at least sequence_length rows)
+            steps: Number of steps to predict ahead
             
-        self.metrics['predictions_made'] += steps
-        return np.array(predictions)
+        Returns:
+            Predicted prices
+        """
+        return self.predict_batch({'data': data}, steps)[0]
         
     def predict_with_confidence(self, data, steps=1, n_simulations=100):
         """Predict with confidence intervals using Monte Carlo dropout
         
+        The window is tiled into one (n_simulations x sequence_length x 5)
+        batch and rolled out in a single pass with dropout active, so every
+        simulation samples a different dropout mask.
+        
         Args:
             data: Recent OHLCV data
             steps: Number of steps ahead
@@ -245,13 +395,13 @@ class LSTMPredictor:
         Returns:
             dict with predictions, confidence intervals
         """
-        predictions = []
+        self._ensure_model()
+        window = self._stack_windows({'data': data})
+        batch = np.repeat(window, n_simulations, axis=0)
         
-        for _ in range(n_simulations):
-            pred = self.predict(data, steps)
-            predictions.append(pred)
-            
-        predictions = np.array(predictions)
+        scaled = self._rollout_fn(steps, mc_dropout=True)(tf.constant(batch)).numpy()
+        predictions = self._denormalize_close(scaled)
+        self.metrics['predictions_made'] += steps
         
         return {
             'mean': predictions.mean(axis=0),
@@ -291,17 +441,23 @@ class LSTMPredictor:
             'accuracy': 1.0 - results[0]
         }
         
-    def save(self, filename='lstm_model.h5'):
-        """Save model and parameters"""
+    def save(self, filename='lstm_model.h5', directory=None):
+        """Save model and parameters
+        
+        Args:
+            filename: Keras model file name
+            directory: Where to write (default model_dir; ModelRegistry passes a version directory)
+        """
         if self.model is None:
             return False
+        directory = directory or self.model_dir
             
         # Save model
-        model_path = os.path.join(self.model_dir, filename)
+        model_path = os.path.join(directory, filename)
         self.model.save(model_path)
         
         # Save scaler parameters
-        params_path = os.path.join(self.model_dir, 'lstm_params.pkl')
+        params_path = os.path.join(directory, 'lstm_params.pkl')
         with open(params_path, 'wb') as f:
             pickle.dump({
                 'scaler_params': self.scaler_params,
@@ -309,17 +465,38 @@ class LSTMPredictor:
                 'metrics': self.metrics
             }, f)
             
+        # Weights for TensorFlow-free inference processes (NumpyLSTMRuntime)
+        self.export_runtime(directory=directory)
+            
         return True
         
-    def load(self, filename='lstm_model.h5'):
-        """Load model and parameters"""
-        model_path = os.path.join(self.model_dir, filename)
-        params_path = os.path.join(self.model_dir, 'lstm_params.pkl')
+    def export_runtime(self, filename='lstm_runtime.npz', directory=None):
+        """Export weights and scaler for NumpyLSTMRuntime
+        
+        Returns:
+            Path of the .npz written
+        """
+        path = os.path.join(directory or self.model_dir, filename)
+        export_weights(self.model, path, self.scaler_params, self.sequence_length)
+        return path
+        
+    def load(self, filename='lstm_model.h5', directory=None):
+        """Load model and parameters
+        
+        Args:
+            filename: Keras model file name
+            directory: Where to read from (default model_dir)
+        """
+        self._load_attempted = True
+        directory = directory or self.model_dir
+        model_path = os.path.join(directory, filename)
+        params_path = os.path.join(directory, 'lstm_params.pkl')
         
         if not os.path.exists(model_path):
             return False
             
         try:
+            _load_tensorflow()
             # Load model
             self.model = load_model(model_path)
             
@@ -340,6 +517,7 @@ class LSTMPredictor:
         """Get model status and metrics"""
         return {
             'model_loaded': self.model is not None,
+            'version': self.version,
             'tensorflow_available': TENSORFLOW_AVAILABLE,
             'metrics': self.metrics,
             'config': self.config,
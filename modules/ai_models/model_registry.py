@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Model Registry - Versioned per-symbol model artifacts with warm loading and hot swap for TPS19"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+ACTIVE_FILE = 'ACTIVE'
+METADATA_FILE = 'metadata.json'
+STAGING_PREFIX = '.staging-'
+
+
+def _load_lstm(directory):
+    try:
+        from .lstm_predictor import LSTMPredictor
+    except ImportError:
+        from lstm_predictor import LSTMPredictor
+    predictor = LSTMPredictor(model_dir=directory)
+    if not predictor.load(directory=directory):
+        raise FileNotFoundError(f"No LSTM model in {directory}")
+    return predictor
+
+
+def _load_lstm_runtime(directory):
+    try:
+        from .numpy_lstm import NumpyLSTMRuntime
+    except ImportError:
+        from numpy_lstm import NumpyLSTMRuntime
+    return NumpyLSTMRuntime(os.path.join(directory, 'lstm_runtime.npz'))
+
+
+def _load_gan(directory):
+    try:
+        from .gan_simulator import GANSimulator
+    except ImportError:
+        from gan_simulator import GANSimulator
+    simulator = GANSimulator(model_dir=directory)
+    if not simulator.load(directory=directory):
+        raise FileNotFoundError(f"No GAN model in {directory}")
+    return simulator
+
+
+# Loader name -> (artifact kind it reads, directory -> model)
+LOADERS = {
+    'lstm': ('lstm', _load_lstm),
+    'lstm_runtime': ('lstm', _load_lstm_runtime),
+    'gan': ('gan', _load_gan)
+}
+
+
+class ModelHandle:
+    """The model currently serving one (kind, symbol), swapped in place on activation
+
+    Inference calls get() once and use that reference for the whole call, so
+    a swap never blocks or interrupts them: the replacement is built off to
+    the side and only the reference assignment happens under the lock. The
+    old model is released once the last in-flight call drops it.
+    """
+
+    def __init__(self, kind, symbol, loader):
+        """Initialize handle
+
+        Args:
+            kind: Artifact kind ('lstm', 'gan')
+            symbol: Trading symbol
+            loader: directory -> loaded model
+        """
+        self.kind = kind
+        self.symbol = symbol
+        self.loader = loader
+        self.model = None
+        self.version = None
+        self.loaded_at = None
+        self.swaps = 0
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+
+    def get(self):
+        """The serving model (None until the first load finishes)"""
+        return self.model
+
+    def current(self):
+        """(model, version) as one consistent pair"""
+        with self._lock:
+            return self.model, self.version
+
+    def load(self, version, directory):
+        """Build a model from a version directory and swap it in
+
+        Returns:
+            True if the handle now serves that version
+        """
+        # One load at a time per handle; readers are never blocked
+        with self._loading:
+            if self.version == version:
+                return True
+            model = self.loader(directory)
+            with self._lock:
+                replaced = self.model is not None
+                self.model, self.version, self.loaded_at = model, version, time.time()
+                self.swaps += replaced
+            return True
+
+    def get_status(self):
+        """Get handle status"""
+        return {
+            'kind': self.kind,
+            'symbol': self.symbol,
+            'version': self.version,
+            'loaded': self.model is not None,
+            'loaded_at': self.loaded_at,
+            'swaps': self.swaps
+        }
+
+
+class ModelRegistry:
+    """Per-symbol, versioned store of trained models
+
+    Layout: root/kind/SYMBOL/vNNNN/ holds a version's artifacts and
+    metadata.json, and root/kind/SYMBOL/ACTIVE names the version in use.
+    Versions are written to a staging directory and renamed into place, and
+    ACTIVE is replaced atomically, so readers never see a partial model.
+    """
+
+    def __init__(self, root='/opt/tps19/data/models/registry', keep_versions=3, max_age_days=None):
+        """Initialize registry
+
+        Args:
+            root: Registry directory
+            keep_versions: Newest versions kept per symbol by gc() (the active one is always kept)
+            max_age_days: Also remove versions older than this (None: no age limit)
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.config = {'keep_versions': keep_versions, 'max_age_days': max_age_days}
+
+        self.handles = {}
+        self._lock = threading.RLock()
+        self.metrics = {'published': 0, 'activations': 0, 'swaps': 0, 'load_errors': 0, 'collected': 0}
+
+    # -- Layout --
+
+    def _symbol_dir(self, kind, symbol):
+        return os.path.join(self.root, kind, symbol.replace('/', '_'))
+
+    def path(self, kind, symbol, version):
+        """Directory holding one version's artifacts"""
+        return os.path.join(self._symbol_dir(kind, symbol), version)
+
+    def list_versions(self, kind, symbol):
+        """Published versions, oldest first"""
+        directory = self._symbol_dir(kind, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if name.startswith('v') and os.path.isdir(os.path.join(directory, name)))
+
+    def symbols(self, kind):
+        """Symbols with at least one published version"""
+        directory = os.path.join(self.root, kind)
+        if not os.path.isdir(directory):
+            return []
+        symbols = []
+        for name in sorted(os.listdir(directory)):
+            versions = sorted(version for version in os.listdir(os.path.join(directory, name))
+                              if version.startswith('v'))
+            if not versions:
+                continue
+            # Directory names are filesystem-safe; the real symbol is in the metadata
+            try:
+                with open(os.path.join(directory, name, versions[-1], METADATA_FILE)) as f:
+                    symbols.append(json.load(f)['symbol'])
+            except (OSError, ValueError, KeyError):
+                continue
+        return symbols
+
+    def get_metadata(self, kind, symbol, version=None):
+        """metadata.json of a version (default: the active one)"""
+        version = version or self.active_version(kind, symbol)
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(self.path(kind, symbol, version), METADATA_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def active_version(self, kind, symbol):
+        """Version named by the ACTIVE pointer (None if nothing is active)"""
+        try:
+            with open(os.path.join(self._symbol_dir(kind, symbol), ACTIVE_FILE)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    # -- Publishing --
+
+    def publish(self, kind, symbol, model, metadata=None, activate=True):
+        """Save a trained model as a new version
+
+        Args:
+            kind: Artifact kind ('lstm', 'gan')
+            symbol: Trading symbol
+            model: Object whose save(directory=...) writes its artifacts
+            metadata: Extra JSON-serializable details (metrics, data range, ...)
+            activate: Make it the active version and swap it into loaded handles
+
+        Returns:
+            New version id
+        """
+        symbol_dir = self._symbol_dir(kind, symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        staging = os.path.join(symbol_dir, f"{STAGING_PREFIX}{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        try:
+            if model.save(directory=staging) is False:
+                raise ValueError(f"{kind} model for {symbol} has nothing to save")
+
+            with self._lock:
+                existing = self.list_versions(kind, symbol)
+                number = int(existing[-1][1:]) + 1 if existing else 1
+                version = f"v{number:04d}"
+                record = {'kind': kind, 'symbol': symbol, 'version': version,
+                          'created_at': datetime.now().isoformat(), **(metadata or {})}
+                with open(os.path.join(staging, METADATA_FILE), 'w') as f:
+                    json.dump(record, f, indent=2, default=str)
+                os.rename(staging, self.path(kind, symbol, version))
+                self.metrics['published'] += 1
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        if activate:
+            self.activate(kind, symbol, version)
+        return version
+
+    def activate(self, kind, symbol, version, background=False):
+        """Point ACTIVE at a version and swap it into any loaded handle
+
+        Args:
+            background: Load the new model on a worker thread and return immediately
+
+        Returns:
+            True if the pointer was updated
+        """
+        if not os.path.isdir(self.path(kind, symbol, version)):
+            return False
+
+        symbol_dir = self._symbol_dir(kind, symbol)
+        tmp_path = os.path.join(symbol_dir, f"{ACTIVE_FILE}.{os.getpid()}.tmp")
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                f.write(version)
+            os.replace(tmp_path, os.path.join(symbol_dir, ACTIVE_FILE))
+            self.metrics['activations'] += 1
+            handles = [handle for (handle_kind, handle_symbol, _), handle in self.handles.items()
+                       if handle_kind == kind and handle_symbol == symbol]
+
+        for handle in handles:
+            self._swap(handle, version, background)
+        return True
+
+    def rollback(self, kind, symbol):
+        """Activate the version published before the active one"""
+        versions = self.list_versions(kind, symbol)
+        active = self.active_version(kind, symbol)
+        if active not in versions or versions.index(active) == 0:
+            return None
+        previous = versions[versions.index(active) - 1]
+        return previous if self.activate(kind, symbol, previous) else None
+
+    # -- Serving --
+
+    def _swap(self, handle, version, background=False):
+        def run():
+            swapped = handle.version is not None and handle.version != version
+            try:
+                handle.load(version, self.path(handle.kind, handle.symbol, version))
+                self.metrics['swaps'] += swapped
+            except Exception as e:
+                self.metrics['load_errors'] += 1
+                print(f"⚠️ Loading {handle.kind} {handle.symbol} {version} failed: {e}")
+
+        if background:
+            thread = threading.Thread(target=run, name=f"registry-load-{handle.symbol}", daemon=True)
+            thread.start()
+            return thread
+        run()
+
+    def handle(self, symbol, loader='lstm'):
+        """Handle serving the active model for a symbol (loaded now if not yet)
+
+        Args:
+            symbol: Trading symbol
+            loader: Name in LOADERS ('lstm', 'lstm_runtime', 'gan')
+        """
+        kind, load = LOADERS[loader]
+        key = (kind, symbol, loader)
+        with self._lock:
+            handle = self.handles.get(key)
+            created = handle is None
+            if created:
+                handle = self.handles[key] = ModelHandle(kind, symbol, load)
+
+        version = self.active_version(kind, symbol)
+        if created and version is not None:
+            self._swap(handle, version)
+        return handle
+
+    def get(self, symbol, loader='lstm'):
+        """Active model for a symbol (None if none is published)"""
+        return self.handle(symbol, loader).get()
+
+    def preload(self, loaders=('lstm_runtime',), background=False):
+        """Load the active version of every published symbol
+
+        Args:
+            loaders: Loader names to warm (the default needs no TensorFlow)
+            background: Load on worker threads and return immediately
+
+        Returns:
+            Worker threads (empty when loading in the foreground)
+        """
+        threads = []
+        for loader in loaders:
+            kind, load = LOADERS[loader]
+            for symbol in self.symbols(kind):
+                version = self.active_version(kind, symbol)
+                if version is None:
+                    continue
+                with self._lock:
+                    handle = self.handles.setdefault((kind, symbol, loader), ModelHandle(kind, symbol, load))
+                thread = self._swap(handle, version, background)
+                if thread is not None:
+                    threads.append(thread)
+        return threads
+
+    # -- Retention --
+
+    def gc(self, kind=None, now=None):
+        """Remove old versions by policy
+
+        Keeps the newest keep_versions per symbol, drops versions older than
+        max_age_days, and never removes the active version or one a handle
+        is serving.
+
+        Returns:
+            Removed version directories
+        """
+        now = now or time.time()
+        keep = self.config['keep_versions']
+        max_age = self.config['max_age_days']
+        removed = []
+
+        kinds = [kind] if kind else sorted(set(kind for kind, _ in LOADERS.values()))
+        for kind in kinds:
+            for symbol in self.symbols(kind):
+                with self._lock:
+                    versions = self.list_versions(kind, symbol)
+                    protected = {self.active_version(kind, symbol)}
+                    protected.update(handle.version for (handle_kind, handle_symbol, _), handle
+                                     in self.handles.items() if handle_kind == kind and handle_symbol == symbol)
+
+                    for index, version in enumerate(versions):
+                        if version in protected:
+                            continue
+                        directory = self.path(kind, symbol, version)
+                        too_many = index < len(versions) - keep
+                        too_old = max_age is not None and now - os.path.getmtime(directory) > max_age * 86400
+                        if too_many or too_old:
+                            shutil.rmtree(directory, ignore_errors=True)
+                            removed.append(directory)
+
+        self.metrics['collected'] += len(removed)
+        return removed
+
+    def get_status(self):
+        """Get registry status"""
+        with self._lock:
+            handles = [handle.get_status() for handle in self.handles.values()]
+        return {
+            'root': self.root,
+            'config': self.config,
+            'handles': handles,
+            'metrics': self.metrics
+        }
+
+
+# Test functionality
+def test_model_registry():
+    """Test model registry"""
+    import tempfile
+    print("🧪 Testing Model Registry...")
+
+    class Artifact:
+        def __init__(self, value):
+            self.value = value
+
+        def save(self, directory):
+            with open(os.path.join(directory, 'value.txt'), 'w') as f:
+                f.write(str(self.value))
+
+    LOADERS['demo'] = ('demo', lambda directory: open(os.path.join(directory, 'value.txt')).read())
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp, keep_versions=2)
+        registry.publish('demo', 'BTC/USDT', Artifact(1), {'val_loss': 0.12})
+        handle = registry.handle('BTC/USDT', loader='demo')
+        print(f"✅ Serving {handle.version}: {handle.get()}")
+
+        for value in range(2, 5):
+            registry.publish('demo', 'BTC/USDT', Artifact(value))
+        print(f"✅ Swapped to {handle.version}: {handle.get()} ({handle.swaps} swaps)")
+        print(f"✅ Collected {len(registry.gc('demo'))} old versions, "
+              f"kept {registry.list_versions('demo', 'BTC/USDT')}")
+    del LOADERS['demo']
+
+
+if __name__ == '__main__':
+    test_model_registry()
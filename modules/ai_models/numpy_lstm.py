@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""NumPy LSTM Runtime - TensorFlow-free inference for exported TPS19 LSTM weights"""
+
+import json
+import os
+import numpy as np
+
+try:
+    from .window_dataset import OHLCV_COLUMNS
+except ImportError:
+    from window_dataset import OHLCV_COLUMNS
+
+FORMAT_VERSION = 1
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'hard_sigmoid': lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0)
+}
+
+
+def export_weights(model, path, scaler_params, sequence_length):
+    """Write a trained Keras LSTM/Dense/BatchNormalization stack to a compact .npz
+
+    Dropout layers are skipped (they are identity at inference).
+
+    Args:
+        model: Trained Keras Sequential model
+        path: Output .npz path
+        scaler_params: {'min', 'max'} per OHLCV column used in training
+        sequence_length: Rows per input window
+
+    Returns:
+        Layer specs written
+    """
+    specs, arrays = [], {}
+    for layer in model.layers:
+        kind = type(layer).__name__
+        config = layer.get_config()
+        weights = layer.get_weights()
+        index = len(specs)
+
+        if kind == 'LSTM':
+            spec = {'type': 'lstm', 'return_sequences': config['return_sequences'],
+                    'activation': config['activation'], 'recurrent_activation': config['recurrent_activation']}
+            names = ['kernel', 'recurrent_kernel', 'bias'] if config.get('use_bias', True) else \
+                ['kernel', 'recurrent_kernel']
+        elif kind == 'Dense':
+            spec = {'type': 'dense', 'activation': config['activation']}
+            names = ['kernel', 'bias'] if config.get('use_bias', True) else ['kernel']
+        elif kind == 'BatchNormalization':
+            spec = {'type': 'batch_norm', 'epsilon': config['epsilon']}
+            names = (['gamma'] if config.get('scale', True) else []) + \
+                    (['beta'] if config.get('center', True) else []) + ['moving_mean', 'moving_variance']
+        elif kind == 'Dropout':
+            continue
+        else:
+            raise ValueError(f"Layer type {kind} is not supported by the NumPy runtime")
+
+        for name, value in zip(names, weights):
+            arrays[f"layer{index}_{name}"] = value.astype(np.float32)
+        specs.append(spec)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(
+        path,
+        spec=np.array(json.dumps({'version': FORMAT_VERSION, 'layers': specs, 'sequence_length': sequence_length})),
+        scaler_min=np.asarray(scaler_params['min'], dtype=np.float64),
+        scaler_max=np.asarray(scaler_params['max'], dtype=np.float64),
+        **arrays
+    )
+    return specs
+
+
+class NumpyLSTMRuntime:
+    """Forward pass of an exported LSTMPredictor model using only NumPy
+
+    Loads the .npz written by export_weights (LSTMPredictor.save() writes
+    one next to the Keras model) and mirrors LSTMPredictor's predict() and
+    predict_batch(), so inference processes never import TensorFlow.
+    """
+
+    def __init__(self, path):
+        """Load exported weights
+
+        Args:
+            path: .npz written by export_weights
+        """
+        self.path = path
+        with np.load(path) as archive:
+            spec = json.loads(str(archive['spec']))
+            if spec['version'] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported runtime format {spec['version']}")
+            self.layers = []
+            for index, layer in enumerate(spec['layers']):
+                prefix = f"layer{index}_"
+                weights = {key[len(prefix):]: archive[key] for key in archive.files if key.startswith(prefix)}
+                self.layers.append((layer, weights))
+            self.scaler_params = {'min': archive['scaler_min'], 'max': archive['scaler_max']}
+
+        self.sequence_length = spec['sequence_length']
+        self.metrics = {'predictions_made': 0}
+
+    @staticmethod
+    def _lstm(x, layer, weights):
+        """Keras LSTM (gate order i, f, c, o) over a (batch x time x features) input"""
+        act = ACTIVATIONS[layer['activation']]
+        recurrent_act = ACTIVATIONS[layer['recurrent_activation']]
+        kernel, recurrent = weights['kernel'], weights['recurrent_kernel']
+        units = recurrent.shape[0]
+
+        # Input projections for every time step in one matmul
+        projected = x @ kernel
+        if 'bias' in weights:
+            projected += weights['bias']
+
+        h = np.zeros((x.shape[0], units), dtype=np.float32)
+        c = np.zeros_like(h)
+        outputs = []
+        for t in range(x.shape[1]):
+            z = projected[:, t] + h @ recurrent
+            i = recurrent_act(z[:, :units])
+            f = recurrent_act(z[:, units:2 * units])
+            g = act(z[:, 2 * units:3 * units])
+            o = recurrent_act(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * act(c)
+            if layer['return_sequences']:
+                outputs.append(h)
+
+        return np.stack(outputs, axis=1) if layer['return_sequences'] else h
+
+    def forward(self, batch):
+        """Model output for a scaled (batch x sequence_length x 5) input"""
+        x = np.asarray(batch, dtype=np.float32)
+        for layer, weights in self.layers:
+            if layer['type'] == 'lstm':
+                x = self._lstm(x, layer, weights)
+            elif layer['type'] == 'dense':
+                x = x @ weights['kernel']
+                if 'bias' in weights:
+                    x = x + weights['bias']
+                x = ACTIVATIONS[layer['activation']](x)
+            else:
+                x = (x - weights['moving_mean']) / np.sqrt(weights['moving_variance'] + layer['epsilon'])
+                if 'gamma' in weights:
+                    x = x * weights['gamma']
+                if 'beta' in weights:
+                    x = x + weights['beta']
+        return x
+
+    def _stack_windows(self, windows):
+        if isinstance(windows, dict):
+            rows = []
+            for symbol, data in windows.items():
+                values = data[OHLCV_COLUMNS].values if hasattr(data, 'columns') else np.asarray(data)
+                if len(values) < self.sequence_length:
+                    raise ValueError(f"{symbol}: need at least {self.sequence_length} data points")
+                rows.append(np.asarray(values[-self.sequence_length:], dtype=np.float64))
+            raw = np.stack(rows)
+        else:
+            raw = np.asarray(windows, dtype=np.float64)[:, -self.sequence_length:]
+
+        scaled = (raw - self.scaler_params['min']) / \
+                 (self.scaler_params['max'] - self.scaler_params['min'] + 1e-8)
+        return scaled.astype(np.float32)
+
+    def predict_batch(self, windows, steps=1):
+        """Predict future prices for many symbols (same contract as LSTMPredictor.predict_batch)
+
+        Args:
+            windows: {symbol: recent OHLCV DataFrame/array} or (symbols x rows x 5) raw OHLCV
+            steps: Number of steps to predict ahead
+
+        Returns:
+            (symbols x steps) predicted prices
+        """
+        sequences = self._stack_windows(windows)
+        outputs = []
+        for _ in range(steps):
+            pred = self.forward(sequences)
+            outputs.append(pred[:, 0])
+
+            # Feed the predicted close back in as the next row
+            new_row = sequences[:, -1, :].copy()
+            new_row[:, 3] = pred[:, 0]
+            sequences = np.concatenate([sequences[:, 1:], new_row[:, None, :]], axis=1)
+
+        self.metrics['predictions_made'] += sequences.shape[0] * steps
+        scaled = np.stack(outputs, axis=1)
+        return scaled * (self.scaler_params['max'][3] - self.scaler_params['min'][3]) + self.scaler_params['min'][3]
+
+    def predict(self, data, steps=1):
+        """Predict future prices for one symbol"""
+        return self.predict_batch({'data': data}, steps)[0]
+
+    def get_status(self):
+        """Get runtime status"""
+        return {
+            'path': self.path,
+            'layers': [layer['type'] for layer, _ in self.layers],
+            'parameters': int(sum(w.size for _, weights in self.layers for w in weights.values())),
+            'sequence_length': self.sequence_length,
+            'metrics': self.metrics
+        }
+
+
+# Test functionality
+def test_numpy_lstm():
+    """Test NumPy LSTM runtime"""
+    import sys
+    import time
+    print("🧪 Testing NumPy LSTM Runtime...")
+
+    path = os.path.join(sys.argv[1] if len(sys.argv) > 1 else '/opt/tps19/data/models', 'lstm_runtime.npz')
+    if not os.path.exists(path):
+        print(f"⚠️ No exported model at {path} (LSTMPredictor.save() writes one)")
+        return
+
+    started = time.perf_counter()
+    runtime = NumpyLSTMRuntime(path)
+    print(f"✅ Loaded in {(time.perf_counter() - started) * 1000:.1f}ms: {runtime.get_status()['parameters']:,} parameters")
+
+    rng = np.random.default_rng(0)
+    windows = rng.normal(26000, 50, (50, runtime.sequence_length, 5))
+    started = time.perf_counter()
+    predictions = runtime.predict_batch(windows, steps=3)
+    print(f"✅ 50 symbols x 3 steps in {(time.perf_counter() - started) * 1000:.1f}ms: {predictions.shape}")
+    print(f"✅ TensorFlow imported: {'tensorflow' in sys.modules}")
+
+
+if __name__ == '__main__':
+    test_numpy_lstm()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Window Dataset - Zero-copy sliding-window batches over memory-mapped candles for TPS19 models"""
+
+import io
+import os
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+ARCHIVE_COLUMNS = ['timestamp'] + OHLCV_COLUMNS
+
+
+class CandleArchive:
+    """Append-only .npy archive of candles (timestamp + OHLCV), read back memory-mapped"""
+
+    def __init__(self, path):
+        """Initialize archive
+
+        Args:
+            path: .npy file holding an (n_candles x 6) float64 array
+        """
+        self.path = path
+
+    def write(self, rows):
+        """Append candles in place
+
+        The new rows are written after the existing data and only the header's
+        shape is updated, so an append costs O(rows) however large the archive
+        is. The header is rewritten last: an interrupted append leaves the
+        previous archive readable.
+
+        Args:
+            rows: Sequence of [timestamp, open, high, low, close, volume]
+
+        Returns:
+            Total candles in the archive
+        """
+        rows = np.ascontiguousarray(rows, dtype='<f8').reshape(-1, len(ARCHIVE_COLUMNS))
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            np.save(self.path, rows)
+            return rows.shape[0]
+
+        fmt = np.lib.format
+        with open(self.path, 'r+b') as f:
+            version = fmt.read_magic(f)
+            read_header, write_header = {(1, 0): (fmt.read_array_header_1_0, fmt.write_array_header_1_0),
+                                         (2, 0): (fmt.read_array_header_2_0, fmt.write_array_header_2_0)}[version]
+            shape, fortran_order, dtype = read_header(f)
+            if fortran_order or dtype != rows.dtype or shape[1:] != rows.shape[1:]:
+                raise ValueError(f"{self.path} is not a C-order float64 candle archive")
+            data_offset = f.tell()
+
+            total = shape[0] + rows.shape[0]
+            header = io.BytesIO()
+            write_header(header, {'descr': fmt.dtype_to_descr(dtype), 'fortran_order': False,
+                                  'shape': (total, shape[1])})
+            if len(header.getvalue()) != data_offset:
+                raise ValueError(f"{self.path} header has no room to grow; re-save it with numpy >= 1.23")
+
+            # Data first (overwriting any tail left by an interrupted append), then the new shape
+            f.seek(data_offset + shape[0] * rows.strides[0])
+            f.write(rows.tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(header.getvalue())
+
+        return total
+
+    def open(self):
+        """The archive as a read-only memmap (nothing is loaded until sliced)"""
+        return np.load(self.path, mmap_mode='r')
+
+    def ohlcv(self):
+        """(n_candles x 5) OHLCV view of the memmap"""
+        return self.open()[:, 1:]
+
+
+def column_min_max(values, chunk_size=1_000_000):
+    """Per-column min and max, reading chunk by chunk (works on memmaps of any size)"""
+    lo = np.full(values.shape[1], np.inf)
+    hi = np.full(values.shape[1], -np.inf)
+    for start in range(0, values.shape[0], chunk_size):
+        chunk = np.asarray(values[start:start + chunk_size], dtype=np.float64)
+        np.minimum(lo, chunk.min(axis=0), out=lo)
+        np.maximum(hi, chunk.max(axis=0), out=hi)
+    return lo, hi
+
+
+class WindowDataset:
+    """Fixed-length training windows as a strided view of a candle array
+
+    The windows are a sliding_window_view of the source (an in-memory array
+    or an archive memmap), so building the dataset allocates nothing; only
+    the windows in a requested batch are gathered and scaled. Each sample is
+    the sequence_length rows ending before its target row. With
+    target_column=None the dataset yields windows only (GAN training); with
+    a target column it yields (windows, next value of that column).
+    """
+
+    def __init__(self, values, sequence_length=60, target_column=3, batch_size=32, scaler=None,
+                 feature_range=(0.0, 1.0), start=0, stop=None, shuffle=False, seed=None):
+        """Initialize dataset
+
+        Args:
+            values: (n_rows x n_features) array or memmap
+            sequence_length: Rows per window
+            target_column: Column of the row after each window to predict (None: no targets)
+            batch_size: Windows per batch
+            scaler: {'min', 'max'} per column (computed from values if omitted)
+            feature_range: Range scaled values are mapped to
+            start: First sample index (for train/validation splits)
+            stop: End sample index (exclusive)
+            shuffle: Shuffle sample order, and reshuffle every epoch
+            seed: Shuffle seed
+        """
+        self.values = values
+        self.sequence_length = sequence_length
+        self.target_column = target_column
+        self.batch_size = batch_size
+        self.feature_range = feature_range
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+
+        if scaler is None:
+            lo, hi = column_min_max(values)
+            scaler = {'min': lo, 'max': hi}
+        self.scaler = scaler
+
+        # (n_windows x n_features x sequence_length) -> (n_windows x sequence_length x n_features), still a view
+        self.windows = sliding_window_view(values, sequence_length, axis=0).swapaxes(1, 2)
+
+        n_samples = self.windows.shape[0] - (1 if target_column is not None else 0)
+        self.start = start
+        self.stop = n_samples if stop is None else min(stop, n_samples)
+        self.order = np.arange(self.start, self.stop)
+        if self.shuffle:
+            self.rng.shuffle(self.order)
+
+    def __len__(self):
+        """Batches per epoch"""
+        return -(-len(self.order) // self.batch_size)
+
+    @property
+    def n_samples(self):
+        return len(self.order)
+
+    def scale(self, array):
+        """Min-max scale raw values into feature_range"""
+        low, high = self.feature_range
+        unit = (array - self.scaler['min']) / (self.scaler['max'] - self.scaler['min'] + 1e-8)
+        return unit * (high - low) + low
+
+    def take(self, indices):
+        """Gather and scale the samples at the given indices"""
+        X = self.scale(np.asarray(self.windows[indices], dtype=np.float64))
+        if self.target_column is None:
+            return X
+        y = self.scale(np.asarray(self.values[indices + self.sequence_length], dtype=np.float64))
+        return X, y[:, self.target_column]
+
+    def __getitem__(self, batch):
+        """Batch number `batch` of the current epoch order"""
+        return self.take(self.order[batch * self.batch_size:(batch + 1) * self.batch_size])
+
+    def __iter__(self):
+        for batch in range(len(self)):
+            yield self[batch]
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.rng.shuffle(self.order)
+
+    def sample(self, n):
+        """n random samples (with replacement)"""
+        return self.take(self.rng.integers(self.start, self.stop, n))
+
+    def split(self, validation_split=0.2):
+        """Chronological train/validation datasets sharing this dataset's view and scaler"""
+        cut = self.start + int(round((self.stop - self.start) * (1 - validation_split)))
+        common = dict(sequence_length=self.sequence_length, target_column=self.target_column,
+                      batch_size=self.batch_size, scaler=self.scaler, feature_range=self.feature_range)
+        train = WindowDataset(self.values, start=self.start, stop=cut, shuffle=self.shuffle, **common)
+        validation = WindowDataset(self.values, start=cut, stop=self.stop, **common)
+        return train, validation
+
+    def to_keras(self):
+        """Wrap as a keras Sequence so model.fit streams batches from the view"""
+        from tensorflow import keras
+        dataset = self
+
+        class _Batches(keras.utils.Sequence):
+            def __init__(self):
+                super().__init__()
+
+            def __len__(self):
+                return len(dataset)
+
+            def __getitem__(self, batch):
+                return dataset[batch]
+
+            def on_epoch_end(self):
+                dataset.on_epoch_end()
+
+        return _Batches()
+
+
+# Test functionality
+def test_window_dataset():
+    """Test window dataset"""
+    import tempfile
+    import time
+    print("🧪 Testing Window Dataset...")
+
+    rng = np.random.default_rng(0)
+    n = 500_000
+    close = rng.normal(0, 5, n).cumsum() + 26000
+    rows = np.column_stack([np.arange(n) * 60_000.0, close, close + 5, close - 5, close,
+                            rng.uniform(1, 10, n)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = CandleArchive(os.path.join(tmp, 'btc_1m.npy'))
+        archive.write(rows)
+
+        started = time.perf_counter()
+        dataset = WindowDataset(archive.ohlcv(), sequence_length=60, batch_size=256)
+        train, validation = dataset.split(0.2)
+        X, y = train[0]
+        print(f"✅ {dataset.n_samples:,} windows ({dataset.n_samples * 60 * 5 * 8 / 1e9:.1f} GB if materialized) "
+              f"ready in {time.perf_counter() - started:.2f}s")
+        print(f"✅ Batch {X.shape} -> {y.shape}; {len(train)} train / {len(validation)} validation batches")
+
+
+if __name__ == '__main__':
+    test_window_dataset()
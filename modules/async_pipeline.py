@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Async Stage Pipeline - Dependency-ordered concurrent stages for TPS19 trading cycles"""
+
+import time
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class StageSkipped(Exception):
+    """Raised inside a stage to mark it skipped (e.g. trading paused)"""
+
+
+class StageInputs(dict):
+    """Dependency results passed to a stage, with ``ages`` in seconds per input"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ages = {}
+
+
+class StageGraph:
+    """Runs async stages as soon as their dependencies finish
+
+    Each stage is ``async def stage(inputs: Dict[str, Any]) -> Any`` where
+    inputs holds the results of the stages it depends on. Stages without a
+    dependency path between them run concurrently, so a cycle takes as long
+    as its slowest dependency chain instead of the sum of all stages.
+
+    Stages may have a latency budget and the run an overall deadline. A
+    stage that overruns is cancelled; if it has a cache_ttl its last good
+    result is used instead (reported under 'fallbacks'), otherwise it is
+    skipped. Every result carries its data age so stale inputs are visible
+    downstream. Keep the graph between runs for the cache to apply.
+    """
+
+    def __init__(self, name: str = 'cycle'):
+        """Initialize stage graph
+
+        Args:
+            name: Name used in reports
+        """
+        self.name = name
+        self.stages = {}
+        self.order = []
+        self.cache = {}
+
+    def add_stage(self, name: str, func: Callable[[Dict[str, Any]], Awaitable[Any]],
+                  depends_on: Optional[List[str]] = None, budget: Optional[float] = None,
+                  cache_ttl: Optional[float] = None) -> 'StageGraph':
+        """Register a stage
+
+        Args:
+            name: Unique stage name
+            func: Coroutine function receiving its dependencies' results
+            depends_on: Names of stages that must complete first (must already be added)
+            budget: Seconds the stage may run before it is cancelled
+            cache_ttl: Reuse the last good result up to this age when the stage
+                overruns or fails (leave unset for stages with side effects)
+        """
+        depends_on = list(depends_on or [])
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' already registered")
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {missing}")
+
+        self.stages[name] = {'func': func, 'depends_on': depends_on, 'budget': budget, 'cache_ttl': cache_ttl}
+        self.order.append(name)
+        return self
+
+    def _fallback(self, name: str, reason: str, report: Dict) -> bool:
+        """Use the cached result for a stage if it is young enough"""
+        ttl = self.stages[name]['cache_ttl']
+        cached = self.cache.get(name)
+        if ttl is None or cached is None or time.monotonic() - cached['produced'] > ttl:
+            return False
+
+        report['results'][name] = cached['result']
+        report['produced'][name] = cached['produced']
+        report['fallbacks'][name] = reason
+        return True
+
+    async def _run_stage(self, name: str, tasks: Dict[str, asyncio.Task], report: Dict,
+                         started: float, deadline: Optional[float]):
+        stage = self.stages[name]
+
+        # Wait for dependencies; a failed or skipped dependency skips this stage
+        inputs = StageInputs()
+        for dep in stage['depends_on']:
+            await asyncio.wait({tasks[dep]})
+            if dep not in report['results']:
+                report['skipped'][name] = f"dependency '{dep}' did not complete"
+                return
+            inputs[dep] = report['results'][dep]
+            inputs.ages[dep] = time.monotonic() - report['produced'][dep]
+
+        start = time.monotonic()
+        timeout = stage['budget']
+        if deadline is not None:
+            remaining = deadline - start
+            if remaining <= 0:
+                if not self._fallback(name, 'cycle deadline reached', report):
+                    report['skipped'][name] = 'cycle deadline reached'
+                return
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        try:
+            result = await asyncio.wait_for(stage['func'](inputs), timeout)
+            report['results'][name] = result
+            report['produced'][name] = time.monotonic()
+            self.cache[name] = {'result': result, 'produced': report['produced'][name]}
+        except StageSkipped as e:
+            report['skipped'][name] = str(e) or 'skipped'
+        except asyncio.TimeoutError:
+            # Cancelled here; work already handed to a thread keeps running to completion
+            reason = f"exceeded {timeout:.1f}s budget"
+            report['overruns'].append(name)
+            if not self._fallback(name, reason, report):
+                report['skipped'][name] = reason
+        except Exception as e:
+            report['errors'][name] = f"{type(e).__name__}: {e}"
+            self._fallback(name, report['errors'][name], report)
+        finally:
+            end = time.monotonic()
+            report['timings'][name] = {
+                'start': start - started,
+                'end': end - started,
+                'duration': end - start
+            }
+
+    def _critical_path(self, timings: Dict) -> List[str]:
+        """Chain of stages that determined the cycle's end time"""
+        if not timings:
+            return []
+
+        current = max(timings, key=lambda n: timings[n]['end'])
+        path = [current]
+        while True:
+            deps = [d for d in self.stages[current]['depends_on'] if d in timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda n: timings[n]['end'])
+            path.append(current)
+
+        return list(reversed(path))
+
+    async def run(self, deadline: Optional[float] = None) -> Dict:
+        """Run all stages and return results with timing
+
+        Args:
+            deadline: Seconds from now by which every stage must finish
+
+        Returns:
+            Report with results, data ages, errors, skipped stages, cached
+            fallbacks, overruns and the critical path
+        """
+        started = time.monotonic()
+        report = {'results': {}, 'produced': {}, 'errors': {}, 'skipped': {},
+                  'fallbacks': {}, 'overruns': [], 'timings': {}}
+        cutoff = started + deadline if deadline is not None else None
+
+        tasks = {}
+        for name in self.order:
+            tasks[name] = asyncio.create_task(self._run_stage(name, tasks, report, started, cutoff))
+        await asyncio.gather(*tasks.values())
+
+        finished = time.monotonic()
+        produced = report.pop('produced')
+        report.update({
+            'name': self.name,
+            'elapsed': finished - started,
+            'ages': {name: finished - at for name, at in produced.items()},
+            'serial_time': sum(t['duration'] for t in report['timings'].values()),
+            'critical_path': self._critical_path(report['timings']),
+            'timestamp': datetime.now().isoformat()
+        })
+
+        return report
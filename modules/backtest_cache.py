@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Backtest Result Cache - Content-addressed disk store with in-memory LRU for TPS19"""
+
+import os
+import copy
+import json
+import pickle
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+
+class BacktestCache:
+    """Caches backtest results keyed by a hash of everything that determines them"""
+
+    def __init__(self, cache_dir='data/backtest_cache', max_memory_entries=256):
+        """Initialize backtest cache
+
+        Args:
+            cache_dir: Directory for on-disk results (created on first write)
+            max_memory_entries: Size of the in-memory LRU in front of disk
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0
+        }
+
+    @staticmethod
+    def data_fingerprint(values) -> str:
+        """Hash a block of market data (DataFrame, array or OHLCV list)
+
+        Args:
+            values: Data the backtest runs on
+
+        Returns:
+            Hex digest of the raw values
+        """
+        if hasattr(values, 'to_numpy'):
+            values = values.to_numpy()
+        array = np.ascontiguousarray(np.asarray(values, dtype=float))
+
+        digest = hashlib.sha256(array.tobytes())
+        digest.update(str(array.shape).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def code_version(func: Callable) -> str:
+        """Version a strategy by hashing its code and everything bound to it
+
+        Besides the source, the bytecode, default arguments, closure cell
+        values and functools.partial arguments are hashed, so lambdas that
+        share a source line and closures from one factory get distinct
+        versions. Values without a stable repr (plain objects) change the
+        version on every run, which costs a recompute but never a wrong hit.
+
+        Args:
+            func: Strategy function, method, partial or class
+
+        Returns:
+            Hex digest identifying this version of the code
+        """
+        digest = hashlib.sha256()
+        BacktestCache._hash_callable(digest, func, depth=0)
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def _hash_callable(digest, func: Any, depth: int):
+        if isinstance(func, functools.partial):
+            BacktestCache._hash_callable(digest, func.func, depth)
+            BacktestCache._hash_value(digest, (func.args, func.keywords), depth)
+            return
+
+        try:
+            digest.update(inspect.getsource(func).encode())
+        except (OSError, TypeError):
+            digest.update(repr(func).encode() if not hasattr(func, '__code__') else b'')
+
+        func = getattr(func, '__func__', func)
+        code = getattr(func, '__code__', None)
+        if code is None:
+            return
+        digest.update(code.co_code + repr((code.co_consts, code.co_names)).encode())
+        BacktestCache._hash_value(digest, (func.__defaults__, func.__kwdefaults__), depth)
+        for cell in func.__closure__ or ():
+            try:
+                BacktestCache._hash_value(digest, cell.cell_contents, depth)
+            except ValueError:
+                digest.update(b'<empty cell>')
+
+    @staticmethod
+    def _hash_value(digest, value: Any, depth: int):
+        # Functions bound as defaults or closure cells are versioned like the strategy
+        if callable(value) and not isinstance(value, type) and depth < 4:
+            BacktestCache._hash_callable(digest, value, depth + 1)
+        elif isinstance(value, (tuple, list)):
+            for item in value:
+                BacktestCache._hash_value(digest, item, depth)
+        elif isinstance(value, dict):
+            for key in sorted(value, key=repr):
+                digest.update(repr(key).encode())
+                BacktestCache._hash_value(digest, value[key], depth)
+        elif hasattr(value, 'to_numpy') or isinstance(value, np.ndarray):
+            try:
+                digest.update(BacktestCache.data_fingerprint(value).encode())
+            except (TypeError, ValueError):
+                digest.update(repr(value).encode())
+        else:
+            digest.update(repr(value).encode())
+
+    @staticmethod
+    def make_key(data_range: Dict, code_version: str, parameters: Dict, fee_model: Any = None) -> str:
+        """Build the content address for a backtest
+
+        Args:
+            data_range: Symbol, timeframe, bounds and fingerprint of the data
+            code_version: Result of code_version() for the strategy
+            parameters: Strategy and engine parameters
+            fee_model: Description of the fee/cost model (None = frictionless)
+
+        Returns:
+            SHA-256 hex key
+        """
+        payload = json.dumps({
+            'data': data_range,
+            'code': code_version,
+            'params': parameters,
+            'fees': fee_model
+        }, sort_keys=True, default=str)
+
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached result for key
+
+        Args:
+            key: Content address from make_key()
+
+        Returns:
+            Copy of the cached result (callers may modify it) or None
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.metrics['memory_hits'] += 1
+                return copy.deepcopy(self._memory[key])
+
+        path = self._path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+                self.metrics['disk_hits'] += 1
+                self._remember(key, value)
+                return copy.deepcopy(value)
+            except Exception as e:
+                print(f"⚠️ Corrupt backtest cache entry {key[:12]}: {e}")
+
+        self.metrics['misses'] += 1
+        return None
+
+    def set(self, key: str, value: Any) -> bool:
+        """Store result under key (memory and disk)
+
+        Args:
+            key: Content address from make_key()
+            value: Backtest result
+        """
+        self._remember(key, copy.deepcopy(value))
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self.metrics['writes'] += 1
+            return True
+        except Exception as e:
+            print(f"❌ Error writing backtest cache: {e}")
+            return False
+
+    def clear_memory(self):
+        """Drop the in-memory LRU (disk entries are kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        lookups = self.metrics['memory_hits'] + self.metrics['disk_hits'] + self.metrics['misses']
+        hits = self.metrics['memory_hits'] + self.metrics['disk_hits']
+
+        return {
+            'cache_dir': self.cache_dir,
+            'memory_entries': len(self._memory),
+            'max_memory_entries': self.max_memory_entries,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'metrics': self.metrics,
+            'timestamp': datetime.now().isoformat()
+        }
@@ -1,5 +1,9 @@
 import os, json, sqlite3, threading, time
 from datetime import datetime
+try:
+    from ..startup import LazySingleton
+except ImportError:
+    from startup import LazySingleton
 
 class CryptoComAIMemoryManager:
     def __init__(self, db_path='/opt/tps19/data/ai_memory.db'):
@@ -58,4 +62,13 @@ class CryptoComAIMemoryManager:
         except Exception as e:
             return {'total_decisions': 0, 'exchange': 'crypto.com', 'error': str(e)}
 
-ai_memory = CryptoComAIMemoryManager()
+# Global instance, created on first access so importing this module has no side effects
+_ai_memory = LazySingleton('ai_memory', CryptoComAIMemoryManager)
+
+def get_ai_memory() -> CryptoComAIMemoryManager:
+    return _ai_memory.get()
+
+def __getattr__(name):
+    if name == 'ai_memory':
+        return _ai_memory.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
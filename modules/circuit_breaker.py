@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Circuit Breaker - Fail-fast endpoint guards with cached fallback for TPS19"""
+
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CircuitOpenError(Exception):
+    """Raised when a breaker is open and no cached value is available"""
+
+
+class CircuitBreaker:
+    """Per-endpoint breaker: closed -> open after repeated failures -> half-open probe
+
+    While closed, calls go through and successful results are cached per
+    key. After failure_threshold consecutive failures (calls slower than
+    slow_call_seconds count as failures too) the breaker opens and calls
+    fail fast for reset_timeout seconds. Then a single probe is let through:
+    success closes the breaker, failure reopens it. Whenever a call cannot
+    be made or fails, the last good value for its key is returned instead,
+    together with its age. The cache keeps the max_cache_entries most
+    recently used keys.
+    """
+
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 slow_call_seconds: Optional[float] = None, max_cache_age: Optional[float] = None,
+                 max_cache_entries: int = 1024, failure_types: Tuple[type, ...] = (Exception,)):
+        """Initialize breaker
+
+        Args:
+            name: Endpoint name
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before probing
+            slow_call_seconds: Successful calls slower than this count as failures
+            max_cache_age: Cached values older than this are not served
+            max_cache_entries: Most keys kept in the fallback cache
+            failure_types: Exceptions that count as endpoint failures; others
+                (bad input, rate limit sheds) propagate untouched
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.max_cache_age = max_cache_age
+        self.max_cache_entries = max_cache_entries
+        self.failure_types = failure_types
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.last_error = None
+        self.cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            'calls': 0,
+            'failures': 0,
+            'rejected': 0,
+            'fallbacks': 0,
+            'opened': 0
+        }
+
+    def _admit(self) -> bool:
+        """Whether a call may go out now (handles open -> half-open)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.probing = False
+            if self.state == self.HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            self.metrics['rejected'] += 1
+            return False
+
+    def _record(self, ok: bool, error: Optional[str] = None):
+        with self._lock:
+            self.probing = False
+            if ok:
+                self.failures = 0
+                self.state = self.CLOSED
+                return
+
+            self.failures += 1
+            self.metrics['failures'] += 1
+            self.last_error = error
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.metrics['opened'] += 1
+                    print(f"⚡ Circuit {self.name} OPEN after {self.failures} failures: {error}")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def _fallback(self, key: Hashable, error: Exception, max_age: Optional[float]) -> Tuple[Any, float]:
+        with self._lock:
+            cached = self.cache.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached[1]
+            if max_age is None or age <= max_age:
+                self.metrics['fallbacks'] += 1
+                return cached[0], age
+        raise error
+
+    def call_with_age(self, func: Callable[..., Any], *args, cache_key: Hashable = None, fallback: bool = True,
+                      max_age: Optional[float] = None, **kwargs) -> Tuple[Any, float]:
+        """Call through the breaker
+
+        Args:
+            func: Endpoint call
+            cache_key: Key for the cached fallback (default: the positional args)
+            fallback: Cache results and serve them on failure (False: fail fast only,
+                for state that must never be served stale)
+            max_age: Oldest cached value to serve for this call (default: max_cache_age)
+
+        Returns:
+            (value, age in seconds); age is 0.0 for a fresh result
+
+        Raises:
+            CircuitOpenError: Breaker open and nothing cached for this key
+            Exception: The call's own error when nothing is cached
+        """
+        key = args if cache_key is None else cache_key
+        max_age = self.max_cache_age if max_age is None else max_age
+
+        if not self._admit():
+            error = CircuitOpenError(f"{self.name} circuit open ({self.last_error})")
+            if not fallback:
+                raise error
+            return self._fallback(key, error, max_age)
+
+        self.metrics['calls'] += 1
+        start = time.monotonic()
+        try:
+            value = func(*args, **kwargs)
+        except self.failure_types as e:
+            self._record(False, f"{type(e).__name__}: {e}")
+            if not fallback:
+                raise
+            return self._fallback(key, e, max_age)
+        except BaseException:
+            with self._lock:
+                self.probing = False
+            raise
+
+        duration = time.monotonic() - start
+        if self.slow_call_seconds is not None and duration > self.slow_call_seconds:
+            self._record(False, f"slow call {duration:.1f}s")
+        else:
+            self._record(True)
+
+        if fallback:
+            with self._lock:
+                self.cache[key] = (value, time.monotonic())
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.max_cache_entries:
+                    self.cache.popitem(last=False)
+        return value, 0.0
+
+    def call(self, func: Callable[..., Any], *args, cache_key: Hashable = None, fallback: bool = True,
+             max_age: Optional[float] = None, **kwargs) -> Any:
+        """Like call_with_age but returns only the value"""
+        return self.call_with_age(func, *args, cache_key=cache_key, fallback=fallback, max_age=max_age,
+                                  **kwargs)[0]
+
+    def get_status(self) -> Dict:
+        """Get breaker status"""
+        return {
+            'name': self.name,
+            'state': self.state,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'cached_keys': len(self.cache),
+            'metrics': self.metrics,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+# Breakers are shared per endpoint across every component calling it
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, **config) -> CircuitBreaker:
+    """Get (or create on first use) the process-wide breaker for an endpoint"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **config)
+        return _breakers[name]
+
+
+def get_breaker_status() -> Dict:
+    """Status of every breaker in the process"""
+    with _breakers_lock:
+        return {name: breaker.get_status() for name, breaker in _breakers.items()}
+
+
+# Test functionality
+def test_circuit_breaker():
+    """Test circuit breaker"""
+    print("🧪 Testing Circuit Breaker...")
+
+    breaker = CircuitBreaker('demo', failure_threshold=2, reset_timeout=0.2)
+    healthy = {'up': True}
+
+    def endpoint(symbol):
+        if not healthy['up']:
+            raise ConnectionError('timeout')
+        return 26000.0
+
+    print(f"✅ Fresh: {breaker.call_with_age(endpoint, 'BTC')}")
+
+    healthy['up'] = False
+    for _ in range(3):
+        value, age = breaker.call_with_age(endpoint, 'BTC')
+    print(f"✅ Degraded -> {breaker.state}, serving cached {value} ({age:.2f}s old)")
+
+    healthy['up'] = True
+    time.sleep(0.25)
+    breaker.call(endpoint, 'BTC')
+    print(f"✅ After probe: {breaker.state}")
+
+
+if __name__ == '__main__':
+    test_circuit_breaker()
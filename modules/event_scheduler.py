@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""Event Scheduler - Per-job cadences and event triggers for TPS19 bots"""
+
+import time
+import heapq
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+TIMEFRAME_SECONDS = {'1m': 60, '5m': 300, '15m': 900, '30m': 1800, '1h': 3600, '4h': 14400, '1d': 86400}
+
+
+class EventScheduler:
+    """Priority-queue scheduler where each job declares its own cadence
+
+    A job runs every ``interval`` seconds and/or whenever one of its
+    ``events`` is emitted (new candle, price move, fill, ...). Events that
+    arrive while a job is waiting are coalesced into one run, and
+    ``min_gap`` debounces bursts. The loop sleeps until the next job is due
+    or an event arrives, so slow jobs no longer ride a fixed global cadence.
+
+    Jobs run on the loop thread unless added with ``background=True``;
+    background jobs run on a small worker pool (one run per job at a time),
+    so a slow signal or analytics job never delays crash and position checks.
+    """
+
+    def __init__(self, name: str = 'scheduler', max_workers: int = 4):
+        """Initialize scheduler
+
+        Args:
+            name: Name used in logs and status
+            max_workers: Threads for background jobs
+        """
+        self.name = name
+        self.jobs = {}
+        self.running = False
+        self.max_workers = max_workers
+
+        self._queue = []            # (due, priority, seq, job_name)
+        self._seq = 0
+        self._events = deque()
+        self._finished = deque()    # Background runs waiting for bookkeeping on the loop thread
+        self._pool = None           # Created on the first background run
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def add_job(self, name: str, func: Callable[[Dict], Any], interval: Optional[float] = None,
+                events: Optional[List[str]] = None, priority: int = 5, min_gap: float = 0.0,
+                delay: float = 0.0, background: bool = False) -> 'EventScheduler':
+        """Register a job
+
+        Args:
+            name: Unique job name
+            func: Called as func(trigger); trigger holds 'reason' and coalesced 'events'
+            interval: Seconds between runs (None = event-driven only)
+            events: Event names that trigger an immediate run
+            priority: Lower runs first when several jobs are due together
+            min_gap: Minimum seconds between event-triggered runs
+            delay: Seconds before the first interval run
+            background: Run on the worker pool instead of the loop thread
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job '{name}' already registered")
+        if interval is None and not events:
+            raise ValueError(f"Job '{name}' needs an interval or events")
+
+        now = time.monotonic()
+        self.jobs[name] = {
+            'func': func,
+            'interval': interval,
+            'events': set(events or []),
+            'priority': priority,
+            'min_gap': min_gap,
+            'next_due': now + delay if interval is not None else float('inf'),
+            'background': background,
+            'running': False,
+            'pending': [],
+            'last_run': None,
+            'last_duration': 0.0,
+            'runs': 0,
+            'event_runs': 0,
+            'errors': 0,
+            'last_error': None
+        }
+        if interval is not None:
+            self._push(name)
+
+        return self
+
+    def add_candle_clock(self, timeframe: str = '1h', priority: int = 1) -> str:
+        """Emit 'candle_<timeframe>' each time a candle closes (wall clock aligned)
+
+        Returns:
+            Name of the emitted event
+        """
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        event = f"candle_{timeframe}"
+        until_close = seconds - (time.time() % seconds)
+
+        self.add_job(event, lambda trigger: self.emit(event, {'timeframe': timeframe}),
+                     interval=seconds, priority=priority, delay=until_close)
+        return event
+
+    def _push(self, name: str):
+        job = self.jobs[name]
+        self._seq += 1
+        heapq.heappush(self._queue, (job['next_due'], job['priority'], self._seq, name))
+
+    def emit(self, event: str, payload: Any = None):
+        """Emit an event (thread-safe); subscribed jobs run on the next loop pass"""
+        with self._lock:
+            self._events.append((event, payload))
+        self._wakeup.set()
+
+    def _dispatch_events(self, now: float):
+        with self._lock:
+            events, self._events = list(self._events), deque()
+
+        for event, payload in events:
+            for name, job in self.jobs.items():
+                if event not in job['events']:
+                    continue
+                job['pending'].append({'event': event, 'payload': payload})
+
+                earliest = now
+                if job['last_run'] is not None:
+                    earliest = max(now, job['last_run'] + job['min_gap'])
+                if earliest < job['next_due']:
+                    job['next_due'] = earliest
+                    self._push(name)
+
+    def run_pending(self) -> int:
+        """Run every job that is due now
+
+        Returns:
+            Number of jobs run
+        """
+        now = time.monotonic()
+        self._collect_finished()
+        self._dispatch_events(now)
+
+        ran = 0
+        while self._queue and self._queue[0][0] <= now:
+            due, _, _, name = heapq.heappop(self._queue)
+            job = self.jobs.get(name)
+            # Entries superseded by an earlier (event) or later (reschedule) due time are stale;
+            # a job still running in the background is requeued when it finishes
+            if job is None or due != job['next_due'] or job['running']:
+                continue
+
+            if job['background']:
+                self._submit(name, job)
+            else:
+                self._run_job(name, job)
+            ran += 1
+
+            # Events emitted by a job (e.g. a fill) are dispatched in the same pass
+            now = time.monotonic()
+            self._dispatch_events(now)
+
+        return ran
+
+    def _begin(self, name: str, job: Dict):
+        events, job['pending'] = job['pending'], []
+        job['running'] = True
+        trigger = {
+            'job': name,
+            'reason': 'event' if events else 'interval',
+            'events': events
+        }
+        return events, trigger
+
+    @staticmethod
+    def _call(name: str, func: Callable[[Dict], Any], trigger: Dict):
+        """Run a job function; returns (started, finished, error message or None)"""
+        started = time.monotonic()
+        error = None
+        try:
+            func(trigger)
+        except Exception as e:
+            error = str(e)
+            print(f"❌ Scheduled job {name} error: {e}")
+        return started, time.monotonic(), error
+
+    def _run_job(self, name: str, job: Dict):
+        events, trigger = self._begin(name, job)
+        self._finish(name, job, events, *self._call(name, job['func'], trigger))
+
+    def _submit(self, name: str, job: Dict):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-job")
+        events, trigger = self._begin(name, job)
+
+        def work():
+            result = self._call(name, job['func'], trigger)
+            with self._lock:
+                self._finished.append((name, events) + result)
+            self._wakeup.set()
+
+        self._pool.submit(work)
+
+    def _collect_finished(self):
+        with self._lock:
+            finished, self._finished = list(self._finished), deque()
+
+        for name, events, started, ended, error in finished:
+            self._finish(name, self.jobs[name], events, started, ended, error)
+
+    def _finish(self, name: str, job: Dict, events: List, started: float, finished: float,
+                error: Optional[str]):
+        job['running'] = False
+        if error is not None:
+            job['errors'] += 1
+            job['last_error'] = error
+        job['last_run'] = finished
+        job['last_duration'] = finished - started
+        job['runs'] += 1
+        job['event_runs'] += 1 if events else 0
+
+        # Any run resets the interval clock; event-only jobs wait for the next event
+        job['next_due'] = finished + job['interval'] if job['interval'] is not None else float('inf')
+        # Events that arrived while a background run was in flight
+        if job['pending']:
+            job['next_due'] = min(job['next_due'], max(time.monotonic(), finished + job['min_gap']))
+        if job['next_due'] != float('inf'):
+            self._push(name)
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the next queued job, None if nothing is queued"""
+        while self._queue:
+            due, _, _, name = self._queue[0]
+            job = self.jobs.get(name)
+            if job is not None and due == job['next_due']:
+                return max(0.0, due - time.monotonic())
+            heapq.heappop(self._queue)
+        return None
+
+    def run(self, duration: Optional[float] = None):
+        """Run the scheduler loop until stop() (or for duration seconds)"""
+        self.running = True
+        deadline = time.monotonic() + duration if duration is not None else None
+
+        while self.running:
+            self.run_pending()
+
+            wait = self.seconds_until_next()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = remaining if wait is None else min(wait, remaining)
+
+            # emit() wakes the loop early
+            self._wakeup.wait(timeout=wait)
+            self._wakeup.clear()
+
+        self.running = False
+        # Background runs still in flight finish on their own; a later run() starts a new pool
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def stop(self):
+        """Stop the scheduler loop"""
+        self.running = False
+        self._wakeup.set()
+
+    def get_status(self) -> Dict:
+        """Get scheduler and per-job status"""
+        now = time.monotonic()
+        return {
+            'name': self.name,
+            'running': self.running,
+            'jobs': {
+                name: {
+                    'interval': job['interval'],
+                    'events': sorted(job['events']),
+                    'background': job['background'],
+                    'running': job['running'],
+                    'runs': job['runs'],
+                    'event_runs': job['event_runs'],
+                    'errors': job['errors'],
+                    'last_error': job['last_error'],
+                    'last_duration': job['last_duration'],
+                    'next_in': None if job['next_due'] == float('inf') else max(0.0, job['next_due'] - now)
+                }
+                for name, job in self.jobs.items()
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+class PriceMoveTrigger:
+    """Reports a move once price travels threshold_pct from the last reference"""
+
+    def __init__(self, threshold_pct: float = 1.0):
+        """Initialize trigger
+
+        Args:
+            threshold_pct: Move (in %) that counts as an event
+        """
+        self.threshold_pct = threshold_pct
+        self.reference = {}
+
+    def update(self, symbol: str, price: float) -> Optional[float]:
+        """Feed a price; returns the move in % when it crosses the threshold"""
+        ref = self.reference.get(symbol)
+        if ref is None or ref <= 0:
+            self.reference[symbol] = price
+            return None
+
+        move_pct = (price - ref) / ref * 100
+        if abs(move_pct) < self.threshold_pct:
+            return None
+
+        self.reference[symbol] = price
+        return move_pct
+
+
+# Test functionality
+def test_event_scheduler():
+    """Test event scheduler"""
+    print("🧪 Testing Event Scheduler...")
+
+    scheduler = EventScheduler('test')
+    runs = {'fast': 0, 'slow': 0, 'on_move': 0}
+
+    def count(name):
+        def job(trigger):
+            runs[name] += 1
+        return job
+
+    scheduler.add_job('fast', count('fast'), interval=0.1, priority=0)
+    scheduler.add_job('slow', count('slow'), interval=10)
+    scheduler.add_job('on_move', count('on_move'), events=['price_move'])
+
+    trigger = PriceMoveTrigger(threshold_pct=1.0)
+    for price in (100.0, 100.5, 101.2):
+        move = trigger.update('BTC/USDT', price)
+        if move is not None:
+            scheduler.emit('price_move', {'symbol': 'BTC/USDT', 'move_pct': move})
+
+    scheduler.run(duration=0.55)
+    print(f"✅ Runs in 0.55s: {runs}")
+
+
+if __name__ == '__main__':
+    test_event_scheduler()
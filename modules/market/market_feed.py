@@ -1,5 +1,9 @@
 import os, json, sqlite3, threading, time, random
 from datetime import datetime
+try:
+    from ..startup import LazySingleton
+except ImportError:
+    from startup import LazySingleton
 
 class CryptoComMarketFeed:
     def __init__(self, db_path='/opt/tps19/data/market_feed.db'):
@@ -48,4 +52,13 @@ class CryptoComMarketFeed:
             print(f"❌ Failed to get data: {e}")
             return []
 
-market_feed = CryptoComMarketFeed()
+# Global instance, created on first access so importing this module has no side effects
+_market_feed = LazySingleton('market_feed', CryptoComMarketFeed)
+
+def get_market_feed() -> CryptoComMarketFeed:
+    return _market_feed.get()
+
+def __getattr__(name):
+    if name == 'market_feed':
+        return _market_feed.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,11 +7,16 @@ import sqlite3
 import time
 from datetime import datetime
 
+from circuit_breaker import get_breaker
+
 class MarketData:
     def __init__(self):
         self.db_path = "/opt/tps19/data/databases/market_data.db"
         self.init_database()
         
+        # Shared with RealtimeDataFeed: one breaker per upstream API
+        self.coingecko = get_breaker('coingecko', failure_threshold=3, reset_timeout=60, slow_call_seconds=5)
+        
     def init_database(self):
         """Initialize market data database"""
         conn = sqlite3.connect(self.db_path)
@@ -41,17 +46,25 @@ class MarketData:
         conn.commit()
         conn.close()
         
-    def get_price(self, symbol="bitcoin"):
-        """Get current price for a symbol"""
+    def _fetch_price(self, symbol):
+        url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol}&vs_currencies=usd"
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        return response.json()[symbol]['usd']
+        
+    def get_price_with_age(self, symbol="bitcoin"):
+        """Get current price and its age in seconds (0 when fresh)
+        
+        While CoinGecko is failing the last good price is returned with its
+        age; (None, None) if there has never been one.
+        """
         try:
-            # Use CoinGecko free API
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol}&vs_currencies=usd"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            price = data[symbol]['usd']
-            
-            # Store in database
+            price, age = self.coingecko.call_with_age(self._fetch_price, symbol, cache_key=('price', symbol))
+        except Exception:
+            return None, None
+        
+        if age == 0.0:
+            # Store fresh prices only
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             cursor.execute('''
@@ -60,37 +73,34 @@ class MarketData:
             ''', (symbol, price))
             conn.commit()
             conn.close()
+        
+        return price, age
+        
+    def get_price(self, symbol="bitcoin"):
+        """Get current price for a symbol (None if unavailable)"""
+        return self.get_price_with_age(symbol)[0]
             
-            return price
-            
-        except Exception as e:
-            # Return mock price if API fails
-            return 50000.0 + (time.time() % 1000)
-            
+    def _fetch_market_stats(self, symbol):
+        url = f"https://api.coingecko.com/api/v3/coins/{symbol}"
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        
+        return {
+            "price": data['market_data']['current_price']['usd'],
+            "high_24h": data['market_data']['high_24h']['usd'],
+            "low_24h": data['market_data']['low_24h']['usd'],
+            "change_24h": data['market_data']['price_change_percentage_24h']
+        }
+        
     def get_market_stats(self, symbol="bitcoin"):
-        """Get market statistics"""
+        """Get market statistics with their age (None if unavailable)"""
         try:
-            url = f"https://api.coingecko.com/api/v3/coins/{symbol}"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            stats = {
-                "price": data['market_data']['current_price']['usd'],
-                "high_24h": data['market_data']['high_24h']['usd'],
-                "low_24h": data['market_data']['low_24h']['usd'],
-                "change_24h": data['market_data']['price_change_percentage_24h']
-            }
-            
-            return stats
-            
-        except Exception as e:
-            # Return mock data if API fails
-            return {
-                "price": 50000.0,
-                "high_24h": 52000.0,
-                "low_24h": 48000.0,
-                "change_24h": 2.5
-            }
+            stats, age = self.coingecko.call_with_age(self._fetch_market_stats, symbol, cache_key=('stats', symbol))
+        except Exception:
+            return None
+        
+        return dict(stats, age=age, stale=age > 0)
             
     def get_historical_data(self, symbol="bitcoin", days=7):
         """Get historical price data"""
@@ -111,5 +121,5 @@ class MarketData:
 
 if __name__ == "__main__":
     market = MarketData()
-    price = market.get_price()
-    print(f"Market Data initialized successfully. Current BTC price: ${price}")
+    price, age = market.get_price_with_age()
+    print(f"Market Data initialized successfully. Current BTC price: ${price} (age {age}s)")
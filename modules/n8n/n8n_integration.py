@@ -4,6 +4,10 @@
 import os, json, requests, time, threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+try:
+    from ..startup import LazySingleton
+except ImportError:
+    from startup import LazySingleton
 
 class TPS19N8NIntegration:
     """Complete N8N Integration for TPS19"""
@@ -276,5 +280,13 @@ class TPS19N8NIntegration:
             print(f"❌ N8N integration test error: {e}")
             return False
 
-# Global N8N integration instance
-n8n_integration = TPS19N8NIntegration()
+# Global instance, created on first access so importing this module has no side effects
+_n8n_integration = LazySingleton('n8n_integration', TPS19N8NIntegration)
+
+def get_n8n_integration() -> TPS19N8NIntegration:
+    return _n8n_integration.get()
+
+def __getattr__(name):
+    if name == 'n8n_integration':
+        return _n8n_integration.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
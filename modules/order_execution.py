@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""Order Execution - Queued concurrent order placement with fill tracking for TPS19"""
+
+import time
+import uuid
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from rate_limiter import EXCHANGE_FAILURES
+
+
+# Tickets in these states still need tracking ('unknown': placement timed
+# out, so the exchange may hold the order under our clientOrderId)
+OPEN_STATES = ('queued', 'submitted', 'unknown', 'open', 'partially_filled')
+
+# ccxt order status -> ticket status
+CCXT_STATUS = {
+    'open': 'open',
+    'closed': 'filled',
+    'canceled': 'canceled',
+    'cancelled': 'canceled',
+    'expired': 'canceled',
+    'rejected': 'rejected'
+}
+
+
+class PositionBook:
+    """Net position, average entry and realized P&L per symbol, built from fills"""
+
+    def __init__(self):
+        self.positions = {}
+        self.realized_pnl = 0.0
+        self._lock = threading.Lock()
+
+    def apply_fill(self, fill: Dict) -> Dict:
+        """Apply a fill event (buy adds, sell reduces)
+
+        Args:
+            fill: Fill event from ExecutionEngine
+
+        Returns:
+            Updated position for the symbol
+        """
+        qty = fill['amount'] if fill['side'] == 'buy' else -fill['amount']
+        price = fill['price']
+
+        with self._lock:
+            pos = self.positions.setdefault(fill['symbol'], {'amount': 0.0, 'avg_entry': 0.0, 'realized_pnl': 0.0})
+            amount, avg = pos['amount'], pos['avg_entry']
+
+            if amount == 0 or (amount > 0) == (qty > 0):
+                # Opening or adding
+                new_amount = amount + qty
+                pos['avg_entry'] = (avg * abs(amount) + price * abs(qty)) / abs(new_amount)
+                pos['amount'] = new_amount
+            else:
+                # Reducing, closing or flipping
+                closed = min(abs(qty), abs(amount))
+                pnl = closed * (price - avg) * (1 if amount > 0 else -1)
+                pos['realized_pnl'] += pnl
+                self.realized_pnl += pnl
+
+                new_amount = amount + qty
+                if abs(new_amount) < 1e-12:
+                    new_amount = 0.0
+                if new_amount == 0 or (new_amount > 0) == (amount > 0):
+                    pos['amount'] = new_amount
+                    if new_amount == 0:
+                        pos['avg_entry'] = 0.0
+                else:
+                    pos['amount'] = new_amount
+                    pos['avg_entry'] = price
+
+            pos['updated'] = fill['timestamp']
+            return dict(pos)
+
+    def get_position(self, symbol: str) -> Dict:
+        with self._lock:
+            return dict(self.positions.get(symbol, {'amount': 0.0, 'avg_entry': 0.0, 'realized_pnl': 0.0}))
+
+    def open_positions(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {s: dict(p) for s, p in self.positions.items() if p['amount'] != 0}
+
+
+class ExecutionEngine:
+    """Order task queue with parallel submission and fill reconciliation
+
+    submit() only enqueues and returns a ticket, so analysis loops never
+    wait on the exchange. Worker threads place orders in priority order
+    (several at once), a tracker polls fetch_order for every open order,
+    and handle_order_update() accepts pushed order updates (e.g. ccxt.pro
+    watch_orders). Both paths reconcile cumulative 'filled' into
+    incremental fill events, so partial fills are reported exactly once,
+    and every fill is pushed to the PositionBook and to on_fill listeners.
+    """
+
+    def __init__(self, exchange, position_book: Optional[PositionBook] = None, max_in_flight: int = 4,
+                 poll_interval: float = 1.0, order_timeout: float = 120.0, name: str = 'execution'):
+        """Initialize execution engine
+
+        Args:
+            exchange: ccxt client (or GuardedExchange) used for orders
+            position_book: Book receiving fills (a new one if omitted)
+            max_in_flight: Orders that may be placed concurrently
+            poll_interval: Seconds between fetch_order sweeps
+            order_timeout: Seconds before an unfilled order is cancelled
+            name: Thread name prefix
+        """
+        self.exchange = exchange
+        self.positions = position_book or PositionBook()
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.order_timeout = order_timeout
+        self.name = name
+
+        self.tickets = {}
+        self.by_order_id = {}
+        self.listeners = []
+        self.queue = queue.PriorityQueue()
+        self.threads = []
+        self.running = False
+
+        self._seq = 0
+        self._done = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+
+        self.metrics = {
+            'submitted': 0,
+            'rejected': 0,
+            'unknown': 0,
+            'fills': 0,
+            'filled_orders': 0,
+            'canceled': 0,
+            'avg_ack_ms': 0.0
+        }
+
+    # ---- Lifecycle --------------------------------------------------------------
+
+    def start(self):
+        """Start submit workers and the fill tracker (idempotent)"""
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+            self._stop.clear()
+
+            for i in range(self.max_in_flight):
+                thread = threading.Thread(target=self._submit_loop, name=f"{self.name}-submit-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+            tracker = threading.Thread(target=self._track_loop, name=f"{self.name}-tracker", daemon=True)
+            tracker.start()
+            self.threads.append(tracker)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop workers; queued orders that were not placed are cancelled"""
+        with self._lock:
+            if not self.running:
+                return
+            self.running = False
+        self._stop.set()
+
+        for _ in range(self.max_in_flight):
+            self.queue.put((float('inf'), 0, None))
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+        with self._lock:
+            for ticket in self.tickets.values():
+                if ticket['status'] == 'queued':
+                    self._finish(ticket, 'canceled', error='engine stopped')
+
+    def on_fill(self, callback: Callable[[Dict], None]):
+        """Register a listener called with every fill event"""
+        self.listeners.append(callback)
+
+    # ---- Submission -----------------------------------------------------------------
+
+    def submit(self, symbol: str, side: str, amount: float, order_type: str = 'market',
+               price: Optional[float] = None, priority: int = 1, tag: Optional[Dict] = None,
+               params: Optional[Dict] = None) -> Dict:
+        """Queue an order and return immediately
+
+        Args:
+            symbol: Trading pair
+            side: 'buy' or 'sell'
+            amount: Base amount
+            order_type: 'market' or 'limit'
+            price: Limit price
+            priority: Lower goes first (0 = exits/stops)
+            tag: Caller context echoed in fill events
+            params: Extra ccxt order params (e.g. {'postOnly': True})
+
+        Returns:
+            Ticket snapshot with client_id and status 'queued'
+        """
+        self.start()
+
+        client_id = f"tps19-{uuid.uuid4().hex[:16]}"
+        ticket = {
+            'client_id': client_id,
+            'symbol': symbol,
+            'side': side,
+            'amount': amount,
+            'type': order_type,
+            'price': price,
+            'priority': priority,
+            'tag': tag or {},
+            'params': params or {},
+            'status': 'queued',
+            'order_id': None,
+            'filled': 0.0,
+            'average': None,
+            'error': None,
+            'created_at': time.time(),
+            'submitted_at': None,
+            'acked_at': None
+        }
+
+        with self._lock:
+            self.tickets[client_id] = ticket
+            self._done[client_id] = threading.Event()
+            self._seq += 1
+            self.queue.put((priority, self._seq, client_id))
+
+        return dict(ticket)
+
+    def _submit_loop(self):
+        while True:
+            _, _, client_id = self.queue.get()
+            if client_id is None:
+                return
+
+            with self._lock:
+                ticket = self.tickets[client_id]
+                if ticket['status'] != 'queued':
+                    continue
+                ticket['status'] = 'submitted'
+                ticket['submitted_at'] = time.time()
+
+            try:
+                order = self.exchange.create_order(ticket['symbol'], ticket['type'], ticket['side'],
+                                                   ticket['amount'], ticket['price'],
+                                                   dict(ticket['params'], clientOrderId=client_id))
+            except EXCHANGE_FAILURES as e:
+                # The request may have reached the exchange; find out before deciding
+                with self._lock:
+                    self.metrics['unknown'] += 1
+                    ticket['status'] = 'unknown'
+                    ticket['error'] = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Order {ticket['side']} {ticket['amount']} {ticket['symbol']} placement unknown: {e}")
+                self._resolve_unknown(client_id)
+                continue
+            except Exception as e:
+                with self._lock:
+                    self.metrics['rejected'] += 1
+                    self._finish(ticket, 'rejected', error=f"{type(e).__name__}: {e}")
+                print(f"❌ Order {ticket['side']} {ticket['amount']} {ticket['symbol']} rejected: {e}")
+                continue
+
+            self._acknowledge(client_id, order)
+
+    def _acknowledge(self, client_id: str, order: Dict):
+        """Attach the exchange order to its ticket and start tracking it"""
+        with self._lock:
+            ticket = self.tickets[client_id]
+            ticket['acked_at'] = time.time()
+            ticket['order_id'] = order.get('id')
+            if ticket['order_id']:
+                self.by_order_id[ticket['order_id']] = client_id
+            ticket['status'] = 'open'
+            ticket['error'] = None
+
+            self.metrics['submitted'] += 1
+            ack_ms = (ticket['acked_at'] - ticket['submitted_at']) * 1000
+            n = self.metrics['submitted']
+            self.metrics['avg_ack_ms'] += (ack_ms - self.metrics['avg_ack_ms']) / n
+
+        # The placement response may already carry fills
+        self._reconcile(client_id, order)
+
+    def _find_by_client_id(self, ticket: Dict) -> Optional[Dict]:
+        """Look an order up by clientOrderId among open, then closed orders"""
+        for method in ('fetch_open_orders', 'fetch_closed_orders'):
+            fetch = getattr(self.exchange, method, None)
+            if fetch is None:
+                continue
+            for order in fetch(ticket['symbol']) or []:
+                if order.get('clientOrderId') == ticket['client_id']:
+                    return order
+        return None
+
+    def _resolve_unknown(self, client_id: str):
+        """Adopt an order whose placement timed out, or reject it once it cannot have landed
+
+        The ticket stays 'unknown' (and counts as an open order, so callers
+        do not submit it again) while the lookup fails or the order has not
+        shown up within order_timeout.
+        """
+        with self._lock:
+            ticket = dict(self.tickets[client_id])
+        if ticket['status'] != 'unknown':
+            return
+
+        try:
+            order = self._find_by_client_id(ticket)
+        except Exception as e:
+            print(f"❌ Order lookup error for {ticket['symbol']} {client_id}: {e}")
+            return
+
+        if order is not None:
+            self._acknowledge(client_id, order)
+        elif time.time() - ticket['submitted_at'] > self.order_timeout:
+            with self._lock:
+                if self.tickets[client_id]['status'] == 'unknown':
+                    self.metrics['rejected'] += 1
+                    self._finish(self.tickets[client_id], 'rejected', error=ticket['error'])
+
+    # ---- Tracking ---------------------------------------------------------------------
+
+    def _track_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.poll_once()
+
+    def poll_once(self):
+        """Refresh every open order from the exchange (called by the tracker)"""
+        with self._lock:
+            open_tickets = [dict(t) for t in self.tickets.values()
+                            if t['status'] in ('open', 'partially_filled') and t['order_id']]
+            unknown = [client_id for client_id, t in self.tickets.items() if t['status'] == 'unknown']
+
+        for client_id in unknown:
+            self._resolve_unknown(client_id)
+
+        for ticket in open_tickets:
+            try:
+                order = self.exchange.fetch_order(ticket['order_id'], ticket['symbol'])
+                self._reconcile(ticket['client_id'], order)
+
+                if time.time() - ticket['acked_at'] > self.order_timeout and \
+                        self.tickets[ticket['client_id']]['status'] in ('open', 'partially_filled'):
+                    self.exchange.cancel_order(ticket['order_id'], ticket['symbol'])
+                    self._reconcile(ticket['client_id'], self.exchange.fetch_order(ticket['order_id'], ticket['symbol']))
+            except Exception as e:
+                print(f"❌ Order tracking error for {ticket['symbol']} {ticket['order_id']}: {e}")
+
+    def cancel(self, client_id: str) -> Optional[Dict]:
+        """Cancel an order; fills that raced the cancel are still reported
+
+        Returns:
+            Ticket snapshot after the cancel
+        """
+        with self._lock:
+            ticket = self.tickets.get(client_id)
+            if not ticket or ticket['status'] not in OPEN_STATES:
+                return self.get_order(client_id)
+            if ticket['status'] == 'queued':
+                self.metrics['canceled'] += 1
+                self._finish(ticket, 'canceled')
+                return dict(ticket)
+            order_id, symbol = ticket['order_id'], ticket['symbol']
+
+        if order_id:
+            try:
+                self.exchange.cancel_order(order_id, symbol)
+                self._reconcile(client_id, self.exchange.fetch_order(order_id, symbol))
+            except Exception as e:
+                print(f"❌ Cancel error for {symbol} {order_id}: {e}")
+        return self.get_order(client_id)
+
+    def handle_order_update(self, order: Dict):
+        """Reconcile a pushed order update (websocket); unknown orders are ignored"""
+        client_id = order.get('clientOrderId')
+        with self._lock:
+            if client_id not in self.tickets:
+                client_id = self.by_order_id.get(order.get('id'))
+        if client_id:
+            self._reconcile(client_id, order)
+
+    async def stream_orders(self, ws_exchange):
+        """Feed ccxt.pro watch_orders updates into the engine until stopped"""
+        while not self._stop.is_set():
+            for order in await ws_exchange.watch_orders():
+                self.handle_order_update(order)
+
+    def _reconcile(self, client_id: str, order: Dict):
+        """Turn an order snapshot into incremental fill events"""
+        events = []
+        with self._lock:
+            ticket = self.tickets[client_id]
+            if ticket['status'] not in OPEN_STATES:
+                return
+
+            filled = float(order.get('filled') or 0.0)
+            average = order.get('average') or order.get('price')
+            delta = filled - ticket['filled']
+
+            if delta > 1e-12 and average:
+                # Price of just this increment, from the change in cumulative cost
+                prev_cost = ticket['filled'] * (ticket['average'] or 0.0)
+                fill_price = (filled * float(average) - prev_cost) / delta
+                ticket['filled'] = filled
+                ticket['average'] = float(average)
+
+                events.append({
+                    'client_id': client_id,
+                    'order_id': ticket['order_id'],
+                    'symbol': ticket['symbol'],
+                    'side': ticket['side'],
+                    'amount': delta,
+                    'price': fill_price,
+                    'filled': filled,
+                    'remaining': max(0.0, ticket['amount'] - filled),
+                    'tag': ticket['tag'],
+                    'timestamp': datetime.now().isoformat()
+                })
+                self.metrics['fills'] += 1
+
+            status = CCXT_STATUS.get(order.get('status'), ticket['status'])
+            if status == 'open' and ticket['filled'] > 0:
+                status = 'partially_filled'
+
+            if status in OPEN_STATES:
+                ticket['status'] = status
+            else:
+                if status == 'filled':
+                    self.metrics['filled_orders'] += 1
+                elif status == 'canceled':
+                    self.metrics['canceled'] += 1
+                self._finish(ticket, status)
+
+            if events:
+                events[-1]['status'] = ticket['status']
+
+        for event in events:
+            self.positions.apply_fill(event)
+            for listener in self.listeners:
+                try:
+                    listener(event)
+                except Exception as e:
+                    print(f"❌ Fill listener error: {e}")
+
+    def _finish(self, ticket: Dict, status: str, error: Optional[str] = None):
+        ticket['status'] = status
+        ticket['error'] = error
+        self._done[ticket['client_id']].set()
+
+    # ---- Queries -------------------------------------------------------------------------
+
+    def get_order(self, client_id: str) -> Optional[Dict]:
+        with self._lock:
+            ticket = self.tickets.get(client_id)
+            return dict(ticket) if ticket else None
+
+    def wait(self, client_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Block until an order is done (for scripts and tests, not trading loops)"""
+        self._done[client_id].wait(timeout)
+        return self.get_order(client_id)
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            return [dict(t) for t in self.tickets.values()
+                    if t['status'] in OPEN_STATES and (symbol is None or t['symbol'] == symbol)]
+
+    def has_open_order(self, symbol: str) -> bool:
+        return bool(self.open_orders(symbol))
+
+    def get_status(self) -> Dict:
+        """Get engine status"""
+        return {
+            'name': self.name,
+            'running': self.running,
+            'queued': self.queue.qsize(),
+            'open_orders': len(self.open_orders()),
+            'positions': self.positions.open_positions(),
+            'realized_pnl': self.positions.realized_pnl,
+            'metrics': self.metrics,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+# Test functionality
+def test_order_execution():
+    """Test order execution"""
+    print("🧪 Testing Order Execution...")
+
+    class PaperExchange:
+        """Fills every market order in two halves"""
+
+        def __init__(self):
+            self.orders = {}
+
+        def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+            order_id = str(len(self.orders) + 1)
+            self.orders[order_id] = {'id': order_id, 'status': 'open', 'filled': amount / 2,
+                                     'average': 100.0, 'amount': amount}
+            return dict(self.orders[order_id])
+
+        def fetch_order(self, order_id, symbol=None):
+            order = self.orders[order_id]
+            order.update(status='closed', filled=order['amount'], average=101.0)
+            return dict(order)
+
+    engine = ExecutionEngine(PaperExchange(), poll_interval=0.05)
+    engine.on_fill(lambda fill: print(f"   fill {fill['side']} {fill['amount']:.4f} {fill['symbol']} @ {fill['price']:.2f}"))
+
+    tickets = [engine.submit(symbol, 'buy', 1.0) for symbol in ('BTC/USDT', 'ETH/USDT')]
+    print(f"✅ Queued {len(tickets)} orders without blocking")
+
+    for ticket in tickets:
+        done = engine.wait(ticket['client_id'], timeout=5)
+        print(f"✅ {done['symbol']}: {done['status']} {done['filled']} @ {done['average']}")
+
+    print(f"✅ Positions: {engine.positions.open_positions()}")
+    engine.stop()
+
+
+if __name__ == '__main__':
+    test_order_execution()
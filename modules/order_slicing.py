@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Order Slicing - TWAP/VWAP child-order scheduler for TPS19 parent orders"""
+
+import time
+import uuid
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from order_execution import ExecutionEngine
+
+
+def twap_weights(n_slices: int) -> List[float]:
+    """Equal share per slice"""
+    return [1.0 / n_slices] * n_slices
+
+
+def vwap_weights(slice_times: List[float], hourly_volume: List[float]) -> List[float]:
+    """Share per slice proportional to the usual volume in its UTC hour
+
+    Args:
+        slice_times: Epoch seconds of each slice
+        hourly_volume: 24 average volumes by UTC hour of day
+
+    Returns:
+        Weights summing to 1 (equal weights if the profile is empty)
+    """
+    raw = [hourly_volume[datetime.fromtimestamp(t, timezone.utc).hour] for t in slice_times]
+    total = sum(raw)
+    if total <= 0:
+        return twap_weights(len(slice_times))
+    return [v / total for v in raw]
+
+
+def hourly_volume_profile(ohlcv: List[List[float]]) -> List[float]:
+    """Average volume per UTC hour of day from hourly candles"""
+    sums, counts = [0.0] * 24, [0] * 24
+    for candle in ohlcv:
+        hour = datetime.fromtimestamp(candle[0] / 1000, timezone.utc).hour
+        sums[hour] += candle[5]
+        counts[hour] += 1
+    return [s / c if c else 0.0 for s, c in zip(sums, counts)]
+
+
+class SliceScheduler:
+    """Works parent orders as timed child orders on an ExecutionEngine
+
+    Each parent has a schedule of cumulative targets (TWAP: equal; VWAP:
+    the symbol's usual hourly volume profile). At every due slice the child
+    size is whatever brings filled + working quantity up to the target, so
+    shortfalls from partial fills roll forward, capped at a share of the
+    visible book depth. After the last slice, catch-up slices continue at
+    the same interval until the parent fills or its grace period ends.
+    Many parents run at once from one scheduler thread; submitting a parent
+    never blocks the caller. Exchange reads (VWAP volume profiles and the
+    books that cap each child) happen on the scheduler thread outside the
+    scheduler lock, so fills and queries are never held up behind them.
+    """
+
+    def __init__(self, engine: ExecutionEngine, exchange=None, max_depth_pct: float = 10.0,
+                 depth_band_bps: float = 50.0, min_child_notional: float = 1.0, catch_up_slices: int = 5,
+                 clock: Callable[[], float] = time.time, autostart: bool = True):
+        """Initialize scheduler
+
+        Args:
+            engine: Execution engine placing the child orders
+            exchange: Client for order books and volume history (default engine.exchange)
+            max_depth_pct: Largest child as % of book depth within depth_band_bps
+            depth_band_bps: Price band from the touch counted as usable depth
+            min_child_notional: Smaller children are deferred to the next slice
+            catch_up_slices: Extra slices allowed after the schedule ends
+            clock: Time source (epoch seconds)
+            autostart: Start the scheduler thread on first submit (else call tick())
+        """
+        self.engine = engine
+        self.exchange = exchange or engine.exchange
+        self.max_depth_pct = max_depth_pct
+        self.depth_band_bps = depth_band_bps
+        self.min_child_notional = min_child_notional
+        self.catch_up_slices = catch_up_slices
+        self.clock = clock
+        self.autostart = autostart
+
+        self.parents = {}
+        self.running = False
+        self.thread = None
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+
+        self.engine.on_fill(self._on_fill)
+
+    # ---- Parents ------------------------------------------------------------------
+
+    def submit(self, symbol: str, side: str, amount: float, style: str = 'twap', duration: float = 300.0,
+               n_slices: int = 10, start: Optional[float] = None, tag: Optional[Dict] = None) -> Dict:
+        """Schedule a parent order and return at once
+
+        Args:
+            symbol: Trading pair
+            side: 'buy' or 'sell'
+            amount: Total base amount
+            style: 'twap' or 'vwap'
+            duration: Seconds over which to work the order
+            n_slices: Scheduled slices
+            start: Epoch seconds of the first slice (default now)
+            tag: Caller context added to every child's fill events
+
+        Returns:
+            Parent snapshot including parent_id and slice schedule
+        """
+        start = self.clock() if start is None else start
+        interval = duration / n_slices
+        slice_times = [start + i * interval for i in range(n_slices)]
+
+        parent_id = f"parent-{uuid.uuid4().hex[:12]}"
+        parent = {
+            'parent_id': parent_id,
+            'symbol': symbol,
+            'side': side,
+            'amount': amount,
+            'style': style,
+            'interval': interval,
+            'slice_times': slice_times,
+            # VWAP targets replace these once the scheduler thread has loaded the volume profile
+            'targets': self._targets(amount, twap_weights(n_slices)),
+            'profile_pending': style == 'vwap',
+            'next_slice': 0,
+            'children': [],
+            'filled': 0.0,
+            'cost': 0.0,
+            'status': 'working',
+            'tag': tag or {},
+            'created_at': self.clock()
+        }
+
+        with self._lock:
+            self.parents[parent_id] = parent
+        if self.autostart:
+            self.start()
+        self._wake.set()
+        return self.get_parent(parent_id)
+
+    def cancel(self, parent_id: str):
+        """Stop scheduling further children (working children are left to finish)"""
+        with self._lock:
+            parent = self.parents.get(parent_id)
+            if parent and parent['status'] == 'working':
+                parent['status'] = 'canceled'
+
+    def get_parent(self, parent_id: str) -> Optional[Dict]:
+        with self._lock:
+            parent = self.parents.get(parent_id)
+            if not parent:
+                return None
+            snapshot = dict(parent, children=list(parent['children']))
+        snapshot['avg_price'] = snapshot['cost'] / snapshot['filled'] if snapshot['filled'] else None
+        snapshot['fill_pct'] = snapshot['filled'] / snapshot['amount'] * 100
+        return snapshot
+
+    # ---- Scheduling -----------------------------------------------------------------
+
+    @staticmethod
+    def _targets(amount: float, weights: List[float]) -> List[float]:
+        """Cumulative target amount after each slice"""
+        cumulative, running = [], 0.0
+        for w in weights:
+            running += w
+            cumulative.append(min(1.0, running))
+        cumulative[-1] = 1.0
+        return [amount * c for c in cumulative]
+
+    def _load_profiles(self):
+        """Fetch volume profiles for new VWAP parents (scheduler thread, outside the lock)"""
+        with self._lock:
+            pending = [(p['parent_id'], p['symbol'], p['slice_times']) for p in self.parents.values()
+                       if p['profile_pending'] and p['status'] == 'working']
+
+        for parent_id, symbol, slice_times in pending:
+            try:
+                ohlcv = self.exchange.fetch_ohlcv(symbol, '1h', limit=24 * 7)
+                weights = vwap_weights(slice_times, hourly_volume_profile(ohlcv))
+            except Exception as e:
+                print(f"⚠️ VWAP profile unavailable for {symbol}, using TWAP: {e}")
+                weights = twap_weights(len(slice_times))
+
+            with self._lock:
+                parent = self.parents[parent_id]
+                parent['targets'] = self._targets(parent['amount'], weights)
+                parent['profile_pending'] = False
+
+    def _child_cap(self, symbol: str, side: str) -> Dict:
+        """Usable depth on the side we take from and the touch price"""
+        book = self.exchange.fetch_order_book(symbol, limit=50)
+        levels = book['asks'] if side == 'buy' else book['bids']
+        if not levels:
+            return {'cap': 0.0, 'price': None}
+
+        touch = levels[0][0]
+        band = touch * self.depth_band_bps / 10000
+        depth = sum(level[1] for level in levels if abs(level[0] - touch) <= band)
+        return {'cap': depth * self.max_depth_pct / 100, 'price': touch}
+
+    def _working_amount(self, parent: Dict) -> float:
+        working = 0.0
+        for client_id in parent['children']:
+            child = self.engine.get_order(client_id)
+            if child and child['status'] in ('queued', 'submitted', 'open', 'partially_filled'):
+                working += child['amount'] - child['filled']
+        return working
+
+    def _deficit(self, parent: Dict, index: int) -> float:
+        target = parent['targets'][min(index, len(parent['slice_times']) - 1)]
+        return target - parent['filled'] - self._working_amount(parent)
+
+    def _next_slice(self, parent: Dict, now: float, last_allowed: int):
+        """Claim the parent's next due slice (under the lock)
+
+        Returns:
+            ('due', index), ('wait', seconds) or ('done', None)
+        """
+        index = parent['next_slice']
+        if index >= last_allowed:
+            parent['status'] = 'incomplete'
+            print(f"⚠️ {parent['parent_id']} {parent['symbol']}: schedule ended at "
+                  f"{parent['filled']:.6f}/{parent['amount']:.6f}")
+            return 'done', None
+
+        due = parent['slice_times'][0] + index * parent['interval']
+        if due > now:
+            return 'wait', due - now
+
+        parent['next_slice'] += 1
+        return 'due', index
+
+    def _work_slice(self, parent_id: str, index: int):
+        """Size and place one child; the book is fetched without holding the lock"""
+        with self._lock:
+            parent = self.parents[parent_id]
+            if parent['status'] != 'working' or self._deficit(parent, index) <= parent['amount'] * 1e-9:
+                return
+            symbol, side = parent['symbol'], parent['side']
+
+        try:
+            book = self._child_cap(symbol, side)
+        except Exception as e:
+            print(f"❌ Order book error for {symbol}, slice deferred: {e}")
+            return
+
+        with self._lock:
+            # Fills and cancels may have landed while the book was being fetched
+            deficit = self._deficit(parent, index)
+            if parent['status'] != 'working' or deficit <= parent['amount'] * 1e-9:
+                return
+
+            final = index >= len(parent['slice_times']) - 1
+            child = min(deficit, book['cap']) if book['cap'] > 0 else 0.0
+            if child <= 0 or (book['price'] and child * book['price'] < self.min_child_notional and not final):
+                return
+
+            ticket = self.engine.submit(symbol, side, child,
+                                        tag=dict(parent['tag'], parent_id=parent_id, slice=index + 1))
+            parent['children'].append(ticket['client_id'])
+
+    def tick(self, now: Optional[float] = None) -> float:
+        """Work every due slice
+
+        Returns:
+            Seconds until the next slice is due (for the scheduler loop)
+        """
+        now = self.clock() if now is None else now
+        next_due = float('inf')
+
+        self._load_profiles()
+
+        with self._lock:
+            parent_ids = [pid for pid, p in self.parents.items() if p['status'] == 'working']
+
+        for parent_id in parent_ids:
+            while True:
+                with self._lock:
+                    parent = self.parents[parent_id]
+                    if parent['status'] != 'working':
+                        break
+                    if parent['profile_pending']:
+                        # Submitted after this tick loaded profiles; the next tick picks it up
+                        next_due = 0.0
+                        break
+                    state, value = self._next_slice(parent, now, len(parent['slice_times']) + self.catch_up_slices)
+                if state == 'wait':
+                    next_due = min(next_due, value)
+                if state != 'due':
+                    break
+                self._work_slice(parent_id, value)
+
+        return next_due
+
+    def _on_fill(self, fill: Dict):
+        parent_id = fill['tag'].get('parent_id')
+        if not parent_id:
+            return
+
+        with self._lock:
+            parent = self.parents.get(parent_id)
+            if not parent:
+                return
+            parent['filled'] += fill['amount']
+            parent['cost'] += fill['amount'] * fill['price']
+            if parent['filled'] >= parent['amount'] * (1 - 1e-9) and parent['status'] in ('working', 'incomplete'):
+                parent['status'] = 'filled'
+
+    def _loop(self):
+        while self.running:
+            wait = self.tick()
+            self._wake.wait(min(wait, 1.0))
+            self._wake.clear()
+
+    def start(self):
+        """Start the scheduler thread (idempotent)"""
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._loop, name='slice-scheduler', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop scheduling (working children stay with the engine)"""
+        self.running = False
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def get_status(self) -> Dict:
+        """Get scheduler status"""
+        with self._lock:
+            parent_ids = list(self.parents)
+        parents = [self.get_parent(pid) for pid in parent_ids]
+        return {
+            'running': self.running,
+            'working': sum(1 for p in parents if p['status'] == 'working'),
+            'parents': parents,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+# Test functionality
+def test_order_slicing():
+    """Test order slicing"""
+    print("🧪 Testing Order Slicing...")
+
+    class PaperExchange:
+        """Fills every child at the touch on the next fetch_order"""
+
+        def __init__(self):
+            self.orders = {}
+
+        def fetch_order_book(self, symbol, limit=50):
+            return {'asks': [[100.0, 2.0], [100.2, 3.0]], 'bids': [[99.9, 2.0], [99.7, 3.0]]}
+
+        def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+            order_id = str(len(self.orders) + 1)
+            self.orders[order_id] = {'id': order_id, 'status': 'closed', 'filled': amount, 'average': 100.0}
+            return dict(self.orders[order_id])
+
+    now = [1_700_000_000.0]
+    engine = ExecutionEngine(PaperExchange(), poll_interval=3600)
+    scheduler = SliceScheduler(engine, clock=lambda: now[0], autostart=False)
+
+    parent = scheduler.submit('BTC/USDT', 'buy', 2.0, style='twap', duration=300, n_slices=5)
+    for _ in range(8):
+        scheduler.tick()
+        time.sleep(0.05)
+        now[0] += 60
+
+    done = scheduler.get_parent(parent['parent_id'])
+    print(f"✅ {done['status']}: {done['filled']:.2f}/{done['amount']} in {len(done['children'])} children "
+          f"@ {done['avg_price']:.2f}")
+    engine.stop()
+
+
+if __name__ == '__main__':
+    test_order_slicing()
@@ -4,6 +4,10 @@
 import os, json, sqlite3, shutil, hashlib, time, subprocess
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+try:
+    from ..startup import LazySingleton
+except ImportError:
+    from startup import LazySingleton
 
 class TPS19PatchManager:
     """Complete Patching and Rollback System"""
@@ -471,5 +475,13 @@ class TPS19PatchManager:
             print(f"❌ Patch + Rollback test failed: {e}")
             return False
 
-# Global patch manager instance
-patch_manager = TPS19PatchManager()
+# Global instance, created on first access so importing this module has no side effects
+_patch_manager = LazySingleton('patch_manager', TPS19PatchManager)
+
+def get_patch_manager() -> TPS19PatchManager:
+    return _patch_manager.get()
+
+def __getattr__(name):
+    if name == 'patch_manager':
+        return _patch_manager.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
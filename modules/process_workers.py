@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""Process Workers - Bot groups in separate processes over a shared-memory market snapshot for TPS19"""
+
+import os
+import sys
+import time
+import queue
+import importlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+OHLCV_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+TICKER_FIELDS = ('timestamp', 'last', 'bid', 'ask', 'volume')
+
+
+class MarketSnapshot:
+    """Candles and tickers for a fixed symbol list in one shared memory block
+
+    Layout: an int64 sequence number per slot, then two slots each holding
+    candles (symbols x bars x OHLCV), tickers (symbols x fields) and a valid
+    bar count per symbol. The coordinator alternates slots, so workers read
+    the previous cycle's slot while the next one is being written. Workers
+    attach by name and get NumPy views; nothing is pickled or copied.
+    """
+
+    SLOTS = 2
+
+    def __init__(self, symbols: List[str], n_bars: int = 200, timeframe: str = '5m',
+                 name: Optional[str] = None, create: bool = True):
+        """Create or attach to a snapshot
+
+        Args:
+            symbols: Symbols in row order
+            n_bars: Candles kept per symbol (most recent last)
+            timeframe: Candle timeframe, for readers
+            name: Shared memory name (required to attach)
+            create: True in the coordinator, False in workers
+        """
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.n_bars = n_bars
+        self.timeframe = timeframe
+        self.owner = create
+
+        n = len(self.symbols)
+        self._shapes = {
+            'candles': (n, n_bars, len(OHLCV_FIELDS)),
+            'tickers': (n, len(TICKER_FIELDS)),
+            'counts': (n,)
+        }
+        self._slot_bytes = sum(int(np.prod(shape)) * 8 for shape in self._shapes.values())
+        size = 8 * self.SLOTS + self._slot_bytes * self.SLOTS
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.name = self.shm.name
+
+        self.sequence = np.ndarray((self.SLOTS,), dtype=np.int64, buffer=self.shm.buf)
+        self.slots = [self._map_slot(slot) for slot in range(self.SLOTS)]
+
+        if create:
+            self.sequence[:] = -1
+        self.published = -1
+
+    def _map_slot(self, slot: int) -> Dict[str, np.ndarray]:
+        offset = 8 * self.SLOTS + slot * self._slot_bytes
+        arrays = {}
+        for key, shape in self._shapes.items():
+            dtype = np.int64 if key == 'counts' else np.float64
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            offset += int(np.prod(shape)) * 8
+        return arrays
+
+    def spec(self) -> Dict:
+        """Picklable description used by workers to attach"""
+        return {'name': self.name, 'symbols': self.symbols, 'n_bars': self.n_bars, 'timeframe': self.timeframe}
+
+    @classmethod
+    def attach(cls, spec: Dict) -> 'MarketSnapshot':
+        """Attach to a snapshot created by the coordinator"""
+        return cls(spec['symbols'], spec['n_bars'], spec['timeframe'], name=spec['name'], create=False)
+
+    def publish(self, candles: Dict[str, list], tickers: Optional[Dict[str, Dict]] = None) -> Dict:
+        """Write one cycle's market data into the next slot
+
+        Args:
+            candles: symbol -> ccxt OHLCV rows
+            tickers: symbol -> ccxt ticker dict
+
+        Returns:
+            Cycle message ({'seq', 'slot'}) for workers
+        """
+        seq = self.published + 1
+        slot = seq % self.SLOTS
+        arrays = self.slots[slot]
+
+        # Mark the slot as being written so late readers can detect it
+        self.sequence[slot] = -1
+        arrays['candles'].fill(np.nan)
+        arrays['tickers'].fill(np.nan)
+        arrays['counts'].fill(0)
+
+        for symbol, rows in (candles or {}).items():
+            if symbol not in self.index or not rows:
+                continue
+            data = np.asarray(rows, dtype=np.float64)[-self.n_bars:, :len(OHLCV_FIELDS)]
+            i = self.index[symbol]
+            arrays['candles'][i, self.n_bars - len(data):] = data
+            arrays['counts'][i] = len(data)
+
+        for symbol, ticker in (tickers or {}).items():
+            if symbol in self.index and ticker:
+                arrays['tickers'][self.index[symbol]] = [
+                    ticker.get(field) if ticker.get(field) is not None else np.nan for field in TICKER_FIELDS
+                ]
+
+        self.sequence[slot] = seq
+        self.published = seq
+
+        return {'seq': seq, 'slot': slot}
+
+    def view(self, slot: int) -> 'SnapshotView':
+        """Zero-copy view of a slot"""
+        return SnapshotView(self, slot)
+
+    def close(self):
+        """Detach (and free, in the coordinator)"""
+        self.sequence = None
+        self.slots = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SnapshotView:
+    """Read-only access to one published cycle"""
+
+    def __init__(self, snapshot: MarketSnapshot, slot: int):
+        self.snapshot = snapshot
+        self.slot = slot
+        self.seq = int(snapshot.sequence[slot])
+        self.symbols = snapshot.symbols
+        self.timeframe = snapshot.timeframe
+        self.candles = snapshot.slots[slot]['candles']
+        self.tickers = snapshot.slots[slot]['tickers']
+        self.counts = snapshot.slots[slot]['counts']
+
+    def ohlcv(self, symbol: str) -> np.ndarray:
+        """(bars x 6) view of a symbol's valid candles, oldest first"""
+        i = self.snapshot.index[symbol]
+        count = int(self.counts[i])
+        return self.candles[i, self.snapshot.n_bars - count:]
+
+    def ticker(self, symbol: str) -> Dict:
+        """A symbol's ticker as a dict"""
+        row = self.tickers[self.snapshot.index[symbol]]
+        return {field: float(value) for field, value in zip(TICKER_FIELDS, row)}
+
+    def is_current(self) -> bool:
+        """False once the coordinator has started overwriting this slot"""
+        return int(self.snapshot.sequence[self.slot]) == self.seq
+
+
+def _resolve(path: str) -> Callable:
+    module_name, attr = path.split(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _worker_main(group: str, bot_names: List[str], handler_path: Optional[str], spec: Dict,
+                 tasks, results, paths: List[str]):
+    """Worker process: load the group's bots once, then handle cycles until None"""
+    for path in paths:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    snapshot = MarketSnapshot.attach(spec)
+    handler = _resolve(handler_path) if handler_path else None
+
+    from bot_registry import BotRegistry
+    registry = BotRegistry()
+    registry.auto_discover_bots()
+    bots = {name: registry.get_bot(name) for name in bot_names}
+    bots = {name: bot for name, bot in bots.items() if bot is not None}
+
+    hooked = list(bots) if handler else [name for name, bot in bots.items() if hasattr(bot, 'on_market_snapshot')]
+    results.put({'type': 'ready', 'group': group, 'pid': os.getpid(), 'bots': list(bots), 'hooked': hooked})
+
+    try:
+        while True:
+            message = tasks.get()
+            if message is None:
+                break
+
+            view = snapshot.view(message['slot'])
+            started = time.perf_counter()
+            signals, errors = [], {}
+
+            if view.seq != message['seq']:
+                errors['_snapshot'] = 'slot overwritten before worker started'
+            elif handler:
+                try:
+                    signals = list(handler(bots, view) or [])
+                except Exception as e:
+                    errors['_handler'] = f"{type(e).__name__}: {e}"
+            else:
+                for name, bot in bots.items():
+                    if not hasattr(bot, 'on_market_snapshot'):
+                        continue
+                    try:
+                        for signal in bot.on_market_snapshot(view) or []:
+                            signals.append(dict(signal, bot=name))
+                    except Exception as e:
+                        errors[name] = f"{type(e).__name__}: {e}"
+
+            results.put({
+                'type': 'cycle',
+                'group': group,
+                'seq': message['seq'],
+                'stale': not view.is_current(),
+                'signals': signals,
+                'errors': errors,
+                'seconds': time.perf_counter() - started
+            })
+            del view
+    finally:
+        snapshot.close()
+
+
+class BotWorkerPool:
+    """Runs BotRegistry categories in separate processes
+
+    Each cycle the coordinator publishes candles and tickers once into a
+    MarketSnapshot and sends every group a tiny {'seq', 'slot'} message.
+    Workers call ``bot.on_market_snapshot(view)`` (or a group handler
+    ``module:function`` taking (bots, view)) and return signals over a
+    shared result queue, so CPU-heavy groups cannot stall the
+    coordinator's own crash and stop-loss checks. A group with no handler
+    and no bot implementing on_market_snapshot would do nothing, so its
+    worker is stopped once loaded and the group is marked idle.
+    """
+
+    def __init__(self, symbols: List[str], n_bars: int = 200, timeframe: str = '5m',
+                 start_method: str = 'spawn'):
+        """Initialize worker pool
+
+        Args:
+            symbols: Symbols carried in the snapshot
+            n_bars: Candles per symbol in the snapshot
+            timeframe: Candle timeframe published each cycle
+            start_method: multiprocessing start method ('spawn' avoids forking live exchange clients)
+        """
+        self.ctx = mp.get_context(start_method)
+        self.snapshot = MarketSnapshot(symbols, n_bars, timeframe)
+        self.results = self.ctx.Queue()
+        self.groups = {}
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.paths = [root, os.path.join(root, 'bots'), os.path.join(root, 'modules')]
+
+        self.metrics = {
+            'cycles_published': 0,
+            'signals_received': 0,
+            'stale_results': 0,
+            'worker_errors': 0
+        }
+
+    def add_group(self, name: str, bot_names: List[str], handler: Optional[str] = None) -> 'BotWorkerPool':
+        """Declare a worker group
+
+        Args:
+            name: Group name (usually a BotRegistry category)
+            bot_names: Registry names of the bots loaded in the worker
+            handler: Optional 'module:function' called as handler(bots, view)
+        """
+        self.groups[name] = {
+            'bots': list(bot_names),
+            'handler': handler,
+            'tasks': self.ctx.Queue(),
+            'process': None,
+            'ready': False,
+            'idle': False,
+            'last_seq': None,
+            'last_seconds': None
+        }
+        return self
+
+    def add_categories(self, registry, categories: List[str]) -> 'BotWorkerPool':
+        """Add one group per registry category"""
+        for category in categories:
+            bots = registry.get_bots_by_category(category)
+            if bots:
+                self.add_group(category, bots)
+        return self
+
+    def start(self, wait_ready: float = 60.0) -> Dict:
+        """Start a process per group and wait until their bots are loaded"""
+        for name, group in self.groups.items():
+            group['process'] = self.ctx.Process(
+                target=_worker_main,
+                args=(name, group['bots'], group['handler'], self.snapshot.spec(),
+                      group['tasks'], self.results, self.paths),
+                name=f"tps19-{name.lower()}",
+                daemon=True
+            )
+            group['process'].start()
+
+        deadline = time.monotonic() + wait_ready
+        while not all(g['ready'] for g in self.groups.values()) and time.monotonic() < deadline:
+            self.collect(timeout=0.1)
+
+        return {name: group['ready'] for name, group in self.groups.items()}
+
+    def publish(self, candles: Dict[str, list], tickers: Optional[Dict[str, Dict]] = None) -> int:
+        """Publish one cycle's market data and notify every worker
+
+        Returns:
+            Cycle sequence number
+        """
+        message = self.snapshot.publish(candles, tickers)
+        for group in self.groups.values():
+            if not group['idle']:
+                group['tasks'].put(message)
+
+        self.metrics['cycles_published'] += 1
+        return message['seq']
+
+    def collect(self, timeout: float = 0.0) -> List[Dict]:
+        """Drain worker results without blocking longer than timeout
+
+        Returns:
+            Signals received, each tagged with group and seq
+        """
+        signals = []
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                result = self.results.get(timeout=remaining) if remaining > 0 else self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            group = self.groups.get(result['group'])
+            if result['type'] == 'ready':
+                if group:
+                    group['ready'] = True
+                    if not result['hooked']:
+                        print(f"⚠️ Worker group {result['group']}: no bot implements on_market_snapshot, stopping it")
+                        group['idle'] = True
+                        group['tasks'].put(None)
+                continue
+
+            if group:
+                group['last_seq'] = result['seq']
+                group['last_seconds'] = result['seconds']
+            if result['stale']:
+                self.metrics['stale_results'] += 1
+            for bot, error in result['errors'].items():
+                self.metrics['worker_errors'] += 1
+                print(f"❌ Worker {result['group']}/{bot} error: {error}")
+
+            for signal in result['signals']:
+                signals.append(dict(signal, group=result['group'], seq=result['seq'], stale=result['stale']))
+
+        self.metrics['signals_received'] += len(signals)
+        return signals
+
+    def wait(self, seq: int, timeout: float = 30.0) -> List[Dict]:
+        """Collect until every ready group has reported cycle seq (or timeout)"""
+        signals = []
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            signals.extend(self.collect(timeout=min(0.05, max(0.0, deadline - time.monotonic()))))
+            pending = [g for g in self.groups.values()
+                       if g['ready'] and not g['idle'] and (g['last_seq'] is None or g['last_seq'] < seq)]
+            if not pending:
+                break
+
+        return signals
+
+    def stop(self, timeout: float = 5.0):
+        """Stop workers and free the shared snapshot"""
+        for group in self.groups.values():
+            if group['process'] and group['process'].is_alive():
+                group['tasks'].put(None)
+
+        for group in self.groups.values():
+            if group['process']:
+                group['process'].join(timeout)
+                if group['process'].is_alive():
+                    group['process'].terminate()
+
+        self.snapshot.close()
+
+    def get_status(self) -> Dict:
+        """Get pool status"""
+        return {
+            'symbols': self.snapshot.symbols,
+            'groups': {
+                name: {
+                    'bots': len(group['bots']),
+                    'pid': group['process'].pid if group['process'] else None,
+                    'alive': bool(group['process'] and group['process'].is_alive()),
+                    'ready': group['ready'],
+                    'idle': group['idle'],
+                    'last_seq': group['last_seq'],
+                    'last_seconds': group['last_seconds']
+                }
+                for name, group in self.groups.items()
+            },
+            'metrics': self.metrics,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+# Test functionality
+def test_process_workers():
+    """Test process workers"""
+    print("🧪 Testing Process Workers...")
+
+    rng = np.random.default_rng(0)
+    symbols = ['BTC/USDT', 'ETH/USDT']
+    now = int(time.time() * 1000)
+    candles = {}
+    for symbol, base in zip(symbols, (26000.0, 1600.0)):
+        closes = base * np.exp(np.cumsum(rng.normal(0, 0.002, 60)))
+        closes[-3:] *= 0.93 if symbol == 'ETH/USDT' else 1.0
+        candles[symbol] = [[now - (60 - i) * 300000, c, c * 1.001, c * 0.999, c, 10.0]
+                           for i, c in enumerate(closes)]
+
+    pool = BotWorkerPool(symbols, n_bars=60)
+    pool.add_group('CORE_APEX', ['crash_shield_bot'])
+    print(f"✅ Workers ready: {pool.start()}")
+
+    seq = pool.publish(candles)
+    signals = pool.wait(seq, timeout=10.0)
+    print(f"✅ Cycle {seq} signals: {[(s['symbol'], s['crash_level']) for s in signals]}")
+
+    pool.stop()
+
+
+if __name__ == '__main__':
+    test_process_workers()
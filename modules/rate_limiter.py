@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Rate Limiter - Shared priority token bucket for all TPS19 exchange calls"""
+
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from single_flight import SingleFlight, request_key
+from circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+
+try:
+    import ccxt
+    EXCHANGE_FAILURES = (ccxt.NetworkError, ConnectionError, TimeoutError)
+except ImportError:
+    EXCHANGE_FAILURES = (ConnectionError, TimeoutError)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# Priority classes, highest first
+PRIORITIES = ('orders', 'positions', 'analytics')
+
+# Share of capacity each class must leave in the bucket, so that near the
+# limit analytics are shed first and orders (including stop exits) always
+# find tokens
+DEFAULT_RESERVES = {'orders': 0.0, 'positions': 0.15, 'analytics': 0.35}
+
+# Longest a caller of each class waits for tokens before the call is shed
+DEFAULT_MAX_WAIT = {'orders': 30.0, 'positions': 10.0, 'analytics': 2.0}
+
+# Token cost per ccxt method (heavier endpoints cost more)
+ENDPOINT_WEIGHTS = {
+    'create_order': 1,
+    'create_market_buy_order': 1,
+    'create_market_sell_order': 1,
+    'create_limit_buy_order': 1,
+    'create_limit_sell_order': 1,
+    'cancel_order': 1,
+    'cancel_all_orders': 2,
+    'edit_order': 1,
+    'fetch_order': 1,
+    'fetch_open_orders': 2,
+    'fetch_my_trades': 2,
+    'fetch_balance': 2,
+    'fetch_positions': 2,
+    'fetch_ticker': 1,
+    'fetch_tickers': 5,
+    'fetch_order_book': 2,
+    'fetch_trades': 2,
+    'fetch_ohlcv': 2,
+    'fetch_markets': 10,
+    'load_markets': 10
+}
+
+# Methods that always run in the orders class, whatever the client default
+ORDER_METHODS = {name for name in ENDPOINT_WEIGHTS if name.startswith(('create_', 'cancel_', 'edit_'))}
+
+# Prefixes of ccxt methods that hit the exchange
+GUARDED_PREFIXES = ('fetch_', 'create_', 'cancel_', 'edit_', 'load_markets')
+
+# Read-only calls that identical concurrent callers may share
+COALESCED_PREFIXES = ('fetch_', 'load_markets')
+
+# Market data reads the breaker may answer from its last good response, and
+# the oldest response (seconds) each may serve; account and order reads
+# (fetch_order, fetch_balance, ...) fail fast instead
+CACHED_READS = {
+    'fetch_ticker': 15,
+    'fetch_tickers': 15,
+    'fetch_order_book': 5,
+    'fetch_l2_order_book': 5,
+    'fetch_ohlcv': 120,
+    'fetch_trades': 30,
+    'fetch_markets': 3600,
+    'load_markets': 3600
+}
+
+# Priority classes whose reads may be answered from the cache; protective
+# reads (crash and stop-loss checks use 'positions') fail fast instead
+CACHED_PRIORITIES = ('analytics',)
+
+
+class RateLimitShed(Exception):
+    """Raised when a call is dropped to keep headroom for higher priorities"""
+
+
+class TokenBucket:
+    """In-process token bucket"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """Initialize bucket
+
+        Args:
+            capacity: Maximum tokens (burst size)
+            refill_rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, weight: float, floor: float = 0.0) -> float:
+        """Take tokens if at least floor would remain
+
+        Returns:
+            0.0 if taken, otherwise seconds until enough tokens refill
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+            self.updated = now
+
+            if self.tokens - weight >= floor:
+                self.tokens -= weight
+                return 0.0
+            return (weight + floor - self.tokens) / self.refill_rate
+
+    def available(self) -> float:
+        with self._lock:
+            return min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.refill_rate)
+
+
+class RedisTokenBucket:
+    """Token bucket kept in Redis so every process shares one budget
+
+    State is a hash (tokens, ts) updated with WATCH/MULTI; time comes from
+    the Redis server so hosts with skewed clocks agree.
+    """
+
+    def __init__(self, redis_like, key: str, capacity: float, refill_rate: float):
+        """Initialize bucket
+
+        Args:
+            redis_like: RedisIntegration or redis client (decode_responses=True)
+            key: Redis key shared by all processes using this budget
+            capacity: Maximum tokens (burst size)
+            refill_rate: Tokens added per second
+        """
+        self.redis = redis_like.client if hasattr(redis_like, 'connected') else redis_like
+        self.key = key
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.ttl_ms = int(max(60.0, 2 * capacity / refill_rate) * 1000)
+
+    def _state(self, conn):
+        seconds, micros = conn.time()
+        now = seconds + micros / 1e6
+        tokens, updated = conn.hmget(self.key, 'tokens', 'ts')
+        if tokens is None:
+            return self.capacity, now
+        return min(self.capacity, float(tokens) + (now - float(updated)) * self.refill_rate), now
+
+    def take(self, weight: float, floor: float = 0.0) -> float:
+        """Take tokens if at least floor would remain
+
+        Returns:
+            0.0 if taken, otherwise seconds until enough tokens refill
+        """
+        for _ in range(5):
+            with self.redis.pipeline() as pipe:
+                try:
+                    pipe.watch(self.key)
+                    tokens, now = self._state(pipe)
+                    if tokens - weight < floor:
+                        pipe.unwatch()
+                        return (weight + floor - tokens) / self.refill_rate
+
+                    pipe.multi()
+                    pipe.hset(self.key, mapping={'tokens': tokens - weight, 'ts': now})
+                    pipe.pexpire(self.key, self.ttl_ms)
+                    pipe.execute()
+                    return 0.0
+                except redis.WatchError:
+                    continue
+
+        # Heavy contention: retry shortly
+        return 0.01
+
+    def available(self) -> float:
+        return self._state(self.redis)[0]
+
+
+class RateLimiter:
+    """Priority-aware limiter every exchange call goes through"""
+
+    def __init__(self, capacity: float = 100, refill_rate: float = 100 / 60,
+                 reserves: Optional[Dict[str, float]] = None, max_wait: Optional[Dict[str, float]] = None,
+                 redis_like=None, key: str = 'ratelimit:cryptocom'):
+        """Initialize rate limiter
+
+        Args:
+            capacity: Token bucket size (burst)
+            refill_rate: Tokens per second (sustained request weight)
+            reserves: Share of capacity each priority class must leave unused
+            max_wait: Seconds each class may wait before being shed
+            redis_like: Share the bucket across processes through Redis
+            key: Redis key of the shared bucket
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.reserves = dict(DEFAULT_RESERVES, **(reserves or {}))
+        self.max_wait = dict(DEFAULT_MAX_WAIT, **(max_wait or {}))
+        self.key = key
+
+        self.bucket = TokenBucket(capacity, refill_rate)
+        if redis_like is not None:
+            self.share(redis_like)
+
+        self.metrics = {p: {'calls': 0, 'weight': 0, 'waited': 0.0, 'shed': 0} for p in PRIORITIES}
+        self._lock = threading.Lock()
+
+        # Identical reads in flight share one call (and one set of tokens)
+        self.flights = SingleFlight()
+
+    def share(self, redis_like):
+        """Move the bucket to Redis so all processes draw from one budget"""
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis package is required for a shared rate limit")
+        self.bucket = RedisTokenBucket(redis_like, self.key, self.capacity, self.refill_rate)
+
+    @staticmethod
+    def weight_of(method: str) -> float:
+        return ENDPOINT_WEIGHTS.get(method, 1)
+
+    def acquire(self, method: str, priority: str = 'analytics', weight: Optional[float] = None) -> float:
+        """Block until the call may go out
+
+        Args:
+            method: ccxt method name (sets the default weight)
+            priority: 'orders', 'positions' or 'analytics'
+            weight: Override the endpoint weight
+
+        Returns:
+            Seconds waited
+
+        Raises:
+            RateLimitShed: The call could not be admitted within its class max_wait
+        """
+        if priority not in self.metrics:
+            raise ValueError(f"Unknown priority '{priority}'")
+
+        weight = self.weight_of(method) if weight is None else weight
+        floor = min(self.reserves[priority] * self.capacity, max(0.0, self.capacity - weight))
+        started = time.monotonic()
+
+        while True:
+            wait = self.bucket.take(weight, floor)
+            waited = time.monotonic() - started
+            if wait == 0.0:
+                break
+            if waited + wait > self.max_wait[priority]:
+                with self._lock:
+                    self.metrics[priority]['shed'] += 1
+                raise RateLimitShed(f"{method} ({priority}) shed: needs {wait:.2f}s for {weight} tokens")
+            time.sleep(wait)
+
+        with self._lock:
+            stats = self.metrics[priority]
+            stats['calls'] += 1
+            stats['weight'] += weight
+            stats['waited'] += waited
+        return waited
+
+    def guard(self, exchange, priority: str = 'analytics') -> 'GuardedExchange':
+        """Route a ccxt client through this limiter
+
+        ccxt's own per-client throttle is turned off, since this limiter is
+        now the single budget for every client sharing it.
+        """
+        if isinstance(exchange, GuardedExchange):
+            exchange = exchange.exchange
+        exchange.enableRateLimit = False
+        return GuardedExchange(exchange, self, priority, flights=self.flights,
+                               breaker=exchange_breaker(exchange))
+
+    def get_status(self) -> Dict:
+        """Get limiter status"""
+        return {
+            'backend': 'redis' if isinstance(self.bucket, RedisTokenBucket) else 'local',
+            'capacity': self.capacity,
+            'refill_rate': self.refill_rate,
+            'available': self.bucket.available(),
+            'reserves': self.reserves,
+            'metrics': self.metrics,
+            'coalescing': self.flights.get_status(),
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+def exchange_breaker(exchange) -> CircuitBreaker:
+    """Shared circuit breaker for an exchange's read endpoints
+
+    Only network-level errors (timeouts, exchange unavailable) count;
+    rejected symbols or parameters and rate-limit sheds do not.
+    """
+    return get_breaker(f"exchange:{getattr(exchange, 'id', 'unknown')}", failure_threshold=5,
+                       reset_timeout=30, slow_call_seconds=10, max_cache_age=max(CACHED_READS.values()),
+                       max_cache_entries=512, failure_types=EXCHANGE_FAILURES)
+
+
+def mark_stale(method: str, value, age: float):
+    """Copy of a cached response flagged with 'stale' and its 'age' in seconds
+
+    Tickers and order books are flagged directly, fetch_tickers per ticker.
+    List responses (candles, trades) are returned as is; use
+    GuardedExchange.call_with_age to get their age.
+    """
+    if not isinstance(value, dict):
+        return value
+    if method == 'fetch_tickers':
+        return {symbol: mark_stale('fetch_ticker', ticker, age) for symbol, ticker in value.items()}
+    return dict(value, stale=True, age=age)
+
+
+class GuardedExchange:
+    """ccxt client proxy that takes tokens before every exchange call
+
+    Order placement and cancellation always use the 'orders' class; all
+    other endpoints use the priority given for the client. limiter can be
+    anything with ``acquire(method, priority)`` (RateLimiter, APIGuardianBot).
+
+    With flights set, identical read calls in flight on any client sharing
+    it collapse into one request. A caller whose shared request was shed at
+    a lower priority retries under its own class. With a breaker set, reads
+    fail fast while the exchange is down. On analytics clients, market data
+    reads (CACHED_READS) return the last good response for the same call
+    instead, if it is recent enough, marked with its age (see mark_stale).
+    Protective clients ('positions') and order, balance and position reads
+    raise rather than act on stale state. Orders always go to the exchange.
+    """
+
+    def __init__(self, exchange, limiter, priority: str = 'analytics', flights: Optional[SingleFlight] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.__dict__['exchange'] = exchange
+        self.__dict__['limiter'] = limiter
+        self.__dict__['priority'] = priority
+        self.__dict__['flights'] = flights
+        self.__dict__['breaker'] = breaker
+
+    def __getattr__(self, name):
+        attr = getattr(self.exchange, name)
+        if not callable(attr) or not name.startswith(GUARDED_PREFIXES):
+            return attr
+
+        def guarded(*args, **kwargs):
+            value, age = self.call_with_age(name, *args, **kwargs)
+            return mark_stale(name, value, age) if age > 0 else value
+
+        guarded.__name__ = name
+        return guarded
+
+    def call_with_age(self, name: str, *args, **kwargs):
+        """Call a guarded exchange method
+
+        Returns:
+            (response, age in seconds); age is 0.0 unless the breaker served
+            a cached response
+        """
+        attr = getattr(self.exchange, name)
+        priority = 'orders' if name in ORDER_METHODS else self.priority
+        read = name.startswith(COALESCED_PREFIXES)
+        coalesce = read and self.flights is not None
+        breaker = self.breaker if read else None
+        cached = name in CACHED_READS
+        key = request_key(self.exchange, name, args, kwargs)
+        ran = []
+
+        def send():
+            ran.append(True)
+            self.limiter.acquire(name, priority)
+            return attr(*args, **kwargs)
+
+        def call():
+            if breaker is None:
+                return send(), 0.0
+            return breaker.call_with_age(send, cache_key=key, fallback=cached, max_age=CACHED_READS.get(name))
+
+        if not coalesce:
+            return self._fresh_or_allowed(name, *call())
+
+        try:
+            value, age = self.flights.do(key, call)
+        except RateLimitShed:
+            if ran:
+                raise
+            value, age = call()
+        return self._fresh_or_allowed(name, value, age)
+
+    def _fresh_or_allowed(self, name: str, value, age: float):
+        # A shared flight may fall back for an analytics caller; protective
+        # callers on the same flight get an error instead
+        if age > 0 and self.priority not in CACHED_PRIORITIES:
+            raise CircuitOpenError(f"{name} is down; only a response {age:.0f}s old is cached")
+        return value, age
+
+    def __setattr__(self, name, value):
+        setattr(self.exchange, name, value)
+
+
+# Test functionality
+def test_rate_limiter():
+    """Test rate limiter"""
+    print("🧪 Testing Rate Limiter...")
+
+    limiter = RateLimiter(capacity=10, refill_rate=5, max_wait={'analytics': 0.0})
+
+    admitted, shed = 0, 0
+    for _ in range(10):
+        try:
+            limiter.acquire('fetch_ohlcv', 'analytics', weight=1)
+            admitted += 1
+        except RateLimitShed:
+            shed += 1
+    print(f"✅ Analytics burst: {admitted} admitted, {shed} shed")
+
+    waited = limiter.acquire('create_order', 'orders')
+    print(f"✅ Order admitted after {waited:.2f}s")
+
+    print(f"✅ Available tokens: {limiter.get_status()['available']:.1f}")
+
+
+if __name__ == '__main__':
+    test_rate_limiter()
@@ -13,6 +13,8 @@ import os
 from datetime import datetime
 import logging
 
+from circuit_breaker import get_breaker
+
 class RealtimeDataFeed:
     def __init__(self):
         self.db_path = "/opt/tps19/data/market_data.db"
@@ -20,6 +22,7 @@ class RealtimeDataFeed:
         self.init_database()
         self.active = False
         self.data_thread = None
+        self.coingecko = get_breaker('coingecko', failure_threshold=3, reset_timeout=60, slow_call_seconds=5)
         
     def init_database(self):
         try:
@@ -70,7 +73,7 @@ class RealtimeDataFeed:
                 
                 for symbol in symbols:
                     data = self.fetch_price_data(symbol)
-                    if data:
+                    if data and not data['stale']:
                         self.store_market_data(data)
                         
                 time.sleep(60)  # Update every minute (API rate limit friendly)
@@ -79,32 +82,45 @@ class RealtimeDataFeed:
                 print(f"❌ Data feed error: {e}")
                 time.sleep(120)  # Wait longer on error
                 
+    def _request_price_data(self, symbol):
+        url = f"https://api.coingecko.com/api/v3/simple/price"
+        params = {
+            'ids': symbol,
+            'vs_currencies': 'usd',
+            'include_24hr_vol': 'true',
+            'include_24hr_change': 'true',
+            'include_market_cap': 'true'
+        }
+        
+        response = requests.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        
+        if symbol not in data:
+            return None
+        
+        coin_data = data[symbol]
+        return {
+            'symbol': symbol.upper(),
+            'price': coin_data['usd'],
+            'volume': coin_data.get('usd_24h_vol', 0),
+            'market_cap': coin_data.get('usd_market_cap', 0),
+            'price_change_24h': coin_data.get('usd_24h_change', 0),
+            'source': 'coingecko'
+        }
+        
     def fetch_price_data(self, symbol):
-        """Fetch price data from API"""
+        """Fetch price data from API
+        
+        Goes through the shared CoinGecko circuit breaker: while the API is
+        failing the last good data is returned with 'stale' set and its
+        'age' in seconds, without waiting on the network.
+        """
         try:
-            url = f"https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                'ids': symbol,
-                'vs_currencies': 'usd',
-                'include_24hr_vol': 'true',
-                'include_24hr_change': 'true',
-                'include_market_cap': 'true'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
-            
-            if symbol in data:
-                coin_data = data[symbol]
-                return {
-                    'symbol': symbol.upper(),
-                    'price': coin_data['usd'],
-                    'volume': coin_data.get('usd_24h_vol', 0),
-                    'market_cap': coin_data.get('usd_market_cap', 0),
-                    'price_change_24h': coin_data.get('usd_24h_change', 0),
-                    'source': 'coingecko'
-                }
-                
+            data, age = self.coingecko.call_with_age(self._request_price_data, symbol,
+                                                     cache_key=('price_data', symbol))
+            if data:
+                return dict(data, age=age, stale=age > 0)
         except Exception as e:
             print(f"❌ API fetch error for {symbol}: {e}")
             
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 import os, json, sqlite3, time, random
 from datetime import datetime, timedelta
+try:
+    from ..startup import LazySingleton
+except ImportError:
+    from startup import LazySingleton
+try:
+    from .matching_engine import MatchingEngine
+except ImportError:
+    from simulation.matching_engine import MatchingEngine
 class TPS19SimulationEngine:
-    def __init__(self, initial_balance=10000.0):
-        self.db_path = '/opt/tps19/data/simulation.db'
+    def __init__(self, initial_balance=10000.0, matching_engine=None, flush_every=1000, db_path='/opt/tps19/data/simulation.db'):
+        self.db_path = db_path
         self.initial_balance = initial_balance
         self.current_balance = initial_balance
         self.portfolio = {}
@@ -11,6 +19,13 @@ class TPS19SimulationEngine:
         self.simulation_active = False
         self.simulation_id = None
         self.start_time = None
+        # Pairs with an order book are matched against it; trades are written to SQLite in batches
+        self.matching = matching_engine or MatchingEngine()
+        self.matching.on_fill(self._on_match_fill)
+        # Orders still working hold back their cash (buys) or asset (sells): order id -> (order, price reserved at)
+        self._reservations = {}
+        self.flush_every = flush_every
+        self._unflushed = []
         self._init_database()
     def _init_database(self):
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
@@ -30,6 +45,7 @@ class TPS19SimulationEngine:
         self.current_balance = self.initial_balance
         self.portfolio = {}
         self.trade_history = []
+        self._reservations = {}
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         cursor.execute("""INSERT INTO simulation_sessions (session_id, initial_balance, current_balance, start_time, status) VALUES (?, ?, ?, ?, 'active')""", (self.simulation_id, self.initial_balance, self.current_balance, self.start_time))
@@ -40,47 +56,122 @@ class TPS19SimulationEngine:
     def simulate_trade(self, pair, side, amount, strategy="manual"):
         if not self.simulation_active:
             return {"error": "No active simulation"}
+        if self.matching.has_book(pair):
+            return self._simulate_matched_trade(pair, side, amount)
         current_price = self._get_simulated_price(pair)
         if not current_price:
             return {"error": f"No price data for {pair}"}
         fee_rate = 0.001
         trade_id = f"sim_{int(time.time())}_{len(self.trade_history)}"
+        if side.lower() == 'buy' and amount * current_price * (1 + fee_rate) > self.current_balance:
+            return {"error": "Insufficient balance"}
+        if side.lower() != 'buy' and self._asset_quantity(pair) < amount:
+            return {"error": "Insufficient asset balance"}
+        trade_result = self._apply_trade(trade_id, pair, side, amount, current_price, amount * current_price * fee_rate)
+        print(f"🎮 Simulated {side} {amount} {pair} @ ${current_price:.2f}")
+        return trade_result
+    def _simulate_matched_trade(self, pair, side, amount):
+        check = self._check_funds(pair, side, amount)
+        if check:
+            return check
+        order = self._submit_reserved(pair, side, amount)
+        self.matching.advance(order.active_at)
+        if not order.filled:
+            return {"error": f"No liquidity for {pair}", "order_id": order.id, "status": order.status}
+        print(f"🎮 Matched {side} {order.filled} {pair} @ ${order.cost / order.filled:.2f} ({order.fills} fills)")
+        return {"trade_id": f"sim_{order.id}", "pair": pair, "side": side, "amount": order.filled, "requested": amount, "price": order.cost / order.filled, "fee": order.fee, "status": "filled" if order.status == 'closed' else "partially_filled", "timestamp": datetime.now().isoformat()}
+    def place_order(self, pair, side, amount, order_type='market', price=None, post_only=False):
+        if not self.simulation_active:
+            return {"error": "No active simulation"}
+        check = self._check_funds(pair, side, amount, price)
+        if check:
+            return check
+        return self._submit_reserved(pair, side, amount, order_type, price, post_only).to_ccxt()
+    def _reference_price(self, pair, price=None):
+        book = self.matching.books.get(pair)
+        return price or (book['asks'][0][0] if book and book['asks'] else None)
+    def _submit_reserved(self, pair, side, amount, order_type='market', price=None, post_only=False):
+        reference = self._reference_price(pair, price)
+        order = self.matching.submit(pair, side.lower(), amount, order_type, price, post_only)
+        self._reservations[order.id] = (order, reference)
+        return order
+    def _reserved(self):
+        """Cash and per-asset quantities held back by orders still working"""
+        cash, assets = 0.0, {}
+        for order_id, (order, reference) in list(self._reservations.items()):
+            if order.status not in ('pending', 'resting'):
+                del self._reservations[order_id]
+            elif order.side == 'buy':
+                cash += order.remaining * reference * (1 + self.matching.taker_fee)
+            else:
+                asset = self._asset(order.symbol)
+                assets[asset] = assets.get(asset, 0.0) + order.remaining
+        return cash, assets
+    def _check_funds(self, pair, side, amount, price=None):
+        if not self.matching.books.get(pair):
+            return {"error": f"No order book for {pair}"}
+        reserved_cash, reserved_assets = self._reserved()
         if side.lower() == 'buy':
-            cost = amount * current_price
-            fee = cost * fee_rate
-            total_cost = cost + fee
-            if total_cost > self.current_balance:
+            reference = self._reference_price(pair, price)
+            if reference is None or amount * reference * (1 + self.matching.taker_fee) > self.current_balance - reserved_cash:
                 return {"error": "Insufficient balance"}
+        elif self._asset_quantity(pair) - reserved_assets.get(self._asset(pair), 0.0) < amount:
+            return {"error": "Insufficient asset balance"}
+        return None
+    def feed_book(self, pair, book, timestamp=None):
+        self.matching.on_book(pair, book, timestamp if timestamp is not None else time.time())
+    def replay(self, snapshots, strategy=None):
+        started = time.perf_counter()
+        orders_before, fills_before = self.matching.metrics['orders'], self.matching.metrics['fills']
+        for snapshot in snapshots:
+            self.matching.on_book(snapshot['symbol'], snapshot, snapshot['timestamp'] / 1000)
+            if strategy:
+                strategy(self, snapshot)
+        self._flush_trades()
+        elapsed = time.perf_counter() - started
+        orders = self.matching.metrics['orders'] - orders_before
+        return {"snapshots": len(snapshots), "orders": orders, "fills": self.matching.metrics['fills'] - fills_before, "elapsed": elapsed, "orders_per_sec": orders / elapsed if elapsed else 0.0, "balance": self.current_balance}
+    def _on_match_fill(self, fill):
+        if self.simulation_active:
+            self._apply_trade(f"sim_{fill['order_id']}_{self.matching.metrics['fills']}", fill['symbol'], fill['side'], fill['amount'], fill['price'], fill['fee'])
+    @staticmethod
+    def _asset(pair):
+        return pair.replace('/', '_').split('_')[0]
+    def _asset_quantity(self, pair):
+        return self.portfolio.get(self._asset(pair), {}).get('quantity', 0.0)
+    def _apply_trade(self, trade_id, pair, side, amount, price, fee):
+        asset = self._asset(pair)
+        if side.lower() == 'buy':
+            cost = amount * price
+            total_cost = cost + fee
             self.current_balance -= total_cost
-            asset = pair.split('_')[0]
             if asset in self.portfolio:
                 old_qty = self.portfolio[asset]['quantity']
                 old_price = self.portfolio[asset]['avg_price']
                 new_qty = old_qty + amount
-                new_avg_price = ((old_qty * old_price) + (amount * current_price)) / new_qty
+                new_avg_price = ((old_qty * old_price) + (amount * price)) / new_qty
                 self.portfolio[asset] = {'quantity': new_qty, 'avg_price': new_avg_price}
             else:
-                self.portfolio[asset] = {'quantity': amount, 'avg_price': current_price}
-            trade_result = {"trade_id": trade_id, "pair": pair, "side": side, "amount": amount, "price": current_price, "cost": cost, "fee": fee, "total_cost": total_cost, "status": "filled", "timestamp": datetime.now().isoformat()}
+                self.portfolio[asset] = {'quantity': amount, 'avg_price': price}
+            trade_result = {"trade_id": trade_id, "pair": pair, "side": side, "amount": amount, "price": price, "cost": cost, "fee": fee, "total_cost": total_cost, "status": "filled", "timestamp": datetime.now().isoformat()}
         else:
-            asset = pair.split('_')[0]
-            if asset not in self.portfolio or self.portfolio[asset]['quantity'] < amount:
-                return {"error": "Insufficient asset balance"}
-            revenue = amount * current_price
-            fee = revenue * fee_rate
+            revenue = amount * price
             net_revenue = revenue - fee
-            avg_price = self.portfolio[asset]['avg_price']
-            pnl = (current_price - avg_price) * amount - fee
+            avg_price = self.portfolio[asset]['avg_price'] if asset in self.portfolio else price
+            pnl = (price - avg_price) * amount - fee
             self.current_balance += net_revenue
-            self.portfolio[asset]['quantity'] -= amount
-            if self.portfolio[asset]['quantity'] <= 0:
-                del self.portfolio[asset]
-            trade_result = {"trade_id": trade_id, "pair": pair, "side": side, "amount": amount, "price": current_price, "revenue": revenue, "fee": fee, "net_revenue": net_revenue, "pnl": pnl, "status": "filled", "timestamp": datetime.now().isoformat()}
+            if asset in self.portfolio:
+                self.portfolio[asset]['quantity'] -= amount
+                if self.portfolio[asset]['quantity'] <= 1e-12:
+                    del self.portfolio[asset]
+            trade_result = {"trade_id": trade_id, "pair": pair, "side": side, "amount": amount, "price": price, "revenue": revenue, "fee": fee, "net_revenue": net_revenue, "pnl": pnl, "status": "filled", "timestamp": datetime.now().isoformat()}
         self.trade_history.append(trade_result)
         self._store_trade(trade_result)
-        print(f"🎮 Simulated {side} {amount} {pair} @ ${current_price:.2f}")
         return trade_result
     def _get_simulated_price(self, pair):
+        mid = self.matching.mid_price(pair) or self.matching.mid_price(pair.replace('_', '/'))
+        if mid:
+            return mid
         base_prices = {'BTC_USDT': 45000.0, 'ETH_USDT': 2800.0, 'ADA_USDT': 0.45, 'DOT_USDT': 6.50, 'MATIC_USDT': 0.85, 'SOL_USDT': 95.0, 'AVAX_USDT': 35.0, 'ATOM_USDT': 12.0, 'LINK_USDT': 14.5, 'UNI_USDT': 6.2}
         if pair not in base_prices:
             return None
@@ -88,14 +179,20 @@ class TPS19SimulationEngine:
         fluctuation = random.uniform(-0.02, 0.02)
         return round(base_price * (1 + fluctuation), 8)
     def _store_trade(self, trade):
+        self._unflushed.append((self.simulation_id, trade['trade_id'], trade['pair'], trade['side'], trade['amount'], trade['price'], trade.get('fee', 0), trade['timestamp'], 'filled', trade.get('pnl', 0)))
+        if len(self._unflushed) >= self.flush_every:
+            self._flush_trades()
+    def _flush_trades(self):
+        if not self._unflushed:
+            return
+        rows, self._unflushed = self._unflushed, []
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""INSERT INTO simulation_trades (session_id, trade_id, pair, side, amount, price, fee, timestamp, status, pnl) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", (self.simulation_id, trade['trade_id'], trade['pair'], trade['side'], trade['amount'], trade['price'], trade.get('fee', 0), datetime.now(), 'filled', trade.get('pnl', 0)))
+            conn.executemany("""INSERT INTO simulation_trades (session_id, trade_id, pair, side, amount, price, fee, timestamp, status, pnl) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
             conn.commit()
             conn.close()
         except Exception as e:
-            print(f"❌ Failed to store trade: {e}")
+            print(f"❌ Failed to store {len(rows)} trades: {e}")
     def get_portfolio_value(self):
         total_value = self.current_balance
         portfolio_details = {}
@@ -110,6 +207,7 @@ class TPS19SimulationEngine:
     def stop_simulation(self):
         if not self.simulation_active:
             return {"error": "No active simulation"}
+        self._flush_trades()
         end_time = datetime.now()
         duration = end_time - self.start_time
         total_pnl = self.current_balance - self.initial_balance
@@ -123,4 +221,13 @@ class TPS19SimulationEngine:
         self.simulation_active = False
         print(f"🏁 Simulation completed: {total_pnl:+.2f} ({total_pnl/self.initial_balance*100:+.1f}%)")
         return results
-simulation_engine = TPS19SimulationEngine()
+# Global instance, created on first access so importing this module has no side effects
+_simulation_engine = LazySingleton('simulation_engine', TPS19SimulationEngine)
+
+def get_simulation_engine() -> TPS19SimulationEngine:
+    return _simulation_engine.get()
+
+def __getattr__(name):
+    if name == 'simulation_engine':
+        return _simulation_engine.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Single Flight - Collapse identical concurrent exchange requests for TPS19"""
+
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight request and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Identical requests in flight at the same time share one execution
+
+    The first caller for a key runs the function; callers arriving before it
+    finishes block and receive the same result (or exception). Nothing is
+    cached afterwards, so the next request after completion goes out again.
+    Shared results are the same object for every caller and must be treated
+    as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.metrics = {
+            'requests': 0,
+            'executed': 0,
+            'shared': 0
+        }
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) unless the same key is already in flight
+
+        Args:
+            key: Identity of the request (e.g. method and arguments)
+            func: Function performing the request
+
+        Returns:
+            The result of the single shared execution
+        """
+        with self._lock:
+            self.metrics['requests'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.metrics['executed'] += 1
+            else:
+                call.waiters += 1
+                self.metrics['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def get_status(self) -> Dict:
+        """Get coalescing statistics"""
+        requests = self.metrics['requests']
+        return {
+            'in_flight': self.in_flight(),
+            'metrics': self.metrics,
+            'shared_pct': (self.metrics['shared'] / requests * 100) if requests else 0.0,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+def request_key(exchange, method: str, args: tuple, kwargs: Dict) -> tuple:
+    """Key for a ccxt call: same exchange, account, method and arguments"""
+    return (getattr(exchange, 'id', id(exchange)), getattr(exchange, 'apiKey', None),
+            method, repr(args), repr(sorted(kwargs.items())))
+
+
+# Test functionality
+def test_single_flight():
+    """Test single flight"""
+    print("🧪 Testing Single Flight...")
+
+    import time
+    flights = SingleFlight()
+    executions = []
+
+    def slow_ticker(symbol):
+        executions.append(symbol)
+        time.sleep(0.2)
+        return {'symbol': symbol, 'last': 26000.0}
+
+    threads = [threading.Thread(target=flights.do, args=(('fetch_ticker', 'BTC/USDT'), slow_ticker, 'BTC/USDT'))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"✅ 8 concurrent requests, {len(executions)} network call(s)")
+    print(f"✅ Shared: {flights.get_status()['shared_pct']:.0f}%")
+
+
+if __name__ == '__main__':
+    test_single_flight()
@@ -4,6 +4,10 @@
 import os, json, sqlite3, threading, time, hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
+try:
+    from ..startup import LazySingleton
+except ImportError:
+    from startup import LazySingleton
 
 class SIULCore:
     """Smart Intelligent Unified Logic - Central Intelligence System"""
@@ -365,5 +369,13 @@ class TrendIntelligenceModule:
         except Exception as e:
             return {'score': 0.5, 'confidence': 0.1, 'reasoning': f"Error: {e}", 'module': 'trend_predictor'}
 
-# Global SIUL instance
-siul_core = SIULCore()
+# Global instance, created on first access so importing this module has no side effects
+_siul_core = LazySingleton('siul_core', SIULCore)
+
+def get_siul_core() -> SIULCore:
+    return _siul_core.get()
+
+def __getattr__(name):
+    if name == 'siul_core':
+        return _siul_core.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Startup Profiler - Lazy singletons and per-module cold start timing for TPS19"""
+
+import os
+import sys
+import time
+import importlib
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+
+class StartupProfiler:
+    """Records how long each import and singleton creation takes"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.entries = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, kind: str = 'stage'):
+        """Time a block of startup work
+
+        Args:
+            name: Module or component name
+            kind: 'import', 'singleton', 'component' or 'stage'
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.entries.append({
+                    'name': name,
+                    'kind': kind,
+                    'seconds': time.perf_counter() - start,
+                    'at': start - self.started
+                })
+
+    def timed_import(self, module_name: str):
+        """Import a module and record the time it took"""
+        with self.stage(module_name, kind='import'):
+            return importlib.import_module(module_name)
+
+    def get_report(self) -> Dict:
+        """Timings sorted slowest first"""
+        with self._lock:
+            entries = sorted(self.entries, key=lambda e: e['seconds'], reverse=True)
+
+        return {
+            'total_seconds': time.perf_counter() - self.started,
+            'entries': entries,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def print_report(self, limit: int = 20):
+        """Print the slowest startup entries"""
+        report = self.get_report()
+
+        print(f"\n⏱️ Startup report ({report['total_seconds']:.3f}s since process start)")
+        for entry in report['entries'][:limit]:
+            print(f"   {entry['seconds']*1000:8.1f}ms  {entry['kind']:<9} {entry['name']}")
+
+
+# Process-wide profiler (holds only timings, no I/O)
+startup_profiler = StartupProfiler()
+
+
+class LazySingleton:
+    """Creates a shared instance on first get() instead of at import time"""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """Initialize lazy singleton
+
+        Args:
+            name: Name shown in the startup report
+            factory: Zero-argument callable creating the instance
+        """
+        self.name = name
+        self.factory = factory
+        self.instance = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the shared instance, creating it on first call"""
+        if self.instance is None:
+            with self._lock:
+                if self.instance is None:
+                    with startup_profiler.stage(self.name, kind='singleton'):
+                        self.instance = self.factory()
+        return self.instance
+
+    @property
+    def created(self) -> bool:
+        return self.instance is not None
+
+
+class LazyComponents(Mapping):
+    """Name -> component mapping whose values are built on first lookup
+
+    ``name in components`` is True as soon as a factory is registered, so
+    code that checks for a component keeps working; the component itself is
+    only created (and timed) when it is actually used.
+    """
+
+    def __init__(self):
+        self.factories = {}
+        self.instances = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register a zero-argument factory for a component"""
+        with self._lock:
+            self.factories[name] = factory
+
+    def add(self, name: str, instance: Any):
+        """Register a component that is already built"""
+        with self._lock:
+            self.factories[name] = lambda: instance
+            self.instances[name] = instance
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.instances:
+            with self._lock:
+                if name not in self.instances:
+                    factory = self.factories[name]
+                    with startup_profiler.stage(name, kind='component'):
+                        self.instances[name] = factory()
+        return self.instances[name]
+
+    def __contains__(self, name) -> bool:
+        # Mapping's default would build the component just to test membership
+        return name in self.factories
+
+    def __iter__(self):
+        # Components may be added from other threads while a caller iterates
+        with self._lock:
+            return iter(list(self.factories))
+
+    def __len__(self) -> int:
+        return len(self.factories)
+
+    def created(self) -> list:
+        """Names of components that have been built"""
+        return list(self.instances)
+
+
+def report_requested() -> bool:
+    """True when TPS19_STARTUP_REPORT is set or --startup-report was passed"""
+    return bool(os.environ.get('TPS19_STARTUP_REPORT')) or '--startup-report' in sys.argv
+
+
+# Test functionality
+def test_startup():
+    """Test startup profiler"""
+    print("🧪 Testing Startup Profiler...")
+
+    created = []
+    singleton = LazySingleton('demo', lambda: created.append(1) or object())
+    print(f"✅ Created before first use: {singleton.created}")
+
+    first = singleton.get()
+    print(f"✅ Same instance on reuse: {singleton.get() is first} (created {len(created)}x)")
+
+    startup_profiler.timed_import('json')
+    startup_profiler.print_report()
+
+
+if __name__ == '__main__':
+    test_startup()
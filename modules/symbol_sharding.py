@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Symbol Sharding - Redis leases for splitting trading pairs across TPS19 runner nodes"""
+
+import json
+import time
+import uuid
+import socket
+import zlib
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    from redis.exceptions import WatchError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+    class WatchError(Exception):
+        """Stand-in so lease transactions still catch conflicts without redis-py installed"""
+
+
+def _client(redis_like):
+    """Accept a RedisIntegration or a redis client"""
+    # redis clients have their own .client attribute; RedisIntegration is recognised by .connected
+    if hasattr(redis_like, 'connected'):
+        return redis_like.client
+    return redis_like
+
+
+def _compare_and_expire(redis, key: str, owner: str, ttl_ms: int) -> bool:
+    """Extend a lease only if owner still holds it (WATCH/MULTI, so an expiry in between is never renewed)"""
+    with redis.pipeline() as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.get(key) != owner:
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            pipe.pexpire(key, ttl_ms)
+            pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+def _compare_and_delete(redis, key: str, owner: str) -> bool:
+    """Delete a lease only if owner still holds it"""
+    with redis.pipeline() as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.get(key) != owner:
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            pipe.delete(key)
+            pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+class ShardCoordinator:
+    """Claims symbol partitions for one runner node
+
+    Symbols hash into a fixed number of partitions. Live nodes (heartbeats
+    in a sorted set) agree on an owner per partition with rendezvous
+    hashing, so a join or death only moves that node's share. Ownership is
+    enforced with per-partition lease keys: a node only evaluates
+    partitions whose lease it holds, renews them every heartbeat, releases
+    those it should hand over, and claims new ones once free or expired.
+    """
+
+    def __init__(self, redis_like, group: str = 'apex', node_id: str = None,
+                 partitions: int = 64, lease_ttl: float = 15.0):
+        """Initialize shard coordinator
+
+        Args:
+            redis_like: RedisIntegration or redis client (decode_responses=True)
+            group: Deployment name used as key prefix
+            node_id: Unique node name (default hostname plus random suffix)
+            partitions: Fixed partition count (must match across nodes)
+            lease_ttl: Seconds a lease/heartbeat stays valid without renewal
+        """
+        self.redis = _client(redis_like)
+        self.group = group
+        self.node_id = node_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.partitions = partitions
+        self.lease_ttl = lease_ttl
+
+        self.owned = set()
+        self.metrics = {
+            'heartbeats': 0,
+            'claimed': 0,
+            'released': 0,
+            'lost': 0,
+            'rebalances': 0
+        }
+        self.last_members = []
+
+    # ---- Keys -----------------------------------------------------------------
+
+    def _key(self, *parts) -> str:
+        return ':'.join(('shard', self.group) + tuple(str(p) for p in parts))
+
+    @property
+    def nodes_key(self) -> str:
+        return self._key('nodes')
+
+    def lease_key(self, partition: int) -> str:
+        return self._key('lease', partition)
+
+    # ---- Partitioning -----------------------------------------------------------
+
+    def partition_of(self, symbol: str) -> int:
+        """Stable partition for a symbol (same on every node)"""
+        return zlib.crc32(symbol.encode()) % self.partitions
+
+    @staticmethod
+    def _weight(node: str, partition: int) -> int:
+        digest = hashlib.blake2b(f"{node}|{partition}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+    def assignment(self, members: List[str]) -> Dict[int, str]:
+        """Rendezvous-hash owner of every partition for a member list"""
+        if not members:
+            return {}
+        return {p: max(members, key=lambda node: self._weight(node, p)) for p in range(self.partitions)}
+
+    def live_members(self, now: float = None) -> List[str]:
+        """Nodes whose heartbeat is within lease_ttl (dead ones are pruned)"""
+        now = time.time() if now is None else now
+        self.redis.zremrangebyscore(self.nodes_key, '-inf', now - self.lease_ttl)
+        return sorted(self.redis.zrangebyscore(self.nodes_key, now - self.lease_ttl, '+inf'))
+
+    # ---- Leases -------------------------------------------------------------------
+
+    def _renew(self, partition: int) -> bool:
+        """Extend our lease only if we still hold it (compare-and-expire)"""
+        return _compare_and_expire(self.redis, self.lease_key(partition), self.node_id, int(self.lease_ttl * 1000))
+
+    def _release(self, partition: int) -> bool:
+        """Delete our lease only if we still hold it (compare-and-delete)"""
+        return _compare_and_delete(self.redis, self.lease_key(partition), self.node_id)
+
+    def _claim(self, partition: int) -> bool:
+        return bool(self.redis.set(self.lease_key(partition), self.node_id,
+                                   nx=True, px=int(self.lease_ttl * 1000)))
+
+    def heartbeat(self) -> Dict:
+        """Announce liveness and converge leases toward the current assignment
+
+        Call at least every lease_ttl / 3 seconds.
+
+        Returns:
+            Summary with owned partitions and changes this beat
+        """
+        now = time.time()
+        self.redis.zadd(self.nodes_key, {self.node_id: now})
+        members = self.live_members(now)
+
+        if members != self.last_members:
+            self.metrics['rebalances'] += 1
+            self.last_members = members
+
+        desired = {p for p, node in self.assignment(members).items() if node == self.node_id}
+        claimed, released, lost = [], [], []
+
+        # Renew what we hold and still want; hand over the rest
+        for partition in sorted(self.owned):
+            if partition in desired:
+                if not self._renew(partition):
+                    lost.append(partition)
+            else:
+                self._release(partition)
+                released.append(partition)
+
+        owned = (self.owned - set(released)) - set(lost)
+
+        # Claim desired partitions that are free (released by their old owner or expired)
+        for partition in sorted(desired - owned):
+            if self._claim(partition):
+                claimed.append(partition)
+                owned.add(partition)
+
+        self.owned = owned
+        self.metrics['heartbeats'] += 1
+        self.metrics['claimed'] += len(claimed)
+        self.metrics['released'] += len(released)
+        self.metrics['lost'] += len(lost)
+
+        return {
+            'node_id': self.node_id,
+            'members': members,
+            'owned': sorted(self.owned),
+            'pending': sorted(desired - self.owned),
+            'claimed': claimed,
+            'released': released,
+            'lost': lost
+        }
+
+    def my_symbols(self, symbols: List[str]) -> List[str]:
+        """Subset of symbols whose partition lease this node holds"""
+        return [s for s in symbols if self.partition_of(s) in self.owned]
+
+    def leave(self):
+        """Release all leases and deregister (graceful shutdown)"""
+        for partition in list(self.owned):
+            self._release(partition)
+        self.owned = set()
+        self.redis.zrem(self.nodes_key, self.node_id)
+
+    # ---- Signals --------------------------------------------------------------------
+
+    @property
+    def signals_key(self) -> str:
+        return self._key('signals')
+
+    def publish_signals(self, signals: List[Dict], cycle: int = None) -> int:
+        """Push signals onto the shared queue read by the execution coordinator"""
+        if not signals:
+            return 0
+
+        payloads = [json.dumps(dict(signal, node_id=self.node_id, cycle=cycle, published_at=time.time()))
+                    for signal in signals]
+        return self.redis.rpush(self.signals_key, *payloads)
+
+    def get_status(self) -> Dict:
+        """Get shard status"""
+        return {
+            'node_id': self.node_id,
+            'group': self.group,
+            'partitions': self.partitions,
+            'owned': sorted(self.owned),
+            'members': self.last_members,
+            'metrics': self.metrics,
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+class SignalCoordinator:
+    """Single execution coordinator consuming signals from all shards
+
+    Leadership is a lease key so a standby coordinator takes over only
+    after the active one stops renewing.
+    """
+
+    def __init__(self, redis_like, group: str = 'apex', node_id: str = None, lease_ttl: float = 15.0,
+                 max_age: float = 120.0):
+        """Initialize coordinator
+
+        Args:
+            redis_like: RedisIntegration or redis client (decode_responses=True)
+            group: Deployment name (same as the shards)
+            node_id: Unique coordinator name
+            lease_ttl: Leadership lease in seconds
+            max_age: Signals older than this are dropped unexecuted
+        """
+        self.redis = _client(redis_like)
+        self.group = group
+        self.node_id = node_id or f"coordinator-{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.lease_ttl = lease_ttl
+        self.max_age = max_age
+
+        self.leader_key = f"shard:{group}:coordinator"
+        self.signals_key = f"shard:{group}:signals"
+        self.is_leader = False
+
+        self.metrics = {'consumed': 0, 'expired': 0, 'leader_changes': 0}
+
+    def acquire_leadership(self) -> bool:
+        """Become (or stay) the active coordinator"""
+        ttl_ms = int(self.lease_ttl * 1000)
+        # Renew atomically: a lease that expires and is taken over between our check and
+        # the expire must not be extended on the new leader's behalf
+        leader = bool(self.redis.set(self.leader_key, self.node_id, nx=True, px=ttl_ms)) or \
+            _compare_and_expire(self.redis, self.leader_key, self.node_id, ttl_ms)
+
+        if leader != self.is_leader:
+            self.metrics['leader_changes'] += 1
+        self.is_leader = leader
+        return leader
+
+    def poll(self, max_signals: int = 100, timeout: float = 0.0) -> List[Dict]:
+        """Pop pending signals (leader only)
+
+        Args:
+            max_signals: Upper bound per call
+            timeout: Seconds to block for the first signal
+
+        Returns:
+            Fresh signals, oldest first
+        """
+        if not self.acquire_leadership():
+            return []
+
+        raw = []
+        if timeout > 0:
+            first = self.redis.blpop(self.signals_key, timeout=timeout)
+            if first:
+                raw.append(first[1])
+
+        while len(raw) < max_signals:
+            item = self.redis.lpop(self.signals_key)
+            if item is None:
+                break
+            raw.append(item)
+
+        now = time.time()
+        signals = []
+        for item in raw:
+            signal = json.loads(item)
+            if now - signal.get('published_at', now) > self.max_age:
+                self.metrics['expired'] += 1
+                continue
+            signals.append(signal)
+
+        self.metrics['consumed'] += len(signals)
+        return signals
+
+    def resign(self):
+        """Give up leadership if held"""
+        _compare_and_delete(self.redis, self.leader_key, self.node_id)
+        self.is_leader = False
+
+
+# Test functionality
+def test_symbol_sharding():
+    """Test symbol sharding"""
+    print("🧪 Testing Symbol Sharding...")
+
+    from redis_integration import RedisIntegration
+    integration = RedisIntegration()
+    if not integration.connected:
+        print("⚠️ Redis not available, skipping")
+        return
+
+    symbols = [f"COIN{i}/USDT" for i in range(200)]
+    nodes = [ShardCoordinator(integration, group='test', node_id=f"node{i}", lease_ttl=5) for i in range(3)]
+
+    for _ in range(2):
+        for node in nodes:
+            node.heartbeat()
+
+    for node in nodes:
+        print(f"✅ {node.node_id}: {len(node.my_symbols(symbols))} symbols")
+
+    for node in nodes:
+        node.leave()
+
+
+if __name__ == '__main__':
+    test_symbol_sharding()
@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import time
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -21,6 +22,8 @@ except ImportError:
     os.system("pip3 install --break-system-packages ccxt -q")
     import ccxt
 
+from order_execution import ExecutionEngine, OPEN_STATES
+
 class MultiCoinTrader:
     """Manages trading across multiple coins"""
     
@@ -42,9 +45,15 @@ class MultiCoinTrader:
             'ADA/USDT': {'weight': 0.15, 'min_size': 1.0}
         }
         
-        self.positions = {}
+        self.positions = {}             # Filled entries only
+        self.entries = {}               # Entry orders not yet done
+        self._lock = threading.RLock()
         self.max_position_size = 0.5  # $0.50 per trade
         
+        # Orders are queued and placed off the strategy loop; fills update positions
+        self.execution = ExecutionEngine(self.exchange, name='multi-coin')
+        self.execution.on_fill(self._on_fill)
+        
     def get_balance(self):
         """Get USDT balance"""
         try:
@@ -78,21 +87,41 @@ class MultiCoinTrader:
             print(f"Position size error for {symbol}: {e}")
             return 0.0
     
-    def place_order(self, symbol, side, amount):
-        """Place market order"""
-        try:
-            if side == 'buy':
-                order = self.exchange.create_market_buy_order(symbol, amount)
-            else:
-                order = self.exchange.create_market_sell_order(symbol, amount)
-            
-            print(f"✅ {side.upper()} {amount} {symbol} @ ${order.get('price', 0):.2f}")
-            
-            return order
-            
-        except Exception as e:
-            print(f"Order error for {symbol}: {e}")
-            return None
+    def place_order(self, symbol, side, amount, priority=1):
+        """Queue a market order (returns the ticket without waiting for the exchange)"""
+        ticket = self.execution.submit(symbol, side, amount, priority=priority)
+        print(f"📤 {side.upper()} {amount} {symbol} queued [{ticket['client_id']}]")
+        return ticket
+    
+    def _on_fill(self, fill):
+        """Fill listener (runs on execution engine threads)"""
+        print(f"✅ {fill['side'].upper()} {fill['amount']} {fill['symbol']} @ ${fill['price']:.2f} ({fill['status']})")
+        self._sync_position(fill['symbol'])
+    
+    def _sync_position(self, symbol):
+        """Record the position from the entry order's fills
+        
+        The position holds the cumulative filled amount and average price.
+        Once the entry order is done it stops being tracked; an entry that
+        was rejected or canceled without fills leaves no position.
+        """
+        with self._lock:
+            entry = self.entries.get(symbol)
+            if not entry:
+                return
+            
+            ticket = self.execution.get_order(entry['client_id'])
+            if not ticket:
+                return
+            if ticket['filled']:
+                self.positions[symbol] = dict(entry, filled=ticket['filled'], entry_price=ticket['average'])
+            if ticket['status'] not in OPEN_STATES:
+                del self.entries[symbol]
+    
+    def sync_positions(self):
+        """Pick up fills and outcomes of every pending entry order"""
+        for symbol in list(self.entries):
+            self._sync_position(symbol)
     
     def should_trade(self, symbol, sentiment_score):
         """Determine if should trade based on sentiment"""
@@ -100,8 +129,9 @@ class MultiCoinTrader:
         if abs(sentiment_score) < 0.3:
             return False, None
         
-        # Check if already have position
-        if symbol in self.positions:
+        # Check if already have position (or an entry order working)
+        self._sync_position(symbol)
+        if symbol in self.positions or symbol in self.entries:
             return False, None
         
         # Determine side
@@ -134,23 +164,38 @@ class MultiCoinTrader:
                 print(f"⚠️  {symbol}: Amount too small (${amount * price:.2f})")
                 continue
             
-            # Place order
+            # Place order; the position is recorded from its fills
             order = self.place_order(symbol, side, amount)
             
-            if order:
-                self.positions[symbol] = {
+            with self._lock:
+                self.entries[symbol] = {
                     'side': side,
                     'amount': amount,
-                    'entry_price': price,
+                    'quoted_price': price,
+                    'client_id': order['client_id'],
                     'timestamp': datetime.now().isoformat()
                 }
+            # Fills that landed before the entry was recorded
+            self._sync_position(symbol)
     
     def close_all_positions(self):
-        """Close all open positions"""
-        for symbol, pos in list(self.positions.items()):
+        """Cancel working entries and close the filled quantity of every position"""
+        for symbol, entry in list(self.entries.items()):
+            self.execution.cancel(entry['client_id'])
+        self.sync_positions()
+        
+        with self._lock:
+            positions = list(self.positions.items())
+            self.positions = {symbol: pos for symbol, pos in positions if symbol in self.entries}
+        
+        for symbol in self.entries:
+            print(f"⚠️  {symbol}: entry order still working, closing after it resolves")
+        
+        for symbol, pos in positions:
+            if symbol in self.positions or pos['filled'] <= 0:
+                continue
             side = 'sell' if pos['side'] == 'buy' else 'buy'
-            self.place_order(symbol, side, pos['amount'])
-            del self.positions[symbol]
+            self.place_order(symbol, side, pos['filled'], priority=0)
 
 if __name__ == '__main__':
     # Test multi-coin trading
@@ -64,58 +64,68 @@ Status: MONITORING MARKETS
 
 Will notify on first trade opportunity...""")
 
-print("\n🔄 Starting trading cycle...")
-
-# Trading cycle
-cycle = 0
-while True:
-    cycle += 1
-    print(f"\n{'='*80}")
-    print(f"CYCLE #{cycle} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80)
-    
-    try:
-        # 1. Check market conditions
-        print("1️⃣ GOD BOT analyzing market...")
-        market_state = god.analyze_market_state(['BTC/USDT', 'ETH/USDT'])
-        print(f"   Market Regime: {market_state.get('regime', 'UNKNOWN')}")
-        
-        # 2. Check for crisis
-        crisis = god.crisis_intervention()
-        if crisis.get('intervention'):
-            print(f"   🚨 CRISIS INTERVENTION: {crisis['action']}")
-            send_telegram(f"🚨 CRISIS: {crisis['reason']}\nTrading HALTED")
-            time.sleep(300)  # Wait 5 minutes
-            continue
-        
-        # 3. Get Oracle prediction
-        print("2️⃣ Oracle AI predicting...")
-        prediction = oracle.predict_price_movement('BTC/USDT')
-        if prediction:
-            print(f"   BTC Direction: {prediction['direction']} ({prediction['confidence']*100:.0f}% confidence)")
-        
-        # 4. Check crash shield
-        print("3️⃣ Crash Shield checking...")
-        crash_check = crash.check_market_status()
-        if crash_check.get('crash_detected'):
-            print(f"   🛡️ CRASH DETECTED: Trading paused")
-            send_telegram(f"🛡️ Market crash detected\n{crash_check['reason']}\nTrading paused")
-            time.sleep(300)
-            continue
-        
-        print("   ✅ No crash detected")
-        
-        # 5. Log cycle
-        print(f"\n✅ Cycle #{cycle} complete - Next cycle in 60s")
-        
-        time.sleep(60)
-        
-    except KeyboardInterrupt:
-        print("\n\n🛑 Shutting down...")
-        send_telegram("🛑 APEX System shutting down")
-        break
-    except Exception as e:
-        print(f"❌ Cycle error: {e}")
-        send_telegram(f"⚠️ Error in cycle #{cycle}: {e}")
-        time.sleep(60)
+print("\n🔄 Starting scheduled trading loop...")
+
+sys.path.insert(0, 'modules')
+from event_scheduler import EventScheduler, PriceMoveTrigger
+
+# Each check runs on its own cadence; fast checks also fire on price moves
+scheduler = EventScheduler('production_runner')
+price_trigger = PriceMoveTrigger(threshold_pct=1.0)
+state = {'halted_until': 0}
+
+def guarded(job):
+    def run(trigger):
+        if time.time() < state['halted_until']:
+            return
+        try:
+            job(trigger)
+        except Exception as e:
+            print(f"❌ {trigger['job']} error: {e}")
+            send_telegram(f"⚠️ Error in {trigger['job']}: {e}")
+    return run
+
+def price_watch(trigger):
+    ticker = crash.exchange.fetch_ticker('BTC/USDT')
+    move = price_trigger.update('BTC/USDT', ticker['last'])
+    if move is not None:
+        print(f"⚡ BTC moved {move:+.2f}%")
+        scheduler.emit('price_move', {'symbol': 'BTC/USDT', 'move_pct': move})
+
+def market_analysis(trigger):
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 1️⃣ GOD BOT analyzing market...")
+    market_state = god.analyze_market_state(['BTC/USDT', 'ETH/USDT'])
+    print(f"   Market Regime: {market_state.get('regime', 'UNKNOWN')}")
 
+    crisis = god.crisis_intervention()
+    if crisis.get('intervention'):
+        print(f"   🚨 CRISIS INTERVENTION: {crisis['action']}")
+        send_telegram(f"🚨 CRISIS: {crisis['reason']}\nTrading HALTED")
+        state['halted_until'] = time.time() + 300  # Wait 5 minutes
+
+def crash_check(trigger):
+    status = crash.check_crash('BTC/USDT')
+    if status.get('crash_detected'):
+        print(f"   🛡️ CRASH DETECTED: Trading paused")
+        send_telegram(f"🛡️ Market crash detected\nBTC {status['drop_pct']:.1f}%\nTrading paused")
+        state['halted_until'] = time.time() + 300
+
+def oracle_prediction(trigger):
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 2️⃣ Oracle AI predicting ({trigger['reason']})...")
+    prediction = oracle.predict_price_movement('BTC/USDT')
+    if prediction:
+        print(f"   BTC Direction: {prediction['direction']} ({prediction['confidence']*100:.0f}% confidence)")
+
+candle_event = scheduler.add_candle_clock('1h')
+scheduler.add_job('price_watch', guarded(price_watch), interval=10, priority=0)
+scheduler.add_job('crash', guarded(crash_check), interval=30, events=['price_move'], priority=0, min_gap=5)
+scheduler.add_job('market', guarded(market_analysis), interval=300, priority=2, background=True)
+# Oracle reads 1h candles: refresh on each new candle or a sharp move, not every minute
+scheduler.add_job('oracle', guarded(oracle_prediction), interval=3600,
+                  events=[candle_event, 'price_move'], priority=3, min_gap=60, background=True)
+
+try:
+    scheduler.run()
+except KeyboardInterrupt:
+    print("\n\n🛑 Shutting down...")
+    send_telegram("🛑 APEX System shutting down")
@@ -4,87 +4,107 @@ Basic Sentiment Analyzer for Crypto Markets
 Scrapes Twitter/Reddit for BTC, ETH sentiment
 """
 
+import os
+import sys
 import requests
 import re
 from datetime import datetime, timedelta
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
+
+from circuit_breaker import get_breaker
+
 class SentimentAnalyzer:
-    """Analyzes market sentiment from social media"""
+    """Analyzes market sentiment from social media
+    
+    Each source sits behind a circuit breaker: once it keeps failing or
+    timing out, calls return the coin's last good score at once (its age
+    is kept in sentiment_scores) until a probe finds the source healthy.
+    """
     
     def __init__(self):
         self.coins = ['BTC', 'ETH', 'SOL', 'ADA']
         self.sentiment_scores = {}
+        self.breakers = {
+            'reddit': get_breaker('pushshift', failure_threshold=3, reset_timeout=300, slow_call_seconds=5),
+            'twitter': get_breaker('nitter', failure_threshold=3, reset_timeout=300, slow_call_seconds=5)
+        }
+        self.source_ages = {}
         
-    def get_reddit_sentiment(self, coin):
-        """Get sentiment from Reddit (using pushshift API)"""
+    def _score_source(self, source, fetch, coin):
+        """Run a source scorer through its breaker; 0.0 if no score is available"""
         try:
-            # Reddit search via pushshift (no auth needed)
-            url = f"https://api.pushshift.io/reddit/search/comment/?q={coin}&size=100&sort=desc"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code != 200:
-                return 0.0
-            
-            data = response.json()
-            comments = data.get('data', [])
-            
-            if not comments:
-                return 0.0
-            
-            # Simple keyword-based sentiment
-            positive_words = ['moon', 'bullish', 'buy', 'pump', 'up', 'gain', 'profit', 'long']
-            negative_words = ['crash', 'bearish', 'sell', 'dump', 'down', 'loss', 'short', 'fear']
-            
-            pos_count = 0
-            neg_count = 0
-            
-            for comment in comments:
-                body = comment.get('body', '').lower()
-                pos_count += sum(1 for word in positive_words if word in body)
-                neg_count += sum(1 for word in negative_words if word in body)
-            
-            total = pos_count + neg_count
-            if total == 0:
-                return 0.0
-            
-            # Score: -1 (very bearish) to +1 (very bullish)
-            score = (pos_count - neg_count) / total
-            return score
-            
+            score, age = self.breakers[source].call_with_age(fetch, coin)
         except Exception as e:
-            print(f"Reddit sentiment error for {coin}: {e}")
+            print(f"{source.capitalize()} sentiment error for {coin}: {e}")
+            self.source_ages[(source, coin)] = None
+            return 0.0
+        
+        self.source_ages[(source, coin)] = age
+        return score
+        
+    def get_reddit_sentiment(self, coin):
+        """Get sentiment from Reddit (using pushshift API)"""
+        return self._score_source('reddit', self._fetch_reddit_sentiment, coin)
+    
+    def _fetch_reddit_sentiment(self, coin):
+        # Reddit search via pushshift (no auth needed)
+        url = f"https://api.pushshift.io/reddit/search/comment/?q={coin}&size=100&sort=desc"
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        
+        data = response.json()
+        comments = data.get('data', [])
+        
+        if not comments:
             return 0.0
+        
+        # Simple keyword-based sentiment
+        positive_words = ['moon', 'bullish', 'buy', 'pump', 'up', 'gain', 'profit', 'long']
+        negative_words = ['crash', 'bearish', 'sell', 'dump', 'down', 'loss', 'short', 'fear']
+        
+        pos_count = 0
+        neg_count = 0
+        
+        for comment in comments:
+            body = comment.get('body', '').lower()
+            pos_count += sum(1 for word in positive_words if word in body)
+            neg_count += sum(1 for word in negative_words if word in body)
+        
+        total = pos_count + neg_count
+        if total == 0:
+            return 0.0
+        
+        # Score: -1 (very bearish) to +1 (very bullish)
+        score = (pos_count - neg_count) / total
+        return score
     
     def get_twitter_sentiment(self, coin):
         """Get sentiment from Twitter (using nitter scraping)"""
-        try:
-            # Use nitter (Twitter scraper, no API key needed)
-            url = f"https://nitter.net/search?q={coin}%20crypto&f=tweets"
-            response = requests.get(url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
-            
-            if response.status_code != 200:
-                return 0.0
-            
-            # Simple keyword extraction
-            text = response.text.lower()
-            
-            positive_words = ['moon', 'bullish', 'buy', 'pump', 'rocket', 'ath', 'breakout']
-            negative_words = ['crash', 'bearish', 'sell', 'dump', 'rekt', 'fud', 'scam']
-            
-            pos_count = sum(text.count(word) for word in positive_words)
-            neg_count = sum(text.count(word) for word in negative_words)
-            
-            total = pos_count + neg_count
-            if total == 0:
-                return 0.0
-            
-            score = (pos_count - neg_count) / total
-            return score
-            
-        except Exception as e:
-            print(f"Twitter sentiment error for {coin}: {e}")
+        return self._score_source('twitter', self._fetch_twitter_sentiment, coin)
+    
+    def _fetch_twitter_sentiment(self, coin):
+        # Use nitter (Twitter scraper, no API key needed)
+        url = f"https://nitter.net/search?q={coin}%20crypto&f=tweets"
+        response = requests.get(url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        response.raise_for_status()
+        
+        # Simple keyword extraction
+        text = response.text.lower()
+        
+        positive_words = ['moon', 'bullish', 'buy', 'pump', 'rocket', 'ath', 'breakout']
+        negative_words = ['crash', 'bearish', 'sell', 'dump', 'rekt', 'fud', 'scam']
+        
+        pos_count = sum(text.count(word) for word in positive_words)
+        neg_count = sum(text.count(word) for word in negative_words)
+        
+        total = pos_count + neg_count
+        if total == 0:
             return 0.0
+        
+        score = (pos_count - neg_count) / total
+        return score
     
     def get_combined_sentiment(self, coin):
         """Combine Reddit + Twitter sentiment"""
@@ -98,6 +118,8 @@ class SentimentAnalyzer:
             'reddit': reddit_score,
             'twitter': twitter_score,
             'combined': combined,
+            'reddit_age': self.source_ages.get(('reddit', coin)),
+            'twitter_age': self.source_ages.get(('twitter', coin)),
             'timestamp': datetime.now().isoformat()
         }
         
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import ccxt, os, time, requests
+import ccxt, os, sys, requests
 from datetime import datetime
 
 # Load env
@@ -20,20 +20,24 @@ def send_telegram(msg):
 
 send_telegram(f"🚀 SIMPLE TRADER ONLINE\n\nTime: {datetime.now()}\nMonitoring BTC/USDT\nWill trade when conditions are right...")
 
-cycle = 0
-while True:
-    cycle += 1
-    try:
-        ticker = exchange.fetch_ticker('BTC/USDT')
-        price = ticker['last']
-        change = ticker.get('percentage', 0)
-        
-        print(f"Cycle {cycle}: BTC ${price:.2f} ({change:+.2f}%)")
-        
-        if cycle % 10 == 0:
-            send_telegram(f"💓 Still monitoring...\nCycle: {cycle}\nBTC: ${price:.2f}")
-        
-        time.sleep(30)
-    except Exception as e:
-        print(f"Error: {e}")
-        time.sleep(60)
+sys.path.insert(0, 'modules')
+from event_scheduler import EventScheduler
+
+scheduler = EventScheduler('simple_trader')
+state = {'cycle': 0}
+
+def monitor(trigger):
+    state['cycle'] += 1
+    cycle = state['cycle']
+    ticker = exchange.fetch_ticker('BTC/USDT')
+    price = ticker['last']
+    change = ticker.get('percentage', 0)
+    
+    print(f"Cycle {cycle}: BTC ${price:.2f} ({change:+.2f}%)")
+    
+    if cycle % 10 == 0:
+        send_telegram(f"💓 Still monitoring...\nCycle: {cycle}\nBTC: ${price:.2f}")
+
+# Errors are logged by the scheduler and the next check runs on the same 30s cadence
+scheduler.add_job('monitor', monitor, interval=30)
+scheduler.run()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Async Stage Pipeline
+Dependency-ordered concurrent stages for trading cycles
+"""
+
+import sys
+import os
+import asyncio
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from async_pipeline import StageGraph, StageSkipped
+
+def make_stage(value, delay=0.0, error=None):
+    async def stage(inputs):
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return value
+    return stage
+
+class TestStageGraph(unittest.TestCase):
+    """Test suite for StageGraph"""
+
+    def test_independent_stages_overlap(self):
+        """Independent stages run concurrently"""
+        graph = StageGraph()
+        graph.add_stage('a', make_stage(1, 0.2))
+        graph.add_stage('b', make_stage(2, 0.2))
+        graph.add_stage('c', make_stage(3, 0.2))
+
+        report = asyncio.run(graph.run())
+
+        self.assertEqual(report['results'], {'a': 1, 'b': 2, 'c': 3})
+        self.assertLess(report['elapsed'], 0.45)
+        self.assertGreater(report['serial_time'], 0.55)
+
+    def test_dependencies_receive_inputs(self):
+        """Stages see their dependencies' results and the critical path follows them"""
+        async def total(inputs):
+            return inputs['a'] + inputs['b']
+
+        graph = StageGraph()
+        graph.add_stage('a', make_stage(1, 0.05))
+        graph.add_stage('b', make_stage(2, 0.15))
+        graph.add_stage('sum', total, depends_on=['a', 'b'])
+
+        report = asyncio.run(graph.run())
+
+        self.assertEqual(report['results']['sum'], 3)
+        self.assertEqual(report['critical_path'], ['b', 'sum'])
+
+    def test_skip_and_error_propagate(self):
+        """Skipped or failed stages skip their dependents without stopping others"""
+        graph = StageGraph()
+        graph.add_stage('paused', make_stage(None, error=StageSkipped('trading paused')))
+        graph.add_stage('broken', make_stage(None, error=RuntimeError('boom')))
+        graph.add_stage('after_pause', make_stage(1), depends_on=['paused'])
+        graph.add_stage('after_error', make_stage(1), depends_on=['broken'])
+        graph.add_stage('free', make_stage(1))
+
+        report = asyncio.run(graph.run())
+
+        self.assertEqual(report['skipped']['paused'], 'trading paused')
+        self.assertIn('RuntimeError', report['errors']['broken'])
+        self.assertIn('after_pause', report['skipped'])
+        self.assertIn('after_error', report['skipped'])
+        self.assertEqual(report['results'], {'free': 1})
+
+    def test_overrun_falls_back_to_cached_result(self):
+        """A stage over budget is cancelled and its last good result reused with its age"""
+        delays = {'feed': 0.0}
+
+        async def feed(inputs):
+            await asyncio.sleep(delays['feed'])
+            return 'fresh'
+
+        async def consumer(inputs):
+            return inputs.ages['feed']
+
+        graph = StageGraph()
+        graph.add_stage('feed', feed, budget=0.1, cache_ttl=60)
+        graph.add_stage('consumer', consumer, depends_on=['feed'])
+
+        asyncio.run(graph.run())
+        delays['feed'] = 5.0
+        report = asyncio.run(graph.run())
+
+        self.assertEqual(report['results']['feed'], 'fresh')
+        self.assertIn('feed', report['fallbacks'])
+        self.assertEqual(report['overruns'], ['feed'])
+        self.assertGreater(report['results']['consumer'], 0.1)
+        self.assertLess(report['elapsed'], 0.5)
+
+    def test_deadline_skips_uncached_stages(self):
+        """Stages without a cache are skipped once the cycle deadline passes"""
+        graph = StageGraph()
+        graph.add_stage('slow', make_stage(1, 5.0))
+        graph.add_stage('after', make_stage(2), depends_on=['slow'])
+        graph.add_stage('quick', make_stage(3))
+
+        report = asyncio.run(graph.run(deadline=0.2))
+
+        self.assertIn('budget', report['skipped']['slow'])
+        self.assertIn('after', report['skipped'])
+        self.assertEqual(report['results'], {'quick': 3})
+        self.assertLess(report['elapsed'], 0.5)
+
+    def test_unknown_dependency_rejected(self):
+        """Dependencies must be registered first"""
+        graph = StageGraph()
+        with self.assertRaises(ValueError):
+            graph.add_stage('b', make_stage(1), depends_on=['a'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Backtest Cache
+Content-addressed keys, in-memory LRU and the on-disk store
+"""
+
+import sys
+import os
+import tempfile
+import functools
+import unittest
+
+import numpy as np
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from backtest_cache import BacktestCache
+
+def strategy_a(df):
+    return []
+
+def strategy_b(df):
+    return [{'action': 'buy'}]
+
+class TestCacheKey(unittest.TestCase):
+    """Test suite for the content address"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.data = np.arange(50, dtype=float).reshape(10, 5)
+        self.data_range = {'symbol': 'BTC/USDT', 'bars': 10, 'fingerprint': BacktestCache.data_fingerprint(self.data)}
+        self.code = BacktestCache.code_version(strategy_a)
+        self.params = {'initial_balance': 1000}
+        self.key = BacktestCache.make_key(self.data_range, self.code, self.params, {'taker': 0.001})
+
+    def test_key_is_stable(self):
+        """The same inputs give the same key"""
+        data_range = dict(self.data_range, fingerprint=BacktestCache.data_fingerprint(self.data.copy()))
+        self.assertEqual(BacktestCache.make_key(data_range, BacktestCache.code_version(strategy_a),
+                                                {'initial_balance': 1000}, {'taker': 0.001}), self.key)
+
+    def test_key_changes_with_data(self):
+        """A single changed value in the data changes the key"""
+        changed = self.data.copy()
+        changed[3, 3] += 0.01
+        data_range = dict(self.data_range, fingerprint=BacktestCache.data_fingerprint(changed))
+        self.assertNotEqual(BacktestCache.make_key(data_range, self.code, self.params, {'taker': 0.001}), self.key)
+
+    def test_key_changes_with_code(self):
+        """Different strategy source gives a different version and key"""
+        code = BacktestCache.code_version(strategy_b)
+        self.assertNotEqual(code, self.code)
+        self.assertNotEqual(BacktestCache.make_key(self.data_range, code, self.params, {'taker': 0.001}), self.key)
+
+    def test_code_version_tells_closures_apart(self):
+        """Lambdas on one line, closures from one factory and partials get distinct versions"""
+        def make(threshold):
+            return lambda df: df > threshold
+
+        def scaled(df, factor=1.0):
+            return df * factor
+
+        first, second = (lambda df: df + 1), (lambda df: df + 2)
+        versions = [BacktestCache.code_version(f) for f in
+                    (first, second, make(1), make(2), functools.partial(scaled, factor=2.0),
+                     functools.partial(scaled, factor=3.0))]
+        self.assertEqual(len(set(versions)), len(versions))
+        self.assertEqual(BacktestCache.code_version(make(1)), BacktestCache.code_version(make(1)))
+
+    def test_key_changes_with_params_and_fee_model(self):
+        """Parameters and the fee model are part of the address"""
+        self.assertNotEqual(BacktestCache.make_key(self.data_range, self.code, {'initial_balance': 2000},
+                                                   {'taker': 0.001}), self.key)
+        self.assertNotEqual(BacktestCache.make_key(self.data_range, self.code, self.params, {'taker': 0.002}), self.key)
+        self.assertNotEqual(BacktestCache.make_key(self.data_range, self.code, self.params, None), self.key)
+
+class TestBacktestCache(unittest.TestCase):
+    """Test suite for BacktestCache storage"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = BacktestCache(cache_dir=self.tmp.name, max_memory_entries=2)
+
+    def tearDown(self):
+        """Clean up"""
+        self.tmp.cleanup()
+
+    def test_lru_evicts_least_recently_used(self):
+        """Past max_memory_entries the oldest untouched entry leaves memory, not disk"""
+        for key in ('a' * 64, 'b' * 64):
+            self.cache.set(key, {'roi': key[0]})
+        self.cache.get('a' * 64)
+        self.cache.set('c' * 64, {'roi': 'c'})
+
+        self.assertEqual(list(self.cache._memory), ['a' * 64, 'c' * 64])
+        self.assertEqual(self.cache.get('b' * 64), {'roi': 'b'})
+        self.assertEqual(self.cache.metrics['disk_hits'], 1)
+        self.assertEqual(self.cache.metrics['memory_hits'], 1)
+
+    def test_hits_are_copies(self):
+        """Modifying a returned result does not change the cached one"""
+        key = 'e' * 64
+        self.cache.set(key, {'trades': [1, 2]})
+        self.cache.get(key)['trades'].append(3)
+        self.assertEqual(self.cache.get(key), {'trades': [1, 2]})
+
+    def test_disk_round_trip(self):
+        """A fresh cache on the same directory reads results back from disk"""
+        result = {'roi': 12.5, 'trades': [{'profit': 1.0}]}
+        self.cache.set('d' * 64, result)
+
+        fresh = BacktestCache(cache_dir=self.tmp.name)
+        self.assertEqual(fresh.get('d' * 64), result)
+        self.assertEqual(fresh.metrics['disk_hits'], 1)
+        self.assertEqual(fresh.get('d' * 64), result)
+        self.assertEqual(fresh.metrics['memory_hits'], 1)
+
+    def test_corrupt_entry_is_a_miss(self):
+        """A truncated pickle is reported as a miss, not an error"""
+        key = 'e' * 64
+        self.cache.set(key, {'roi': 1.0, 'equity': list(range(100))})
+        with open(self.cache._path(key), 'rb') as f:
+            data = f.read()
+        with open(self.cache._path(key), 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        fresh = BacktestCache(cache_dir=self.tmp.name)
+        self.assertIsNone(fresh.get(key))
+        self.assertEqual(fresh.metrics['misses'], 1)
+
+    def test_missing_entry_is_a_miss(self):
+        """Unknown keys miss"""
+        self.assertIsNone(self.cache.get('f' * 64))
+        self.assertEqual(self.cache.get_stats()['hit_rate'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
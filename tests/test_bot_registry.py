@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Bot Registry
+Metadata-only discovery and lazy bot loading
+"""
+
+import sys
+import os
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from bot_registry import BotRegistry
+
+class TestBotRegistry(unittest.TestCase):
+    """Test suite for Bot Registry"""
+
+    def setUp(self):
+        """Write a throwaway bots directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bots_dir = self.tmp.name
+
+        self.write_bot('lazy_probe_bot', """
+            import lazy_probe_marker
+            BOT_CATEGORY = 'CORE_APEX'
+
+            class LazyProbeBot:
+                \"\"\"Probe bot used by the registry tests\"\"\"
+                def __init__(self):
+                    self.name = 'LazyProbeBot'
+        """)
+        self.write_bot('lazy_broken_bot', """
+            BOT_CATEGORY = 'PROTECTION'
+
+            class LazyBrokenBot:
+                def __init__(self):
+                    raise RuntimeError('no credentials')
+        """)
+        self.write_bot('lazy_marker_free', """
+            class Helper:
+                pass
+        """)
+        self.write_bot('lazy_slow_bot', """
+            import time
+            BOT_CATEGORY = 'STRATEGY'
+            BUILT = []
+
+            class LazySlowBot:
+                def __init__(self):
+                    time.sleep(0.5)
+                    BUILT.append(self)
+        """)
+        self.write_bot('lazy_computed_bot', """
+            BOT_CATEGORY = 'CORE' + '_APEX'
+
+            class LazyComputedBot:
+                pass
+        """)
+        with open(os.path.join(self.bots_dir, 'lazy_probe_marker.py'), 'w') as f:
+            f.write("LOADED = True\n")
+
+        self.registry = BotRegistry()
+        self.result = self.registry.auto_discover_bots(self.bots_dir)
+
+    def tearDown(self):
+        """Clean up"""
+        for module in ('lazy_probe_bot', 'lazy_broken_bot', 'lazy_probe_marker', 'lazy_slow_bot'):
+            sys.modules.pop(module, None)
+        if self.bots_dir in sys.path:
+            sys.path.remove(self.bots_dir)
+        self.tmp.cleanup()
+
+    def write_bot(self, module_name, source):
+        with open(os.path.join(self.bots_dir, f"{module_name}.py"), 'w') as f:
+            f.write(textwrap.dedent(source))
+
+    def test_discovery_reads_metadata_without_importing(self):
+        """Discovery registers declared categories but imports nothing"""
+        self.assertIn('lazy_probe_bot', self.result['bots'])
+        self.assertNotIn('lazy_probe_bot', sys.modules)
+        self.assertNotIn('lazy_probe_marker', sys.modules)
+
+        self.assertEqual(self.registry.get_bots_by_category('CORE_APEX'), ['lazy_probe_bot'])
+        info = self.registry.get_bot_info('lazy_probe_bot')
+        self.assertEqual(info['class'], 'LazyProbeBot')
+        self.assertEqual(info['description'], 'Probe bot used by the registry tests')
+        self.assertEqual(info['status'], 'registered')
+        self.assertEqual(self.registry.get_all_active_bots(), [])
+
+    def test_get_bot_loads_once(self):
+        """First get_bot() imports and instantiates; later calls reuse the instance"""
+        bot = self.registry.get_bot('lazy_probe_bot')
+
+        self.assertEqual(bot.name, 'LazyProbeBot')
+        self.assertIs(self.registry.get_bot('lazy_probe_bot'), bot)
+        self.assertEqual(self.registry.get_all_active_bots(), ['lazy_probe_bot'])
+        self.assertEqual(self.registry.metrics['active_bots'], 1)
+
+    def test_failed_bot_is_recorded(self):
+        """A constructor error marks the bot failed instead of raising"""
+        self.assertIsNone(self.registry.get_bot('lazy_broken_bot'))
+        self.assertIsNone(self.registry.get_bot('lazy_broken_bot'))
+
+        info = self.registry.get_bot_info('lazy_broken_bot')
+        self.assertEqual(info['status'], 'failed')
+        self.assertIn('no credentials', info['error'])
+        self.assertEqual(self.registry.metrics['failed_bots'], 1)
+
+    def test_slow_bot_blocks_only_its_own_callers(self):
+        """A bot under construction does not hold up other bots; racing callers share one build"""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get_bot('lazy_slow_bot')))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+
+        started = time.perf_counter()
+        self.assertEqual(self.registry.get_bot('lazy_probe_bot').name, 'LazyProbeBot')
+        self.assertLess(time.perf_counter() - started, 0.3)
+
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(sys.modules['lazy_slow_bot'].BUILT), 1)
+        self.assertTrue(all(bot is results[0] for bot in results))
+
+    def test_non_literal_category_is_uncategorized(self):
+        """A computed BOT_CATEGORY does not abort discovery"""
+        self.assertIn('lazy_computed_bot', self.result['bots'])
+        self.assertEqual(self.registry.get_bot_info('lazy_computed_bot')['category'], 'UNCATEGORIZED')
+
+    def test_repo_bots_declare_categories(self):
+        """Every bot in bots/ declares a known category"""
+        registry = BotRegistry()
+        registry.auto_discover_bots()
+
+        self.assertGreater(len(registry.bots), 40)
+        self.assertEqual(registry.get_bots_by_category('UNCATEGORIZED'), [])
+        self.assertEqual(registry.get_bots_by_category('THRONES'), ['thrones_ai'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Circuit Breaker
+Fail-fast endpoints with cached fallback and half-open recovery
+"""
+
+import sys
+import os
+import time
+import unittest
+from unittest import mock
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+import rate_limiter
+from rate_limiter import RateLimiter
+
+class FlakyEndpoint:
+    """Endpoint that can be switched down"""
+
+    def __init__(self):
+        self.up = True
+        self.calls = 0
+
+    def __call__(self, symbol):
+        self.calls += 1
+        if not self.up:
+            raise ConnectionError('timed out')
+        return {'symbol': symbol, 'price': 100.0 + self.calls}
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test suite for CircuitBreaker"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.endpoint = FlakyEndpoint()
+        self.breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=0.2)
+
+    def test_opens_and_serves_cached_value_with_age(self):
+        """After the threshold the endpoint is skipped and the last good value returned"""
+        fresh, age = self.breaker.call_with_age(self.endpoint, 'BTC')
+        self.assertEqual(age, 0.0)
+
+        self.endpoint.up = False
+        for _ in range(2):
+            value, age = self.breaker.call_with_age(self.endpoint, 'BTC')
+            self.assertIs(value, fresh)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        calls = self.endpoint.calls
+        value, age = self.breaker.call_with_age(self.endpoint, 'BTC')
+        self.assertEqual(self.endpoint.calls, calls)
+        self.assertIs(value, fresh)
+        self.assertGreater(age, 0.0)
+
+    def test_open_without_cache_fails_fast(self):
+        """Keys never fetched successfully raise CircuitOpenError while open"""
+        self.endpoint.up = False
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(self.endpoint, 'ETH')
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(self.endpoint, 'ETH')
+
+    def test_half_open_probe_restores(self):
+        """After reset_timeout one probe goes through and closes the breaker on success"""
+        self.breaker.call(self.endpoint, 'BTC')
+        self.endpoint.up = False
+        for _ in range(2):
+            self.breaker.call(self.endpoint, 'BTC')
+
+        time.sleep(0.25)
+        self.endpoint.up = True
+        value, age = self.breaker.call_with_age(self.endpoint, 'BTC')
+
+        self.assertEqual(age, 0.0)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_non_failure_errors_do_not_trip(self):
+        """Errors outside failure_types propagate without counting"""
+        breaker = CircuitBreaker('strict', failure_threshold=1, failure_types=(ConnectionError,))
+
+        def bad_symbol(symbol):
+            raise ValueError('unknown symbol')
+
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                breaker.call(bad_symbol, 'XXX')
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_guarded_exchange_reads_fall_back(self):
+        """Guarded exchange reads return the last ticker while the exchange is down"""
+        class Exchange:
+            id = 'breaker-test'
+            enableRateLimit = True
+
+            def __init__(self):
+                self.endpoint = FlakyEndpoint()
+
+            def fetch_ticker(self, symbol):
+                return self.endpoint(symbol)
+
+        raw = Exchange()
+        limiter = RateLimiter(capacity=100, refill_rate=100)
+        guarded = limiter.guard(raw)
+
+        first = guarded.fetch_ticker('BTC/USDT')
+        self.assertNotIn('stale', first)
+        raw.endpoint.up = False
+        served = guarded.fetch_ticker('BTC/USDT')
+        self.assertEqual(served['price'], first['price'])
+        self.assertTrue(served['stale'])
+        self.assertGreater(served['age'], 0)
+        value, age = guarded.call_with_age('fetch_ticker', 'BTC/USDT')
+        self.assertEqual(value['price'], first['price'])
+        self.assertGreater(age, 0)
+
+        # Protective clients never act on cached prices
+        with self.assertRaises((ConnectionError, CircuitOpenError)):
+            limiter.guard(raw, 'positions').fetch_ticker('BTC/USDT')
+
+    def test_guarded_exchange_cache_is_bounded(self):
+        """Cached responses expire per endpoint and the cache keeps a fixed number of keys"""
+        class Exchange:
+            id = 'breaker-bound-test'
+            enableRateLimit = True
+
+            def __init__(self):
+                self.endpoint = FlakyEndpoint()
+
+            def fetch_order_book(self, symbol, limit=None):
+                return self.endpoint(symbol)
+
+        raw = Exchange()
+        guarded = RateLimiter(capacity=1000, refill_rate=1000).guard(raw)
+        breaker = guarded.breaker
+        for limit in range(breaker.max_cache_entries + 10):
+            guarded.fetch_order_book('BTC/USDT', limit)
+        self.assertEqual(len(breaker.cache), breaker.max_cache_entries)
+
+        guarded.fetch_order_book('ETH/USDT')
+        raw.endpoint.up = False
+        with mock.patch.dict(rate_limiter.CACHED_READS, {'fetch_order_book': 0.0}):
+            with self.assertRaises(ConnectionError):
+                guarded.fetch_order_book('ETH/USDT')
+
+    def test_guarded_exchange_account_reads_never_serve_stale(self):
+        """Order and balance reads raise while the exchange is down"""
+        class Exchange:
+            id = 'breaker-account-test'
+            enableRateLimit = True
+
+            def __init__(self):
+                self.endpoint = FlakyEndpoint()
+
+            def fetch_balance(self):
+                return self.endpoint('balance')
+
+            def fetch_order(self, order_id, symbol=None):
+                return self.endpoint(order_id)
+
+        raw = Exchange()
+        guarded = RateLimiter(capacity=100, refill_rate=100).guard(raw)
+
+        guarded.fetch_balance()
+        guarded.fetch_order('1')
+        raw.endpoint.up = False
+        for _ in range(10):
+            with self.assertRaises((ConnectionError, CircuitOpenError)):
+                guarded.fetch_balance()
+        with self.assertRaises(CircuitOpenError):
+            guarded.fetch_order('1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Event Scheduler
+Per-job cadences, event triggers and debouncing
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from event_scheduler import EventScheduler, PriceMoveTrigger
+
+class TestEventScheduler(unittest.TestCase):
+    """Test suite for EventScheduler"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.scheduler = EventScheduler('test')
+        self.triggers = []
+
+    def record(self, trigger):
+        self.triggers.append(trigger)
+
+    def test_interval_jobs_keep_their_own_cadence(self):
+        """A fast job runs many times while a slow job runs once"""
+        runs = {'fast': 0, 'slow': 0}
+        self.scheduler.add_job('fast', lambda t: runs.__setitem__('fast', runs['fast'] + 1), interval=0.05)
+        self.scheduler.add_job('slow', lambda t: runs.__setitem__('slow', runs['slow'] + 1), interval=60)
+
+        self.scheduler.run(duration=0.3)
+
+        self.assertGreaterEqual(runs['fast'], 4)
+        self.assertEqual(runs['slow'], 1)
+
+    def test_events_trigger_and_coalesce(self):
+        """Events run subscribed jobs once with all payloads"""
+        self.scheduler.add_job('on_fill', self.record, events=['fill'])
+        self.scheduler.emit('fill', {'symbol': 'BTC/USDT'})
+        self.scheduler.emit('fill', {'symbol': 'ETH/USDT'})
+        self.scheduler.emit('other')
+
+        self.assertEqual(self.scheduler.run_pending(), 1)
+        self.assertEqual(self.triggers[0]['reason'], 'event')
+        self.assertEqual([e['payload']['symbol'] for e in self.triggers[0]['events']], ['BTC/USDT', 'ETH/USDT'])
+        self.assertEqual(self.scheduler.run_pending(), 0)
+
+    def test_min_gap_debounces_events(self):
+        """Events inside min_gap wait instead of re-running immediately"""
+        self.scheduler.add_job('crash', self.record, interval=60, events=['price_move'], min_gap=30)
+        self.scheduler.run_pending()
+        self.scheduler.emit('price_move')
+
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.assertGreater(self.scheduler.seconds_until_next(), 25)
+
+    def test_job_errors_are_isolated(self):
+        """A failing job is counted and does not stop others"""
+        def broken(trigger):
+            raise RuntimeError('exchange down')
+
+        self.scheduler.add_job('broken', broken, interval=60, priority=0)
+        self.scheduler.add_job('ok', self.record, interval=60)
+
+        self.assertEqual(self.scheduler.run_pending(), 2)
+        status = self.scheduler.get_status()['jobs']
+        self.assertEqual(status['broken']['errors'], 1)
+        self.assertEqual(len(self.triggers), 1)
+
+    def test_background_job_does_not_delay_urgent_jobs(self):
+        """A slow background job runs off the loop thread while crash checks keep their cadence"""
+        runs = {'crash': 0, 'signals': 0}
+
+        def signals(trigger):
+            runs['signals'] += 1
+            time.sleep(0.5)
+
+        self.scheduler.add_job('signals', signals, interval=0.05, background=True)
+        self.scheduler.add_job('crash', lambda t: runs.__setitem__('crash', runs['crash'] + 1), interval=0.05,
+                               priority=0)
+
+        self.scheduler.run(duration=0.4)
+
+        self.assertGreaterEqual(runs['crash'], 5)
+        self.assertEqual(runs['signals'], 1)
+        self.assertTrue(self.scheduler.get_status()['jobs']['signals']['running'])
+
+    def test_background_job_requeues_after_finishing(self):
+        """Events that arrive mid-run trigger one more run once the background run is recorded"""
+        release = threading.Event()
+        self.scheduler.add_job('slow', lambda t: (self.record(t), release.wait(2)), events=['fill'],
+                               background=True)
+        self.scheduler.emit('fill')
+        self.assertEqual(self.scheduler.run_pending(), 1)
+
+        self.scheduler.emit('fill', {'symbol': 'ETH/USDT'})
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        release.set()
+        self.scheduler.run(duration=0.3)
+
+        self.assertEqual(len(self.triggers), 2)
+        self.assertEqual(self.triggers[1]['events'][0]['payload']['symbol'], 'ETH/USDT')
+        self.assertEqual(self.scheduler.get_status()['jobs']['slow']['runs'], 2)
+
+    def test_price_move_trigger(self):
+        """Moves are reported once they cross the threshold from the last reference"""
+        trigger = PriceMoveTrigger(threshold_pct=1.0)
+
+        self.assertIsNone(trigger.update('BTC/USDT', 100.0))
+        self.assertIsNone(trigger.update('BTC/USDT', 100.9))
+        self.assertAlmostEqual(trigger.update('BTC/USDT', 98.0), -2.0)
+        self.assertIsNone(trigger.update('BTC/USDT', 98.5))
+
+if __name__ == '__main__':
+    unittest.main()
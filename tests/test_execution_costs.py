@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Execution Cost Model
+Calibration, depth-based impact and backtest fills
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bots'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from execution_costs import ExecutionCostModel
+from backtesting_engine import BacktestingEngine
+
+def make_snapshots(volume, count=5, levels=50, mid=100.0, tick=0.05):
+    """Flat order books with the same volume resting on every level"""
+    steps = np.arange(1, levels + 1)
+    return [{
+        'bids': np.column_stack([mid - tick * steps, np.full(levels, volume)]).tolist(),
+        'asks': np.column_stack([mid + tick * steps, np.full(levels, volume)]).tolist()
+    } for _ in range(count)]
+
+class TestExecutionCostModel(unittest.TestCase):
+    """Test suite for ExecutionCostModel"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.model = ExecutionCostModel()
+        self.summary = self.model.calibrate(make_snapshots(volume=1.0), 'TEST/USDT')
+
+    def test_calibration_summary(self):
+        """Spread comes from the touch and depth from the visible book"""
+        self.assertTrue(self.summary['calibrated'])
+        self.assertEqual(self.summary['snapshots'], 5)
+        self.assertAlmostEqual(self.summary['half_spread_bps'], 5.0, places=6)
+        self.assertEqual(self.model.calibration['symbol'], 'TEST/USDT')
+
+    def test_empty_books_do_not_calibrate(self):
+        """Snapshots without both sides are skipped"""
+        model = ExecutionCostModel()
+        result = model.calibrate([{'bids': [], 'asks': [[100.0, 1.0]]}])
+        self.assertFalse(result['calibrated'])
+        self.assertEqual(model.half_spread, 0.0)
+
+    def test_impact_increases_with_notional(self):
+        """Walking further into the book costs more, including past visible depth"""
+        sizes = np.array([10, 100, 1000, 4000, 20000, 100000], dtype=float)
+        for side in ('buy', 'sell'):
+            impact = self.model.impact(sizes, [side] * len(sizes))
+            self.assertTrue(np.all(np.diff(impact) > 0), side)
+            self.assertTrue(np.all(impact >= 0))
+
+    def test_impact_decreases_with_calibrated_depth(self):
+        """The same order moves a deeper book less"""
+        deep = ExecutionCostModel()
+        deep.calibrate(make_snapshots(volume=10.0))
+
+        sizes = np.array([500, 2000, 4000], dtype=float)
+        shallow_impact = self.model.impact(sizes, np.ones(3))
+        deep_impact = deep.impact(sizes, np.ones(3))
+        self.assertTrue(np.all(deep_impact < shallow_impact))
+
+    def test_cost_rate_by_liquidity(self):
+        """Takers pay fee, spread and impact; makers only their fee"""
+        notional = np.array([1000.0])
+        taker = self.model.cost_rate(notional, np.ones(1))
+        expected = self.model.taker_fee + self.model.half_spread + self.model.impact(notional, np.ones(1))
+        np.testing.assert_allclose(taker, expected)
+        np.testing.assert_allclose(self.model.cost_rate(notional, np.ones(1), 'maker'), self.model.maker_fee)
+
+    def test_fill_prices_move_against_the_taker(self):
+        """Buys fill above and sells below the reference price"""
+        fills, fees = self.model.fill_prices(100.0, [5.0, 5.0], ['buy', 'sell'])
+        self.assertGreater(fills[0], 100.0)
+        self.assertLess(fills[1], 100.0)
+        np.testing.assert_allclose(fees, fills * 5.0 * self.model.taker_fee)
+
+class TestBacktestingEngineCosts(unittest.TestCase):
+    """BacktestingEngine fills under a cost model"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.model = ExecutionCostModel()
+        self.model.calibrate(make_snapshots(volume=1.0))
+        self.engine = BacktestingEngine(exchange_config={}, cache=False, cost_model=self.model)
+
+    def test_fill_includes_modelled_cost(self):
+        """Engine fills match the model's price and fee"""
+        fill_price, fee = self.engine._fill(100.0, 5.0, 'buy')
+        expected_price, expected_fee = self.model.fill_prices(100.0, 5.0, 'buy')
+        self.assertAlmostEqual(fill_price, float(expected_price))
+        self.assertAlmostEqual(fee, float(expected_fee))
+        self.assertGreater(fill_price, 100.0)
+
+    def test_round_trip_at_flat_price_loses_modelled_cost(self):
+        """Entering and exiting at the same price loses exactly the spread, impact and fees"""
+        price, amount = 100.0, 5.0
+        entry_price, entry_fee = self.engine._fill(price, amount, 'buy')
+        position = {'entry_price': entry_price, 'amount': amount, 'entry_time': 0, 'entry_fee': entry_fee}
+
+        trade = self.engine._close_position(position, price, 1)
+
+        self.assertLess(trade['exit_price'], price)
+        self.assertAlmostEqual(trade['fees'], entry_fee + amount * trade['exit_price'] * self.model.taker_fee)
+        expected_loss = amount * (entry_price - trade['exit_price']) + trade['fees']
+        self.assertAlmostEqual(trade['profit'], -expected_loss)
+        self.assertLess(trade['profit'], 0)
+
+    def test_no_cost_model_fills_at_price(self):
+        """Without a cost model fills are at the signal price with no fee"""
+        engine = BacktestingEngine(exchange_config={}, cache=False)
+        self.assertEqual(engine._fill(100.0, 5.0, 'buy'), (100.0, 0.0))
+
+if __name__ == '__main__':
+    unittest.main()
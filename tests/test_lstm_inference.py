@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test Suite for LSTM Inference
+Batched multi-symbol prediction and rollouts
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from ai_models.lstm_predictor import LSTMPredictor, TENSORFLOW_AVAILABLE
+from ai_models.numpy_lstm import NumpyLSTMRuntime
+
+def make_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    close = rng.normal(0, 5, n).cumsum() + 26000
+    return pd.DataFrame({'open': close, 'high': close + 5, 'low': close - 5, 'close': close,
+                         'volume': rng.uniform(1, 10, n)})
+
+class TestLSTMInference(unittest.TestCase):
+    """Test suite for LSTMPredictor batch inference"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.predictor = LSTMPredictor(model_dir=self.tmp.name)
+        self.frames = {f"SYM{i}/USDT": make_frame(80, i) for i in range(50)}
+        self.predictor.prepare_data(pd.concat(self.frames.values()))
+
+    def tearDown(self):
+        """Clean up"""
+        self.tmp.cleanup()
+
+    def test_windows_stack_into_one_batch(self):
+        """Each symbol contributes its latest window, scaled, in the order given"""
+        batch = self.predictor._stack_windows(self.frames)
+        self.assertEqual(batch.shape, (50, 60, 5))
+        self.assertEqual(batch.dtype, np.float32)
+
+        raw = np.stack([frame.values for frame in self.frames.values()])
+        np.testing.assert_allclose(self.predictor._stack_windows(raw), batch)
+
+        with self.assertRaises(ValueError):
+            self.predictor._stack_windows({'BTC/USDT': make_frame(30, 0)})
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_batch_matches_single_symbol_rollouts(self):
+        """One batched rollout gives the same prices as per-symbol predictions"""
+        self.predictor.config['lstm_units'] = [8, 8, 8]
+        self.predictor.build_model()
+
+        batched = self.predictor.predict_batch(self.frames, steps=3)
+        self.assertEqual(batched.shape, (50, 3))
+        for row, frame in zip(batched[:3], list(self.frames.values())[:3]):
+            np.testing.assert_allclose(self.predictor.predict(frame, steps=3), row, rtol=1e-5)
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_mc_dropout_samples_differ(self):
+        """Simulations see different dropout masks; plain predictions stay deterministic"""
+        self.predictor.config['lstm_units'] = [8, 8, 8]
+        self.predictor.build_model()
+        frame = next(iter(self.frames.values()))
+
+        result = self.predictor.predict_with_confidence(frame, steps=2, n_simulations=64)
+
+        self.assertEqual(result['mean'].shape, (2,))
+        self.assertTrue(np.all(result['std'] > 0))
+        self.assertTrue(np.all(result['lower_95'] < result['upper_95']))
+        np.testing.assert_allclose(self.predictor.predict(frame, 2), self.predictor.predict(frame, 2))
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_rollout_traced_once_across_batch_sizes(self):
+        """Changing the number of symbols or simulations reuses the compiled rollout"""
+        self.predictor.config['lstm_units'] = [8, 8, 8]
+        self.predictor.build_model()
+        symbols = list(self.frames)
+
+        for n in (1, 7, 50):
+            self.predictor.predict_batch({s: self.frames[s] for s in symbols[:n]}, steps=2)
+        for n in (16, 64):
+            self.predictor.predict_with_confidence(self.frames[symbols[0]], steps=2, n_simulations=n)
+
+        self.assertEqual(self.predictor._rollout_fn(2).experimental_get_tracing_count(), 1)
+        self.assertEqual(self.predictor._rollout_fn(2, mc_dropout=True).experimental_get_tracing_count(), 1)
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_numpy_runtime_matches_keras(self):
+        """Exported weights give the same rollouts without TensorFlow"""
+        self.predictor.config['lstm_units'] = [8, 8, 8]
+        self.predictor.build_model()
+        # Non-trivial BatchNormalization statistics
+        for layer in self.predictor.model.layers:
+            if type(layer).__name__ == 'BatchNormalization':
+                gamma, beta, mean, var = layer.get_weights()
+                layer.set_weights([gamma * 1.5, beta + 0.1, mean + 0.05, var * 2.0])
+
+        path = self.predictor.export_runtime()
+        runtime = NumpyLSTMRuntime(path)
+
+        np.testing.assert_allclose(runtime.predict_batch(self.frames, steps=3),
+                                   self.predictor.predict_batch(self.frames, steps=3), rtol=1e-4)
+
+class TestNumpyRuntimeImport(unittest.TestCase):
+    """Test suite for the NumPy runtime's dependencies"""
+
+    def test_runtime_does_not_import_tensorflow(self):
+        """Inference processes stay free of TensorFlow"""
+        modules = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modules')
+        code = "import sys; from ai_models import NumpyLSTMRuntime; print('tensorflow' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], cwd=modules, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Matching Engine
+Paper-trading order matching against order book snapshots
+"""
+
+import sys
+import os
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from simulation.matching_engine import MatchingEngine
+from simulation.simulation_engine import TPS19SimulationEngine
+
+BOOK = {'bids': [[99.9, 1.0], [99.8, 2.0]], 'asks': [[100.1, 1.0], [100.2, 2.0]]}
+
+class TestMatchingEngine(unittest.TestCase):
+    """Test suite for MatchingEngine"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.engine = MatchingEngine(maker_fee=0.0, taker_fee=0.001, latency_ms=50, latency_jitter_ms=0)
+        self.engine.on_book('BTC/USDT', BOOK, 0.0)
+
+    def test_latency_and_partial_market_fill(self):
+        """Orders wait out the latency, walk the book and drop what is not there"""
+        order = self.engine.submit('BTC/USDT', 'buy', 5.0)
+        self.engine.advance(0.04)
+        self.assertEqual(order.filled, 0.0)
+
+        self.engine.advance(0.05)
+        self.assertEqual(order.status, 'canceled')
+        self.assertAlmostEqual(order.filled, 3.0)
+        self.assertAlmostEqual(order.cost / order.filled, (100.1 + 2 * 100.2) / 3)
+        self.assertAlmostEqual(order.fee, order.cost * 0.001)
+
+        # Consumed liquidity is gone until the next snapshot
+        self.assertEqual(self.engine.fetch_order_book('BTC/USDT')['asks'], [])
+
+    def test_resting_orders_queue_behind_visible_volume(self):
+        """Price-time priority: volume ahead trades first, then earlier orders first"""
+        first = self.engine.submit('BTC/USDT', 'buy', 0.5, 'limit', 99.9)
+        second = self.engine.submit('BTC/USDT', 'buy', 0.5, 'limit', 99.9)
+        self.engine.advance(0.1)
+        self.assertEqual(first.ahead, 1.0)
+
+        self.engine.on_book('BTC/USDT', {'bids': [[99.9, 0.3], [99.8, 2.0]], 'asks': BOOK['asks']}, 1.0)
+        self.assertEqual(first.filled, 0.0)
+
+        # New volume joins behind us; then 0.8 trades: 0.3 still ahead, 0.5 fills the first order
+        self.engine.on_book('BTC/USDT', {'bids': [[99.9, 2.0], [99.8, 2.0]], 'asks': BOOK['asks']}, 2.0)
+        self.engine.on_book('BTC/USDT', {'bids': [[99.9, 1.2], [99.8, 2.0]], 'asks': BOOK['asks']}, 3.0)
+        self.assertEqual(first.status, 'closed')
+        self.assertAlmostEqual(first.filled, 0.5)
+        self.assertEqual(second.filled, 0.0)
+        self.assertEqual(second.ahead, 0.0)
+
+    def test_trade_through_and_post_only(self):
+        """Crossing markets fill resting orders; crossing post-only orders are rejected"""
+        resting = self.engine.submit('BTC/USDT', 'sell', 1.0, 'limit', 100.1)
+        rejected = self.engine.submit('BTC/USDT', 'buy', 1.0, 'limit', 100.2, post_only=True)
+        self.engine.advance(0.1)
+        self.assertEqual(rejected.status, 'rejected')
+
+        self.engine.on_book('BTC/USDT', {'bids': [[100.15, 1.0]], 'asks': [[100.3, 1.0]]}, 1.0)
+        self.assertEqual(resting.status, 'closed')
+        self.assertEqual(resting.cost, 100.1)
+        self.assertEqual(self.engine.metrics['maker_fills'], 1)
+
+    def test_spread_improving_quote_waits_for_the_other_side(self):
+        """A bid inside the spread is not traded through by an unchanged book"""
+        order = self.engine.submit('BTC/USDT', 'buy', 1.0, 'limit', 100.0, post_only=True)
+        self.engine.advance(0.1)
+        self.assertEqual(order.status, 'resting')
+
+        self.engine.on_book('BTC/USDT', BOOK, 1.0)
+        self.assertEqual(order.filled, 0.0)
+
+        self.engine.on_book('BTC/USDT', {'bids': BOOK['bids'], 'asks': [[100.0, 2.0], [100.1, 1.0]]}, 2.0)
+        self.assertEqual(order.status, 'closed')
+
+    def test_concurrent_ccxt_calls(self):
+        """Submit and tracker threads can call in while snapshots are applied"""
+        errors, ids = [], []
+
+        def trader():
+            try:
+                for _ in range(200):
+                    order = self.engine.create_order('BTC/USDT', 'market', 'buy', 0.001)
+                    ids.append(order['id'])
+                    self.engine.fetch_order(order['id'])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=trader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(500):
+            self.engine.on_book('BTC/USDT', BOOK, 1.0 + i * 0.01)
+        for thread in threads:
+            thread.join()
+        self.engine.advance(100.0)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(ids)), 800)
+        self.assertEqual(self.engine.get_status()['pending'], 0)
+
+    def test_throughput(self):
+        """Thousands of orders per second"""
+        started = time.perf_counter()
+        for i in range(5000):
+            self.engine.submit('BTC/USDT', 'buy' if i % 2 else 'sell', 0.001)
+            self.engine.on_book('BTC/USDT', BOOK, 1.0 + i)
+        self.assertLess(time.perf_counter() - started, 2.5)
+        self.assertEqual(len(self.engine.drain_ledger()), 5000)
+
+class TestSimulationReplay(unittest.TestCase):
+    """Test suite for TPS19SimulationEngine on the matching engine"""
+
+    def test_replay_flushes_trades_in_bulk(self):
+        """A strategy replayed over snapshots books its fills and persists them"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'simulation.db')
+            sim = TPS19SimulationEngine(matching_engine=MatchingEngine(latency_jitter_ms=0), flush_every=50,
+                                        db_path=db_path)
+            sim.start_simulation('replay')
+
+            snapshots = [dict(BOOK, symbol='BTC_USDT', timestamp=i * 1000) for i in range(200)]
+            report = sim.replay(snapshots, lambda s, snap: s.place_order('BTC_USDT', 'buy', 0.01))
+
+            self.assertEqual(report['orders'], 200)
+            self.assertEqual(report['fills'], 199)
+            self.assertAlmostEqual(sim.portfolio['BTC']['quantity'], 1.99)
+            self.assertLess(sim.current_balance, 10000 - 1.99 * 100.1)
+
+            conn = sqlite3.connect(db_path)
+            stored = conn.execute('SELECT COUNT(*) FROM simulation_trades').fetchone()[0]
+            conn.close()
+            self.assertEqual(stored, 199)
+
+    def test_resting_orders_reserve_funds(self):
+        """Working orders hold back their cash or asset, so together they cannot overdraw"""
+        with tempfile.TemporaryDirectory() as tmp:
+            sim = TPS19SimulationEngine(initial_balance=1000.0, matching_engine=MatchingEngine(latency_jitter_ms=0),
+                                        db_path=os.path.join(tmp, 'simulation.db'))
+            sim.start_simulation('reserve')
+            sim.feed_book('BTC/USDT', BOOK, 0.0)
+
+            first = sim.place_order('BTC/USDT', 'buy', 6.0, 'limit', 99.0)
+            self.assertNotIn('error', first)
+            self.assertEqual(sim.place_order('BTC/USDT', 'buy', 6.0, 'limit', 99.0), {"error": "Insufficient balance"})
+
+            sim.matching.cancel(first['id'])
+            sim.matching.advance(1.0)
+            self.assertNotIn('error', sim.place_order('BTC/USDT', 'buy', 6.0, 'limit', 99.0))
+
+            sim.portfolio['BTC'] = {'quantity': 1.0, 'avg_price': 100.0}
+            self.assertNotIn('error', sim.place_order('BTC/USDT', 'sell', 1.0, 'limit', 101.0))
+            self.assertEqual(sim.place_order('BTC/USDT', 'sell', 1.0, 'limit', 101.0),
+                             {"error": "Insufficient asset balance"})
+
+    def test_imports_as_a_package(self):
+        """modules.simulation.simulation_engine imports with only the repo root on sys.path"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys; sys.path[:] = [p for p in sys.path if 'modules' not in p]; sys.path.append(%r); "
+                  "from modules.simulation.simulation_engine import TPS19SimulationEngine" % root)
+        result = subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(root),
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
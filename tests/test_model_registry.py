@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Model Registry
+Versioned publishing, warm loading, hot swap and retention
+"""
+
+import sys
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from ai_models import model_registry
+from ai_models.model_registry import ModelRegistry
+from ai_models.lstm_predictor import LSTMPredictor, TENSORFLOW_AVAILABLE
+
+class Artifact:
+    """Stand-in for a trained model: save() writes one file"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def save(self, directory):
+        with open(os.path.join(directory, 'value.txt'), 'w') as f:
+            f.write(str(self.value))
+
+def load_artifact(directory):
+    with open(os.path.join(directory, 'value.txt')) as f:
+        return int(f.read())
+
+class TestModelRegistry(unittest.TestCase):
+    """Test suite for ModelRegistry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry(self.tmp.name, keep_versions=2)
+        loaders = mock.patch.dict(model_registry.LOADERS, {'demo': ('demo', load_artifact)})
+        loaders.start()
+        self.addCleanup(loaders.stop)
+
+    def tearDown(self):
+        """Clean up"""
+        self.tmp.cleanup()
+
+    def test_publish_writes_versions_and_metadata(self):
+        """Each publish is a new version; the latest becomes active"""
+        self.registry.publish('demo', 'BTC/USDT', Artifact(1), {'val_loss': 0.2})
+        version = self.registry.publish('demo', 'BTC/USDT', Artifact(2), {'val_loss': 0.1})
+
+        self.assertEqual(version, 'v0002')
+        self.assertEqual(self.registry.list_versions('demo', 'BTC/USDT'), ['v0001', 'v0002'])
+        self.assertEqual(self.registry.active_version('demo', 'BTC/USDT'), 'v0002')
+        self.assertEqual(self.registry.get_metadata('demo', 'BTC/USDT')['val_loss'], 0.1)
+        self.assertEqual(self.registry.symbols('demo'), ['BTC/USDT'])
+        # No staging directories left behind
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.registry.path('demo', 'BTC/USDT', 'v0001')))),
+                         ['ACTIVE', 'v0001', 'v0002'])
+
+    def test_failed_save_publishes_nothing(self):
+        """A model with nothing to save leaves no version behind"""
+        empty = mock.Mock(save=mock.Mock(return_value=False))
+        with self.assertRaises(ValueError):
+            self.registry.publish('demo', 'BTC/USDT', empty)
+        self.assertEqual(self.registry.list_versions('demo', 'BTC/USDT'), [])
+
+    def test_activation_swaps_loaded_handles(self):
+        """Serving handles pick up a new version; references already taken keep the old one"""
+        self.registry.publish('demo', 'BTC/USDT', Artifact(1))
+        handle = self.registry.handle('BTC/USDT', loader='demo')
+        in_flight = handle.get()
+
+        self.registry.publish('demo', 'BTC/USDT', Artifact(2))
+        self.assertEqual(in_flight, 1)
+        self.assertEqual(handle.get(), 2)
+        self.assertEqual(handle.version, 'v0002')
+
+        self.assertEqual(self.registry.rollback('demo', 'BTC/USDT'), 'v0001')
+        self.assertEqual(handle.get(), 1)
+        self.assertEqual(self.registry.get_status()['metrics']['swaps'], 2)
+
+    def test_publish_without_activation(self):
+        """Candidates can be staged and activated later"""
+        self.registry.publish('demo', 'BTC/USDT', Artifact(1))
+        handle = self.registry.handle('BTC/USDT', loader='demo')
+        self.registry.publish('demo', 'BTC/USDT', Artifact(2), activate=False)
+
+        self.assertEqual(handle.get(), 1)
+        self.registry.activate('demo', 'BTC/USDT', 'v0002', background=True)
+        for _ in range(100):
+            if handle.version == 'v0002':
+                break
+            time.sleep(0.01)
+        self.assertEqual(handle.get(), 2)
+
+    def test_preload_warms_active_versions(self):
+        """Startup loads every symbol's active version"""
+        for symbol, value in (('BTC/USDT', 1), ('ETH/USDT', 2)):
+            self.registry.publish('demo', symbol, Artifact(value))
+
+        fresh = ModelRegistry(self.tmp.name)
+        for thread in fresh.preload(loaders=('demo',), background=True):
+            thread.join()
+
+        self.assertEqual(len(fresh.get_status()['handles']), 2)
+        self.assertEqual(fresh.get('ETH/USDT', loader='demo'), 2)
+
+    def test_gc_keeps_newest_and_serving_versions(self):
+        """Old versions go, but never the active one or one still being served"""
+        self.registry.publish('demo', 'BTC/USDT', Artifact(1))
+        self.registry.handle('BTC/USDT', loader='demo')
+        for value in range(2, 6):
+            self.registry.publish('demo', 'BTC/USDT', Artifact(value), activate=False)
+
+        removed = self.registry.gc('demo')
+
+        self.assertEqual(len(removed), 2)
+        self.assertEqual(self.registry.list_versions('demo', 'BTC/USDT'), ['v0001', 'v0004', 'v0005'])
+
+    def test_gc_age_limit(self):
+        """Versions past max_age_days are removed even within keep_versions"""
+        self.registry.config['max_age_days'] = 1
+        self.registry.publish('demo', 'BTC/USDT', Artifact(1), activate=False)
+        self.registry.publish('demo', 'BTC/USDT', Artifact(2))
+
+        removed = self.registry.gc('demo', now=os.path.getmtime(self.tmp.name) + 2 * 86400)
+
+        self.assertEqual([os.path.basename(path) for path in removed], ['v0001'])
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_lstm_publish_serves_numpy_runtime(self):
+        """A published LSTMPredictor loads as both the Keras and NumPy models"""
+        predictor = LSTMPredictor(model_dir=self.tmp.name)
+        predictor.config['lstm_units'] = [8, 8, 8]
+        predictor.scaler_params = {'min': np.full(5, 25000.0), 'max': np.full(5, 27000.0)}
+        predictor.build_model()
+        self.registry.publish('lstm', 'BTC/USDT', predictor, {'val_loss': 0.01})
+
+        runtime = self.registry.get('BTC/USDT', loader='lstm_runtime')
+        keras_model = self.registry.get('BTC/USDT', loader='lstm')
+        window = np.random.default_rng(0).normal(26000, 50, (1, 60, 5))
+        expected = predictor.predict_batch(window, steps=2)
+        np.testing.assert_allclose(runtime.predict_batch(window, steps=2), expected, rtol=1e-4)
+        np.testing.assert_allclose(keras_model.predict_batch(window, steps=2), expected, rtol=1e-5)
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_retrained_model_swaps_into_running_predictor(self):
+        """A predictor attached to the registry serves each newly published version"""
+        scaler = {'min': np.full(5, 25000.0), 'max': np.full(5, 27000.0)}
+        window = np.random.default_rng(0).normal(26000, 50, (1, 60, 5))
+
+        def trained():
+            predictor = LSTMPredictor(model_dir=self.tmp.name, registry=self.registry, symbol='BTC/USDT')
+            predictor.config['lstm_units'] = [8, 8, 8]
+            predictor.scaler_params = scaler
+            predictor.build_model()
+            self.assertEqual(predictor.publish(), predictor.version)
+            return predictor
+
+        first = trained()
+        serving = LSTMPredictor(model_dir=self.tmp.name, registry=self.registry, symbol='BTC/USDT')
+        np.testing.assert_allclose(serving.predict_batch(window), first.predict_batch(window), rtol=1e-5)
+        self.assertEqual(serving.version, 'v0001')
+
+        second = trained()
+        np.testing.assert_allclose(serving.predict_batch(window), second.predict_batch(window), rtol=1e-5)
+        self.assertEqual(serving.get_status()['version'], 'v0002')
+
+    @unittest.skipUnless(TENSORFLOW_AVAILABLE, "tensorflow not installed")
+    def test_retraining_never_fits_the_served_model(self):
+        """A predictor serving a registry version trains a copy and publishes it"""
+        rng = np.random.default_rng(0)
+        candles = rng.normal(26000, 50, (200, 5))
+        publisher = LSTMPredictor(model_dir=self.tmp.name, registry=self.registry, symbol='BTC/USDT')
+        publisher.config['lstm_units'] = [8, 8, 8]
+        publisher.scaler_params = {'min': candles.min(axis=0), 'max': candles.max(axis=0)}
+        publisher.build_model()
+        publisher.publish()
+
+        trainer = LSTMPredictor(model_dir=self.tmp.name, registry=self.registry, symbol='BTC/USDT')
+        trainer.config.update(lstm_units=[8, 8, 8], epochs=1)
+        trainer.predict_batch(candles[None, -60:])
+        served = self.registry.get('BTC/USDT', loader='lstm').model
+        self.assertIs(trainer.model, served)
+        before = [w.copy() for w in served.get_weights()]
+
+        trainer.train(candles)
+
+        self.assertIsNot(trainer.model, served)
+        self.assertTrue(all(np.array_equal(a, b) for a, b in zip(before, served.get_weights())))
+        self.assertEqual(self.registry.active_version('lstm', 'BTC/USDT'), 'v0002')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Monte Carlo Analyzer
+Trade-sequence bootstrap statistics for backtest robustness
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from monte_carlo import MonteCarloAnalyzer
+
+class TestMonteCarloAnalyzer(unittest.TestCase):
+    """Test suite for Monte Carlo Analyzer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.analyzer = MonteCarloAnalyzer(n_simulations=2000, seed=1)
+        self.returns = np.array([0.05, -0.02, 0.03, -0.04, 0.01, 0.02, -0.01, 0.04])
+
+    def test_path_matrix_shape(self):
+        """Every method returns one row per simulation"""
+        for method in MonteCarloAnalyzer.METHODS:
+            paths = self.analyzer.simulate_paths(self.returns, method=method, block_size=3)
+            self.assertEqual(paths.shape, (2000, len(self.returns)))
+
+    def test_permutation_preserves_final_return(self):
+        """Reordering trades never changes the compounded return"""
+        report = self.analyzer.analyze(self.returns, method='permute')
+
+        self.assertAlmostEqual(report['return_pct']['p5'], report['original_return_pct'], places=6)
+        self.assertAlmostEqual(report['return_pct']['p95'], report['original_return_pct'], places=6)
+        self.assertGreaterEqual(report['max_drawdown_pct']['p95'], report['max_drawdown_pct']['p5'])
+
+    def test_drawdown_matches_known_path(self):
+        """Max drawdown of a fixed path matches a hand calculation"""
+        log_paths = np.log1p(np.array([[0.10, -0.20, 0.05]]))
+        stats = self.analyzer.path_statistics(log_paths)
+
+        self.assertAlmostEqual(stats['max_drawdown'][0], 0.20)
+        self.assertAlmostEqual(stats['final_return'][0], 1.1 * 0.8 * 1.05 - 1)
+
+    def test_ruin_probability(self):
+        """Always-losing trades are ruined; always-winning trades never are"""
+        losing = self.analyzer.analyze(np.full(20, -0.05))
+        winning = self.analyzer.analyze(np.full(20, 0.05))
+
+        self.assertEqual(losing['ruin_probability'], 1.0)
+        self.assertEqual(losing['probability_of_loss'], 1.0)
+        self.assertEqual(winning['ruin_probability'], 0.0)
+
+    def test_analyze_backtest_trades(self):
+        """Backtest trade lists are converted to account returns"""
+        result = {
+            'symbol': 'BTC/USDT',
+            'initial_balance': 100.0,
+            'trades': [{'profit': 10.0}, {'profit': -11.0}, {'profit': 9.9}]
+        }
+        returns = MonteCarloAnalyzer.trade_returns(result['trades'], 100.0)
+        np.testing.assert_allclose(returns, [0.10, -0.10, 0.10])
+
+        report = self.analyzer.analyze_backtest(result)
+        self.assertEqual(report['symbol'], 'BTC/USDT')
+        self.assertEqual(report['n_returns'], 3)
+
+    def test_unknown_method(self):
+        """Unknown methods are rejected"""
+        with self.assertRaises(ValueError):
+            self.analyzer.simulate_paths(self.returns, method='shuffle')
+
+if __name__ == '__main__':
+    unittest.main()
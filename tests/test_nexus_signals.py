@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test Suite for APEX Nexus Signal Evaluation
+Concurrent per-pair predictions with per-pair timeouts, and the trading schedule
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+# Add paths (apex_nexus_v2 loads .env and its bot paths relative to the repo root)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+_cwd = os.getcwd()
+os.chdir(ROOT)
+try:
+    from apex_nexus_v2 import APEXNexusV2
+finally:
+    os.chdir(_cwd)
+
+class Oracle:
+    """Oracle stand-in: per-pair delay, confidence or error"""
+
+    def __init__(self, delays=None, confidence=None, errors=None):
+        self.delays = delays or {}
+        self.confidence = confidence or {}
+        self.errors = errors or {}
+
+    def predict_price_movement(self, pair, horizon_minutes=60):
+        time.sleep(self.delays.get(pair, 0.0))
+        if pair in self.errors:
+            raise self.errors[pair]
+        return {'direction': 'UP', 'confidence': self.confidence.get(pair, 0.8)}
+
+def make_nexus(oracle, pairs, timeout=0.5, workers=None):
+    nexus = APEXNexusV2.__new__(APEXNexusV2)
+    nexus.config = {'pairs': pairs, 'signal_timeout': timeout}
+    nexus.oracle = oracle
+    nexus.signal_pool = ThreadPoolExecutor(max_workers=workers or len(pairs))
+    return nexus
+
+class TestEvaluatePairs(unittest.TestCase):
+    """Test suite for APEXNexusV2.evaluate_pairs"""
+
+    def tearDown(self):
+        """Clean up"""
+        self.nexus.signal_pool.shutdown(wait=False, cancel_futures=True)
+
+    def test_pairs_run_concurrently(self):
+        """All pairs are evaluated together and low-confidence ones are filtered"""
+        pairs = ['A/USDT', 'B/USDT', 'C/USDT', 'D/USDT']
+        self.nexus = make_nexus(Oracle(delays=dict.fromkeys(pairs, 0.2), confidence={'D/USDT': 0.5}), pairs)
+
+        started = time.time()
+        signals = self.nexus.evaluate_pairs(pairs)
+
+        self.assertLess(time.time() - started, 0.6)
+        self.assertEqual(sorted(s['pair'] for s in signals), ['A/USDT', 'B/USDT', 'C/USDT'])
+
+    def test_slow_pair_is_dropped_without_stalling(self):
+        """A pair past its timeout is dropped; the others still return"""
+        pairs = ['FAST/USDT', 'SLOW/USDT']
+        self.nexus = make_nexus(Oracle(delays={'SLOW/USDT': 2.0}), pairs, timeout=0.3)
+
+        started = time.time()
+        signals = self.nexus.evaluate_pairs(pairs)
+
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual([s['pair'] for s in signals], ['FAST/USDT'])
+
+    def test_errors_are_isolated(self):
+        """One pair raising does not lose the other pairs' signals"""
+        pairs = ['A/USDT', 'B/USDT']
+        self.nexus = make_nexus(Oracle(errors={'A/USDT': RuntimeError('boom')}), pairs)
+
+        self.assertEqual([s['pair'] for s in self.nexus.evaluate_pairs(pairs)], ['B/USDT'])
+
+    def test_timeout_counts_from_start_not_submission(self):
+        """A pair queued behind a busy worker still gets its full timeout once it runs"""
+        pairs = ['A/USDT', 'B/USDT']
+        self.nexus = make_nexus(Oracle(delays=dict.fromkeys(pairs, 0.3)), pairs, timeout=0.5, workers=1)
+
+        signals = self.nexus.evaluate_pairs(pairs)
+
+        # B starts at ~0.3s and finishes at ~0.6s: past a submission deadline, inside its own
+        self.assertEqual(sorted(s['pair'] for s in signals), pairs)
+
+    def test_pair_without_worker_is_dropped(self):
+        """A pair that never gets a worker is cancelled after the timeout"""
+        pairs = ['A/USDT', 'B/USDT']
+        self.nexus = make_nexus(Oracle(), pairs, timeout=0.2, workers=1)
+        release = threading.Event()
+        self.nexus.signal_pool.submit(release.wait, 5)
+
+        started = time.time()
+        signals = self.nexus.evaluate_pairs(pairs)
+        release.set()
+
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(signals, [])
+
+class TestSchedule(unittest.TestCase):
+    """Test suite for APEXNexusV2.build_schedule"""
+
+    def make_nexus(self, crash_detected):
+        pairs = ['A/USDT', 'B/USDT']
+        self.nexus = make_nexus(Oracle(), pairs)
+        self.nexus.config.update(price_move_pct=1.0, halt_seconds=300)
+        self.nexus.state = {'cycle': 0, 'halted_until': 0}
+        self.nexus.god = mock.Mock(**{'analyze_market_state.return_value': {'regime': 'RANGING'},
+                                      'crisis_intervention.return_value': {}})
+        self.nexus.crash_shield = mock.Mock(**{'check_crash.return_value': {'crash_detected': crash_detected,
+                                                                             'drop_pct': -6.0}})
+        self.nexus.exchange = mock.Mock(**{'fetch_tickers.return_value': {p: {'last': 100.0} for p in pairs}})
+        self.nexus.send_telegram = mock.Mock()
+        self.nexus.execute_signals = mock.Mock()
+        self.nexus.worker_pool = None
+        return self.nexus
+
+    def tearDown(self):
+        """Clean up"""
+        self.nexus.signal_pool.shutdown(wait=False, cancel_futures=True)
+
+    def test_signal_cycle_runs_after_market_checks(self):
+        """Each job runs on its own cadence and the signal cycle executes the pairs' signals"""
+        nexus = self.make_nexus(crash_detected=False)
+        nexus.build_schedule().run(duration=1.3)
+
+        nexus.crash_shield.check_crash.assert_called_with('BTC/USDT')
+        nexus.god.analyze_market_state.assert_called_once()
+        self.assertEqual(nexus.state['cycle'], 1)
+        signals = nexus.execute_signals.call_args[0][0]
+        self.assertEqual(sorted(s['pair'] for s in signals), ['A/USDT', 'B/USDT'])
+
+    def test_worker_mode_moves_predictions_to_worker_pool(self):
+        """With a worker pool signals are published as candles and executed from collected results"""
+        nexus = self.make_nexus(crash_detected=False)
+        nexus.oracle = mock.Mock()
+        nexus.exchange.fetch_ohlcv.return_value = [[0, 100, 100, 100, 100, 1]]
+        nexus.worker_pool = mock.Mock(**{'collect.return_value': [
+            {'symbol': 'A/USDT', 'direction': 'UP', 'confidence': 0.8, 'seq': 2, 'stale': False},
+            {'symbol': 'B/USDT', 'direction': 'UP', 'confidence': 0.5, 'seq': 2, 'stale': False},
+            {'symbol': 'B/USDT', 'direction': 'DOWN', 'confidence': 0.9, 'seq': 1, 'stale': False},
+            {'symbol': 'A/USDT', 'direction': 'DOWN', 'confidence': 0.9, 'seq': 2, 'stale': True}]})
+
+        nexus.build_schedule().run(duration=1.3)
+
+        candles = {p: [[0, 100, 100, 100, 100, 1]] for p in ['A/USDT', 'B/USDT']}
+        nexus.worker_pool.publish.assert_called_once_with(candles)
+        nexus.worker_pool.wait.assert_not_called()
+        nexus.oracle.predict_price_movement.assert_not_called()
+        nexus.crash_shield.check_crash.assert_called_with('BTC/USDT')
+        nexus.execute_signals.assert_called_with([{'pair': 'A/USDT', 'signal': 'UP', 'confidence': 0.8}])
+
+    def test_crash_halts_signal_cycles(self):
+        """A detected crash pauses signal evaluation for halt_seconds"""
+        nexus = self.make_nexus(crash_detected=True)
+        nexus.build_schedule().run(duration=1.3)
+
+        nexus.execute_signals.assert_not_called()
+        self.assertGreater(nexus.state['halted_until'], time.time() + 250)
+        nexus.send_telegram.assert_called_once()
+
+class TestCoordinator(unittest.TestCase):
+    """Test suite for APEXNexusV2.run_coordinator"""
+
+    def test_halt_keeps_renewing_leadership(self):
+        """A market halt drops signals but keeps polling (and renewing) well inside the lease TTL"""
+        nexus = APEXNexusV2.__new__(APEXNexusV2)
+        nexus.state = {'cycle': 0}
+        nexus.god = mock.Mock(**{'crisis_intervention.return_value': {}})
+        nexus.crash_shield = mock.Mock(**{'check_crash.return_value': {'crash_detected': True}})
+        nexus.execute_signals = mock.Mock()
+        signal = {'pair': 'A/USDT', 'signal': 'UP', 'confidence': 0.9}
+        coordinator = mock.Mock(node_id='c1', lease_ttl=15.0, **{
+            'acquire_leadership.return_value': True,
+            'poll.side_effect': [[signal], [signal], KeyboardInterrupt]})
+
+        started = time.time()
+        with self.assertRaises(KeyboardInterrupt):
+            nexus.run_coordinator(coordinator)
+
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(coordinator.acquire_leadership.call_count, 3)
+        coordinator.poll.assert_called_with(max_signals=1000, timeout=5.0)
+        nexus.crash_shield.check_crash.assert_called_once()
+        nexus.execute_signals.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Order Execution
+Queued concurrent order placement, fill reconciliation and the position book
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+
+# Add paths
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'modules'))
+sys.path.insert(0, ROOT)
+
+from order_execution import ExecutionEngine, PositionBook
+
+class ScriptedExchange:
+    """Stand-in ccxt client whose orders fill as the test dictates"""
+
+    def __init__(self, ack_delay=0.0, reject=False, timeout_after_record=False):
+        self.ack_delay = ack_delay
+        self.reject = reject
+        self.timeout_after_record = timeout_after_record
+        self.orders = {}
+        self.created = []
+        self._lock = threading.Lock()
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+        time.sleep(self.ack_delay)
+        if self.reject:
+            raise ValueError('insufficient balance')
+        with self._lock:
+            order_id = str(len(self.orders) + 1)
+            self.orders[order_id] = {'id': order_id, 'clientOrderId': params['clientOrderId'],
+                                     'status': 'open', 'filled': 0.0, 'average': None, 'amount': amount}
+            self.created.append(time.monotonic())
+            if self.timeout_after_record:
+                raise TimeoutError('read timed out')
+            return dict(self.orders[order_id])
+
+    def fetch_open_orders(self, symbol=None):
+        return [dict(order) for order in self.orders.values() if order['status'] == 'open']
+
+    def fill(self, order_id, filled, average, status='open'):
+        self.orders[order_id].update(filled=filled, average=average, status=status)
+
+    def fetch_order(self, order_id, symbol=None):
+        return dict(self.orders[order_id])
+
+    def cancel_order(self, order_id, symbol=None):
+        self.orders[order_id]['status'] = 'canceled'
+
+class TestExecutionEngine(unittest.TestCase):
+    """Test suite for ExecutionEngine"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.fills = []
+        self.engines = []
+
+    def tearDown(self):
+        """Clean up"""
+        for engine in self.engines:
+            engine.stop()
+
+    def make_engine(self, exchange, **kwargs):
+        kwargs.setdefault('poll_interval', 3600)
+        engine = ExecutionEngine(exchange, **kwargs)
+        engine.on_fill(self.fills.append)
+        self.engines.append(engine)
+        return engine
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_submit_does_not_block_and_orders_go_out_in_parallel(self):
+        """submit() returns immediately and slow acks overlap"""
+        exchange = ScriptedExchange(ack_delay=0.3)
+        engine = self.make_engine(exchange, max_in_flight=4)
+
+        started = time.monotonic()
+        tickets = [engine.submit(s, 'buy', 1.0) for s in ('BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT')]
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertTrue(all(t['status'] == 'queued' for t in tickets))
+
+        self.wait_for(lambda: len(exchange.created) == 4)
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_partial_fills_reported_once(self):
+        """Cumulative fills become incremental events, duplicates are ignored"""
+        exchange = ScriptedExchange()
+        engine = self.make_engine(exchange)
+        ticket = engine.submit('BTC/USDT', 'buy', 2.0)
+        self.wait_for(lambda: engine.get_order(ticket['client_id'])['status'] == 'open')
+        order_id = engine.get_order(ticket['client_id'])['order_id']
+
+        exchange.fill(order_id, 0.5, 100.0)
+        engine.poll_once()
+        engine.poll_once()
+        exchange.fill(order_id, 2.0, 103.0, status='closed')
+        engine.poll_once()
+
+        self.assertEqual([f['amount'] for f in self.fills], [0.5, 1.5])
+        self.assertAlmostEqual(self.fills[1]['price'], 104.0)
+        self.assertEqual(self.fills[1]['status'], 'filled')
+        self.assertEqual(engine.wait(ticket['client_id'], 1)['status'], 'filled')
+        self.assertAlmostEqual(engine.positions.get_position('BTC/USDT')['avg_entry'], 103.0)
+
+    def test_pushed_updates_reconcile(self):
+        """Websocket order updates are matched by client order id"""
+        exchange = ScriptedExchange()
+        engine = self.make_engine(exchange)
+        ticket = engine.submit('ETH/USDT', 'sell', 1.0, priority=0)
+        self.wait_for(lambda: engine.get_order(ticket['client_id'])['status'] == 'open')
+
+        engine.handle_order_update({'clientOrderId': ticket['client_id'], 'status': 'closed',
+                                    'filled': 1.0, 'average': 1600.0})
+
+        self.assertEqual(len(self.fills), 1)
+        self.assertFalse(engine.has_open_order('ETH/USDT'))
+
+    def test_rejection_finishes_ticket(self):
+        """Exchange errors mark the ticket rejected without fills"""
+        engine = self.make_engine(ScriptedExchange(reject=True))
+        ticket = engine.submit('BTC/USDT', 'buy', 1.0)
+
+        done = engine.wait(ticket['client_id'], 5)
+
+        self.assertEqual(done['status'], 'rejected')
+        self.assertIn('insufficient balance', done['error'])
+        self.assertEqual(self.fills, [])
+
+    def test_placement_timeout_adopts_order_the_exchange_recorded(self):
+        """A timed-out create_order is looked up by clientOrderId, not rejected"""
+        exchange = ScriptedExchange(timeout_after_record=True)
+        engine = self.make_engine(exchange)
+        ticket = engine.submit('BTC/USDT', 'buy', 1.0)
+
+        self.wait_for(lambda: engine.get_order(ticket['client_id'])['status'] == 'open')
+        self.assertEqual(engine.get_order(ticket['client_id'])['order_id'], '1')
+        self.assertTrue(engine.has_open_order('BTC/USDT'))
+        self.assertEqual(engine.metrics['unknown'], 1)
+
+        exchange.fill('1', 1.0, 100.0, status='closed')
+        engine.poll_once()
+        self.assertEqual(engine.get_order(ticket['client_id'])['status'], 'filled')
+        self.assertEqual(len(self.fills), 1)
+
+    def test_placement_timeout_stays_open_until_order_timeout(self):
+        """An order that never shows up blocks resubmission, then is rejected"""
+        def lost_in_transit(*args, **kwargs):
+            raise TimeoutError('read timed out')
+
+        exchange = ScriptedExchange()
+        exchange.create_order = lost_in_transit
+        engine = self.make_engine(exchange, order_timeout=0.2)
+        ticket = engine.submit('BTC/USDT', 'buy', 1.0)
+
+        self.wait_for(lambda: engine.metrics['unknown'] == 1)
+        self.assertEqual(engine.get_order(ticket['client_id'])['status'], 'unknown')
+        self.assertTrue(engine.has_open_order('BTC/USDT'))
+
+        time.sleep(0.25)
+        engine.poll_once()
+        done = engine.get_order(ticket['client_id'])
+        self.assertEqual(done['status'], 'rejected')
+        self.assertIn('TimeoutError', done['error'])
+
+class TestPositionBook(unittest.TestCase):
+    """Test suite for PositionBook"""
+
+    def test_round_trip_realizes_pnl(self):
+        """Buying then selling realizes P&L at the average entry"""
+        book = PositionBook()
+        for side, amount, price in (('buy', 1.0, 100.0), ('buy', 1.0, 110.0), ('sell', 2.0, 120.0)):
+            book.apply_fill({'symbol': 'BTC/USDT', 'side': side, 'amount': amount, 'price': price,
+                             'timestamp': 'now'})
+
+        self.assertEqual(book.get_position('BTC/USDT')['amount'], 0.0)
+        self.assertAlmostEqual(book.realized_pnl, 30.0)
+        self.assertEqual(book.open_positions(), {})
+
+class TestMultiCoinTrader(unittest.TestCase):
+    """Positions of MultiCoinTrader come from fills only"""
+
+    def make_trader(self, exchange):
+        import multi_coin_trader
+        with mock.patch.object(multi_coin_trader.ccxt, 'cryptocom', return_value=exchange):
+            trader = multi_coin_trader.MultiCoinTrader()
+        trader.execution.poll_interval = 3600
+        self.addCleanup(trader.execution.stop)
+        return trader
+
+    def enter(self, trader, symbol='BTC/USDT'):
+        ticket = trader.place_order(symbol, 'buy', 2.0)
+        trader.entries[symbol] = {'side': 'buy', 'amount': 2.0, 'quoted_price': 100.0,
+                                  'client_id': ticket['client_id'], 'timestamp': ''}
+        return ticket
+
+    def test_rejected_entry_leaves_no_position(self):
+        """A rejected entry is dropped and nothing is sold on close"""
+        exchange = ScriptedExchange(reject=True)
+        trader = self.make_trader(exchange)
+        ticket = self.enter(trader)
+        trader.execution.wait(ticket['client_id'], timeout=5)
+
+        trader.sync_positions()
+        self.assertEqual((trader.positions, trader.entries), ({}, {}))
+        trader.close_all_positions()
+        self.assertEqual(trader.execution.open_orders(), [])
+        self.assertEqual(len(trader.execution.tickets), 1)
+
+    def test_close_sells_only_the_filled_amount(self):
+        """An unfilled remainder is cancelled and only the filled part is closed"""
+        exchange = ScriptedExchange()
+        trader = self.make_trader(exchange)
+        ticket = self.enter(trader)
+        engine = trader.execution
+        deadline = time.monotonic() + 5
+        while engine.get_order(ticket['client_id'])['status'] != 'open' and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        exchange.fill('1', 0.5, 100.0)
+        engine.poll_once()
+        self.assertEqual(trader.positions['BTC/USDT']['filled'], 0.5)
+
+        trader.close_all_positions()
+        self.assertEqual(exchange.orders['1']['status'], 'canceled')
+        self.assertEqual(trader.positions, {})
+        exits = [t for t in engine.tickets.values() if t['side'] == 'sell']
+        self.assertEqual([t['amount'] for t in exits], [0.5])
+
+if __name__ == '__main__':
+    unittest.main()
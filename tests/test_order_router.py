@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Order Router
+Route choice from the fee schedule and book, requoting and realized cost
+"""
+
+import sys
+import os
+import time
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from order_execution import ExecutionEngine
+from order_router import OrderRouter, estimate_routes
+
+WIDE_BOOK = {'bids': [[99.9, 5.0], [99.8, 5.0]], 'asks': [[100.1, 5.0], [100.2, 5.0]]}
+TIGHT_BOOK = {'bids': [[99.99, 5.0]], 'asks': [[100.01, 5.0]]}
+
+class RestingExchange:
+    """Market orders fill at the ask; limits rest until the test fills them"""
+
+    def __init__(self, book=WIDE_BOOK):
+        self.book = book
+        self.orders = {}
+
+    def market(self, symbol):
+        return {'maker': 0.0004, 'taker': 0.0010}
+
+    def fetch_order_book(self, symbol, limit=50):
+        return self.book
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+        order_id = str(len(self.orders) + 1)
+        market = order_type == 'market'
+        self.orders[order_id] = {'id': order_id, 'type': order_type, 'price': price, 'amount': amount,
+                                 'params': params, 'status': 'closed' if market else 'open',
+                                 'filled': amount if market else 0.0,
+                                 'average': self.book['asks'][0][0] if market else None}
+        return dict(self.orders[order_id])
+
+    def fetch_order(self, order_id, symbol=None):
+        return dict(self.orders[order_id])
+
+    def cancel_order(self, order_id, symbol=None):
+        self.orders[order_id]['status'] = 'canceled'
+
+    def fill(self, order_id, filled):
+        order = self.orders[order_id]
+        order.update(filled=filled, average=order['price'],
+                     status='closed' if filled >= order['amount'] else 'open')
+
+class TestEstimateRoutes(unittest.TestCase):
+    """Test suite for the route cost estimate"""
+
+    def test_wide_spread_prefers_post_only(self):
+        """Earning a 10 bps half spread beats paying it plus the taker fee"""
+        estimate = estimate_routes(WIDE_BOOK, 'buy', 1.0, 0.0004, 0.0010)
+        self.assertAlmostEqual(estimate['costs_bps']['market'], 20.0)
+        self.assertEqual(estimate['best'], 'post_only')
+
+    def test_tight_spread_prefers_market(self):
+        """With a 1 bps half spread, resting is not worth the non-fill risk"""
+        estimate = estimate_routes(TIGHT_BOOK, 'buy', 1.0, 0.0010, 0.0010, maker_fill_rate=0.2)
+        self.assertEqual(estimate['best'], 'market')
+
+    def test_large_order_prefers_slicing(self):
+        """An order deeper than the touch is cheaper in a few depth-capped children"""
+        book = {'bids': [[99.99, 4.0], [99.0, 100.0]], 'asks': [[100.01, 4.0], [101.0, 100.0]]}
+        estimate = estimate_routes(book, 'buy', 8.0, 0.0010, 0.0010, maker_fill_rate=0.0,
+                                   max_depth_pct=50.0)
+        self.assertEqual(estimate['best'], 'sliced')
+        self.assertEqual(estimate['children'], 4)
+        # One child's taker cost plus 1.5 intervals of drift for the average child
+        self.assertAlmostEqual(estimate['costs_bps']['sliced'], 11.0 + 2.0 * 1.5)
+
+    def test_many_children_pay_for_drift(self):
+        """Slicing into dozens of children is not free: waiting costs more than crossing"""
+        book = {'bids': [[99.99, 1.0], [99.7, 100.0]], 'asks': [[100.01, 1.0], [100.3, 100.0]]}
+        estimate = estimate_routes(book, 'buy', 20.0, 0.0010, 0.0010, maker_fill_rate=0.0,
+                                   max_depth_pct=50.0, depth_band_bps=10.0)
+        self.assertEqual(estimate['children'], 40)
+        self.assertAlmostEqual(estimate['costs_bps']['sliced'], 11.0 + 2.0 * 19.5)
+        self.assertGreater(estimate['costs_bps']['sliced'], estimate['costs_bps']['market'])
+        self.assertEqual(estimate['best'], 'market')
+
+class TestOrderRouter(unittest.TestCase):
+    """Test suite for OrderRouter"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = [1_700_000_000.0]
+        self.engines = []
+
+    def tearDown(self):
+        """Clean up"""
+        for engine in self.engines:
+            engine.stop()
+
+    def make_router(self, exchange):
+        engine = ExecutionEngine(exchange, poll_interval=3600)
+        self.engines.append(engine)
+        return OrderRouter(engine, clock=lambda: self.now[0], autostart=False)
+
+    def settle(self, router, route_id, ticks=20):
+        for _ in range(ticks):
+            time.sleep(0.02)
+            router.engine.poll_once()
+            router.tick()
+            if router.get_route(route_id)['status'] != 'working':
+                break
+        return router.get_route(route_id)
+
+    def test_post_only_requotes_then_falls_back(self):
+        """Stale quotes are replaced for the remainder, then the rest crosses"""
+        exchange = RestingExchange()
+        router = self.make_router(exchange)
+        router.config['max_requotes'] = 1
+
+        route = router.route('BTC/USDT', 'buy', 2.0)
+        self.assertEqual(route['route'], 'post_only')
+        self.settle(router, route['route_id'], ticks=2)
+        self.assertEqual(exchange.orders['1']['params']['postOnly'], True)
+        self.assertEqual(exchange.orders['1']['price'], 99.9)
+
+        exchange.fill('1', 1.0)
+        self.now[0] += 20
+        self.settle(router, route['route_id'], ticks=3)
+        self.assertEqual(exchange.orders['1']['status'], 'canceled')
+        self.assertEqual(exchange.orders['2']['amount'], 1.0)
+
+        self.now[0] += 20
+        done = self.settle(router, route['route_id'])
+
+        self.assertEqual(exchange.orders['3']['type'], 'market')
+        self.assertEqual(done['status'], 'filled')
+        self.assertTrue(done['fallback'])
+        self.assertAlmostEqual(done['maker_filled'], 1.0)
+        # Half at the bid (-10 bps + 4 fee), half at the ask (+10 bps + 10 fee)
+        self.assertAlmostEqual(done['realized_bps'], 7.0, places=1)
+
+    def test_no_requote_while_old_quote_may_be_live(self):
+        """A quote whose cancel failed or whose placement is unresolved is never doubled"""
+        exchange = RestingExchange()
+        router = self.make_router(exchange)
+
+        def refuse(order_id, symbol=None):
+            raise ConnectionError('timed out')
+
+        route = router.route('BTC/USDT', 'buy', 2.0)
+        self.settle(router, route['route_id'], ticks=2)
+        exchange.cancel_order = refuse
+        self.now[0] += 20
+        self.settle(router, route['route_id'], ticks=3)
+        self.assertEqual(list(exchange.orders), ['1'])
+
+        ticket = router.get_route(route['route_id'])['active']
+        with router.engine._lock:
+            router.engine.tickets[ticket].update(status='unknown', order_id=None)
+        self.settle(router, route['route_id'], ticks=3)
+        self.assertEqual(list(exchange.orders), ['1'])
+
+    def test_urgent_orders_go_to_market_and_record_cost(self):
+        """Exits cross immediately and their realized cost matches the estimate"""
+        exchange = RestingExchange()
+        router = self.make_router(exchange)
+
+        route = router.route('BTC/USDT', 'buy', 1.0, urgency='high')
+        done = self.settle(router, route['route_id'])
+
+        self.assertEqual(done['route'], 'market')
+        self.assertEqual(done['status'], 'filled')
+        self.assertAlmostEqual(done['realized_bps'], done['estimate_bps'], places=6)
+        self.assertEqual(router.get_status()['metrics']['completed'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
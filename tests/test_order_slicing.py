@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Order Slicing
+TWAP/VWAP child-order scheduling on the execution engine
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from order_execution import ExecutionEngine
+from order_slicing import SliceScheduler, vwap_weights, hourly_volume_profile
+
+START = 1_700_006_400.0  # 00:00 UTC
+
+class BookExchange:
+    """Stand-in ccxt client with a fixed book; children fill a set fraction"""
+
+    def __init__(self, fill_ratio=1.0, ask_depth=10.0):
+        self.fill_ratio = fill_ratio
+        self.ask_depth = ask_depth
+        self.children = []
+
+    def fetch_order_book(self, symbol, limit=50):
+        return {'asks': [[100.0, self.ask_depth]], 'bids': [[99.9, self.ask_depth]]}
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', limit=None):
+        # Hour 0 trades three times the volume of hour 1
+        return [[(START + h * 3600) * 1000, 100, 100, 100, 100, 30.0 if h % 24 == 0 else 10.0]
+                for h in range(48)]
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+        self.children.append((symbol, amount))
+        return {'id': str(len(self.children)), 'status': 'canceled' if self.fill_ratio < 1 else 'closed',
+                'filled': amount * self.fill_ratio, 'average': 100.0}
+
+class TestSliceScheduler(unittest.TestCase):
+    """Test suite for SliceScheduler"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = [START]
+        self.engines = []
+
+    def tearDown(self):
+        """Clean up"""
+        for engine in self.engines:
+            engine.stop()
+
+    def scheduler(self, exchange, **kwargs):
+        engine = ExecutionEngine(exchange, poll_interval=3600)
+        self.engines.append(engine)
+        return SliceScheduler(engine, clock=lambda: self.now[0], autostart=False, **kwargs)
+
+    def run_ticks(self, scheduler, count, step=60):
+        for _ in range(count):
+            scheduler.tick()
+            time.sleep(0.05)
+            self.now[0] += step
+
+    def test_twap_spreads_children_over_time(self):
+        """Children follow the schedule, one per interval"""
+        exchange = BookExchange()
+        scheduler = self.scheduler(exchange)
+        parent = scheduler.submit('BTC/USDT', 'buy', 2.0, duration=240, n_slices=4)
+
+        scheduler.tick()
+        time.sleep(0.05)
+        self.assertEqual(len(exchange.children), 1)
+
+        self.now[0] += 60
+        self.run_ticks(scheduler, 4)
+        done = scheduler.get_parent(parent['parent_id'])
+
+        self.assertEqual([round(a, 6) for _, a in exchange.children], [0.5] * 4)
+        self.assertEqual(done['status'], 'filled')
+        self.assertAlmostEqual(done['avg_price'], 100.0)
+
+    def test_shortfall_rolls_forward_with_depth_cap(self):
+        """Partial fills are topped up on later slices, never above the depth cap"""
+        exchange = BookExchange(fill_ratio=0.5, ask_depth=4.0)
+        scheduler = self.scheduler(exchange, max_depth_pct=25.0, catch_up_slices=3)
+        parent = scheduler.submit('BTC/USDT', 'buy', 2.0, duration=120, n_slices=2)
+
+        self.run_ticks(scheduler, 6)
+        done = scheduler.get_parent(parent['parent_id'])
+
+        amounts = [a for _, a in exchange.children]
+        self.assertTrue(all(a <= 1.0 + 1e-9 for a in amounts))
+        self.assertGreater(amounts[1], 0.5)
+        self.assertEqual(done['status'], 'incomplete')
+        self.assertAlmostEqual(done['filled'], sum(amounts) * 0.5)
+
+    def test_vwap_follows_volume_profile(self):
+        """VWAP weights slices by the usual volume of their hour"""
+        profile = hourly_volume_profile(BookExchange().fetch_ohlcv('BTC/USDT'))
+        weights = vwap_weights([START, START + 3600], profile)
+        self.assertAlmostEqual(weights[0], 0.75)
+
+        exchange = BookExchange()
+        scheduler = self.scheduler(exchange)
+        parent = scheduler.submit('BTC/USDT', 'buy', 4.0, style='vwap', duration=7200, n_slices=2)
+        scheduler.tick()
+        self.assertAlmostEqual(scheduler.get_parent(parent['parent_id'])['targets'][0], 3.0)
+
+    def test_exchange_reads_stay_off_caller_and_lock(self):
+        """VWAP profiles load on the scheduler thread; books are fetched without the lock held"""
+        scheduler = None
+        calls = []
+
+        class SlowExchange(BookExchange):
+            def fetch_ohlcv(self, symbol, timeframe='1h', limit=None):
+                calls.append(('ohlcv', threading.current_thread().name))
+                return super().fetch_ohlcv(symbol, timeframe, limit)
+
+            def fetch_order_book(self, symbol, limit=50):
+                # Another thread must be able to query the scheduler meanwhile
+                query = threading.Thread(target=scheduler.get_status)
+                query.start()
+                query.join(timeout=2)
+                calls.append(('book', not query.is_alive()))
+                return super().fetch_order_book(symbol, limit)
+
+        exchange = SlowExchange()
+        scheduler = self.scheduler(exchange)
+        scheduler.submit('BTC/USDT', 'buy', 4.0, style='vwap', duration=7200, n_slices=2)
+        self.assertEqual(calls, [])
+
+        worker = threading.Thread(target=scheduler.tick, name='slice-scheduler')
+        worker.start()
+        worker.join(timeout=5)
+
+        self.assertEqual(calls, [('ohlcv', 'slice-scheduler'), ('book', True)])
+        # The engine places the child on its own thread
+        deadline = time.time() + 2
+        while not exchange.children and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(exchange.children), 1)
+
+    def test_parents_run_concurrently(self):
+        """Several parents are worked in the same ticks"""
+        exchange = BookExchange()
+        scheduler = self.scheduler(exchange)
+        parents = [scheduler.submit(s, 'buy', 1.0, duration=120, n_slices=2) for s in ('BTC/USDT', 'ETH/USDT')]
+
+        self.run_ticks(scheduler, 3)
+
+        self.assertEqual(sorted(s for s, _ in exchange.children), ['BTC/USDT'] * 2 + ['ETH/USDT'] * 2)
+        self.assertTrue(all(scheduler.get_parent(p['parent_id'])['status'] == 'filled' for p in parents))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Portfolio Backtester
+Shared cash pool, rebalancing and vectorized portfolio metrics
+"""
+
+import sys
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bots'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from portfolio_backtester import PortfolioBacktester
+from execution_costs import ExecutionCostModel
+
+class TestPortfolioBacktester(unittest.TestCase):
+    """Test suite for Portfolio Backtester"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.bt = PortfolioBacktester()
+        self.symbols = ['BTC/USDT', 'ETH/USDT']
+        bars = np.arange(48, dtype=float)
+        self.closes = np.column_stack([100 + bars, 50 - 0.5 * bars])
+
+    def test_flat_prices_keep_balance_without_fees(self):
+        """Flat prices with zero fees should leave equity unchanged"""
+        closes = np.full((10, 2), 10.0)
+        result = self.bt.backtest_portfolio(closes, {'A': 0.5, 'B': 0.5}, symbols=['A', 'B'],
+                                            initial_balance=100.0, fee_rate=0.0)
+
+        np.testing.assert_allclose(result['equity'], 100.0)
+        np.testing.assert_allclose(result['exposure'], 1.0)
+        self.assertAlmostEqual(result['roi'], 0.0)
+
+    def test_arrays_are_aligned(self):
+        """Every per-bar output should have one row per bar"""
+        result = self.bt.backtest_portfolio(self.closes, {'BTC/USDT': 0.6, 'ETH/USDT': 0.3},
+                                            symbols=self.symbols, initial_balance=100.0)
+
+        for key in ('equity', 'cash', 'exposure', 'turnover', 'drawdown'):
+            self.assertEqual(result[key].shape, (48,))
+        self.assertEqual(result['weights'].shape, (48, 2))
+
+        # 10% stays in cash
+        self.assertAlmostEqual(result['exposure'][0], 0.9, places=2)
+
+    def test_shared_cash_pool_matches_buy_and_hold(self):
+        """Without rebalancing the portfolio equals buy-and-hold of both legs"""
+        result = self.bt.backtest_portfolio(self.closes, {'BTC/USDT': 0.5, 'ETH/USDT': 0.5},
+                                            symbols=self.symbols, initial_balance=100.0,
+                                            rebalance_every=1000, fee_rate=0.0)
+
+        expected = 50 * self.closes[:, 0] / self.closes[0, 0] + 50 * self.closes[:, 1] / self.closes[0, 1]
+        np.testing.assert_allclose(result['equity'], expected)
+        self.assertEqual(result['rebalances'], 1)
+
+    def test_scheduled_rebalances_and_turnover(self):
+        """Scheduled rebalances generate turnover and fees"""
+        result = self.bt.backtest_portfolio(self.closes, {'BTC/USDT': 0.5, 'ETH/USDT': 0.5},
+                                            symbols=self.symbols, initial_balance=100.0,
+                                            rebalance_every=6, fee_rate=0.001)
+
+        self.assertEqual(result['rebalances'], 8)
+        self.assertGreater(result['total_turnover'], 1.0)
+        self.assertGreater(result['fees_paid'], 0.0)
+        self.assertGreaterEqual(result['cash'].min(), -1e-9)
+
+    def test_drift_threshold_triggers_rebalance(self):
+        """Weight drift beyond threshold rebalances before the schedule"""
+        result = self.bt.backtest_portfolio(self.closes, {'BTC/USDT': 0.5, 'ETH/USDT': 0.5},
+                                            symbols=self.symbols, rebalance_every=1000,
+                                            drift_threshold_pct=2.0, fee_rate=0.0)
+
+        self.assertGreater(result['rebalances'], 1)
+
+    def test_rotation_schedule_normalized(self):
+        """Rotation weights are normalized with an equal-weight warm-up"""
+        rng = np.random.default_rng(7)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (200, 5)), axis=0))
+        weights = self.bt.rotation_schedule(closes, lookback=24)
+
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        np.testing.assert_allclose(weights[:24], 0.2)
+
+        result = self.bt.backtest_portfolio(closes, weights, initial_balance=100.0)
+        self.assertNotIn('error', result)
+
+    def test_cost_model_replaces_flat_fee(self):
+        """An uncalibrated cost model charges its taker fee plus half spread"""
+        flat = self.bt.backtest_portfolio(self.closes, {'BTC/USDT': 0.5, 'ETH/USDT': 0.5},
+                                          symbols=self.symbols, initial_balance=100.0, fee_rate=0.003)
+
+        costed = PortfolioBacktester(cost_model=ExecutionCostModel(taker_fee=0.001, half_spread_bps=20))
+        result = costed.backtest_portfolio(self.closes, {'BTC/USDT': 0.5, 'ETH/USDT': 0.5},
+                                           symbols=self.symbols, initial_balance=100.0)
+
+        self.assertAlmostEqual(result['fees_paid'], flat['fees_paid'], places=9)
+        np.testing.assert_allclose(result['equity'], flat['equity'])
+
+    def test_leverage_rejected(self):
+        """Weights summing above one are rejected"""
+        result = self.bt.backtest_portfolio(self.closes, {'BTC/USDT': 0.8, 'ETH/USDT': 0.8},
+                                            symbols=self.symbols)
+        self.assertIn('error', result)
+
+    def test_cash_never_negative_after_costs(self):
+        """Rebalances that sell into high fees still leave non-negative cash"""
+        closes = np.array([[64.79, 119.28], [131.42, 93.11], [166.13, 155.32], [275.99, 286.52]])
+        weights = np.array([[0.994, 0.006], [0.157, 0.843], [0.988, 0.012], [0.653, 0.347]])
+
+        result = self.bt.backtest_portfolio(closes, weights, symbols=['A', 'B'], initial_balance=100.0,
+                                            rebalance_every=1, fee_rate=0.05)
+
+        self.assertTrue(np.all(result['cash'] >= 0))
+        np.testing.assert_allclose(result['equity'], result['cash'] + result['values'].sum(axis=1))
+        self.assertTrue(np.all(result['exposure'] <= 1.0 + 1e-12))
+
+    def test_high_fee_rates_fit_costs_into_equity(self):
+        """Costs that are a large share of each trade still converge to a feasible rebalance"""
+        closes = np.array([[64.79, 119.28], [131.42, 93.11], [166.13, 155.32], [275.99, 286.52]])
+        weights = np.array([[0.994, 0.006], [0.157, 0.843], [0.988, 0.012], [0.653, 0.347]])
+
+        for fee_rate in (0.3, 0.5, 0.9):
+            result = self.bt.backtest_portfolio(closes, weights, symbols=['A', 'B'], initial_balance=100.0,
+                                                rebalance_every=1, fee_rate=fee_rate)
+
+            self.assertTrue(np.all(result['cash'] >= 0), fee_rate)
+            self.assertTrue(np.all(result['equity'] > 0), fee_rate)
+            np.testing.assert_allclose(result['equity'], result['cash'] + result['values'].sum(axis=1))
+
+    def test_costs_above_equity_raise(self):
+        """A cost model that cannot even liquidate within equity is an error, not an assert"""
+        model = mock.Mock(**{'cost_rate.return_value': 2.0})
+        bt = PortfolioBacktester(cost_model=model)
+        closes = np.array([[100.0, 100.0], [50.0, 200.0]])
+
+        with self.assertRaises(ValueError):
+            bt.backtest_portfolio(closes, {'A': 0.5, 'B': 0.5}, symbols=['A', 'B'], initial_balance=100.0,
+                                  rebalance_every=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Process Workers
+Shared-memory market snapshot and per-category worker processes
+"""
+
+import sys
+import os
+import time
+import unittest
+
+import numpy as np
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from process_workers import MarketSnapshot, BotWorkerPool
+
+def make_candles(closes, start_ms=1_700_000_000_000, step_ms=300000):
+    return [[start_ms + i * step_ms, c, c * 1.001, c * 0.999, c, 5.0] for i, c in enumerate(closes)]
+
+class TestMarketSnapshot(unittest.TestCase):
+    """Test suite for MarketSnapshot"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.snapshot = MarketSnapshot(['BTC/USDT', 'ETH/USDT'], n_bars=10)
+        self.reader = MarketSnapshot.attach(self.snapshot.spec())
+
+    def tearDown(self):
+        """Clean up"""
+        self.reader.close()
+        self.snapshot.close()
+
+    def test_reader_sees_published_data_without_copy(self):
+        """Attached readers get views onto the writer's memory"""
+        message = self.snapshot.publish({'BTC/USDT': make_candles(np.linspace(100, 104, 5))},
+                                        {'ETH/USDT': {'last': 1600.0, 'bid': 1599.5, 'ask': 1600.5}})
+
+        view = self.reader.view(message['slot'])
+        btc = view.ohlcv('BTC/USDT')
+
+        self.assertEqual(btc.shape, (5, 6))
+        self.assertAlmostEqual(btc[-1, 4], 104.0)
+        self.assertEqual(len(view.ohlcv('ETH/USDT')), 0)
+        self.assertEqual(view.ticker('ETH/USDT')['last'], 1600.0)
+        self.assertFalse(btc.flags['OWNDATA'])
+
+    def test_slots_alternate_and_detect_overwrite(self):
+        """A view goes stale once its slot is reused two cycles later"""
+        first = self.snapshot.publish({'BTC/USDT': make_candles([1.0, 2.0])})
+        view = self.reader.view(first['slot'])
+        second = self.snapshot.publish({'BTC/USDT': make_candles([3.0, 4.0])})
+
+        self.assertNotEqual(first['slot'], second['slot'])
+        self.assertTrue(view.is_current())
+
+        self.snapshot.publish({'BTC/USDT': make_candles([5.0, 6.0])})
+        self.assertFalse(view.is_current())
+
+    def test_long_history_keeps_latest_bars(self):
+        """Only the most recent n_bars candles are kept"""
+        message = self.snapshot.publish({'BTC/USDT': make_candles(np.arange(1, 26, dtype=float))})
+        closes = self.reader.view(message['slot']).ohlcv('BTC/USDT')[:, 4]
+
+        np.testing.assert_array_equal(closes, np.arange(16, 26, dtype=float))
+
+class TestBotWorkerPool(unittest.TestCase):
+    """Test suite for BotWorkerPool"""
+
+    def test_crash_signals_from_worker_process(self):
+        """A CORE_APEX worker flags a crash from the shared snapshot"""
+        pool = BotWorkerPool(['BTC/USDT', 'ETH/USDT'], n_bars=24)
+        pool.add_group('CORE_APEX', ['crash_shield_bot'])
+
+        try:
+            ready = pool.start(wait_ready=60)
+            self.assertEqual(ready, {'CORE_APEX': True})
+
+            now = int(time.time() * 1000) - 24 * 300000
+            seq = pool.publish({
+                'BTC/USDT': make_candles(np.full(24, 26000.0), now),
+                'ETH/USDT': make_candles(np.r_[np.full(20, 1600.0), np.full(4, 1400.0)], now)
+            })
+            signals = pool.wait(seq, timeout=30)
+
+            self.assertEqual([s['symbol'] for s in signals], ['ETH/USDT'])
+            self.assertEqual(signals[0]['crash_level'], 'CRASH')
+            self.assertEqual(signals[0]['bot'], 'crash_shield_bot')
+            self.assertEqual(pool.get_status()['groups']['CORE_APEX']['last_seq'], seq)
+        finally:
+            pool.stop()
+
+    def test_oracle_predictions_from_worker_process(self):
+        """A GOD_LEVEL worker predicts every symbol from the snapshot without API calls"""
+        pool = BotWorkerPool(['BTC/USDT', 'ETH/USDT'], n_bars=100, timeframe='1h')
+        pool.add_group('GOD_LEVEL', ['oracle_ai'])
+
+        try:
+            self.assertEqual(pool.start(wait_ready=60), {'GOD_LEVEL': True})
+
+            seq = pool.publish({
+                'BTC/USDT': make_candles(np.linspace(26000, 27000, 100), step_ms=3600000),
+                'ETH/USDT': make_candles(np.linspace(1600, 1500, 100), step_ms=3600000)
+            })
+            predictions = pool.wait(seq, timeout=30)
+
+            self.assertEqual(sorted(p['symbol'] for p in predictions), ['BTC/USDT', 'ETH/USDT'])
+            for prediction in predictions:
+                self.assertEqual(prediction['bot'], 'oracle_ai')
+                self.assertIn(prediction['direction'], ('UP', 'DOWN', 'NEUTRAL'))
+                self.assertEqual(prediction['seq'], seq)
+        finally:
+            pool.stop()
+
+    def test_group_without_hook_is_idle(self):
+        """A group whose bots cannot read snapshots is stopped instead of receiving cycles"""
+        pool = BotWorkerPool(['BTC/USDT'], n_bars=10)
+        pool.add_group('SUPPORT', ['conflict_resolver_bot'])
+
+        try:
+            self.assertEqual(pool.start(wait_ready=60), {'SUPPORT': True})
+
+            started = time.monotonic()
+            self.assertEqual(pool.wait(pool.publish({'BTC/USDT': make_candles([1.0, 2.0])}), timeout=5), [])
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertTrue(pool.get_status()['groups']['SUPPORT']['idle'])
+        finally:
+            pool.stop()
+
+if __name__ == '__main__':
+    unittest.main()
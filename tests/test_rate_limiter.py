@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Rate Limiter
+Priority token bucket shared by all exchange calls
+"""
+
+import sys
+import os
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+from rate_limiter import RateLimiter, RateLimitShed
+
+NO_WAIT = {'orders': 0.0, 'positions': 0.0, 'analytics': 0.0}
+
+class RecordingExchange:
+    """Stand-in ccxt client that records calls"""
+
+    enableRateLimit = True
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', limit=None):
+        self.calls.append(('fetch_ohlcv', symbol))
+        return []
+
+    def create_market_sell_order(self, symbol, amount):
+        self.calls.append(('create_market_sell_order', symbol))
+        return {'id': '1'}
+
+class TestRateLimiter(unittest.TestCase):
+    """Test suite for RateLimiter"""
+
+    def test_analytics_shed_before_orders(self):
+        """Near the limit analytics are refused while orders still get tokens"""
+        limiter = RateLimiter(capacity=10, refill_rate=0.01, max_wait=NO_WAIT)
+
+        admitted = 0
+        with self.assertRaises(RateLimitShed):
+            while True:
+                limiter.acquire('fetch_ticker', 'analytics')
+                admitted += 1
+
+        self.assertEqual(admitted, 6)
+        limiter.acquire('fetch_ticker', 'positions')
+        for _ in range(3):
+            limiter.acquire('create_order', 'orders')
+
+        self.assertEqual(limiter.metrics['analytics']['shed'], 1)
+        self.assertEqual(limiter.metrics['orders']['calls'], 3)
+
+    def test_endpoint_weights(self):
+        """Heavier endpoints consume more tokens"""
+        limiter = RateLimiter(capacity=20, refill_rate=0.01, max_wait=NO_WAIT)
+
+        limiter.acquire('fetch_markets', 'orders')
+        self.assertAlmostEqual(limiter.bucket.available(), 10, places=0)
+        self.assertEqual(limiter.metrics['orders']['weight'], 10)
+
+    def test_guarded_exchange_routes_orders_first(self):
+        """Wrapped clients throttle every call and send orders in the orders class"""
+        limiter = RateLimiter(capacity=10, refill_rate=0.01, max_wait=NO_WAIT)
+        exchange = RecordingExchange()
+        guarded = limiter.guard(exchange, 'analytics')
+
+        self.assertFalse(exchange.enableRateLimit)
+        guarded.fetch_ohlcv('BTC/USDT', '5m')
+        guarded.create_market_sell_order('BTC/USDT', 0.001)
+
+        self.assertEqual([c[0] for c in exchange.calls], ['fetch_ohlcv', 'create_market_sell_order'])
+        self.assertEqual(limiter.metrics['analytics']['calls'], 1)
+        self.assertEqual(limiter.metrics['orders']['calls'], 1)
+
+    @unittest.skipUnless(FAKEREDIS_AVAILABLE, "fakeredis not installed")
+    def test_redis_bucket_shared_between_processes(self):
+        """Limiters sharing a Redis key draw from the same budget"""
+        server = fakeredis.FakeServer()
+        first = RateLimiter(capacity=4, refill_rate=0.01, max_wait=NO_WAIT, reserves={'analytics': 0.0},
+                            redis_like=fakeredis.FakeRedis(server=server, decode_responses=True))
+        second = RateLimiter(capacity=4, refill_rate=0.01, max_wait=NO_WAIT, reserves={'analytics': 0.0},
+                             redis_like=fakeredis.FakeRedis(server=server, decode_responses=True))
+
+        first.acquire('fetch_ohlcv', 'analytics')
+        second.acquire('fetch_ohlcv', 'analytics')
+
+        with self.assertRaises(RateLimitShed):
+            first.acquire('fetch_ticker', 'analytics')
+        self.assertEqual(second.get_status()['backend'], 'redis')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Single Flight
+Identical concurrent exchange requests collapse into one call
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from single_flight import SingleFlight
+from rate_limiter import RateLimiter
+
+class SlowExchange:
+    """Stand-in ccxt client with a slow ticker endpoint"""
+
+    id = 'cryptocom'
+    apiKey = None
+    enableRateLimit = True
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch_ticker(self, symbol):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return {'symbol': symbol, 'last': 26000.0}
+
+def run_concurrently(funcs):
+    results, threads = [None] * len(funcs), []
+    for i, func in enumerate(funcs):
+        def target(i=i, func=func):
+            try:
+                results[i] = func()
+            except Exception as e:
+                results[i] = e
+        threads.append(threading.Thread(target=target))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+class TestSingleFlight(unittest.TestCase):
+    """Test suite for SingleFlight"""
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        """A burst of identical requests runs once and everyone gets the result"""
+        flights = SingleFlight()
+        exchange = SlowExchange()
+
+        results = run_concurrently([lambda: flights.do('btc', exchange.fetch_ticker, 'BTC/USDT')] * 6)
+
+        self.assertEqual(exchange.calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(flights.metrics['shared'], 5)
+        self.assertEqual(flights.in_flight(), 0)
+
+    def test_errors_reach_every_waiter(self):
+        """An exception from the shared call is raised to all callers"""
+        flights = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise ConnectionError('exchange down')
+
+        results = run_concurrently([lambda: flights.do('x', failing)] * 3)
+
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(flights.metrics['executed'], 1)
+
+    def test_guarded_clients_coalesce_across_bots(self):
+        """Two bots' clients behind one limiter share a ticker request and its tokens"""
+        limiter = RateLimiter(capacity=10, refill_rate=1)
+        shared = SlowExchange()
+        crash_shield = limiter.guard(shared, 'positions')
+        oracle = limiter.guard(shared, 'analytics')
+
+        run_concurrently([lambda: crash_shield.fetch_ticker('BTC/USDT'),
+                          lambda: oracle.fetch_ticker('BTC/USDT'),
+                          lambda: oracle.fetch_ticker('BTC/USDT')])
+
+        self.assertEqual(shared.calls, 1)
+        self.assertEqual(sum(m['calls'] for m in limiter.metrics.values()), 1)
+
+        oracle.fetch_ticker('BTC/USDT')
+        self.assertEqual(shared.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Deferred Startup
+Lazy components and singletons, and the unified system's startup path
+"""
+
+import sys
+import os
+import subprocess
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add paths
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'modules'))
+sys.path.insert(0, ROOT)
+
+from startup import LazyComponents, LazySingleton, startup_profiler
+import tps19_main
+
+class Service:
+    """Optional service stand-in"""
+
+    def __init__(self, connected):
+        self.connected = connected
+
+class TestLazyComponents(unittest.TestCase):
+    """Test suite for LazyComponents and LazySingleton"""
+
+    def test_built_on_first_lookup_only(self):
+        """Membership and iteration do not build; lookup builds once and is timed"""
+        built = []
+        components = LazyComponents()
+        components.register('slow_demo', lambda: built.append(1) or object())
+
+        self.assertIn('slow_demo', components)
+        self.assertEqual(list(components), ['slow_demo'])
+        self.assertEqual(built, [])
+        self.assertEqual(components.created(), [])
+
+        first = components['slow_demo']
+        self.assertIs(components['slow_demo'], first)
+        self.assertEqual(built, [1])
+        self.assertEqual(components.created(), ['slow_demo'])
+        self.assertIn('slow_demo', [e['name'] for e in startup_profiler.get_report()['entries']
+                                    if e['kind'] == 'component'])
+
+    def test_unknown_component_raises(self):
+        """Unregistered names behave like a missing dict key"""
+        components = LazyComponents()
+        self.assertNotIn('redis', components)
+        with self.assertRaises(KeyError):
+            components['redis']
+        self.assertIsNone(components.get('redis'))
+
+    def test_concurrent_lookups_build_once(self):
+        """Threads racing for a component share one instance"""
+        built = []
+
+        def factory():
+            time.sleep(0.05)
+            built.append(1)
+            return object()
+
+        components = LazyComponents()
+        components.register('shared', factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(components['shared'])) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(built, [1])
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+    def test_add_registers_built_instance(self):
+        """Already built components are served as-is"""
+        components = LazyComponents()
+        instance = object()
+        components.add('redis', instance)
+        self.assertIs(components['redis'], instance)
+        self.assertEqual(components.created(), ['redis'])
+
+    def test_lazy_singleton(self):
+        """The factory runs on first get() only"""
+        built = []
+        singleton = LazySingleton('demo', lambda: built.append(1) or object())
+        self.assertFalse(singleton.created)
+        self.assertIs(singleton.get(), singleton.get())
+        self.assertEqual(built, [1])
+
+    def test_singleton_modules_import_as_a_package(self):
+        """Callers that only put the repo root on sys.path import modules.<pkg>.<module>"""
+        script = ("import sys; sys.path[:] = [p for p in sys.path if 'modules' not in p]; sys.path.append(%r); "
+                  "import modules.siul.siul_core, modules.patching.patch_manager, modules.brain.ai_memory, "
+                  "modules.n8n.n8n_integration, modules.market.market_feed" % ROOT)
+        result = subprocess.run([sys.executable, '-c', script], cwd=os.path.dirname(ROOT),
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+class TestDeferredStartup(unittest.TestCase):
+    """TPS19UnifiedSystem startup builds nothing until it is used"""
+
+    def make_system(self, redis_connected, sheets_connected, eager=False):
+        with mock.patch.object(tps19_main, 'RedisIntegration', lambda: Service(redis_connected)), \
+                mock.patch.object(tps19_main, 'GoogleSheetsIntegration', lambda: Service(sheets_connected)):
+            system = tps19_main.TPS19UnifiedSystem(eager=eager)
+            if system.optional_thread:
+                system.optional_thread.join(timeout=5)
+        return system
+
+    @unittest.skipUnless(tps19_main.PHASE1_AVAILABLE, "Phase 1 modules not installed")
+    def test_construction_defers_components(self):
+        """Core and model components are registered but not built"""
+        system = self.make_system(False, False)
+
+        for name in ('siul', 'patch_manager', 'n8n', 'models', 'lstm', 'gan', 'learning'):
+            self.assertIn(name, system.system_components)
+        self.assertEqual(system.system_components.created(), [])
+
+    @unittest.skipUnless(tps19_main.PHASE1_AVAILABLE, "Phase 1 modules not installed")
+    def test_optional_services_registered_only_when_connected(self):
+        """Redis and Google Sheets are components only once they have connected"""
+        system = self.make_system(redis_connected=True, sheets_connected=False)
+
+        self.assertIn('redis', system.system_components)
+        self.assertTrue(system.system_components['redis'].connected)
+        self.assertIs(system.redis, system.system_components['redis'])
+        self.assertNotIn('google_sheets', system.system_components)
+        self.assertIsNone(system.google_sheets)
+
+    @unittest.skipUnless(tps19_main.PHASE1_AVAILABLE, "Phase 1 modules not installed")
+    def test_failed_optional_service_is_skipped(self):
+        """An optional service raising on connect does not break startup"""
+        def broken():
+            raise ConnectionError('refused')
+
+        with mock.patch.object(tps19_main, 'RedisIntegration', broken), \
+                mock.patch.object(tps19_main, 'GoogleSheetsIntegration', lambda: Service(True)):
+            system = tps19_main.TPS19UnifiedSystem()
+            system.optional_thread.join(timeout=5)
+
+        self.assertNotIn('redis', system.system_components)
+        self.assertIn('google_sheets', system.system_components)
+
+if __name__ == '__main__':
+    unittest.main()
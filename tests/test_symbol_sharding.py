@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Symbol Sharding
+Redis partition leases, rebalancing and the signal coordinator
+"""
+
+import sys
+import os
+import time
+import importlib
+import unittest
+from unittest import mock
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+import symbol_sharding
+from symbol_sharding import ShardCoordinator, SignalCoordinator
+
+SYMBOLS = [f"COIN{i}/USDT" for i in range(300)]
+
+@unittest.skipUnless(FAKEREDIS_AVAILABLE, "fakeredis not installed")
+class TestShardCoordinator(unittest.TestCase):
+    """Test suite for ShardCoordinator"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+
+    def node(self, name, **kwargs):
+        return ShardCoordinator(self.redis, group='test', node_id=name, partitions=32, **kwargs)
+
+    def converge(self, nodes, beats=3):
+        for _ in range(beats):
+            for node in nodes:
+                node.heartbeat()
+
+    def test_nodes_split_symbols_without_overlap(self):
+        """Every symbol is owned by exactly one live node"""
+        nodes = [self.node(f"node{i}") for i in range(3)]
+        self.converge(nodes)
+
+        owned = [set(node.my_symbols(SYMBOLS)) for node in nodes]
+        self.assertEqual(sum(len(o) for o in owned), len(SYMBOLS))
+        self.assertEqual(set().union(*owned), set(SYMBOLS))
+        self.assertTrue(all(len(o) > 0 for o in owned))
+
+    def test_join_moves_only_new_nodes_share(self):
+        """A joining node takes partitions without reshuffling the others"""
+        a, b = self.node('a'), self.node('b')
+        self.converge([a, b])
+        before = {'a': set(a.owned), 'b': set(b.owned)}
+
+        c = self.node('c')
+        self.converge([a, b, c])
+
+        self.assertTrue(c.owned)
+        self.assertTrue(a.owned <= before['a'])
+        self.assertTrue(b.owned <= before['b'])
+        self.assertEqual(len(a.owned | b.owned | c.owned), 32)
+
+    def test_dead_node_partitions_are_reclaimed(self):
+        """Partitions of a node that stops heartbeating move after the lease expires"""
+        a, b = self.node('a', lease_ttl=0.3), self.node('b', lease_ttl=0.3)
+        self.converge([a, b])
+        self.assertTrue(b.owned)
+
+        time.sleep(0.4)
+        self.converge([a])
+
+        self.assertEqual(len(a.owned), 32)
+        self.assertEqual(a.get_status()['members'], ['a'])
+
+    def test_graceful_leave_hands_over_immediately(self):
+        """leave() releases leases so survivors claim them on the next beat"""
+        a, b = self.node('a'), self.node('b')
+        self.converge([a, b])
+
+        b.leave()
+        a.heartbeat()
+
+        self.assertEqual(len(a.owned), 32)
+
+    def test_signals_reach_single_coordinator(self):
+        """Shard signals are consumed once, by the lease-holding coordinator"""
+        shard = self.node('a')
+        shard.publish_signals([{'pair': 'COIN1/USDT', 'signal': 'UP', 'confidence': 0.7}], cycle=4)
+
+        leader = SignalCoordinator(self.redis, group='test', node_id='c1')
+        standby = SignalCoordinator(self.redis, group='test', node_id='c2')
+
+        signals = leader.poll()
+        self.assertEqual(len(signals), 1)
+        self.assertEqual(signals[0]['node_id'], 'a')
+        self.assertEqual(signals[0]['cycle'], 4)
+        self.assertEqual(standby.poll(), [])
+        self.assertFalse(standby.is_leader)
+
+        leader.resign()
+        self.assertTrue(standby.acquire_leadership())
+
+    def test_leader_does_not_renew_a_taken_over_lease(self):
+        """An expired leader neither renews nor deletes its successor's lease"""
+        old = SignalCoordinator(self.redis, group='test', node_id='c1', lease_ttl=15)
+        new = SignalCoordinator(self.redis, group='test', node_id='c2', lease_ttl=15)
+        self.assertTrue(old.acquire_leadership())
+
+        self.redis.delete(old.leader_key)
+        self.assertTrue(new.acquire_leadership())
+        self.redis.pexpire(new.leader_key, 5000)
+
+        self.assertFalse(old.acquire_leadership())
+        old.resign()
+        self.assertEqual(self.redis.get(new.leader_key), 'c2')
+        self.assertLessEqual(self.redis.pttl(new.leader_key), 5000)
+
+class ConflictingRedis:
+    """Client whose lease transactions always lose the WATCH race"""
+
+    def __init__(self, node_id):
+        self.node_id = node_id
+
+    def pipeline(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        pass
+
+    def get(self, key):
+        return self.node_id
+
+    def set(self, key, value, nx=False, px=None):
+        return None
+
+    def multi(self):
+        pass
+
+    def pexpire(self, key, ttl):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def execute(self):
+        raise symbol_sharding.WatchError()
+
+class TestWithoutRedisPy(unittest.TestCase):
+    """ShardCoordinator on a Redis-compatible client when redis-py is not installed"""
+
+    def setUp(self):
+        """Reload symbol_sharding with redis-py hidden"""
+        with mock.patch.dict(sys.modules, {'redis': None, 'redis.exceptions': None}):
+            importlib.reload(symbol_sharding)
+        self.addCleanup(importlib.reload, symbol_sharding)
+
+    def test_lease_conflicts_are_caught(self):
+        """A lost WATCH race reports the lease as not held instead of raising NameError"""
+        self.assertFalse(symbol_sharding.REDIS_AVAILABLE)
+        node = symbol_sharding.ShardCoordinator(ConflictingRedis('a'), group='test', node_id='a', partitions=4)
+
+        self.assertFalse(node._renew(0))
+        self.assertFalse(node._release(0))
+
+    def test_leadership_renewal_is_atomic(self):
+        """A coordinator whose lease changes hands mid-renewal is not leader"""
+        coordinator = symbol_sharding.SignalCoordinator(ConflictingRedis('c1'), group='test', node_id='c1')
+
+        self.assertFalse(coordinator.acquire_leadership())
+        self.assertFalse(coordinator.is_leader)
+
+if __name__ == '__main__':
+    unittest.main()
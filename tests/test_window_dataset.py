@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Window Dataset
+Strided training windows over in-memory and memory-mapped candles
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'modules'))
+
+from ai_models.window_dataset import WindowDataset, CandleArchive
+from ai_models.lstm_predictor import LSTMPredictor
+
+def make_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = rng.normal(0, 5, n).cumsum() + 26000
+    return np.column_stack([np.arange(n) * 60_000.0, close, close + 5, close - 5, close, rng.uniform(1, 10, n)])
+
+class TestWindowDataset(unittest.TestCase):
+    """Test suite for WindowDataset"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.candles = make_candles(1000)
+
+    def tearDown(self):
+        """Clean up"""
+        self.tmp.cleanup()
+
+    def test_matches_loop_construction_without_copying(self):
+        """Batches equal the old append loop; the window array is a view"""
+        values = self.candles[:, 1:]
+        lo, hi = values.min(axis=0), values.max(axis=0)
+        scaled = (values - lo) / (hi - lo + 1e-8)
+        X_loop = np.array([scaled[i - 60:i] for i in range(60, len(scaled))])
+        y_loop = scaled[60:, 3]
+
+        dataset = WindowDataset(values, 60, batch_size=128)
+        self.assertTrue(np.shares_memory(dataset.windows, values))
+        X, y = zip(*dataset)
+
+        np.testing.assert_allclose(np.concatenate(X), X_loop)
+        np.testing.assert_allclose(np.concatenate(y), y_loop)
+
+    def test_streams_from_memmapped_archive(self):
+        """Appended archives are read back memory-mapped and split chronologically"""
+        archive = CandleArchive(os.path.join(self.tmp.name, 'btc_1m.npy'))
+        archive.write(self.candles[:600])
+        self.assertEqual(archive.write(self.candles[600:]), 1000)
+
+        values = archive.ohlcv()
+        self.assertIsInstance(values.base, np.memmap)
+
+        train, validation = WindowDataset(values, 60, batch_size=100).split(0.25)
+        self.assertEqual(train.n_samples + validation.n_samples, 940)
+        X, _ = validation[0]
+        expected = train.scale(self.candles[train.stop:train.stop + 60, 1:])
+        np.testing.assert_allclose(X[0], expected)
+
+    def test_archive_appends_in_place(self):
+        """Appends write only the new rows; an interrupted append's tail is overwritten"""
+        path = os.path.join(self.tmp.name, 'btc_1m.npy')
+        archive = CandleArchive(path)
+        archive.write(self.candles[:1])
+        inode = os.stat(path).st_ino
+
+        for start in range(1, 1000, 111):
+            archive.write(self.candles[start:start + 111])
+        self.assertEqual(os.stat(path).st_ino, inode)
+        np.testing.assert_array_equal(np.load(path), self.candles)
+
+        # Rows written without their header update are ignored, then replaced
+        with open(path, 'ab') as f:
+            f.write(b'partial row')
+        np.testing.assert_array_equal(archive.open(), self.candles)
+        self.assertEqual(archive.write(self.candles[:2]), 1002)
+        np.testing.assert_array_equal(archive.open()[-2:], self.candles[:2])
+        self.assertEqual(os.path.getsize(path), archive.open().offset + 1002 * 6 * 8)
+
+    def test_training_split_is_shuffled(self):
+        """Training windows are shuffled from the first epoch; validation stays in order"""
+        dataset = WindowDataset(self.candles[:, 1:], 60, batch_size=100, shuffle=True, seed=1)
+        train, validation = dataset.split(0.25)
+
+        self.assertFalse(np.array_equal(train.order, np.arange(train.start, train.stop)))
+        np.testing.assert_array_equal(np.sort(train.order), np.arange(train.start, train.stop))
+        np.testing.assert_array_equal(validation.order, np.arange(validation.start, validation.stop))
+        self.assertLess(train.order.max(), validation.order.min())
+
+    def test_lstm_prepare_data_unchanged(self):
+        """LSTMPredictor.prepare_data returns the same sequences as before, as a view"""
+        frame = pd.DataFrame(self.candles[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'])
+        predictor = LSTMPredictor(model_dir=self.tmp.name)
+        X, y = predictor.prepare_data(frame)
+
+        self.assertEqual(X.shape, (940, 60, 5))
+        self.assertIsNotNone(X.base)
+        dataset = WindowDataset(frame.values, 60, scaler=predictor.scaler_params)
+        X_ref, y_ref = dataset.take(np.arange(940))
+        np.testing.assert_allclose(X, X_ref)
+        np.testing.assert_allclose(y, y_ref)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,22 +9,24 @@ workspace_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(workspace_dir, 'modules'))
 sys.path.insert(0, '/opt/tps19/modules')
 
-# Import all modules
+from startup import startup_profiler, LazyComponents, report_requested
+
+# Import all modules (cheap: singletons are created on first use)
 try:
-    from siul.siul_core import siul_core
-    from patching.patch_manager import patch_manager
-    from n8n.n8n_integration import n8n_integration
+    get_siul_core = startup_profiler.timed_import('siul.siul_core').get_siul_core
+    get_patch_manager = startup_profiler.timed_import('patching.patch_manager').get_patch_manager
+    get_n8n_integration = startup_profiler.timed_import('n8n.n8n_integration').get_n8n_integration
     print("✅ All unified modules imported successfully")
 except ImportError as e:
     print(f"❌ Module import failed: {e}")
     print(f"   Workspace: {workspace_dir}")
     sys.exit(1)
 
-# Import Phase 1 AI/ML modules
+# Import Phase 1 AI/ML modules (ai_models defers pandas/TensorFlow until a model is used)
 try:
-    from ai_models import LSTMPredictor, GANSimulator, SelfLearningPipeline
-    from redis_integration import RedisIntegration
-    from google_sheets_integration import GoogleSheetsIntegration
+    ai_models = startup_profiler.timed_import('ai_models')
+    RedisIntegration = startup_profiler.timed_import('redis_integration').RedisIntegration
+    GoogleSheetsIntegration = startup_profiler.timed_import('google_sheets_integration').GoogleSheetsIntegration
     print("✅ Phase 1 AI/ML modules imported successfully")
     PHASE1_AVAILABLE = True
 except ImportError as e:
@@ -32,64 +34,103 @@ except ImportError as e:
     print("   Install dependencies: pip install -r requirements_phase1.txt")
     PHASE1_AVAILABLE = False
 
+# Symbol the system-wide LSTM and GAN components are trained for
+MODEL_SYMBOL = 'BTC/USDT'
+
 class TPS19UnifiedSystem:
     """TPS19 Definitive Unified System"""
     
-    def __init__(self):
+    def __init__(self, eager=False):
+        """Register system components
+        
+        Args:
+            eager: Build every component now instead of on first use
+        """
         self.running = False
         self.exchange = 'crypto.com'
-        self.system_components = {
-            'siul': siul_core,
-            'patch_manager': patch_manager,
-            'n8n': n8n_integration
-        }
+        self.system_components = LazyComponents()
+        self.predictors = {}
+        self._predictors_lock = threading.Lock()
+        self.redis = None
+        self.google_sheets = None
+        self.optional_thread = None
+        self.system_components.register('siul', get_siul_core)
+        self.system_components.register('patch_manager', get_patch_manager)
+        self.system_components.register('n8n', get_n8n_integration)
         
-        # Initialize Phase 1 components if available
+        # Register Phase 1 components if available
         if PHASE1_AVAILABLE:
             self._init_phase1_components()
             
-    def _init_phase1_components(self):
-        """Initialize Phase 1 AI/ML components"""
-        try:
-            # Initialize LSTM predictor
-            self.lstm_predictor = LSTMPredictor()
-            self.system_components['lstm'] = self.lstm_predictor
-            print("✅ LSTM Predictor initialized")
-            
-            # Initialize GAN simulator
-            self.gan_simulator = GANSimulator()
-            self.system_components['gan'] = self.gan_simulator
-            print("✅ GAN Simulator initialized")
-            
-            # Initialize self-learning pipeline
-            self.learning_pipeline = SelfLearningPipeline()
-            self.system_components['learning'] = self.learning_pipeline
-            print("✅ Self-Learning Pipeline initialized")
+            # Optional services connect off the startup path unless everything is built now
+            if eager:
+                self._connect_optional()
+            else:
+                self.optional_thread = threading.Thread(target=self._connect_optional, name='optional-services',
+                                                        daemon=True)
+                self.optional_thread.start()
+        
+        if eager:
+            for name in list(self.system_components):
+                try:
+                    self.system_components[name]
+                except Exception as e:
+                    print(f"⚠️ {name} initialization failed: {e}")
             
-            # Initialize Redis (optional)
+    def _init_phase1_components(self):
+        """Register Phase 1 AI/ML components (created on first use)"""
+        # Models train into and serve from the registry, so retrained versions swap in live
+        self.system_components.register('models', self._start_model_registry)
+        self.system_components.register('lstm', lambda: self.predictor(MODEL_SYMBOL))
+        self.system_components.register('gan', lambda: ai_models.GANSimulator(registry=self.model_registry,
+                                                                              symbol=MODEL_SYMBOL))
+        self.system_components.register('learning', lambda: ai_models.SelfLearningPipeline())
+    
+    def _connect_optional(self):
+        """Connect Redis and Google Sheets; each is registered only once it has connected"""
+        for name, label, factory in (('redis', 'Redis', RedisIntegration),
+                                     ('google_sheets', 'Google Sheets', GoogleSheetsIntegration)):
             try:
-                self.redis = RedisIntegration()
-                if self.redis.connected:
-                    self.system_components['redis'] = self.redis
-                    print("✅ Redis connected")
-                else:
-                    print("⚠️ Redis not available (optional)")
+                client = factory()
             except Exception as e:
-                print(f"⚠️ Redis initialization failed (optional): {e}")
-                
-            # Initialize Google Sheets (optional)
-            try:
-                self.google_sheets = GoogleSheetsIntegration()
-                if self.google_sheets.connected:
-                    self.system_components['google_sheets'] = self.google_sheets
-                    print("✅ Google Sheets connected")
-                else:
-                    print("⚠️ Google Sheets not available (optional)")
-            except Exception as e:
-                print(f"⚠️ Google Sheets initialization failed (optional): {e}")
-                
-        except Exception as e:
-            print(f"⚠️ Phase 1 component initialization error: {e}")
+                print(f"⚠️ {label} initialization failed (optional): {e}")
+                continue
+            
+            if client.connected:
+                setattr(self, name, client)
+                self.system_components.add(name, client)
+                print(f"✅ {label} connected")
+            else:
+                print(f"⚠️ {label} not available (optional)")
+    
+    def _start_model_registry(self):
+        """Model registry with every symbol's active model loading in the background"""
+        registry = ai_models.ModelRegistry()
+        registry.preload(loaders=('lstm', 'gan'), background=True)
+        return registry
+    
+    @property
+    def model_registry(self):
+        return self.system_components['models']
+    
+    def predictor(self, symbol):
+        """LSTMPredictor for a symbol, serving (and publishing to) the registry's active version"""
+        with self._predictors_lock:
+            if symbol not in self.predictors:
+                self.predictors[symbol] = ai_models.LSTMPredictor(registry=self.model_registry, symbol=symbol)
+            return self.predictors[symbol]
+    
+    @property
+    def lstm_predictor(self):
+        return self.system_components['lstm']
+    
+    @property
+    def gan_simulator(self):
+        return self.system_components['gan']
+    
+    @property
+    def learning_pipeline(self):
+        return self.system_components['learning']
         
     def start_system(self):
         """Start the complete unified system"""
@@ -97,6 +138,13 @@ class TPS19UnifiedSystem:
             print("🚀 Starting TPS19 Definitive Unified System...")
             self.running = True
             
+            # Start warming the active models while the services come up
+            if PHASE1_AVAILABLE:
+                self.model_registry
+            
+            siul_core = self.system_components['siul']
+            n8n_integration = self.system_components['n8n']
+            
             # Start N8N service
             n8n_integration.start_n8n_service()
             
@@ -142,6 +190,9 @@ class TPS19UnifiedSystem:
         print("="*60)
         
         test_results = {}
+        siul_core = self.system_components['siul']
+        patch_manager = self.system_components['patch_manager']
+        n8n_integration = self.system_components['n8n']
         
         # Test SIUL
         print("🔍 Testing SIUL...")
@@ -177,10 +228,12 @@ class TPS19UnifiedSystem:
         return passed == total
 
 if __name__ == "__main__":
-    system = TPS19UnifiedSystem()
+    system = TPS19UnifiedSystem(eager='--eager' in sys.argv)
     
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         system.run_comprehensive_tests()
+        if report_requested():
+            startup_profiler.print_report()
     else:
         # Start health check server for Cloud Run
         import threading
@@ -207,5 +260,8 @@ if __name__ == "__main__":
         health_thread.start()
         print(f"✅ Health check server running on port {port}")
         
+        if report_requested():
+            startup_profiler.print_report()
+        
         # Start main trading system
         system.start_system()